@@ -14,14 +14,19 @@
 # License: MIT
 # ==============================================================================
 
+import time
 import uuid
 import requests
 
 from typing import List, Dict
 
+from api.metrics import record_cloud_request
+from api.tracing import traced
+
 # Govee Cloud API endpoint for querying device DIY scenes
 API_ENDPOINT = "https://openapi.api.govee.com/router/api/v1/device/diy-scenes"
 
+@traced("cloud.get_device_diy_scenes")
 def get_device_diy_scenes(device_id: str, sku: str, api_key: str) -> List[Dict]:
     """
     Fetch the list of DIY scene options for a given Govee device from the Cloud API.
@@ -48,6 +53,8 @@ def get_device_diy_scenes(device_id: str, sku: str, api_key: str) -> List[Dict]:
         }
     }
 
+    response = None
+    started = time.perf_counter()
     try:
         response = requests.post(API_ENDPOINT, headers=headers, json=payload)
         response.raise_for_status()
@@ -70,5 +77,7 @@ def get_device_diy_scenes(device_id: str, sku: str, api_key: str) -> List[Dict]:
             print(f"❌ Response: {response.text}")
     except Exception as err:
         print(f"❌ An error occurred: {err}")
+    finally:
+        record_cloud_request("diy_scenes", started, response)
 
     return []
\ No newline at end of file
@@ -14,14 +14,18 @@
 # License: MIT
 # ==============================================================================
 
+import time
 import requests
 from typing import Dict
 
+from api.metrics import record_cloud_request
+from api.tracing import traced
 from models.govee_device import GoveeDevice
 
 # Govee Cloud API endpoint to fetch user's device list
 API_ENDPOINT = "https://openapi.api.govee.com/router/api/v1/user/devices"
 
+@traced("cloud.get_devices")
 def get_govee_devices(api_key: str) -> Dict[str, GoveeDevice]:
     """
     Fetch all Govee devices associated with the user's account.
@@ -37,6 +41,8 @@ def get_govee_devices(api_key: str) -> Dict[str, GoveeDevice]:
         "Content-Type": "application/json"
     }
 
+    response = None
+    started = time.perf_counter()
     try:
         response = requests.get(API_ENDPOINT, headers=headers)
         response.raise_for_status()
@@ -62,5 +68,7 @@ def get_govee_devices(api_key: str) -> Dict[str, GoveeDevice]:
             print(f"❌ Response content: {response.text}")
     except Exception as err:
         print(f"❌ An unexpected error occurred: {err}")
+    finally:
+        record_cloud_request("devices", started, response)
 
     return {}
\ No newline at end of file
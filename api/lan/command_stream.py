@@ -0,0 +1,310 @@
+# api/lan/command_stream.py
+
+# ==============================================================================
+# Govee LAN API Plus – JSONL Command Stream
+# -----------------------------------------
+#
+# Description:
+# Reads light commands as newline-delimited JSON (from stdin, a pipe or a
+# FIFO) and sends them to the devices as fast as they arrive, so other tools
+# can drive the lights without importing this project.
+#
+# Each line is one command, using the same keys as show timeline cues:
+#
+#   {"device": "smart_ground_lights", "scene": "smart_ground_lights_spooky_123456"}
+#   {"device": ["porch_light", "garage_lights"], "color": {"r": 255, "g": 80, "b": 0}}
+#   {"device": "porch_light", "brightness": 40, "deadline": 1761951300.25}
+#   {"device": "porch_light", "power": false}
+#   {"device": "porch_light", "msg": {"cmd": "colorwc", "data": {...}}}
+#
+# `msg` passes a native LAN command through as is. `deadline` (optional) is
+# a Unix timestamp: a command read after its deadline is dropped, not sent
+# late.
+#
+# - Lines are parsed one at a time as they arrive; a half-written line waits
+#   in the read buffer until its newline comes in.
+# - Every packet goes out through one reused UDP socket. Encoded packets are
+#   cached per distinct command content (up to COMMAND_STREAM_CACHE_SIZE of
+#   them), whichever device it is for, so a repeated command costs a JSON
+#   parse, a couple of dict lookups and the sends.
+# - Backpressure: nothing is queued in memory. When the devices' side can't
+#   keep up, the pipe fills and the producer's writes block. Every
+#   COMMAND_STREAM_REPORT_INTERVAL seconds a report gives the command rate,
+#   late and invalid commands, send errors and how full the pipe is. Reports
+#   come from a timer thread, so they keep coming while a slow or idle
+#   producer leaves the reader blocked waiting for a line.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import json
+import time
+import socket
+import threading
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+    import termios
+except ImportError:  # Windows: no pipe fill level in the reports
+    fcntl = termios = None
+
+from api.lan.packet_capture import capture_lan_send
+from api.lan.set_device_brightness import build_brightness_payload
+from api.lan.set_device_color import build_color_payload
+from api.lan.set_device_mqtt_diy_scene import build_mqtt_diy_scene_payload
+from api.lan.set_device_power import build_power_payload
+from api.metrics import LAN_SEND_ERRORS, record_lan_send
+from api.tracing import traced
+from models.govee_device import GoveeDevice
+from models.govee_mqtt_diy_scene import GoveeMqttDiyScene
+
+# Configurable via .env
+COMMAND_STREAM_REPORT_INTERVAL = float(os.getenv("COMMAND_STREAM_REPORT_INTERVAL", 1.0))
+COMMAND_STREAM_CACHE_SIZE = int(os.getenv("COMMAND_STREAM_CACHE_SIZE", 4096))
+
+MAX_LOGGED_ERRORS = 10  # Invalid lines printed before going quiet (all are counted)
+
+Packets = List[Tuple[bytes, Tuple[str, int]]]
+
+
+class CommandStream:
+    """Sends newline-delimited JSON commands to devices through one socket."""
+
+    def __init__(
+        self,
+        devices: Dict[str, GoveeDevice],
+        scenes: Optional[Dict[str, GoveeMqttDiyScene]] = None,
+        report_interval: float = COMMAND_STREAM_REPORT_INTERVAL,
+        on_report: Optional[Callable[[dict], None]] = None,
+        cache_size: int = COMMAND_STREAM_CACHE_SIZE
+    ):
+        """
+        Initialize a CommandStream.
+
+        Args:
+            devices (Dict[str, GoveeDevice]): Device variable name → device.
+            scenes (Dict[str, GoveeMqttDiyScene], optional): MQTT DIY scene variable name → scene.
+            report_interval (float): Seconds between reports passed to `on_report`.
+            on_report (Callable[[dict], None], optional): Called with every periodic report.
+            cache_size (int): Max distinct commands (and device lists) whose encoded packets (and addresses) are kept.
+        """
+        self.devices = devices
+        self.scenes = scenes or {}
+        self.report_interval = report_interval
+        self.on_report = on_report
+        self.cache_size = cache_size
+
+        self.commands = 0
+        self.packets = 0
+        self.late = 0
+        self.invalid = 0
+        self.send_errors = 0
+
+        self._cache: Dict[tuple, object] = {}  # Command → encoded messages (or per-device groups, for scenes)
+        self._addresses: Dict[object, Tuple[Tuple[str, int], ...]] = {}  # Device name(s) → addresses
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # --------------------------------------------------------------------------
+    # Commands
+    # --------------------------------------------------------------------------
+
+    def encode(self, command: dict) -> Packets:
+        """
+        The packets one command sends, as (bytes, (ip, port)) pairs.
+
+        Raises:
+            ValueError: If the command names an unknown device or scene, or has nothing to send.
+        """
+        return [(data, address) for messages, address in self._groups(command) for data in messages]
+
+    def _groups(self, command: dict) -> List[Tuple[Tuple[bytes, ...], Tuple[str, int]]]:
+        """The packets one command sends, as (encoded messages, address) per target device."""
+        device = command["device"]
+        device_key = device if isinstance(device, str) else tuple(device)
+        addresses = self._addresses.get(device_key)
+        if addresses is None:
+            addresses = tuple((d.ip, d.port) for d in self._targets(device_key))
+            if len(self._addresses) >= self.cache_size:
+                self._addresses.clear()
+            self._addresses[device_key] = addresses
+
+        if "msg" in command:
+            data = (json.dumps({"msg": command["msg"]}).encode("utf-8"),)
+            return [(data, address) for address in addresses]
+
+        color = command.get("color")
+        scene = command.get("scene")
+        key = (
+            scene,
+            command.get("power"),
+            command.get("brightness"),
+            (color.get("r"), color.get("g"), color.get("b")) if color is not None else None,
+            command.get("color_temp_in_kelvin"),
+        )
+        if scene is not None:
+            # Scene payloads name their device, so they are cached per device
+            key = (device_key,) + key
+        cached = self._cache.get(key)
+        if cached is None:
+            if scene is None:
+                cached = self._encode(command)
+            else:
+                cached = [(self._encode(command, d), (d.ip, d.port)) for d in self._targets(device_key)]
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[key] = cached
+        return cached if scene is not None else [(cached, address) for address in addresses]
+
+    def _targets(self, device_key) -> List[GoveeDevice]:
+        targets = []
+        for name in (device_key,) if isinstance(device_key, str) else device_key:
+            device = self.devices.get(name)
+            if device is None:
+                raise ValueError(f"Unknown device '{name}'")
+            if not device.ip:
+                raise ValueError(f"Device '{name}' has no LAN IP")
+            targets.append(device)
+        return targets
+
+    def _encode(self, command: dict, device: Optional[GoveeDevice] = None) -> Tuple[bytes, ...]:
+        payloads = []
+        if device is not None:
+            scene = self.scenes.get(command["scene"])
+            if scene is None:
+                raise ValueError(f"Unknown MQTT DIY scene '{command['scene']}'")
+            payloads.append(build_mqtt_diy_scene_payload(device, scene))
+        if "power" in command:
+            payloads.append(build_power_payload(command["power"]))
+        if "brightness" in command:
+            payloads.append(build_brightness_payload(command["brightness"]))
+        if "color" in command or "color_temp_in_kelvin" in command:
+            color = command.get("color", {"r": 0, "g": 0, "b": 0})
+            payloads.append(build_color_payload(color, command.get("color_temp_in_kelvin", 0)))
+        if not payloads:
+            raise ValueError("No scene, power, brightness, color or msg to send")
+        return tuple(json.dumps(p).encode("utf-8") for p in payloads)
+
+    # --------------------------------------------------------------------------
+    # Streaming
+    # --------------------------------------------------------------------------
+
+    @traced("lan.command_stream")
+    def run(self, stream: BinaryIO) -> dict:
+        """
+        Send every command read from `stream` until it ends.
+
+        Args:
+            stream (BinaryIO): A binary stream of JSON lines, e.g. `sys.stdin.buffer` or an opened FIFO.
+
+        Returns:
+            dict: The report for the whole run (see `report`). Counters add up across runs.
+        """
+        started = time.monotonic()
+        first_commands = self.commands
+
+        # Reports come from a timer thread: the loop below blocks while the producer is idle
+        stop = threading.Event()
+        reporter = None
+        if self.on_report and self.report_interval > 0:
+            reporter = threading.Thread(target=self._report_every, args=(stream, stop), name="command-stream-report", daemon=True)
+            reporter.start()
+        try:
+            self._send_lines(stream)
+        finally:
+            stop.set()
+            if reporter:
+                reporter.join()
+
+        return self.report(time.monotonic() - started, self.commands - first_commands, stream)
+
+    def _send_lines(self, stream: BinaryIO) -> None:
+        loads, now, groups = json.loads, time.time, self._groups
+        sendto = self._sock.sendto
+        count = 0
+        for line in stream:
+            count += 1
+            try:
+                command = loads(line)
+                deadline = command.get("deadline")
+                if deadline is not None and now() > deadline:
+                    self.late += 1
+                    continue
+                targets = groups(command)
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                if not line.strip():
+                    continue
+                self.invalid += 1
+                if self.invalid <= MAX_LOGGED_ERRORS:
+                    print(f"⚠️  Skipping command on line {count}: {e}", file=sys.stderr)
+                continue
+
+            self.commands += 1
+            for messages, address in targets:
+                for data in messages:
+                    try:
+                        sendto(data, address)
+                    except OSError:
+                        LAN_SEND_ERRORS.inc(1, address[0])
+                        self.send_errors += 1
+                        continue
+                    record_lan_send(address[0], len(data))
+                    capture_lan_send(address, data)
+                    self.packets += 1
+
+    def _report_every(self, stream: BinaryIO, stop: threading.Event) -> None:
+        """Call `on_report` every `report_interval` seconds until `stop` is set."""
+        last = time.monotonic()
+        last_commands = self.commands
+        while not stop.wait(max(0.0, last + self.report_interval - time.monotonic())):
+            checked = time.monotonic()
+            commands = self.commands
+            self.on_report(self.report(checked - last, commands - last_commands, stream))
+            last, last_commands = checked, commands
+
+    def report(self, seconds: float, commands: Optional[int] = None, stream: Optional[BinaryIO] = None) -> dict:
+        """
+        Counters so far, with the command rate over the last `seconds`.
+
+        Args:
+            seconds (float): Length of the period the rate is for.
+            commands (int, optional): Commands sent in that period. Defaults to all of them.
+            stream (BinaryIO, optional): The input, to report how much unread data is waiting in it.
+
+        Returns:
+            dict: {"commands", "packets", "late", "invalid", "send_errors", "seconds", "commands_per_second",
+                   "backlog_bytes", "pipe_size"}. The last two are None when unknown; a backlog near
+                   the pipe size means the producer is being held back.
+        """
+        commands = self.commands if commands is None else commands
+        backlog = pipe_size = None
+        if stream is not None and fcntl is not None:
+            try:
+                fd = stream.fileno()
+                backlog = int.from_bytes(fcntl.ioctl(fd, termios.FIONREAD, b"\0\0\0\0"), sys.byteorder)
+                pipe_size = fcntl.fcntl(fd, fcntl.F_GETPIPE_SZ) if hasattr(fcntl, "F_GETPIPE_SZ") else None
+            except (OSError, ValueError, AttributeError):
+                pass  # Not a pipe (or already closed)
+        return {
+            "commands": self.commands,
+            "packets": self.packets,
+            "late": self.late,
+            "invalid": self.invalid,
+            "send_errors": self.send_errors,
+            "seconds": seconds,
+            "commands_per_second": commands / seconds if seconds > 0 else 0.0,
+            "backlog_bytes": backlog,
+            "pipe_size": pipe_size,
+        }
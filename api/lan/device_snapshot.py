@@ -0,0 +1,234 @@
+# api/lan/device_snapshot.py
+
+# ==============================================================================
+# Govee LAN API Plus – Device State Snapshots
+# -------------------------------------------
+#
+# Description:
+# Captures the state of many Govee devices at once (power, brightness, color
+# and color temperature) and puts it back later, e.g. to return every light
+# to how it was before a show.
+#
+# - Snapshot: one concurrent `devStatus` fan-out (get_devices_status), so it
+#   takes about one round trip however many devices there are. Devices whose
+#   reply was lost are asked once more.
+# - Each state is kept as a 6-tuple (on, brightness, r, g, b, kelvin), and
+#   saved as JSON in the same compact shape.
+# - Restore: every packet is encoded up front, then sent in one paced burst.
+#   Devices get their packets in rounds (`turn`, then `brightness`, then
+#   `colorwc`), so each device's own packets are spread out by at least
+#   LAN_RESTORE_DEVICE_GAP, and the burst as a whole never exceeds
+#   LAN_RESTORE_RATE packets per second. Devices that were off are only
+#   switched off. An optional verify pass reads every state back (asking
+#   again when a reply is lost) and resends what didn't stick. Devices that
+#   never answer are reported as unverified, not as mismatched.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import json
+import time
+import socket
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from api.lan.get_device_status import LAN_IP_ADDRESS_HELPER_TIMEOUT, get_devices_status
+from api.lan.packet_capture import capture_lan_send
+from api.lan.set_device_brightness import build_brightness_payload
+from api.lan.set_device_color import build_color_payload
+from api.lan.set_device_power import build_power_payload
+from api.metrics import LAN_SEND_ERRORS, record_lan_send
+from api.tracing import traced
+from models.govee_device import GoveeDevice
+
+# Configurable via .env
+LAN_RESTORE_RATE = float(os.getenv("LAN_RESTORE_RATE", 2000))
+LAN_RESTORE_DEVICE_GAP = float(os.getenv("LAN_RESTORE_DEVICE_GAP", 0.01))
+LAN_RESTORE_VERIFY_RETRIES = int(os.getenv("LAN_RESTORE_VERIFY_RETRIES", 2))
+
+DeviceState = Tuple[int, int, int, int, int, int]  # on, brightness, r, g, b, kelvin
+
+
+def state_from_status(data: dict) -> DeviceState:
+    """Reduce a `devStatus` reply's data to a DeviceState."""
+    color = data.get("color", {})
+    return (
+        int(data.get("onOff", 0)),
+        int(data.get("brightness", 100)),
+        int(color.get("r", 0)),
+        int(color.get("g", 0)),
+        int(color.get("b", 0)),
+        int(data.get("colorTemInKelvin", 0)),
+    )
+
+
+def restore_packets(state: DeviceState) -> List[bytes]:
+    """The packets that put a device back into `state`, in the order they are sent."""
+    on, brightness, r, g, b, kelvin = state
+    if not on:
+        return [json.dumps(build_power_payload(False)).encode("utf-8")]
+    return [
+        json.dumps(build_power_payload(True)).encode("utf-8"),
+        json.dumps(build_brightness_payload(brightness)).encode("utf-8"),
+        json.dumps(build_color_payload({"r": r, "g": g, "b": b}, kelvin)).encode("utf-8"),
+    ]
+
+
+class DeviceSnapshot:
+    """The captured state of a set of devices."""
+
+    def __init__(self, states: Optional[Dict[str, DeviceState]] = None, taken_at: Optional[str] = None,
+                 missing: Optional[List[str]] = None):
+        """
+        Initialize a DeviceSnapshot.
+
+        Args:
+            states (Dict[str, DeviceState]): Device ID → (on, brightness, r, g, b, kelvin).
+            taken_at (str, optional): ISO timestamp of the capture.
+            missing (List[str], optional): IDs of devices that did not reply.
+        """
+        self.states = states or {}
+        self.taken_at = taken_at or datetime.now().isoformat()
+        self.missing = missing or []
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def save(self, path: str) -> None:
+        """Write the snapshot as JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"taken_at": self.taken_at, "states": self.states, "missing": self.missing}, f)
+
+    @classmethod
+    def load(cls, path: str) -> "DeviceSnapshot":
+        """Read a snapshot written by `save`."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        states = {device_id: tuple(state) for device_id, state in data["states"].items()}
+        return cls(states, data.get("taken_at"), data.get("missing"))
+
+
+@traced("lan.snapshot")
+def take_snapshot(govee_devices: List[GoveeDevice], timeout: float = LAN_IP_ADDRESS_HELPER_TIMEOUT,
+                  retries: int = 1) -> DeviceSnapshot:
+    """
+    Capture the state of many devices with concurrent `devStatus` requests.
+
+    Args:
+        govee_devices (List[GoveeDevice]): Devices to capture. Devices without an IP are skipped.
+        timeout (float): Max time to wait for each round of replies (in seconds).
+        retries (int): Extra rounds for devices that did not reply.
+
+    Returns:
+        DeviceSnapshot: The captured states, with the IDs of devices that never replied in `missing`.
+    """
+    pending = [d for d in govee_devices if d.ip]
+    states = {}
+    for _ in range(1 + retries):
+        for device_id, result in get_devices_status(pending, timeout=timeout).items():
+            states[device_id] = state_from_status(result["data"])
+        pending = [d for d in pending if d.id not in states]
+        if not pending:
+            break
+    return DeviceSnapshot(states, missing=[d.id for d in pending])
+
+
+@traced("lan.restore")
+def restore_snapshot(
+    snapshot: DeviceSnapshot,
+    govee_devices: List[GoveeDevice],
+    rate: float = LAN_RESTORE_RATE,
+    device_gap: float = LAN_RESTORE_DEVICE_GAP,
+    verify: bool = False,
+    timeout: float = LAN_IP_ADDRESS_HELPER_TIMEOUT,
+    verify_retries: int = LAN_RESTORE_VERIFY_RETRIES
+) -> dict:
+    """
+    Put devices back into their snapshot state in one rate-limited burst.
+
+    Args:
+        snapshot (DeviceSnapshot): States to restore.
+        govee_devices (List[GoveeDevice]): Devices to restore; those not in the snapshot (or without an IP) are skipped.
+        rate (float): Max packets per second across all devices.
+        device_gap (float): Min seconds between two packets to the same device.
+        verify (bool): Read every state back afterwards and resend to devices that don't match.
+        timeout (float): Max time to wait for each round of the verify pass's replies (in seconds).
+        verify_retries (int): Extra verify reads for devices whose `devStatus` reply was lost.
+
+    Returns:
+        dict: {"devices", "packets", "seconds", "send_errors", "mismatched", "unverified"}. `mismatched` lists
+              the IDs still reporting a different state after the verify pass; `unverified` the IDs that
+              never answered it, so whether they were restored is unknown (both empty without `verify`).
+    """
+    targets = [d for d in govee_devices if d.ip and d.id in snapshot.states]
+    started = time.perf_counter()
+    packets, errors = _send_rounds(targets, snapshot, rate, device_gap)
+
+    mismatched = []
+    unverified = []
+    if verify and targets:
+        current = take_snapshot(targets, timeout=timeout, retries=verify_retries)
+        wrong = [d for d in targets if d.id in current.states and not _matches(snapshot.states[d.id], current.states[d.id])]
+        unverified = list(current.missing)
+        if wrong:
+            resent, resend_errors = _send_rounds(wrong, snapshot, rate, device_gap)
+            packets += resent
+            errors += resend_errors
+            current = take_snapshot(wrong, timeout=timeout, retries=verify_retries)
+            mismatched = [d.id for d in wrong if d.id in current.states and not _matches(snapshot.states[d.id], current.states[d.id])]
+            unverified += current.missing
+
+    return {
+        "devices": len(targets),
+        "packets": packets,
+        "seconds": time.perf_counter() - started,
+        "send_errors": errors,
+        "mismatched": mismatched,
+        "unverified": unverified,
+    }
+
+
+def _matches(saved: DeviceState, current: DeviceState) -> bool:
+    """Whether a device reports its saved state. For devices that were off, only the power state matters."""
+    return current == saved if saved[0] else not current[0]
+
+
+def _send_rounds(devices: List[GoveeDevice], snapshot: DeviceSnapshot, rate: float, device_gap: float) -> Tuple[int, int]:
+    """Send every device its restore packets, round by round. Returns (packets sent, send errors)."""
+    plans = [((d.ip, d.port), restore_packets(snapshot.states[d.id])) for d in devices]
+    rounds = max((len(packets) for _, packets in plans), default=0)
+    interval = 1 / rate if rate > 0 else 0.0
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sent = errors = 0
+    next_at = time.perf_counter()
+    try:
+        for index in range(rounds):
+            round_started = time.perf_counter()
+            for address, packets in plans:
+                if index >= len(packets):
+                    continue
+                ahead = next_at - time.perf_counter()
+                if ahead > 0.001:  # Sleep only when well ahead; short waits are absorbed by the next packets
+                    time.sleep(ahead)
+                data = packets[index]
+                send_started = time.perf_counter()
+                try:
+                    sock.sendto(data, address)
+                except OSError:
+                    LAN_SEND_ERRORS.inc(1, address[0])
+                    errors += 1
+                    continue
+                record_lan_send(address[0], len(data), time.perf_counter() - send_started)
+                capture_lan_send(address, data)
+                sent += 1
+                next_at = max(next_at + interval, send_started - 0.01)  # Don't bank more than 10 ms of credit
+            if index + 1 < rounds:
+                wait = round_started + device_gap - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+    finally:
+        sock.close()
+    return sent, errors
@@ -0,0 +1,143 @@
+# api/lan/get_device_status.py
+
+# ==============================================================================
+# Govee LAN API Plus – LAN Device Status Query
+# --------------------------------------------
+#
+# Description:
+# This module sends `devStatus` requests to Govee devices over LAN and collects
+# their replies (power, brightness, color and color temperature).
+#
+# Devices reply to the sender's IP on the LAN response port (4002), so a single
+# socket bound to that port is used to fan out requests to many devices at once
+# and match the replies back to devices by their source IP address.
+#
+# Reference: https://app-h5.govee.com/user-manual/wlan-guide
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import json
+import time
+import socket
+from typing import Dict, List, Optional
+
+from api.lan.packet_capture import capture_lan_send
+from api.metrics import (
+    LAN_DEV_STATUS_REQUESTS,
+    LAN_DEV_STATUS_RTT,
+    LAN_DEV_STATUS_TIMEOUTS,
+    LAN_SEND_ERRORS,
+    record_lan_send
+)
+from api.tracing import traced
+from models.govee_device import GoveeDevice
+
+# Configurable via .env
+LAN_IP_ADDRESS_HELPER_RECEIVE_PORT = int(os.getenv("LAN_IP_ADDRESS_HELPER_RECEIVE_PORT", 4002))
+LAN_IP_ADDRESS_HELPER_TIMEOUT = int(os.getenv("LAN_IP_ADDRESS_HELPER_TIMEOUT", 3))
+
+# Status request formatted according to Govee LAN protocol
+DEV_STATUS_MESSAGE = json.dumps({
+    "msg": {
+        "cmd": "devStatus",
+        "data": {}
+    }
+}).encode("utf-8")
+
+
+@traced("lan.dev_status")
+def get_devices_status(govee_devices: List[GoveeDevice], timeout: float = LAN_IP_ADDRESS_HELPER_TIMEOUT) -> Dict[str, dict]:
+    """
+    Query the status of many Govee devices concurrently over LAN.
+
+    All requests are sent in one burst from a single socket, then replies are
+    collected until every device has answered or the timeout expires.
+
+    Args:
+        govee_devices (List[GoveeDevice]): The devices to query. Devices without an IP are skipped.
+        timeout (float): Max time to wait for all replies (in seconds).
+
+    Returns:
+        Dict[str, dict]: A dictionary mapping device IDs to {"data": status_dict, "rtt": seconds}.
+                         Devices that did not reply are omitted.
+    """
+    devices_by_ip = {d.ip: d for d in govee_devices if d.ip}
+    results = {}
+    if not devices_by_ip:
+        return results
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("", LAN_IP_ADDRESS_HELPER_RECEIVE_PORT))
+
+    try:
+        sent_at = {}
+        for ip, device in devices_by_ip.items():
+            sent_at[ip] = time.perf_counter()
+            try:
+                sock.sendto(DEV_STATUS_MESSAGE, (ip, device.port))
+            except OSError as e:
+                LAN_SEND_ERRORS.inc(1, ip)
+                print(f"⚠️  Failed to send devStatus to {device.name} ({ip}): {e}")
+                del sent_at[ip]
+                continue
+            record_lan_send(ip, len(DEV_STATUS_MESSAGE))
+            capture_lan_send((ip, device.port), DEV_STATUS_MESSAGE)
+        LAN_DEV_STATUS_REQUESTS.inc(len(sent_at))
+
+        deadline = time.perf_counter() + timeout
+        while len(results) < len(devices_by_ip):
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            sock.settimeout(remaining)
+            try:
+                data, addr = sock.recvfrom(2048)
+            except socket.timeout:
+                break
+
+            received_at = time.perf_counter()
+            device = devices_by_ip.get(addr[0])
+            if device is None or device.id in results or addr[0] not in sent_at:
+                continue
+
+            try:
+                response = json.loads(data.decode("utf-8"))
+            except Exception as e:
+                print(f"⚠️  Error decoding status response from {addr[0]}: {e}")
+                continue
+
+            msg = response.get("msg", {})
+            if msg.get("cmd") != "devStatus":
+                continue
+
+            results[device.id] = {
+                "data": msg.get("data", {}),
+                "rtt": received_at - sent_at[addr[0]],
+            }
+            LAN_DEV_STATUS_RTT.observe(results[device.id]["rtt"])
+    finally:
+        sock.close()
+
+    LAN_DEV_STATUS_TIMEOUTS.inc(len(sent_at) - len(results))
+
+    return results
+
+
+def get_device_status(govee_device: GoveeDevice, timeout: float = LAN_IP_ADDRESS_HELPER_TIMEOUT) -> Optional[dict]:
+    """
+    Query the status of a single Govee device over LAN.
+
+    Args:
+        govee_device (GoveeDevice): The device to query.
+        timeout (float): Max time to wait for a reply (in seconds).
+
+    Returns:
+        Optional[dict]: The device's status data (e.g. {"onOff": 1, "brightness": 100, ...}),
+                        or None if the device did not reply.
+    """
+    result = get_devices_status([govee_device], timeout=timeout).get(govee_device.id)
+    return result["data"] if result else None
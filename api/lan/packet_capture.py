@@ -0,0 +1,258 @@
+# api/lan/packet_capture.py
+
+# ==============================================================================
+# Govee LAN API Plus – LAN Packet Capture
+# ---------------------------------------
+#
+# Description:
+# Records exactly what the LAN send paths put on the wire (send time,
+# destination and payload bytes) into a compact binary capture file, reads
+# captures back, and exports them as pcap for Wireshark.
+#
+# Every LAN send site calls `capture_lan_send` right after `sendto`. With no
+# PacketRecorder running that is a single list check; while one runs it is a
+# timestamp and a deque append, and a background thread writes the records.
+#
+# Capture file layout (little-endian):
+#   header: b"GLPC", version (u8), 3 reserved bytes, wall-clock start (u64 ns)
+#   record: offset from start (u64 ns), IPv4 address (4 bytes), port (u16),
+#           length (u16), followed by the payload bytes
+#
+# The isolated sender process (api.lan.sender_process) sends from its own
+# process and is not captured.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import time
+import socket
+import struct
+import threading
+from collections import deque
+from typing import List, Optional, Tuple
+
+# Configurable via .env
+CAPTURE_FLUSH_INTERVAL = float(os.getenv("CAPTURE_FLUSH_INTERVAL", 0.5))
+
+CAPTURE_MAGIC = b"GLPC"
+CAPTURE_VERSION = 1
+HEADER = struct.Struct("<4sB3xQ")
+RECORD = struct.Struct("<Q4sHH")
+
+# pcap with nanosecond timestamps and raw IPv4 frames (no link-layer header)
+PCAP_MAGIC_NS = 0xA1B23C4D
+PCAP_LINKTYPE_RAW = 101
+
+_recorders: List["PacketRecorder"] = []
+
+
+def capture_lan_send(address: Tuple[str, int], data: bytes) -> None:
+    """
+    Hand one sent LAN packet to the running PacketRecorders (if any).
+
+    Args:
+        address (Tuple[str, int]): Destination (ip, port) the packet was sent to.
+        data (bytes): The packet payload.
+    """
+    if _recorders:
+        now = time.monotonic_ns()
+        for recorder in _recorders:
+            recorder.pending.append((now, address, data))
+
+
+class CapturedPacket:
+    """One recorded LAN packet."""
+
+    __slots__ = ("at", "ip", "port", "data")
+
+    def __init__(self, at: float, ip: str, port: int, data: bytes):
+        """
+        Initialize a CapturedPacket.
+
+        Args:
+            at (float): Seconds from the start of the capture.
+            ip (str): Destination IPv4 address.
+            port (int): Destination UDP port.
+            data (bytes): Payload bytes, exactly as sent.
+        """
+        self.at = at
+        self.ip = ip
+        self.port = port
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f"CapturedPacket(at={self.at:.6f}, ip='{self.ip}', port={self.port}, bytes={len(self.data)})"
+
+
+class PacketRecorder:
+    """Taps the LAN send paths into a capture file while running."""
+
+    def __init__(self, path: str, flush_interval: float = CAPTURE_FLUSH_INTERVAL):
+        """
+        Initialize a PacketRecorder.
+
+        Args:
+            path (str): Capture file to write (overwritten).
+            flush_interval (float): Seconds between background writes of recorded packets.
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.pending = deque()
+        self.packets = 0
+        self.bytes = 0
+        self.skipped = 0  # Non-IPv4 destinations, which the format cannot hold
+
+        self._file = None
+        self._started_ns = 0
+        self._addresses = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._file = open(self.path, "wb")
+        self._file.write(HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, time.time_ns()))
+        self._started_ns = time.monotonic_ns()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="packet-recorder", daemon=True)
+        self._thread.start()
+        _recorders.append(self)
+
+    def stop(self) -> None:
+        """Stop recording, write what is left and close the file."""
+        if self in _recorders:
+            _recorders.remove(self)
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self._file:
+            self.flush()
+            self._file.close()
+            self._file = None
+        print(f"📼 Captured {self.packets} packets ({self.bytes} bytes) to {self.path}")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self) -> int:
+        """Write recorded packets to the capture file. Returns how many were written."""
+        chunks = []
+        written = 0
+        popleft = self.pending.popleft
+        while True:
+            try:
+                sent_ns, (ip, port), data = popleft()
+            except IndexError:
+                break
+            packed_ip = self._addresses.get(ip)
+            if packed_ip is None:
+                try:
+                    packed_ip = self._addresses[ip] = socket.inet_aton(ip)
+                except OSError:
+                    self.skipped += 1
+                    continue
+            chunks.append(RECORD.pack(max(0, sent_ns - self._started_ns), packed_ip, port, len(data)))
+            chunks.append(data)
+            written += 1
+            self.bytes += len(data)
+        if chunks:
+            self._file.write(b"".join(chunks))
+            self._file.flush()
+        self.packets += written
+        return written
+
+
+def read_capture(path: str) -> Tuple[float, List[CapturedPacket]]:
+    """
+    Read a capture file.
+
+    Args:
+        path (str): Capture file written by PacketRecorder.
+
+    Returns:
+        Tuple[float, List[CapturedPacket]]: Wall-clock start time (epoch seconds) and the packets in send order.
+    """
+    with open(path, "rb") as f:
+        blob = f.read()
+
+    if len(blob) < HEADER.size:
+        raise ValueError(f"{path} is not a LAN packet capture (too short)")
+    magic, version, started_ns = HEADER.unpack_from(blob, 0)
+    if magic != CAPTURE_MAGIC:
+        raise ValueError(f"{path} is not a LAN packet capture")
+    if version != CAPTURE_VERSION:
+        raise ValueError(f"{path} has unsupported capture version {version}")
+
+    packets = []
+    ips = {}
+    offset = HEADER.size
+    record_size = RECORD.size
+    while offset + record_size <= len(blob):
+        at_ns, packed_ip, port, length = RECORD.unpack_from(blob, offset)
+        offset += record_size
+        if offset + length > len(blob):
+            print(f"⚠️  {path} ends with a truncated packet; ignoring it.")
+            break
+        ip = ips.get(packed_ip)
+        if ip is None:
+            ip = ips[packed_ip] = socket.inet_ntoa(packed_ip)
+        packets.append(CapturedPacket(at_ns / 1e9, ip, port, blob[offset:offset + length]))
+        offset += length
+
+    packets.sort(key=lambda p: p.at)  # Sends from different threads can be flushed slightly out of order
+    return started_ns / 1e9, packets
+
+
+def _ipv4_checksum(header: bytes) -> int:
+    total = sum(struct.unpack("!10H", header))
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    return ~total & 0xFFFF
+
+
+def write_pcap(
+    packets: List[CapturedPacket],
+    started_at: float,
+    path: str,
+    source_ip: str = "0.0.0.0",
+    source_port: int = 4002
+) -> None:
+    """
+    Export captured packets as a pcap file of raw IPv4/UDP frames (opens in Wireshark / tcpdump -r).
+
+    The capture only records destinations, so every frame gets the same source address.
+
+    Args:
+        packets (List[CapturedPacket]): Packets from `read_capture`.
+        started_at (float): Wall-clock capture start (epoch seconds), used for the frame timestamps.
+        path (str): pcap file to write.
+        source_ip (str): Source address for the frames.
+        source_port (int): Source UDP port for the frames.
+    """
+    source = socket.inet_aton(source_ip)
+    started_ns = int(started_at * 1e9)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<IHHiIII", PCAP_MAGIC_NS, 2, 4, 0, 0, 65535, PCAP_LINKTYPE_RAW))
+        for ident, packet in enumerate(packets):
+            udp = struct.pack("!HHHH", source_port, packet.port, 8 + len(packet.data), 0) + packet.data
+            header = struct.pack(
+                "!BBHHHBBH4s4s",
+                0x45, 0, 20 + len(udp), ident & 0xFFFF, 0x4000, 64, socket.IPPROTO_UDP, 0,
+                source, socket.inet_aton(packet.ip)
+            )
+            header = header[:10] + struct.pack("!H", _ipv4_checksum(header)) + header[12:]
+            frame = header + udp
+            seconds, nanoseconds = divmod(started_ns + int(packet.at * 1e9), 1_000_000_000)
+            f.write(struct.pack("<IIII", seconds, nanoseconds, len(frame), len(frame)))
+            f.write(frame)
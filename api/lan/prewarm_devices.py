@@ -0,0 +1,153 @@
+# api/lan/prewarm_devices.py
+
+# ==============================================================================
+# Govee LAN API Plus – LAN Path Pre-Warming
+# -----------------------------------------
+#
+# Description:
+# The first UDP datagram sent to a device that is not in the kernel's neighbour
+# (ARP) cache is held back until ARP resolution completes, which delays the
+# first — and most visible — cue of a show.
+#
+# This module "touches" every target device with a harmless `devStatus` request
+# shortly before showtime, then keeps touching them at an interval below the
+# neighbour-cache timeout so the entries never go stale. Each pass records the
+# reply round-trip time so slow or unreachable devices can be spotted before
+# the show starts.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import time
+import threading
+from typing import Dict, List, Optional
+
+from api.lan.get_device_status import get_devices_status
+from models.govee_device import GoveeDevice
+
+# Configurable via .env
+LAN_PREWARM_LEAD_TIME = float(os.getenv("LAN_PREWARM_LEAD_TIME", 30))
+LAN_PREWARM_INTERVAL = float(os.getenv("LAN_PREWARM_INTERVAL", 15))
+LAN_PREWARM_TIMEOUT = float(os.getenv("LAN_PREWARM_TIMEOUT", 1))
+LAN_PREWARM_SLOW_THRESHOLD = float(os.getenv("LAN_PREWARM_SLOW_THRESHOLD", 0.05))
+
+
+def prewarm_devices(
+    govee_devices: List[GoveeDevice],
+    timeout: float = LAN_PREWARM_TIMEOUT,
+    slow_threshold: float = LAN_PREWARM_SLOW_THRESHOLD
+) -> Dict[str, dict]:
+    """
+    Touch every device once with a `devStatus` request and report how each one responded.
+
+    Args:
+        govee_devices (List[GoveeDevice]): The devices to warm up.
+        timeout (float): Max time to wait for replies (in seconds).
+        slow_threshold (float): Round-trip time (in seconds) above which a device is reported as slow.
+
+    Returns:
+        Dict[str, dict]: A dictionary mapping device IDs to {"state": "ok" | "slow" | "unreachable", "rtt": seconds or None}.
+    """
+    replies = get_devices_status(govee_devices, timeout=timeout)
+
+    report = {}
+    for device in govee_devices:
+        reply = replies.get(device.id)
+        if reply is None:
+            report[device.id] = {"state": "unreachable", "rtt": None}
+        elif reply["rtt"] > slow_threshold:
+            report[device.id] = {"state": "slow", "rtt": reply["rtt"]}
+        else:
+            report[device.id] = {"state": "ok", "rtt": reply["rtt"]}
+    return report
+
+
+class DevicePrewarmer:
+    """
+    Keeps the LAN path to a set of devices warm in a background thread.
+
+    Typical use is to start it with the show's start time; the first pass runs
+    `lead_time` seconds before showtime and repeats every `interval` seconds
+    until stopped.
+    """
+
+    def __init__(
+        self,
+        govee_devices: List[GoveeDevice],
+        interval: float = LAN_PREWARM_INTERVAL,
+        lead_time: float = LAN_PREWARM_LEAD_TIME,
+        timeout: float = LAN_PREWARM_TIMEOUT,
+        slow_threshold: float = LAN_PREWARM_SLOW_THRESHOLD
+    ):
+        """
+        Initialize a DevicePrewarmer.
+
+        Args:
+            govee_devices (List[GoveeDevice]): The devices to keep warm.
+            interval (float): Seconds between passes. Keep this below the neighbour-cache
+                              timeout (Linux marks entries stale after 15-45 seconds).
+            lead_time (float): Seconds before showtime to run the first pass.
+            timeout (float): Max time to wait for replies on each pass (in seconds).
+            slow_threshold (float): Round-trip time (in seconds) above which a device is reported as slow.
+        """
+        self.govee_devices = govee_devices
+        self.interval = interval
+        self.lead_time = lead_time
+        self.timeout = timeout
+        self.slow_threshold = slow_threshold
+
+        self.report = {}  # Latest pass: device ID → {"state", "rtt"}
+        self.passes = 0
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def warm(self) -> Dict[str, dict]:
+        """Run a single warm-up pass now and store its report."""
+        self.report = prewarm_devices(self.govee_devices, self.timeout, self.slow_threshold)
+        self.passes += 1
+
+        problems = {k: v for k, v in self.report.items() if v["state"] != "ok"}
+        if problems:
+            names = {d.id: d.name for d in self.govee_devices}
+            for device_id, entry in problems.items():
+                if entry["state"] == "slow":
+                    print(f"🐢 {names[device_id]} is slow to respond ({entry['rtt'] * 1000:.1f} ms)")
+                else:
+                    print(f"⚠️  {names[device_id]} did not respond to pre-warm")
+        return self.report
+
+    def start(self, showtime: Optional[float] = None) -> None:
+        """
+        Start keeping devices warm in the background.
+
+        Args:
+            showtime (float, optional): Show start as a `time.time()` timestamp. When given,
+                                        the first pass is delayed until `lead_time` seconds before it.
+                                        Otherwise the first pass runs immediately.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(showtime,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, showtime: Optional[float]) -> None:
+        if showtime is not None:
+            delay = showtime - self.lead_time - time.time()
+            if delay > 0 and self._stop.wait(delay):
+                return
+
+        while not self._stop.is_set():
+            self.warm()
+            self._stop.wait(self.interval)
@@ -0,0 +1,343 @@
+# api/lan/ptreal_codec.py
+
+# ==============================================================================
+# Govee LAN API Plus – ptReal Command Codec
+# -----------------------------------------
+#
+# Description:
+# Decodes, validates and re-encodes the base64 `command` list of a captured
+# `ptReal` MQTT DIY scene, so scenes can be inspected and varied (e.g.
+# recolored) without a new Frida capture.
+#
+# Each base64 string is one 20-byte BLE-style frame:
+#
+#   byte 0       header   0xa3 = multi-packet data, 0x33 = command, 0xaa = status
+#   bytes 1..18  body     for 0xa3 frames byte 1 is the packet index
+#                         (0x00 first, 0xff last) and bytes 2..18 carry data
+#   byte 19      checksum XOR of bytes 0..18
+#
+# The data of consecutive 0xa3 frames is reassembled into one buffer (the
+# scene's effect/colour definition). When the first body starts with 0x01,
+# its second byte is the packet count. Any 0x33 frames that follow (typically
+# the "switch to DIY mode" command) are kept verbatim.
+#
+# The effect definition's layout isn't documented, so recoloring treats any
+# three data bytes within one frame (never split across frames, never in the
+# preamble) as a colour field. Matches are taken left to right without
+# overlapping, and `recolor` and `recolor_variants` write the same offsets.
+#
+# Checksums, frame assembly and base64 encoding are vectorized with NumPy so
+# thousands of variants can be generated up front, e.g. for an audio-reactive
+# show (see `recolor_variants`).
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import base64
+import binascii
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+FRAME_SIZE = 20
+BODY_SIZE = FRAME_SIZE - 1  # Everything the checksum covers
+MULTI_DATA_SIZE = 17  # Data bytes per 0xa3 frame
+HEADER_MULTI = 0xa3
+HEADER_COMMAND = 0x33
+HEADER_STATUS = 0xaa
+LAST_PACKET_INDEX = 0xff
+BASE64_FRAME_SIZE = 28  # 20 bytes → 28 base64 characters (one "=" of padding)
+PREAMBLE_SIZE = 2  # 0x01 + packet count at the start of the data, when present
+
+
+# ------------------------------------------------------------------------------
+# Vectorized primitives
+# ------------------------------------------------------------------------------
+
+def xor_checksums(frames: np.ndarray) -> np.ndarray:
+    """XOR checksum of each frame's first 19 bytes. Accepts (..., 19) or (..., 20) uint8 arrays."""
+    return np.bitwise_xor.reduce(frames[..., :BODY_SIZE], axis=-1)
+
+
+def seal_frames(bodies: np.ndarray) -> np.ndarray:
+    """Append checksums to (..., 19) frame bodies, returning (..., 20) frames."""
+    frames = np.empty(bodies.shape[:-1] + (FRAME_SIZE,), dtype=np.uint8)
+    frames[..., :BODY_SIZE] = bodies
+    frames[..., BODY_SIZE] = xor_checksums(bodies)
+    return frames
+
+
+def frames_to_base64(frames: np.ndarray) -> List[str]:
+    """
+    Base64-encode (N, 20) frames in a single pass.
+
+    Each frame is padded to 21 bytes (a multiple of 3) so the whole buffer can be
+    encoded at once; the padding byte only affects the final character, which is
+    then replaced with the "=" a standalone 20-byte encoding ends with.
+    """
+    frames = np.ascontiguousarray(frames, dtype=np.uint8).reshape(-1, FRAME_SIZE)
+    padded = np.zeros((len(frames), FRAME_SIZE + 1), dtype=np.uint8)
+    padded[:, :FRAME_SIZE] = frames
+    encoded = np.frombuffer(base64.b64encode(padded.tobytes()), dtype=np.uint8).reshape(-1, BASE64_FRAME_SIZE).copy()
+    encoded[:, -1] = ord("=")
+    text = encoded.tobytes().decode("ascii")
+    return [text[i:i + BASE64_FRAME_SIZE] for i in range(0, len(text), BASE64_FRAME_SIZE)]
+
+
+def base64_to_frames(command: Sequence[str]) -> np.ndarray:
+    """
+    Decode base64 frames into an (N, 20) uint8 array.
+
+    Raises:
+        ValueError: If a string isn't valid base64 for a 20-byte frame.
+    """
+    if command and all(len(c) == BASE64_FRAME_SIZE and c.endswith("=") and not c.endswith("==") for c in command):
+        # Reverse of the frames_to_base64 trick: decode everything in one call
+        joined = "".join(c[:-1] + "A" for c in command)
+        try:
+            raw = np.frombuffer(base64.b64decode(joined, validate=True), dtype=np.uint8)
+        except binascii.Error as e:
+            raise ValueError(f"Invalid base64 in ptReal command: {e}") from e
+        return raw.reshape(-1, FRAME_SIZE + 1)[:, :FRAME_SIZE].copy()
+
+    frames = np.zeros((len(command), FRAME_SIZE), dtype=np.uint8)
+    for i, c in enumerate(command):
+        try:
+            raw = base64.b64decode(c, validate=True)
+        except binascii.Error as e:
+            raise ValueError(f"Invalid base64 in ptReal frame {i}: {e}") from e
+        if len(raw) != FRAME_SIZE:
+            raise ValueError(f"ptReal frame {i} is {len(raw)} bytes, expected {FRAME_SIZE}")
+        frames[i] = np.frombuffer(raw, dtype=np.uint8)
+    return frames
+
+
+# ------------------------------------------------------------------------------
+# Structured command
+# ------------------------------------------------------------------------------
+
+class PtRealCommand:
+    """A decoded ptReal `command` list: reassembled multi-packet data plus trailing command frames."""
+
+    def __init__(self, frames: np.ndarray):
+        """
+        Initialize a PtRealCommand from raw frames.
+
+        Args:
+            frames (np.ndarray): (N, 20) uint8 frames, in send order.
+        """
+        self.frames = frames
+        headers = frames[:, 0] if len(frames) else np.empty(0, dtype=np.uint8)
+        self.multi_mask = headers == HEADER_MULTI
+
+    @classmethod
+    def decode(cls, command: Sequence[str]) -> "PtRealCommand":
+        """Decode a base64 `command` list (raises ValueError on malformed base64/frame sizes)."""
+        return cls(base64_to_frames(command))
+
+    def encode(self) -> List[str]:
+        """Re-encode the frames as a base64 `command` list."""
+        return frames_to_base64(self.frames)
+
+    # --------------------------------------------------------------------------
+    # Structure
+    # --------------------------------------------------------------------------
+
+    @property
+    def headers(self) -> List[int]:
+        return self.frames[:, 0].tolist()
+
+    @property
+    def checksums_valid(self) -> np.ndarray:
+        return xor_checksums(self.frames) == self.frames[:, BODY_SIZE]
+
+    @property
+    def multi_frames(self) -> np.ndarray:
+        return self.frames[self.multi_mask]
+
+    @property
+    def command_frames(self) -> np.ndarray:
+        """Non-multi-packet frames (e.g. the 0x33 mode switch), verbatim."""
+        return self.frames[~self.multi_mask]
+
+    @property
+    def packet_indexes(self) -> List[int]:
+        return self.multi_frames[:, 1].tolist()
+
+    @property
+    def declared_packet_count(self) -> Optional[int]:
+        """Packet count from the first data frame's preamble, if it has one."""
+        multi = self.multi_frames
+        if len(multi) and multi[0, 1] == 0 and multi[0, 2] == 0x01:
+            return int(multi[0, 3])
+        return None
+
+    @property
+    def data(self) -> bytes:
+        """Reassembled multi-packet data (bytes 2..18 of every 0xa3 frame, in order)."""
+        return self.multi_frames[:, 2:BODY_SIZE].tobytes()
+
+    def validate(self) -> List[str]:
+        """
+        Check the frames for structural problems.
+
+        Returns:
+            List[str]: Human-readable problems; empty if the command is valid.
+        """
+        problems = []
+        if not len(self.frames):
+            return ["command is empty"]
+
+        bad = np.flatnonzero(~self.checksums_valid)
+        if len(bad):
+            problems.append(f"bad checksum in frame(s) {bad.tolist()}")
+
+        indexes = self.packet_indexes
+        if indexes:
+            expected = list(range(len(indexes) - 1)) + [LAST_PACKET_INDEX]
+            if len(indexes) == 1:
+                expected = [indexes[0]] if indexes[0] in (0, LAST_PACKET_INDEX) else [0]
+            if indexes != expected:
+                problems.append(f"multi-packet indexes out of sequence: {indexes}")
+            declared = self.declared_packet_count
+            if declared is not None and declared != len(indexes):
+                problems.append(f"preamble declares {declared} packets, found {len(indexes)}")
+            if not np.all(self.multi_mask[:len(indexes)]):
+                problems.append("multi-packet frames are not contiguous at the start of the command")
+        return problems
+
+    # --------------------------------------------------------------------------
+    # Synthesis
+    # --------------------------------------------------------------------------
+
+    def with_data(self, data: bytes) -> "PtRealCommand":
+        """
+        Return a copy whose multi-packet data is replaced by `data`.
+
+        The data is re-split into 0xa3 frames (zero padded), the packet count in the
+        preamble is updated if the length changed, and every checksum is recomputed.
+        """
+        data = np.frombuffer(bytes(data), dtype=np.uint8)
+        count = max(1, -(-len(data) // MULTI_DATA_SIZE))
+        padded = np.zeros(count * MULTI_DATA_SIZE, dtype=np.uint8)
+        padded[:len(data)] = data
+
+        bodies = np.zeros((count, BODY_SIZE), dtype=np.uint8)
+        bodies[:, 0] = HEADER_MULTI
+        bodies[:, 1] = np.arange(count)
+        bodies[-1, 1] = LAST_PACKET_INDEX
+        bodies[:, 2:] = padded.reshape(count, MULTI_DATA_SIZE)
+        if count > 1 and bodies[0, 2] == 0x01:
+            bodies[0, 3] = count
+
+        return PtRealCommand(np.concatenate([seal_frames(bodies), self.command_frames]))
+
+    @property
+    def preamble_size(self) -> int:
+        """Bytes at the start of `data` taken up by the preamble (0 if there is none)."""
+        return PREAMBLE_SIZE if self.declared_packet_count is not None else 0
+
+    def color_offsets(self, rgb: Tuple[int, int, int]) -> List[int]:
+        """
+        Byte offsets in `data` of the colour fields holding `rgb`.
+
+        Fields lie within one frame's data and outside the preamble. Matches are taken
+        left to right and never overlap (a run of one byte value yields every third offset).
+        """
+        data = self.multi_frames[:, 2:BODY_SIZE]
+        if not len(data):
+            return []
+        matches = (data[:, :-2] == rgb[0]) & (data[:, 1:-1] == rgb[1]) & (data[:, 2:] == rgb[2])
+        matches[0, :self.preamble_size] = False
+
+        offsets = []
+        next_free = 0
+        for frame, position in zip(*np.nonzero(matches)):
+            offset = int(frame) * MULTI_DATA_SIZE + int(position)
+            if offset >= next_free:
+                offsets.append(offset)
+                next_free = offset + 3
+        return offsets
+
+    def recolor(self, old_rgb: Tuple[int, int, int], new_rgb: Tuple[int, int, int]) -> "PtRealCommand":
+        """Return a copy with every colour field holding `old_rgb` set to `new_rgb`."""
+        return PtRealCommand(recolored_frames(self, self.color_offsets(old_rgb), [new_rgb])[0])
+
+
+def recolored_frames(command: PtRealCommand, offsets: Sequence[int], colors) -> np.ndarray:
+    """
+    Build (V, N, 20) frames with each of V colours written at `offsets` in the scene data.
+
+    Args:
+        command (PtRealCommand): The captured scene to vary.
+        offsets (Sequence[int]): Colour field offsets in `command.data` (see `color_offsets`).
+        colors (array-like): (V, 3) RGB colours.
+
+    Returns:
+        np.ndarray: One full frame list per colour, checksums recomputed and trailing frames appended.
+    """
+    colors = np.asarray(colors, dtype=np.uint8).reshape(-1, 3)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    multi = command.multi_frames
+    trailing = command.command_frames
+
+    # (V, frames, 19) bodies: copy the captured frames, then write each variant's colour
+    bodies = np.broadcast_to(multi[:, :BODY_SIZE], (len(colors),) + multi[:, :BODY_SIZE].shape).copy()
+    if len(offsets):
+        data = bodies[:, :, 2:].reshape(len(colors), -1)
+        for channel in range(3):
+            data[:, offsets + channel] = colors[:, channel:channel + 1]
+        bodies[:, :, 2:] = data.reshape(len(colors), len(multi), MULTI_DATA_SIZE)
+
+    frames = seal_frames(bodies)
+    if len(trailing):
+        frames = np.concatenate([frames, np.broadcast_to(trailing, (len(colors),) + trailing.shape)], axis=1)
+    return frames
+
+
+def recolor_variants(command: PtRealCommand, old_rgb: Tuple[int, int, int], colors) -> List[List[str]]:
+    """
+    Generate one recolored `command` list per colour, vectorized across all variants.
+
+    Args:
+        command (PtRealCommand): The captured scene to vary.
+        old_rgb (Tuple[int, int, int]): Colour in the scene data to replace.
+        colors (array-like): (V, 3) replacement RGB colours.
+
+    Returns:
+        List[List[str]]: V base64 `command` lists.
+    """
+    frames = recolored_frames(command, command.color_offsets(old_rgb), colors)
+    encoded = frames_to_base64(frames.reshape(-1, FRAME_SIZE))
+    per_variant = frames.shape[1]
+    return [encoded[i:i + per_variant] for i in range(0, len(encoded), per_variant)]
+
+
+def validate_scene_commands(scenes: dict) -> dict:
+    """
+    Decode and validate the `command` of every ptReal scene.
+
+    Args:
+        scenes (dict): {name: GoveeMqttDiyScene} to check (e.g. the scene factory's variables).
+
+    Returns:
+        dict: {name: [problems]} for invalid scenes only.
+    """
+    invalid = {}
+    for name, scene in scenes.items():
+        if scene.cmd != "ptReal":
+            continue
+        try:
+            # Packed scenes are validated straight from their frames, without building the base64 strings
+            frames = getattr(scene, "command_frames", None)
+            if frames is not None:
+                command = PtRealCommand(np.frombuffer(frames, dtype=np.uint8).reshape(-1, FRAME_SIZE))
+            else:
+                command = PtRealCommand.decode(scene.command)
+            problems = command.validate()
+        except ValueError as e:
+            problems = [str(e)]
+        if problems:
+            invalid[name] = problems
+    return invalid
@@ -0,0 +1,333 @@
+# api/lan/redundant_send.py
+
+# ==============================================================================
+# Govee LAN API Plus – Redundant LAN Sends
+# ----------------------------------------
+#
+# Description:
+# UDP datagrams to Govee devices are occasionally lost on busy 2.4 GHz Wi-Fi and
+# the LAN protocol has no acknowledgements. This module masks that loss by
+# sending each command K times, a few milliseconds apart.
+#
+# K comes from a RedundancyPolicy assigned per device (or to a group of devices
+# at once). Adaptive policies sample delivery with `devStatus` probes and raise
+# or lower K so the chance of every copy being lost stays below a target. Each
+# device has at most one probe in flight. Probes for different devices share
+# one `devStatus` fan-out, because the replies all arrive on the same LAN
+# response port.
+#
+# Only idempotent commands (absolute state such as `turn`, `brightness`,
+# `colorwc` and `ptReal` scene payloads) are ever repeated, and every copy is
+# byte-identical — including the scene's transaction ID — so a device that
+# receives more than one copy simply re-applies the same state.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import json
+import math
+import time
+import heapq
+import socket
+import itertools
+import threading
+from typing import Dict, Iterable, Optional
+
+from api.lan.get_device_status import get_devices_status
+from api.lan.packet_capture import capture_lan_send
+from api.metrics import LAN_SEND_ERRORS, record_lan_send
+from api.tracing import traced
+from models.govee_device import GoveeDevice
+
+# Configurable via .env
+LAN_REDUNDANCY_COPIES = int(os.getenv("LAN_REDUNDANCY_COPIES", 1))
+LAN_REDUNDANCY_SPACING = float(os.getenv("LAN_REDUNDANCY_SPACING", 0.004))
+LAN_REDUNDANCY_MAX_COPIES = int(os.getenv("LAN_REDUNDANCY_MAX_COPIES", 4))
+LAN_REDUNDANCY_TARGET_LOSS = float(os.getenv("LAN_REDUNDANCY_TARGET_LOSS", 0.001))
+LAN_REDUNDANCY_PROBE_EVERY = int(os.getenv("LAN_REDUNDANCY_PROBE_EVERY", 20))
+LAN_REDUNDANCY_PROBE_TIMEOUT = float(os.getenv("LAN_REDUNDANCY_PROBE_TIMEOUT", 0.5))
+
+# LAN commands that set absolute state and are therefore safe to repeat
+IDEMPOTENT_COMMANDS = {"turn", "brightness", "colorwc", "ptReal"}
+
+
+class RedundancyPolicy:
+    """How many copies of each command to send to a device, and how far apart."""
+
+    def __init__(
+        self,
+        copies: int = LAN_REDUNDANCY_COPIES,
+        spacing: float = LAN_REDUNDANCY_SPACING,
+        adaptive: bool = False,
+        max_copies: int = LAN_REDUNDANCY_MAX_COPIES,
+        target_loss: float = LAN_REDUNDANCY_TARGET_LOSS
+    ):
+        """
+        Initialize a RedundancyPolicy.
+
+        Args:
+            copies (int): Copies of each command to send (the minimum when adaptive).
+            spacing (float): Seconds between copies.
+            adaptive (bool): If True, raise K for devices with measured loss.
+            max_copies (int): Upper bound on K for adaptive policies.
+            target_loss (float): Acceptable probability of all copies being lost (adaptive only).
+        """
+        self.copies = max(1, copies)
+        self.spacing = spacing
+        self.adaptive = adaptive
+        self.max_copies = max(self.copies, max_copies)
+        self.target_loss = target_loss
+
+    def copies_for_loss(self, loss_rate: float) -> int:
+        """
+        Return the number of copies needed for a device with the given loss rate.
+
+        Args:
+            loss_rate (float): Estimated probability (0-1) that a single datagram is lost.
+
+        Returns:
+            int: K, between `copies` and `max_copies`.
+        """
+        if not self.adaptive or loss_rate <= 0:
+            return self.copies
+        if loss_rate >= 1:
+            return self.max_copies
+        needed = math.ceil(math.log(self.target_loss) / math.log(loss_rate))
+        return max(self.copies, min(self.max_copies, needed))
+
+
+class RedundantSender:
+    """
+    Sends LAN commands with per-device redundancy.
+
+    The first copy goes out immediately on the caller's thread; the remaining
+    copies are sent `spacing` seconds apart from a background thread so the
+    caller (and other devices' cues) are never held up by the spacing.
+    """
+
+    def __init__(
+        self,
+        default_policy: Optional[RedundancyPolicy] = None,
+        probe_every: int = LAN_REDUNDANCY_PROBE_EVERY,
+        probe_timeout: float = LAN_REDUNDANCY_PROBE_TIMEOUT
+    ):
+        """
+        Initialize a RedundantSender.
+
+        Args:
+            default_policy (RedundancyPolicy, optional): Policy for devices without their own.
+            probe_every (int): For adaptive policies, send a `devStatus` probe every N commands per device.
+            probe_timeout (float): Seconds to wait for a probe reply before counting it as lost.
+        """
+        self.default_policy = default_policy or RedundancyPolicy()
+        self.probe_every = probe_every
+        self.probe_timeout = probe_timeout
+
+        self.policies: Dict[str, RedundancyPolicy] = {}
+        self.loss_rates: Dict[str, float] = {}
+        self._round_trip_loss: Dict[str, float] = {}
+        self._devices_by_ip: Dict[str, GoveeDevice] = {}
+
+        self.counters = {
+            "commands": 0,
+            "packets_sent": 0,
+            "bytes_sent": 0,
+            "extra_packets_sent": 0,
+            "extra_bytes_sent": 0,
+            "probes_sent": 0,
+            "probes_confirmed": 0,
+        }
+
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._pending = []
+        self._sequence = itertools.count()
+        self._commands_per_device: Dict[str, int] = {}
+        self._probing = set()  # IDs of devices with a probe queued or in flight
+        self._probe_queue = []
+        self._prober_running = False
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self) -> None:
+        """Send any copies still pending, then stop the background thread."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join()
+        self._sock.close()
+
+    # --------------------------------------------------------------------------
+    # Policies
+    # --------------------------------------------------------------------------
+
+    def set_policy(self, policy: RedundancyPolicy, govee_devices: Iterable[GoveeDevice]) -> None:
+        """
+        Assign a policy to a device or a group of devices.
+
+        Args:
+            policy (RedundancyPolicy): The policy to apply.
+            govee_devices (Iterable[GoveeDevice]): The devices it applies to.
+        """
+        for device in govee_devices:
+            self.policies[device.id] = policy
+            self._devices_by_ip[device.ip] = device
+
+    def copies_for(self, govee_device: GoveeDevice) -> int:
+        """Return the current K for a device."""
+        policy = self.policies.get(govee_device.id, self.default_policy)
+        return policy.copies_for_loss(self.loss_rates.get(govee_device.id, 0.0))
+
+    # --------------------------------------------------------------------------
+    # Sending
+    # --------------------------------------------------------------------------
+
+    @traced("lan.redundant_send")
+    def send(self, cmd: dict, govee_device: GoveeDevice) -> int:
+        """
+        Send a LAN command to a device with its redundancy policy applied.
+
+        Args:
+            cmd (dict): The JSON-serializable command payload to send.
+            govee_device (GoveeDevice): The target device.
+
+        Returns:
+            int: The number of copies that will be sent.
+        """
+        message = json.dumps(cmd).encode("utf-8")
+        address = (govee_device.ip, govee_device.port)
+        policy = self.policies.get(govee_device.id, self.default_policy)
+
+        name = cmd.get("msg", {}).get("cmd")
+        copies = self.copies_for(govee_device) if name in IDEMPOTENT_COMMANDS else 1
+
+        started = time.perf_counter()
+        self._sock.sendto(message, address)
+        record_lan_send(address[0], len(message), time.perf_counter() - started)
+        capture_lan_send(address, message)
+
+        now = time.monotonic()
+        with self._cond:
+            self.counters["commands"] += 1
+            self.counters["packets_sent"] += 1
+            self.counters["bytes_sent"] += len(message)
+            for i in range(1, copies):
+                heapq.heappush(self._pending, (now + i * policy.spacing, next(self._sequence), message, address))
+            if copies > 1:
+                self._cond.notify()
+
+            count = self._commands_per_device.get(govee_device.id, 0) + 1
+            self._commands_per_device[govee_device.id] = count
+            start_prober = False
+            if policy.adaptive and count % self.probe_every == 0 and govee_device.id not in self._probing:
+                self._probing.add(govee_device.id)
+                self._probe_queue.append(govee_device)
+                # Probes share the LAN response port, so one thread sends them all
+                start_prober = not self._prober_running
+                self._prober_running = True
+
+        if start_prober:
+            threading.Thread(target=self._probe, daemon=True).start()
+
+        return copies
+
+    def send_lan_command(self, cmd: dict, device_ip: str, device_port: int) -> None:
+        """
+        Drop-in replacement for `send_lan_command` (e.g. as a LanSendQueue sender).
+
+        Devices are looked up by IP; unknown IPs use the default policy.
+        """
+        device = self._devices_by_ip.get(device_ip)
+        if device is None or device.port != device_port:
+            device = GoveeDevice(device_ip, device_ip, "", ip=device_ip)
+            device.port = device_port
+        self.send(cmd, device)
+
+    # --------------------------------------------------------------------------
+    # Loss estimation
+    # --------------------------------------------------------------------------
+
+    def _probe(self) -> None:
+        """Probe every queued device, in one `devStatus` fan-out per batch, until none are left."""
+        while True:
+            with self._cond:
+                batch = self._probe_queue
+                if not batch:
+                    self._prober_running = False
+                    return
+                self._probe_queue = []
+                self.counters["probes_sent"] += len(batch)
+
+            replies = get_devices_status(batch, timeout=self.probe_timeout)
+
+            with self._cond:
+                for govee_device in batch:
+                    self._probing.discard(govee_device.id)
+                    confirmed = govee_device.id in replies
+                    if confirmed:
+                        self.counters["probes_confirmed"] += 1
+
+                    # Exponentially weighted round-trip loss. A probe needs both the request and
+                    # the reply to survive, so per-datagram loss is 1 - sqrt(1 - round-trip loss).
+                    observed = 0.0 if confirmed else 1.0
+                    round_trip_loss = 0.8 * self._round_trip_loss.get(govee_device.id, 0.0) + 0.2 * observed
+                    self._round_trip_loss[govee_device.id] = round_trip_loss
+                    self.loss_rates[govee_device.id] = 1 - math.sqrt(1 - round_trip_loss)
+
+    def stats(self) -> dict:
+        """
+        Return redundancy counters.
+
+        Returns:
+            dict: Packet and byte counters (including extra copies), probe confirmation counts,
+                  and the current per-device loss estimates.
+        """
+        with self._cond:
+            stats = dict(self.counters)
+            stats["loss_rates"] = dict(self.loss_rates)
+        return stats
+
+    # --------------------------------------------------------------------------
+    # Background copy sender
+    # --------------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+
+                due, _, message, address = self._pending[0]
+                delay = due - time.monotonic()
+                if delay > 0 and self._running:
+                    self._cond.wait(delay)
+                    continue
+                heapq.heappop(self._pending)
+
+            started = time.perf_counter()
+            try:
+                self._sock.sendto(message, address)
+            except OSError as e:
+                LAN_SEND_ERRORS.inc(1, address[0])
+                print(f"⚠️  Failed to send redundant copy to {address[0]}: {e}")
+                continue
+            record_lan_send(address[0], len(message), time.perf_counter() - started)
+            capture_lan_send(address, message)
+
+            with self._cond:
+                self.counters["packets_sent"] += 1
+                self.counters["bytes_sent"] += len(message)
+                self.counters["extra_packets_sent"] += 1
+                self.counters["extra_bytes_sent"] += len(message)
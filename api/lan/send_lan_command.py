@@ -15,10 +15,21 @@
 import socket
 import json
 import logging
+from time import perf_counter
+
+from api.lan.packet_capture import capture_lan_send
+from api.metrics import LAN_SEND_ERRORS, record_lan_send
+from api.tracing import traced
 
 # Configure logging format
 logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(message)s')
 
+# Traced phases of a send (the functions themselves when tracing is off). Time
+# in `lan.send_lan_command` outside these spans is the socket work.
+_encode_json = traced("lan.json_encode")(json.dumps)
+_log_sent = traced("lan.log")(logging.info)
+
+@traced("lan.send_lan_command")
 def send_lan_command(cmd: dict, device_ip: str, device_port: int) -> None:
     """
     Sends a UDP JSON command to a Govee device over LAN.
@@ -28,9 +39,18 @@ def send_lan_command(cmd: dict, device_ip: str, device_port: int) -> None:
         device_ip (str): The IP address of the target Govee device.
         device_port (int): The port to send the UDP packet to (usually 4003).
     """
-    message = json.dumps(cmd)
+    message = _encode_json(cmd)
+    data = message.encode('utf-8')
+    started = perf_counter()
     udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    udp_socket.sendto(message.encode('utf-8'), (device_ip, device_port))
-    udp_socket.close()
+    try:
+        udp_socket.sendto(data, (device_ip, device_port))
+    except OSError:
+        LAN_SEND_ERRORS.inc(1, device_ip)
+        raise
+    finally:
+        udp_socket.close()
+    record_lan_send(device_ip, len(data), perf_counter() - started)
+    capture_lan_send((device_ip, device_port), data)
 
-    logging.info(f"📤 Sent LAN command to {device_ip}:{device_port} → {message}")
\ No newline at end of file
+    _log_sent(f"📤 Sent LAN command to {device_ip}:{device_port} → {message}")
\ No newline at end of file
@@ -0,0 +1,307 @@
+# api/lan/send_queue.py
+
+# ==============================================================================
+# Govee LAN API Plus – Deadline-Aware LAN Send Queue
+# --------------------------------------------------
+#
+# Description:
+# A background send queue that wraps `send_lan_command` for timed shows.
+#
+# Every queued command carries a deadline (a `time.monotonic()` timestamp by
+# which it should be on the wire) and a priority. When the sender falls behind
+# (GC pause, Wi-Fi hiccup, ...) commands are sent earliest-deadline-first and:
+#
+# - Late LOW priority commands are dropped.
+# - Late NORMAL priority commands are dropped once they are later than the
+#   configured tolerance.
+# - HIGH priority commands (key cues) are never dropped, only sent late.
+# - Commands sharing a collapse key (e.g. "living room color") replace any
+#   pending, not-yet-sent command with the same key, so a backlog of stale
+#   frames collapses into the latest one.
+#
+# Lateness statistics for every sent command are available via `stats()`.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import time
+import heapq
+import itertools
+import threading
+from typing import Callable, Optional
+
+from api.lan.send_lan_command import send_lan_command
+from api.lan.set_device_mqtt_diy_scene import build_mqtt_diy_scene_payload
+
+from models.govee_device import GoveeDevice
+from models.govee_mqtt_diy_scene import GoveeMqttDiyScene
+
+# Configurable via .env
+LAN_SEND_QUEUE_LATE_TOLERANCE = float(os.getenv("LAN_SEND_QUEUE_LATE_TOLERANCE", 0.05))
+
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 1
+PRIORITY_HIGH = 2
+
+# Upper bounds (in seconds) of the lateness histogram buckets
+LATENESS_BUCKETS = (0.0, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, float("inf"))
+
+
+class _QueuedCommand:
+    __slots__ = ("deadline", "priority", "cmd", "ip", "port", "key", "cancelled")
+
+    def __init__(self, deadline, priority, cmd, ip, port, key):
+        self.deadline = deadline
+        self.priority = priority
+        self.cmd = cmd
+        self.ip = ip
+        self.port = port
+        self.key = key
+        self.cancelled = False
+
+
+class LanSendQueue:
+    """Deadline-aware priority queue in front of `send_lan_command`."""
+
+    def __init__(
+        self,
+        late_tolerance: float = LAN_SEND_QUEUE_LATE_TOLERANCE,
+        sender: Callable[[dict, str, int], None] = send_lan_command
+    ):
+        """
+        Initialize a LanSendQueue.
+
+        Args:
+            late_tolerance (float): Seconds past its deadline after which a NORMAL priority command is dropped.
+            sender (Callable): Function used to put a command on the wire. Defaults to `send_lan_command`.
+        """
+        self.late_tolerance = late_tolerance
+        self.sender = sender
+
+        self._heap = []
+        self._pending_by_key = {}
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+        self._stats = {
+            "enqueued": 0,
+            "sent": 0,
+            "sent_late": 0,
+            "dropped_late": 0,
+            "collapsed": 0,
+            "errors": 0,
+            "max_lateness": 0.0,
+            "total_lateness": 0.0,
+        }
+        self._histogram = [0] * len(LATENESS_BUCKETS)
+
+    # --------------------------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------------------------
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self) -> None:
+        """Start the background sender thread."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, drain: bool = True) -> None:
+        """
+        Stop the background sender thread.
+
+        Args:
+            drain (bool): If True, commands still queued are processed (sent or dropped) before stopping.
+        """
+        if drain:
+            with self._cond:
+                while self._heap and self._running:
+                    self._cond.wait(0.05)
+
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    # --------------------------------------------------------------------------
+    # Enqueueing
+    # --------------------------------------------------------------------------
+
+    def enqueue(
+        self,
+        cmd: dict,
+        device_ip: str,
+        device_port: int,
+        deadline: Optional[float] = None,
+        priority: int = PRIORITY_NORMAL,
+        key: Optional[str] = None
+    ) -> None:
+        """
+        Queue a raw LAN command.
+
+        Args:
+            cmd (dict): The JSON-serializable command payload to send.
+            device_ip (str): The IP address of the target Govee device.
+            device_port (int): The port to send the UDP packet to (usually 4003).
+            deadline (float, optional): `time.monotonic()` timestamp the command must be sent by. Defaults to now.
+            priority (int): PRIORITY_LOW, PRIORITY_NORMAL or PRIORITY_HIGH.
+            key (str, optional): Collapse key. A pending LOW/NORMAL command with the same key is replaced.
+        """
+        if deadline is None:
+            deadline = time.monotonic()
+
+        item = _QueuedCommand(deadline, priority, cmd, device_ip, device_port, key)
+
+        with self._cond:
+            if key is not None:
+                previous = self._pending_by_key.get(key)
+                if previous is not None and previous.priority < PRIORITY_HIGH:
+                    previous.cancelled = True
+                    self._stats["collapsed"] += 1
+                self._pending_by_key[key] = item
+
+            # Earliest deadline first; higher priority wins ties
+            heapq.heappush(self._heap, (deadline, -priority, next(self._sequence), item))
+            self._stats["enqueued"] += 1
+            self._cond.notify()
+
+    def enqueue_mqtt_diy_scene(
+        self,
+        govee_device: GoveeDevice,
+        govee_mqtt_diy_scene: GoveeMqttDiyScene,
+        deadline: Optional[float] = None,
+        priority: int = PRIORITY_NORMAL,
+        key: Optional[str] = None
+    ) -> None:
+        """
+        Queue a stored MQTT DIY scene for a device.
+
+        Args:
+            govee_device (GoveeDevice): The target device to send the command to.
+            govee_mqtt_diy_scene (GoveeMqttDiyScene): The DIY scene payload captured from MQTT.
+            deadline (float, optional): `time.monotonic()` timestamp the command must be sent by. Defaults to now.
+            priority (int): PRIORITY_LOW, PRIORITY_NORMAL or PRIORITY_HIGH.
+            key (str, optional): Collapse key. Defaults to "<device id>:scene".
+        """
+        payload = build_mqtt_diy_scene_payload(govee_device, govee_mqtt_diy_scene)
+        self.enqueue(
+            payload,
+            govee_device.ip,
+            govee_device.port,
+            deadline=deadline,
+            priority=priority,
+            key=key if key is not None else f"{govee_device.id}:scene"
+        )
+
+    def enqueue_device_command(
+        self,
+        govee_device: GoveeDevice,
+        cmd: dict,
+        deadline: Optional[float] = None,
+        priority: int = PRIORITY_NORMAL,
+        key: Optional[str] = None
+    ) -> None:
+        """
+        Queue a native LAN command (e.g. from `build_color_payload`) for a device.
+
+        Args:
+            govee_device (GoveeDevice): The target device to send the command to.
+            cmd (dict): The JSON-serializable command payload to send.
+            deadline (float, optional): `time.monotonic()` timestamp the command must be sent by. Defaults to now.
+            priority (int): PRIORITY_LOW, PRIORITY_NORMAL or PRIORITY_HIGH.
+            key (str, optional): Collapse key. Defaults to "<device id>:<cmd>".
+        """
+        if key is None:
+            key = f"{govee_device.id}:{cmd.get('msg', {}).get('cmd')}"
+        self.enqueue(cmd, govee_device.ip, govee_device.port, deadline=deadline, priority=priority, key=key)
+
+    # --------------------------------------------------------------------------
+    # Statistics
+    # --------------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """
+        Return a snapshot of the queue's counters and lateness statistics.
+
+        Returns:
+            dict: Counters plus "pending", "mean_lateness" and a "lateness_histogram"
+                  mapping bucket upper bounds (seconds) to sent-command counts.
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats["pending"] = sum(1 for _, _, _, item in self._heap if not item.cancelled)
+            stats["mean_lateness"] = stats["total_lateness"] / stats["sent"] if stats["sent"] else 0.0
+            stats["lateness_histogram"] = dict(zip(LATENESS_BUCKETS, self._histogram))
+        return stats
+
+    # --------------------------------------------------------------------------
+    # Sender thread
+    # --------------------------------------------------------------------------
+
+    def _next_item(self) -> Optional[_QueuedCommand]:
+        with self._cond:
+            while self._running and not self._heap:
+                self._cond.wait()
+            if not self._heap:
+                return None
+
+            _, _, _, item = heapq.heappop(self._heap)
+            if item.key is not None and self._pending_by_key.get(item.key) is item:
+                del self._pending_by_key[item.key]
+            if not self._heap:
+                self._cond.notify_all()
+            return item
+
+    def _record_sent(self, lateness: float) -> None:
+        with self._cond:
+            self._stats["sent"] += 1
+            if lateness > 0:
+                self._stats["sent_late"] += 1
+                self._stats["total_lateness"] += lateness
+                self._stats["max_lateness"] = max(self._stats["max_lateness"], lateness)
+            for i, bound in enumerate(LATENESS_BUCKETS):
+                if lateness <= bound:
+                    self._histogram[i] += 1
+                    break
+
+    def _run(self) -> None:
+        while True:
+            item = self._next_item()
+            if item is None:
+                return
+            if item.cancelled:
+                continue
+
+            lateness = time.monotonic() - item.deadline
+            if lateness > 0 and (
+                item.priority == PRIORITY_LOW
+                or (item.priority == PRIORITY_NORMAL and lateness > self.late_tolerance)
+            ):
+                with self._cond:
+                    self._stats["dropped_late"] += 1
+                continue
+
+            try:
+                self.sender(item.cmd, item.ip, item.port)
+            except Exception as e:
+                with self._cond:
+                    self._stats["errors"] += 1
+                print(f"❌ Failed to send queued LAN command to {item.ip}:{item.port}: {e}")
+                continue
+
+            self._record_sent(lateness)
@@ -0,0 +1,290 @@
+# api/lan/sender_process.py
+
+# ==============================================================================
+# Govee LAN API Plus – Isolated LAN Sender Process
+# ------------------------------------------------
+#
+# Description:
+# Runs LAN sends in a dedicated process so audio playback, automation logic or
+# anything else sharing the main interpreter can't delay packets through GIL
+# contention.
+#
+# The sender process receives the table of precompiled cue packets once, at
+# start-up, and owns the UDP socket. Producers then enqueue cues by number
+# through a `multiprocessing.shared_memory` ring buffer of fixed-size
+# (cue id, deadline) records — no pickling or pipes per cue. The sender waits
+# until each cue's deadline (a `time.monotonic()` timestamp, which is shared
+# between processes on the same machine) and puts its packet on the wire.
+#
+# The ring buffer is single-producer/single-consumer and lock-free: the
+# producer only ever writes `head`, the consumer only ever writes `tail`, and
+# each slot carries a sequence number written last so a half-written slot is
+# never consumed. Use one CueSenderProcess per producing thread/process, or
+# pass `multi_producer=True` to serialize producers with a lock.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import time
+import struct
+import socket
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+# Configurable via .env
+LAN_SENDER_RING_CAPACITY = int(os.getenv("LAN_SENDER_RING_CAPACITY", 4096))
+LAN_SENDER_POLL_INTERVAL = float(os.getenv("LAN_SENDER_POLL_INTERVAL", 0.0002))
+LAN_SENDER_SPIN_MARGIN = float(os.getenv("LAN_SENDER_SPIN_MARGIN", 0.002))
+
+# Ring buffer layout
+HEADER = struct.Struct("<QQQQ")  # head, tail, capacity, rejected (full) count
+HEADER_SIZE = 64
+SLOT = struct.Struct("<QId")  # sequence, cue id, deadline
+SLOT_SIZE = 24
+HEAD_OFFSET = 0
+TAIL_OFFSET = 8
+REJECTED_OFFSET = 24
+U64 = struct.Struct("<Q")
+
+
+class CueRingBuffer:
+    """Fixed-capacity SPSC ring of (cue id, deadline) records in shared memory."""
+
+    def __init__(self, capacity: int = LAN_SENDER_RING_CAPACITY, name: Optional[str] = None):
+        """
+        Create a new ring buffer, or attach to an existing one by name.
+
+        Args:
+            capacity (int): Number of slots (ignored when attaching).
+            name (str, optional): Shared memory block name to attach to.
+        """
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=HEADER_SIZE + capacity * SLOT_SIZE)
+            self.buf = self.shm.buf
+            HEADER.pack_into(self.buf, 0, 0, 0, capacity, 0)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.buf = self.shm.buf
+            self.owner = False
+        self.capacity = HEADER.unpack_from(self.buf, 0)[2]
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def __len__(self) -> int:
+        head, tail = U64.unpack_from(self.buf, HEAD_OFFSET)[0], U64.unpack_from(self.buf, TAIL_OFFSET)[0]
+        return head - tail
+
+    @property
+    def rejected(self) -> int:
+        """Number of pushes refused because the ring was full."""
+        return U64.unpack_from(self.buf, REJECTED_OFFSET)[0]
+
+    def push(self, cue_id: int, deadline: float) -> bool:
+        """
+        Append a record (producer side).
+
+        Returns:
+            bool: False if the ring is full (the consumer is falling behind).
+        """
+        head = U64.unpack_from(self.buf, HEAD_OFFSET)[0]
+        tail = U64.unpack_from(self.buf, TAIL_OFFSET)[0]
+        if head - tail >= self.capacity:
+            U64.pack_into(self.buf, REJECTED_OFFSET, self.rejected + 1)
+            return False
+
+        offset = HEADER_SIZE + (head % self.capacity) * SLOT_SIZE
+        SLOT.pack_into(self.buf, offset, 0, cue_id, deadline)
+        U64.pack_into(self.buf, offset, head + 1)  # Publish the slot
+        U64.pack_into(self.buf, HEAD_OFFSET, head + 1)
+        return True
+
+    def peek(self) -> Optional[Tuple[int, float]]:
+        """Return the oldest record without consuming it (consumer side), or None if empty."""
+        tail = U64.unpack_from(self.buf, TAIL_OFFSET)[0]
+        if tail == U64.unpack_from(self.buf, HEAD_OFFSET)[0]:
+            return None
+
+        sequence, cue_id, deadline = SLOT.unpack_from(self.buf, HEADER_SIZE + (tail % self.capacity) * SLOT_SIZE)
+        if sequence != tail + 1:
+            return None  # Slot not fully written yet
+        return cue_id, deadline
+
+    def advance(self) -> None:
+        """Consume the record returned by `peek()` (consumer side)."""
+        U64.pack_into(self.buf, TAIL_OFFSET, U64.unpack_from(self.buf, TAIL_OFFSET)[0] + 1)
+
+    def close(self) -> None:
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _sender_main(ring_name, packets, conn, poll_interval, spin_margin, forked):
+    """Sender process entry point."""
+    ring = CueRingBuffer(name=ring_name)
+    if not forked:
+        # The parent owns (and unlinks) the block; don't let this process's own tracker clean it up too
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(ring.shm._name, "shared_memory")
+        except Exception:
+            pass
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    stats = {"sent": 0, "errors": 0, "unknown_cues": 0, "latencies": []}
+    stopping = False
+
+    while True:
+        record = ring.peek()
+        if record is None:
+            if stopping:
+                break
+            if conn.poll():
+                conn.recv()
+                stopping = True
+                continue
+            time.sleep(poll_interval)
+            continue
+
+        cue_id, deadline = record
+        remaining = deadline - time.monotonic()
+        if remaining > spin_margin:
+            time.sleep(min(remaining - spin_margin, 0.05))
+            continue
+        while time.monotonic() < deadline:
+            pass
+
+        if 0 <= cue_id < len(packets):
+            message, address = packets[cue_id]
+            try:
+                sock.sendto(message, address)
+                stats["sent"] += 1
+            except OSError:
+                stats["errors"] += 1
+        else:
+            stats["unknown_cues"] += 1
+        stats["latencies"].append(time.monotonic() - deadline)
+        ring.advance()
+
+    sock.close()
+    ring.buf = None
+    ring.shm.close()
+    conn.send(stats)
+    conn.close()
+
+
+class CueSenderProcess:
+    """A dedicated process that owns the LAN socket and fires precompiled cues from a shared ring buffer."""
+
+    def __init__(
+        self,
+        packets: List[Tuple[bytes, Tuple[str, int]]],
+        capacity: int = LAN_SENDER_RING_CAPACITY,
+        poll_interval: float = LAN_SENDER_POLL_INTERVAL,
+        spin_margin: float = LAN_SENDER_SPIN_MARGIN,
+        multi_producer: bool = False
+    ):
+        """
+        Initialize a CueSenderProcess.
+
+        Args:
+            packets (List[Tuple[bytes, Tuple[str, int]]]): Precompiled (message, (ip, port)) per cue id.
+                                                           See `packets_from_cues` for show cues.
+            capacity (int): Ring buffer slots.
+            poll_interval (float): Seconds the sender sleeps when the ring is empty.
+            spin_margin (float): Seconds before a deadline to stop sleeping and busy-wait.
+            multi_producer (bool): Serialize `enqueue()` with a lock so several producers can share the ring.
+        """
+        self.packets = packets
+        self.capacity = capacity
+        self.poll_interval = poll_interval
+        self.spin_margin = spin_margin
+        self.stats = None
+
+        self._lock = multiprocessing.Lock() if multi_producer else None
+        self._ring = None
+        self._process = None
+        self._conn = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self) -> None:
+        """Create the ring buffer and start the sender process."""
+        self._ring = CueRingBuffer(self.capacity)
+        self._conn, child_conn = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_sender_main,
+            args=(
+                self._ring.name,
+                self.packets,
+                child_conn,
+                self.poll_interval,
+                self.spin_margin,
+                multiprocessing.get_start_method() == "fork"
+            ),
+            daemon=True
+        )
+        self._process.start()
+
+    def enqueue(self, cue_id: int, deadline: Optional[float] = None) -> bool:
+        """
+        Schedule a cue. Cues must be enqueued in deadline order.
+
+        Args:
+            cue_id (int): Index into the packet table.
+            deadline (float, optional): `time.monotonic()` time to fire at. Defaults to now.
+
+        Returns:
+            bool: False if the ring is full.
+        """
+        if deadline is None:
+            deadline = time.monotonic()
+        if self._lock is None:
+            return self._ring.push(cue_id, deadline)
+        with self._lock:
+            return self._ring.push(cue_id, deadline)
+
+    def stop(self) -> dict:
+        """
+        Let the sender drain the ring, stop it and collect its statistics.
+
+        Returns:
+            dict: {"sent", "errors", "unknown_cues", "latencies", "rejected"}; latencies are
+                  seconds between each cue's deadline and its send.
+        """
+        if self._process is None:
+            return self.stats
+
+        self._conn.send("stop")
+        self.stats = self._conn.recv()
+        self.stats["rejected"] = self._ring.rejected
+        self._process.join()
+        self._conn.close()
+        self._ring.close()
+        self._process = None
+        return self.stats
+
+
+def packets_from_cues(cues) -> List[Tuple[bytes, Tuple[str, int]]]:
+    """
+    Build a sender packet table from compiled show cues (cue id = list index).
+
+    Args:
+        cues (List[ShowCue]): Compiled show cues.
+
+    Returns:
+        List[Tuple[bytes, Tuple[str, int]]]: (message, (ip, port)) per cue.
+    """
+    return [(cue.message, (cue.device.ip, cue.device.port)) for cue in cues]
@@ -0,0 +1,47 @@
+# api/lan/set_device_brightness.py
+
+# ==============================================================================
+# Govee LAN API Plus – Set Device Brightness via LAN
+# --------------------------------------------------
+#
+# Description:
+# Sets a Govee device's brightness using the native LAN `brightness` command.
+#
+# Reference: https://app-h5.govee.com/user-manual/wlan-guide
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+from api.lan.send_lan_command import send_lan_command
+
+from models.govee_device import GoveeDevice
+
+def build_brightness_payload(brightness: int) -> dict:
+    """
+    Builds the LAN `brightness` command payload.
+
+    Args:
+        brightness (int): Brightness percentage (1-100).
+
+    Returns:
+        dict: The JSON-serializable command payload.
+    """
+    return {
+        "msg": {
+            "cmd": "brightness",
+            "data": {
+                "value": max(1, min(100, int(brightness)))
+            }
+        }
+    }
+
+def set_device_brightness(govee_device: GoveeDevice, brightness: int) -> None:
+    """
+    Sets a Govee device's brightness over LAN.
+
+    Args:
+        govee_device (GoveeDevice): The target device to send the command to.
+        brightness (int): Brightness percentage (1-100).
+    """
+    send_lan_command(build_brightness_payload(brightness), govee_device.ip, govee_device.port)
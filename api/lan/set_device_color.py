@@ -0,0 +1,57 @@
+# api/lan/set_device_color.py
+
+# ==============================================================================
+# Govee LAN API Plus – Set Device Color via LAN
+# ---------------------------------------------
+#
+# Description:
+# Sets a Govee device's RGB color or white color temperature using the native
+# LAN `colorwc` command.
+#
+# Reference: https://app-h5.govee.com/user-manual/wlan-guide
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+from api.lan.send_lan_command import send_lan_command
+
+from models.govee_device import GoveeDevice
+
+def build_color_payload(color: dict, color_temp_in_kelvin: int = 0) -> dict:
+    """
+    Builds the LAN `colorwc` command payload.
+
+    Args:
+        color (dict): RGB color as {"r": 0-255, "g": 0-255, "b": 0-255}.
+        color_temp_in_kelvin (int, optional): White color temperature (2000-9000).
+                                              Use 0 to apply the RGB color instead. Defaults to 0.
+
+    Returns:
+        dict: The JSON-serializable command payload.
+    """
+    return {
+        "msg": {
+            "cmd": "colorwc",
+            "data": {
+                "color": {
+                    "r": int(color["r"]),
+                    "g": int(color["g"]),
+                    "b": int(color["b"])
+                },
+                "colorTemInKelvin": int(color_temp_in_kelvin)
+            }
+        }
+    }
+
+def set_device_color(govee_device: GoveeDevice, color: dict, color_temp_in_kelvin: int = 0) -> None:
+    """
+    Sets a Govee device's color over LAN.
+
+    Args:
+        govee_device (GoveeDevice): The target device to send the command to.
+        color (dict): RGB color as {"r": 0-255, "g": 0-255, "b": 0-255}.
+        color_temp_in_kelvin (int, optional): White color temperature (2000-9000).
+                                              Use 0 to apply the RGB color instead. Defaults to 0.
+    """
+    send_lan_command(build_color_payload(color, color_temp_in_kelvin), govee_device.ip, govee_device.port)
@@ -13,22 +13,27 @@
 # ==============================================================================
 
 from api.lan.send_lan_command import send_lan_command
+from api.tracing import traced
 
 from models.govee_mqtt_diy_scene import GoveeMqttDiyScene
 from models.govee_device import GoveeDevice
 
-def set_device_mqtt_diy_scene(
+@traced("lan.build_mqtt_diy_scene_payload")
+def build_mqtt_diy_scene_payload(
     govee_device: GoveeDevice,
     govee_mqtt_diy_scene: GoveeMqttDiyScene
-) -> None:
+) -> dict:
     """
-    Sends a stored MQTT DIY scene to a Govee device over LAN.
+    Builds the LAN command payload for a stored MQTT DIY scene.
 
     Args:
-        govee_device (GoveeDevice): The target device to send the command to.
+        govee_device (GoveeDevice): The target device the command is addressed to.
         govee_mqtt_diy_scene (GoveeMqttDiyScene): The DIY scene payload captured from MQTT.
+
+    Returns:
+        dict: The JSON-serializable command payload.
     """
-    payload = {
+    return {
         "msg": {
             "accountTopic": govee_mqtt_diy_scene.accountTopic,
             "cmd": govee_mqtt_diy_scene.cmd,
@@ -44,4 +49,17 @@ def set_device_mqtt_diy_scene(
         "cmd": govee_mqtt_diy_scene.cmd
     }
 
+@traced("lan.set_device_mqtt_diy_scene")
+def set_device_mqtt_diy_scene(
+    govee_device: GoveeDevice,
+    govee_mqtt_diy_scene: GoveeMqttDiyScene
+) -> None:
+    """
+    Sends a stored MQTT DIY scene to a Govee device over LAN.
+
+    Args:
+        govee_device (GoveeDevice): The target device to send the command to.
+        govee_mqtt_diy_scene (GoveeMqttDiyScene): The DIY scene payload captured from MQTT.
+    """
+    payload = build_mqtt_diy_scene_payload(govee_device, govee_mqtt_diy_scene)
     send_lan_command(payload, govee_device.ip, govee_device.port)
\ No newline at end of file
@@ -0,0 +1,47 @@
+# api/lan/set_device_power.py
+
+# ==============================================================================
+# Govee LAN API Plus – Set Device Power via LAN
+# ---------------------------------------------
+#
+# Description:
+# Turns a Govee device on or off using the native LAN `turn` command.
+#
+# Reference: https://app-h5.govee.com/user-manual/wlan-guide
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+from api.lan.send_lan_command import send_lan_command
+
+from models.govee_device import GoveeDevice
+
+def build_power_payload(on: bool) -> dict:
+    """
+    Builds the LAN `turn` command payload.
+
+    Args:
+        on (bool): True to turn the device on, False to turn it off.
+
+    Returns:
+        dict: The JSON-serializable command payload.
+    """
+    return {
+        "msg": {
+            "cmd": "turn",
+            "data": {
+                "value": 1 if on else 0
+            }
+        }
+    }
+
+def set_device_power(govee_device: GoveeDevice, on: bool) -> None:
+    """
+    Turns a Govee device on or off over LAN.
+
+    Args:
+        govee_device (GoveeDevice): The target device to send the command to.
+        on (bool): True to turn the device on, False to turn it off.
+    """
+    send_lan_command(build_power_payload(on), govee_device.ip, govee_device.port)
@@ -0,0 +1,366 @@
+# api/metrics.py
+
+# ==============================================================================
+# Govee LAN API Plus – Metrics
+# ----------------------------
+#
+# Description:
+# In-process counters, gauges and latency histograms for the LAN and cloud
+# layers (packets and bytes sent per device, send-call duration, discovery
+# responses, devStatus round trips, cloud request latency and status codes,
+# cache hit rates), readable with `metrics_snapshot()` and optionally served
+# in the Prometheus text format on localhost:
+#
+#   from api.metrics import metrics_snapshot, start_metrics_server
+#   start_metrics_server(port=9464)   # http://127.0.0.1:9464/metrics
+#
+# Hot path:
+# Every LAN packet goes through `record_lan_send`, which only appends one
+# tuple to a deque (thread-safe, no lock). Packets are folded into the
+# per-device counters and the duration histogram when metrics are read and
+# by a background thread every METRICS_FOLD_INTERVAL seconds. The thread is
+# started by the first recorded packet or by `start_metrics_server`, so
+# importing this module starts nothing.
+# Everything else updates its metric directly; updates are plain dict/list
+# operations without locks, so a concurrent update can very rarely be lost,
+# which is fine for monitoring.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import time
+import threading
+from bisect import bisect_left
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Configurable via .env
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", 0))
+METRICS_FOLD_INTERVAL = float(os.getenv("METRICS_FOLD_INTERVAL", 1.0))
+
+# Seconds; covers sub-millisecond sends through slow cloud requests
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Metric:
+    """A named metric with optional labels. Label values are passed as one value or a tuple."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict = {}
+
+    def labels_of(self, key) -> Dict[str, str]:
+        values = key if isinstance(key, tuple) else (key,)
+        return {name: str(value) for name, value in zip(self.labelnames, values)}
+
+    def reset(self) -> None:
+        self._values.clear()
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, labels=()) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels=()) -> float:
+        return self._values.get(labels, 0)
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def set(self, value: float, labels=()) -> None:
+        self._values[labels] = value
+
+    def inc(self, amount: float = 1, labels=()) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels=()) -> float:
+        return self._values.get(labels, 0)
+
+
+class Histogram(Metric):
+    """Fixed-bucket histogram. Each label set keeps [bucket counts..., +Inf count, sum, count]."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _series(self, labels) -> List[float]:
+        series = self._values.get(labels)
+        if series is None:
+            series = self._values[labels] = [0] * (len(self.buckets) + 3)
+        return series
+
+    def observe(self, value: float, labels=()) -> None:
+        series = self._series(labels)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def summary(self, labels=()) -> dict:
+        """Return {"count", "sum", "buckets": {upper bound: cumulative count}} for one label set."""
+        series = self._values.get(labels) or [0] * (len(self.buckets) + 3)
+        cumulative = {}
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), series[:-2]):
+            running += count
+            cumulative[bound] = running
+        return {"count": series[-1], "sum": series[-2], "buckets": cumulative}
+
+    def quantile(self, q: float, labels=()) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None without observations)."""
+        summary = self.summary(labels)
+        if not summary["count"]:
+            return None
+        target = q * summary["count"]
+        for bound, cumulative in summary["buckets"].items():
+            if cumulative >= target:
+                return bound
+        return float("inf")
+
+
+class MetricsRegistry:
+    """Holds metrics by name and renders them."""
+
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def _register(self, cls, name: str, *args, **kwargs) -> Metric:
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = cls(name, *args, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"Metric '{name}' is already registered as a {metric.type}")
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help, labelnames, buckets)
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Register a callable run before every read (e.g. to fold buffered events)."""
+        self._collectors.append(collector)
+
+    def collect(self) -> None:
+        for collector in self._collectors:
+            collector()
+
+    def snapshot(self) -> dict:
+        """
+        Return every metric's current values.
+
+        Returns:
+            dict: {name: {"type", "help", "values": [{"labels": {...}, "value": ...}]}}.
+                  Histogram values are {"count", "sum", "buckets"} (see `Histogram.summary`).
+        """
+        self.collect()
+        snapshot = {}
+        for name, metric in self.metrics.items():
+            values = []
+            for key in list(metric._values):
+                value = metric.summary(key) if isinstance(metric, Histogram) else metric._values[key]
+                values.append({"labels": metric.labels_of(key), "value": value})
+            snapshot[name] = {"type": metric.type, "help": metric.help, "values": values}
+        return snapshot
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, entry in self.snapshot().items():
+            lines.append(f"# HELP {name} {entry['help']}")
+            lines.append(f"# TYPE {name} {entry['type']}")
+            for sample in entry["values"]:
+                labels = sample["labels"]
+                if entry["type"] == "histogram":
+                    for bound, count in sample["value"]["buckets"].items():
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f"{name}_bucket{_format_labels({**labels, 'le': le})} {count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {sample['value']['sum']}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {sample['value']['count']}")
+                else:
+                    lines.append(f"{name}{_format_labels(labels)} {sample['value']}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Zero every metric (e.g. between benchmark runs)."""
+        self.collect()
+        for metric in self.metrics.values():
+            metric.reset()
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in labels.items()) + "}"
+
+
+REGISTRY = MetricsRegistry()
+
+# --- LAN ---
+LAN_PACKETS_SENT = REGISTRY.counter("govee_lan_packets_sent_total", "LAN UDP packets sent, per device IP.", ("device",))
+LAN_BYTES_SENT = REGISTRY.counter("govee_lan_bytes_sent_total", "LAN UDP payload bytes sent, per device IP.", ("device",))
+LAN_SEND_ERRORS = REGISTRY.counter("govee_lan_send_errors_total", "LAN sends that raised an OS error, per device IP.", ("device",))
+LAN_SEND_SECONDS = REGISTRY.histogram("govee_lan_send_seconds", "Duration of LAN send calls.")
+LAN_DISCOVERY_SCANS = REGISTRY.counter("govee_lan_discovery_scans_total", "Multicast discovery scans sent.")
+LAN_DISCOVERY_RESPONSES = REGISTRY.counter("govee_lan_discovery_responses_total", "Discovery responses received.")
+LAN_DISCOVERY_DEVICES = REGISTRY.gauge("govee_lan_discovery_devices", "Devices found by the most recent discovery scan.")
+LAN_DEV_STATUS_REQUESTS = REGISTRY.counter("govee_lan_dev_status_requests_total", "devStatus requests sent.")
+LAN_DEV_STATUS_TIMEOUTS = REGISTRY.counter("govee_lan_dev_status_timeouts_total", "devStatus requests that got no reply in time.")
+LAN_DEV_STATUS_RTT = REGISTRY.histogram("govee_lan_dev_status_rtt_seconds", "devStatus request/reply round-trip time.")
+
+# --- Cloud ---
+CLOUD_REQUEST_SECONDS = REGISTRY.histogram("govee_cloud_request_seconds", "Govee Cloud API request latency, per endpoint.", ("endpoint",))
+CLOUD_RESPONSES = REGISTRY.counter("govee_cloud_responses_total", "Govee Cloud API responses, per endpoint and HTTP status ('error' if none).", ("endpoint", "status"))
+
+# --- Caches ---
+CACHE_LOOKUPS = REGISTRY.counter("govee_cache_lookups_total", "Cache lookups, per cache and result (hit/miss).", ("cache", "result"))
+
+_pending_sends = deque()
+_fold_lock = threading.Lock()
+_folder: Optional[threading.Thread] = None
+
+
+def record_lan_send(device_ip: str, nbytes: int, seconds: Optional[float] = None) -> None:
+    """
+    Record one LAN packet put on the wire (the send hot path: a single deque append).
+
+    Args:
+        device_ip (str): Destination device IP.
+        nbytes (int): Payload size.
+        seconds (float, optional): Duration of the send call, if it was timed.
+    """
+    _pending_sends.append((device_ip, nbytes, seconds))
+    if _folder is None:
+        _start_folder()
+
+
+def fold_lan_sends() -> int:
+    """Fold buffered LAN packets into the LAN counters and send-duration histogram."""
+    folded = 0
+    with _fold_lock:
+        packets = LAN_PACKETS_SENT._values
+        sent_bytes = LAN_BYTES_SENT._values
+        buckets = LAN_SEND_SECONDS.buckets
+        durations = LAN_SEND_SECONDS._series(())
+        popleft = _pending_sends.popleft
+        while True:
+            try:
+                device_ip, nbytes, seconds = popleft()
+            except IndexError:
+                break
+            packets[device_ip] = packets.get(device_ip, 0) + 1
+            sent_bytes[device_ip] = sent_bytes.get(device_ip, 0) + nbytes
+            if seconds is not None:
+                durations[bisect_left(buckets, seconds)] += 1
+                durations[-2] += seconds
+                durations[-1] += 1
+            folded += 1
+    return folded
+
+
+def _fold_periodically() -> None:
+    while True:
+        time.sleep(METRICS_FOLD_INTERVAL)
+        fold_lan_sends()
+
+
+def _start_folder() -> None:
+    """Start the background fold thread, once."""
+    global _folder
+    with _fold_lock:
+        if _folder is None:
+            _folder = threading.Thread(target=_fold_periodically, name="metrics-folder", daemon=True)
+            _folder.start()
+
+
+REGISTRY.add_collector(fold_lan_sends)
+
+
+def record_cloud_request(endpoint: str, started: float, response=None) -> None:
+    """
+    Record a Govee Cloud API call.
+
+    Args:
+        endpoint (str): Short endpoint name (e.g. "devices").
+        started (float): `time.perf_counter()` before the request.
+        response (requests.Response, optional): The response, or None if the request failed outright.
+    """
+    CLOUD_REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint)
+    status = str(response.status_code) if response is not None else "error"
+    CLOUD_RESPONSES.inc(1, (endpoint, status))
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.inc(1, (cache, "hit" if hit else "miss"))
+
+
+def cache_hit_rate(cache: str) -> Optional[float]:
+    """Hit rate of a cache so far (None before any lookup)."""
+    hits = CACHE_LOOKUPS.value((cache, "hit"))
+    total = hits + CACHE_LOOKUPS.value((cache, "miss"))
+    return hits / total if total else None
+
+
+def metrics_snapshot() -> dict:
+    """Return all current metric values (see `MetricsRegistry.snapshot`)."""
+    return REGISTRY.snapshot()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(host: str = METRICS_HOST, port: int = METRICS_PORT or 9464) -> ThreadingHTTPServer:
+    """
+    Serve `/metrics` in the Prometheus text format from a background thread.
+
+    Args:
+        host (str): Address to bind. Defaults to localhost only.
+        port (int): Port to listen on (0 picks a free one; see `server.server_address`).
+
+    Returns:
+        ThreadingHTTPServer: The running server; call `shutdown()` to stop it.
+    """
+    _start_folder()
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,288 @@
+# api/tracing.py
+
+# ==============================================================================
+# Govee LAN API Plus – Tracing Hooks
+# ----------------------------------
+#
+# Description:
+# Opt-in spans on the hot paths (LAN sends, MQTT scene payload building,
+# discovery, the cloud fetchers, the capture extractor and show playback),
+# fed to pluggable hooks:
+#
+# - ChromeTraceWriter: a Chrome trace / Perfetto JSON file
+#   (chrome://tracing or https://ui.perfetto.dev), which
+#   `scripts/trace_timeline.py` turns into a flame-style timeline.
+# - MetricsSpanHook: a per-span duration histogram in `api.metrics`.
+# - SamplingProfiler: periodic stack samples tagged with the active spans,
+#   written as collapsed stacks for flamegraph tools.
+#
+# Tracing is switched on with GOVEE_TRACING=true, which must be set before the
+# API modules are imported. When it is off, `traced` returns functions
+# unchanged and `span` hands back a shared no-op object, so the hot paths run
+# exactly as they would without tracing. When it is on but no hook is
+# installed, a traced call costs one extra function call and a list check.
+#
+#   GOVEE_TRACING=true python3 scripts/play_show.py shows/halloween.json --trace trace.json
+#   python3 scripts/trace_timeline.py trace.json
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import json
+import time
+import threading
+import functools
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+# Configurable via .env
+GOVEE_TRACING = os.getenv("GOVEE_TRACING", "false").lower() in ("1", "true", "yes")
+TRACE_SAMPLE_INTERVAL = float(os.getenv("TRACE_SAMPLE_INTERVAL", 0.001))
+
+# Hooks are called with (name, start_ns, end_ns, thread_id, args)
+SpanHook = Callable[[str, int, int, int, Optional[dict]], None]
+
+_hooks: List[SpanHook] = []
+_active: Dict[int, List[str]] = {}  # thread id → names of the spans currently open on it
+
+
+def tracing_enabled() -> bool:
+    return GOVEE_TRACING
+
+
+def add_hook(hook: SpanHook) -> None:
+    """Start feeding finished spans to `hook`."""
+    if not GOVEE_TRACING:
+        print("⚠️  Tracing is disabled; set GOVEE_TRACING=true before importing the API to record spans.")
+    _hooks.append(hook)
+
+
+def remove_hook(hook: SpanHook) -> None:
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+_now = time.perf_counter_ns
+_get_ident = threading.get_ident
+
+
+def _open(name: str) -> int:
+    tid = _get_ident()
+    stack = _active.get(tid)
+    if stack is None:
+        stack = _active[tid] = []
+    stack.append(name)
+    return tid
+
+
+def _close(name: str, start: int, tid: int, args: Optional[dict]) -> None:
+    end = _now()
+    _active[tid].pop()
+    for hook in _hooks:
+        hook(name, start, end, tid, args)
+
+
+def traced(name: str, args: Optional[Callable[..., dict]] = None):
+    """
+    Decorate a function so each call is recorded as a span named `name`.
+
+    Returns the function itself when tracing is disabled.
+
+    Args:
+        name (str): Span name, "<layer>.<operation>".
+        args (Callable, optional): Called with the function's arguments to build the span's args
+                                   (e.g. a cue label). Only evaluated while a hook is installed.
+    """
+    def decorate(fn):
+        if not GOVEE_TRACING:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*a, **kw):
+            if not _hooks:
+                return fn(*a, **kw)
+            # _open/_close inlined: this runs on every traced call
+            tid = _get_ident()
+            stack = _active.get(tid)
+            if stack is None:
+                stack = _active[tid] = []
+            stack.append(name)
+            start = _now()
+            try:
+                return fn(*a, **kw)
+            finally:
+                end = _now()
+                stack.pop()
+                span_args = args(*a, **kw) if args else None
+                for hook in _hooks:
+                    hook(name, start, end, tid, span_args)
+
+        return wrapper
+
+    return decorate
+
+
+class _Span:
+    __slots__ = ("name", "args", "start", "tid")
+
+    def __init__(self, name: str, args: Optional[dict]):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.tid = _open(self.name)
+        self.start = _now()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _close(self.name, self.start, self.tid, self.args)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **args):
+    """
+    Context manager recording the enclosed block as a span, with optional args (e.g. a cue label).
+
+    Returns a shared no-op context manager when tracing is off or no hook is installed.
+    """
+    if not GOVEE_TRACING or not _hooks:
+        return _NULL_SPAN
+    return _Span(name, args or None)
+
+
+# --------------------------------------------------------------------------
+# Hooks
+# --------------------------------------------------------------------------
+
+class ChromeTraceWriter:
+    """Collects spans and writes them in the Chrome trace event format (also read by Perfetto)."""
+
+    def __init__(self, path: str, process_name: str = "govee-lan-api-plus"):
+        """
+        Initialize a ChromeTraceWriter.
+
+        Args:
+            path (str): JSON file written by `close()`.
+            process_name (str): Process label shown in the trace viewer.
+        """
+        self.path = path
+        self.process_name = process_name
+        self.spans = []
+
+    def __call__(self, name: str, start: int, end: int, tid: int, args: Optional[dict]) -> None:
+        self.spans.append((name, start, end, tid, args))
+
+    def __enter__(self):
+        add_hook(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def events(self) -> List[dict]:
+        pid = os.getpid()
+        thread_names = {t.ident: t.name for t in threading.enumerate()}
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": self.process_name}}]
+        for tid in sorted({s[3] for s in self.spans}):
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                           "args": {"name": thread_names.get(tid, str(tid))}})
+        for name, start, end, tid, args in self.spans:
+            event = {"name": name, "cat": name.split(".")[0], "ph": "X", "pid": pid, "tid": tid,
+                     "ts": start / 1000, "dur": (end - start) / 1000}
+            if args:
+                event["args"] = args
+            events.append(event)
+        return events
+
+    def close(self) -> None:
+        """Stop recording and write the trace file."""
+        remove_hook(self)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events(), "displayTimeUnit": "ms"}, f)
+        print(f"🧵 Wrote {len(self.spans)} spans to {self.path}")
+
+
+class MetricsSpanHook:
+    """Feeds span durations into the `govee_span_seconds` histogram in `api.metrics`."""
+
+    def __init__(self):
+        from api.metrics import REGISTRY
+        self.histogram = REGISTRY.histogram("govee_span_seconds", "Duration of traced spans.", ("span",))
+
+    def __call__(self, name: str, start: int, end: int, tid: int, args: Optional[dict]) -> None:
+        self.histogram.observe((end - start) / 1e9, name)
+
+
+class SamplingProfiler:
+    """
+    Samples every thread's Python stack on a timer and tags each sample with the spans open on that thread.
+
+    Samples are kept as collapsed stacks ("span;span;module.function;...") with counts,
+    the input format of flamegraph.pl, speedscope and `scripts/trace_timeline.py --collapsed`.
+    """
+
+    def __init__(self, interval: float = TRACE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = Counter()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def __call__(self, name, start, end, tid, args) -> None:
+        pass  # Installed as a hook only so traced calls keep the active-span stacks up to date
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self) -> None:
+        add_hook(self)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="trace-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._thread:
+            self._thread.join()
+        remove_hook(self)
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while self._running:
+            for tid, frame in sys._current_frames().items():
+                if tid == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                spans = list(_active.get(tid, ()))
+                self.samples[";".join(spans + stack[::-1])] += 1
+            time.sleep(self.interval)
+
+    def write_collapsed(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        print(f"🔥 Wrote {sum(self.samples.values())} samples to {path}")
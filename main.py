@@ -26,13 +26,19 @@ load_dotenv()
 
 from scripts.generate_device_and_scene_factories import sanitize_var_name, generate_device_and_scene_factories
 from scripts.select_from_list import select_from_list
-from scripts.frida_govee_mqtt_extractor import extract_and_generate_mqtt_payload
+from scripts.frida_govee_mqtt_extractor import extract_and_generate_mqtt_payload, generate_mqtt_payload_from_msg, make_var_name, mqtt_diy_scene_from_msg
 from scripts.lan_discover_govee_devices import discover_govee_devices
-from scripts.log_monitor import wait_for_log_update
+from scripts.frida_log_reader import FridaLogReader
+from scripts.frida_mqtt_stream import MqttStreamListener, wait_for_stream_message
+from scripts.batch_capture import run_batch_capture
+from scripts.scene_factory_journal import compact_scene_factory_journal
+from scripts.scene_search_index import SceneSearchIndex
 
 from api.cloud.get_devices import get_govee_devices
 from api.cloud.get_device_diy_scenes import get_device_diy_scenes
 from api.lan.set_device_mqtt_diy_scene import set_device_mqtt_diy_scene
+from api.lan.ptreal_codec import validate_scene_commands
+from api.metrics import METRICS_PORT, record_cache_lookup, start_metrics_server
 
 from models.govee_device import GoveeDevice
 from models.govee_diy_scene import GoveeDIYScene
@@ -50,6 +56,9 @@ FRIDA_LAUNCH_DELAY = int(os.getenv("FRIDA_LAUNCH_DELAY", 5))
 FRIDA_LOG_FILE_PATH = os.path.abspath(os.getenv("FRIDA_LOG_FILE_PATH", "logs/frida_govee_mqtt_output.log"))
 DEVICE_FACTORY_FILE_PATH = os.path.abspath(os.getenv("DEVICE_FACTORY_FILE_PATH", "factories/device_factory.py"))
 
+# Search index over all loaded devices' scenes, kept in sync as factories are reloaded
+scene_index = SceneSearchIndex()
+
 def update_env_file(filepath, key, value, comment=""):
     updated = False
     new_lines = []
@@ -132,9 +141,22 @@ def sync_govee_devices(api_key: str):
     refresh_mqtt_diy_scene_factories()
     print("✅ Sync complete!")
 
+def warn_invalid_mqtt_scenes():
+    scenes = {
+        name: scene for name, scene in vars(mqtt_scene_factory).items()
+        if isinstance(scene, GoveeMqttDiyScene)
+    }
+    for name, problems in validate_scene_commands(scenes).items():
+        print(f"⚠️  Captured scene '{name}' looks malformed: {'; '.join(problems)}")
+
 def reload_device_factory():
+    # Fold any journaled scene captures into the factories before reading them
+    compact_scene_factory_journal()
+    importlib.reload(mqtt_scene_factory)
+    warn_invalid_mqtt_scenes()
     import factories.device_factory as df
     importlib.reload(df)
+    scene_index.sync_devices(df.all_devices)
     if len(df.all_devices) > 0:
         print("♻️ Reloaded devices from disk.")
     return df.all_devices
@@ -146,6 +168,56 @@ def load_devices_from_factory():
         print(f"⚠️ Failed to reload factory devices: {e}")
         return None
 
+def load_device_diy_scenes(device: GoveeDevice, api_key: str):
+    """Populate `device.diy_scenes` from the cached factory scenes, or from the Cloud API if there are none."""
+    if hasattr(device, "scenes") and isinstance(device.scenes, SimpleNamespace):
+        scene_dict = vars(device.scenes)
+        if scene_dict:
+            record_cache_lookup("diy_scenes", True)
+            print(f"📦 Using {len(scene_dict)} cached DIY scenes for {device.name}.")
+            device.diy_scenes = list(scene_dict.values())
+            return
+
+    record_cache_lookup("diy_scenes", False)
+    print(f"☁️ Fetching DIY scenes for {device.name} from Cloud...")
+    scene_options = get_device_diy_scenes(device.id, device.sku, api_key=api_key)
+    device.diy_scenes = [
+        GoveeDIYScene(value=opt["value"], name=opt["name"]) for opt in scene_options
+    ]
+
+def record_scene_capture(device: GoveeDevice, scene: GoveeDIYScene, msg: dict) -> str:
+    """Journal a captured scene and make it searchable straight away."""
+    var_name = generate_mqtt_payload_from_msg(device, scene, msg)
+    scene_index.add_scene(device, mqtt_diy_scene_from_msg(msg), "mqtt", var_name)
+    return var_name
+
+def select_search_match(matches: list, query: str, label):
+    """Let the user pick one of the search index matches for `query` (None if there are none or they go back)."""
+    if not matches:
+        print(f"❌ Nothing matches '{query}'. Try again.")
+        return None
+    return select_from_list(matches, f"🔎 Matches for '{query}'", label=label, allow_cancel=True)
+
+def start_frida_observer(keep_alive: bool = False) -> subprocess.Popen:
+    """Launch the Frida MQTT observer in its own process group."""
+    print("📡 Starting Frida MQTT observer (running in background)...")
+    return subprocess.Popen(
+        ["python3", "scripts/frida_attach_and_observe_govee.py"] + (["--keep-alive"] if keep_alive else []),
+        stdin=subprocess.DEVNULL if keep_alive else None,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        preexec_fn=os.setsid
+    )
+
+def stop_frida_observer(frida_proc: subprocess.Popen):
+    print("\n🛑 Stopping Frida observer...")
+    try:
+        if frida_proc.poll() is None:
+            os.killpg(os.getpgid(frida_proc.pid), signal.SIGTERM)
+            frida_proc.wait()
+    except ProcessLookupError:
+        print("⚠️  Frida process already exited.")
+
 def capture_scene_mqtt(api_key: str):
     print("\n🔍 Fetching Govee devices...")
 
@@ -163,36 +235,30 @@ def capture_scene_mqtt(api_key: str):
         for i, d in enumerate(device_list, 1):
             print(f"{i}. {d.name} ({d.id})")
 
-        selected_device_index = input("\nSelect a device (or enter to 👈 go back): ").strip()
+        selected_device_index = input("\nSelect a device or type to search (or enter to 👈 go back): ").strip()
         if selected_device_index == "":
             print("👋 Leaving MQTT Scene Capturing.")
             return
 
-        try:
-            selected_device = device_list[int(selected_device_index) - 1]
-        except (IndexError, ValueError):
-            print("❌ Invalid device selection. Try again.")
-            continue
+        if not selected_device_index.isdecimal():
+            selected_device = select_search_match(
+                [d for d in scene_index.find_devices(selected_device_index) if d in device_list],
+                selected_device_index,
+                lambda d: f"{d.name} ({d.id})"
+            )
+            if selected_device is None:
+                continue
+        else:
+            try:
+                selected_device = device_list[int(selected_device_index) - 1]
+            except (IndexError, ValueError):
+                print("❌ Invalid device selection. Try again.")
+                continue
 
         print(f"\n🎯 Selected device: {selected_device.name} ({selected_device.id})")
 
-        if hasattr(selected_device, "scenes") and isinstance(selected_device.scenes, SimpleNamespace):
-            scene_dict = vars(selected_device.scenes)
-            if scene_dict:
-                print(f"📦 Using {len(scene_dict)} cached DIY scenes for this device.")
-                selected_device.diy_scenes = list(scene_dict.values())
-            else:
-                print(f"☁️ Fetching DIY scenes for {selected_device.name} from Cloud...")
-                scene_options = get_device_diy_scenes(selected_device.id, selected_device.sku, api_key=GOVEE_API_KEY)
-                selected_device.diy_scenes = [
-                    GoveeDIYScene(value=opt["value"], name=opt["name"]) for opt in scene_options
-                ]
-        else:
-            print(f"☁️ Fetching DIY scenes for {selected_device.name} from Cloud...")
-            scene_options = get_device_diy_scenes(selected_device.id, selected_device.sku, api_key=api_key)
-            selected_device.diy_scenes = [
-                GoveeDIYScene(value=opt["value"], name=opt["name"]) for opt in scene_options
-            ]
+        load_device_diy_scenes(selected_device, api_key)
+        scene_index.update_device(selected_device)
 
         if not selected_device.diy_scenes:
             print("❌ No DIY scenes found for this device.")
@@ -203,26 +269,35 @@ def capture_scene_mqtt(api_key: str):
             for i, scene in enumerate(selected_device.diy_scenes, 1):
                 print(f"{i}. {scene.name} ({scene.value})")
 
-            selected_scene_index = input("\nSelect a scene (or enter to 👈 go back): ").strip()
+            selected_scene_index = input("\nSelect a scene or type to search (or enter to 👈 go back): ").strip()
             if selected_scene_index == "":
                 break
 
-            try:
-                selected_scene = selected_device.diy_scenes[int(selected_scene_index) - 1]
-            except (IndexError, ValueError):
-                print("❌ Invalid scene selection. Try again.")
-                continue
+            if not selected_scene_index.isdecimal():
+                match = select_search_match(
+                    scene_index.search(selected_scene_index, kind="diy", device_id=selected_device.id),
+                    selected_scene_index,
+                    lambda e: f"{e.name} ({e.value})"
+                )
+                if match is None:
+                    continue
+                selected_scene = match.scene
+            else:
+                try:
+                    selected_scene = selected_device.diy_scenes[int(selected_scene_index) - 1]
+                except (IndexError, ValueError):
+                    print("❌ Invalid scene selection. Try again.")
+                    continue
 
             while True:
                 print(f"\n🎬 Selected scene: {selected_scene.name} ({selected_scene.value})")
 
-                print("📡 Starting Frida MQTT observer (running in background)...")
-                frida_proc = subprocess.Popen(
-                    ["python3", "scripts/frida_attach_and_observe_govee.py"],
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    preexec_fn=os.setsid
-                )
+                # Receive parsed MQTT messages straight from the observer process
+                stream_listener = MqttStreamListener()
+                # Where this session's messages start in the (persistent) log, for the fallback below
+                log_offset = FridaLogReader(FRIDA_LOG_FILE_PATH, from_end=True).offset
+
+                frida_proc = start_frida_observer()
                 # TEMP DEBUG MODE: show logs live
                 # frida_proc = subprocess.Popen(
                 #     ["python3", "scripts/frida_attach_and_observe_govee.py"]
@@ -234,16 +309,11 @@ def capture_scene_mqtt(api_key: str):
                     time.sleep(1)
                 print("🪝 Hooks ready! You may now trigger the scene you want to capture from the Govee app.")
 
-                from scripts.log_monitor import wait_for_log_update
-
-                triggered = False
-
-                def on_mqtt_triggered():
-                    nonlocal triggered
-                    triggered = True
-                    print("📡 Detected MQTT payload in log!")
-
-                wait_for_log_update(FRIDA_LOG_FILE_PATH, on_mqtt_triggered, selected_device, selected_scene, timeout=60)
+                stream_listener.drain()
+                captured = wait_for_stream_message(
+                    stream_listener.queue, selected_device, selected_scene, timeout=60, on_captured=record_scene_capture
+                )
+                stream_listener.close()
 
                 try:
                     import termios
@@ -251,17 +321,13 @@ def capture_scene_mqtt(api_key: str):
                 except Exception:
                     pass
 
-                print("\n🛑 Stopping Frida observer...")
-                try:
-                    if frida_proc.poll() is None:
-                        os.killpg(os.getpgid(frida_proc.pid), signal.SIGTERM)
-                        frida_proc.wait()
-                except ProcessLookupError:
-                    print("⚠️  Frida process already exited.")
+                stop_frida_observer(frida_proc)
 
-                print("\n📦 Extracting MQTT payload...")
-                extract_and_generate_mqtt_payload(selected_device, selected_scene)
-                print("✅ Scene captured!")
+                if not captured:
+                    print("\n📦 Extracting MQTT payload from log...")
+                    captured = extract_and_generate_mqtt_payload(selected_device, selected_scene, log_offset)
+                if captured:
+                    print("✅ Scene captured!")
 
                 while True:
                     another = input("\n➕ Would you like to capture another scene? (y/n): ").strip().lower()
@@ -273,6 +339,64 @@ def capture_scene_mqtt(api_key: str):
                         print("❌ Invalid input. Please enter 'y' or 'n'.")
                 break
 
+def batch_capture_scene_mqtt(api_key: str):
+    print("\n🎞  Batch Capture DIY Scene MQTT Payloads")
+
+    devices = load_devices_from_factory()
+    if not devices:
+        print("☁️ Fetching devices from Govee Cloud API...")
+        devices = list(get_govee_devices(api_key=api_key).values())
+    device_list = list(devices)
+
+    print("\n📱 Available Devices:")
+    print("0. 📦 All Devices")
+    for i, d in enumerate(device_list, 1):
+        print(f"{i}. {d.name} ({d.id})")
+
+    selected_device_index = input("\nSelect a device (or enter to 👈 go back): ").strip()
+    if selected_device_index == "":
+        return
+    try:
+        selected_devices = device_list if selected_device_index == "0" else [device_list[int(selected_device_index) - 1]]
+    except (IndexError, ValueError):
+        print("❌ Invalid device selection.")
+        return
+
+    recapture = input("\n♻️  Include scenes that were already captured? (y/N): ").strip().lower() == "y"
+
+    targets = []
+    for device in selected_devices:
+        load_device_diy_scenes(device, api_key)
+        captured_vars = vars(getattr(device, "mqtt_diy_scenes", SimpleNamespace()))
+        for scene in device.diy_scenes:
+            if recapture or make_var_name(device, scene) not in captured_vars:
+                targets.append((device, scene))
+
+    if not targets:
+        print("✅ Nothing left to capture.")
+        return
+    print(f"\n🗂  {len(targets)} scenes queued for capture.")
+
+    # One observer (and one Frida attach) for the whole queue
+    stream_listener = MqttStreamListener()
+    frida_proc = start_frida_observer(keep_alive=True)
+    try:
+        print("⏳ Preparing MQTT hook...")
+        for i in range(FRIDA_LAUNCH_DELAY, 0, -1):
+            print(f"   Waiting for hooks to activate... {i}")
+            time.sleep(1)
+        print("🪝 Hooks ready!")
+
+        stream_listener.drain()
+        run_batch_capture(
+            targets,
+            stream_listener.queue,
+            record_scene_capture
+        )
+    finally:
+        stream_listener.close()
+        stop_frida_observer(frida_proc)
+
 def send_mqtt_scene():
     print("\n📡 Send LAN MQTT DIY Scene")
 
@@ -285,10 +409,22 @@ def send_mqtt_scene():
     for i, d in enumerate(devices, 1):
         print(f"{i}. {d.name} ({d.id})")
 
-    selected_device_index = input("\nSelect a device (or enter to 👈 go back): ").strip()
+    selected_device_index = input("\nSelect a device, or type a scene name to search all devices (or enter to 👈 go back): ").strip()
     if selected_device_index == "":
         return
 
+    if not selected_device_index.isdecimal():
+        match = select_search_match(
+            scene_index.search(selected_device_index, kind="mqtt"),
+            selected_device_index,
+            lambda e: f"{e.var_name} on {e.device.name}"
+        )
+        if match is not None:
+            print(f"\n📨 Sending scene '{match.var_name}' to {match.device.name} ({match.device.id})...")
+            set_device_mqtt_diy_scene(match.device, match.scene)
+            print("✅ Scene sent!")
+        return
+
     try:
         selected_device = devices[int(selected_device_index) - 1]
     except (IndexError, ValueError):
@@ -311,11 +447,23 @@ def send_mqtt_scene():
         for i, var_name in enumerate(scene_names, 1):
             print(f"{i}. {var_name}")
 
-        selected_scene_index = input("\nSelect a scene to send (or enter to 👈 go back): ").strip()
+        selected_scene_index = input("\nSelect a scene to send or type to search (or enter to 👈 go back): ").strip()
         if selected_scene_index == "":
             print("👋 Done sending scenes.\n")
             break
 
+        if not selected_scene_index.isdecimal():
+            match = select_search_match(
+                scene_index.search(selected_scene_index, kind="mqtt", device_id=selected_device.id),
+                selected_scene_index,
+                lambda e: e.var_name
+            )
+            if match is not None:
+                print(f"\n📨 Sending scene '{match.var_name}' to {selected_device.name} ({selected_device.id})...")
+                set_device_mqtt_diy_scene(selected_device, match.scene)
+                print("✅ Scene sent!")
+            continue
+
         if selected_scene_index == "0":
             print(f"\n🔁 Sending ALL scenes for {selected_device.name}...\n")
             for var_name in scene_names:
@@ -384,6 +532,8 @@ def refresh_device_ips():
 
 def refresh_mqtt_diy_scene_factories():
     print("\n🔁 Refreshing MQTT DIY Scene Factory mappings...")
+    compact_scene_factory_journal()
+    importlib.reload(mqtt_scene_factory)
 
     if not os.path.exists(DEVICE_FACTORY_FILE_PATH):
         print("❌ device_factory.py not found.")
@@ -457,6 +607,7 @@ def run_wizard():
         print("3. 🎬 Capture DIY Scene MQTT Payloads")
         print("4. 🏭 Refresh MQTT DIY Scene Factories")
         print("5. 📡 Send LAN MQTT DIY Scene Command")
+        print("6. 🎞  Batch Capture DIY Scene MQTT Payloads")
 
         choice = input("\nSelect an option (or enter to quit): ").strip()
 
@@ -470,6 +621,8 @@ def run_wizard():
             refresh_mqtt_diy_scene_factories()
         elif choice == "5":
             send_mqtt_scene()
+        elif choice == "6":
+            batch_capture_scene_mqtt(api_key=GOVEE_API_KEY)
         elif choice == "":
             print("✌️ Goodbye!")
             break
@@ -477,6 +630,9 @@ def run_wizard():
             print("❌ Invalid option. Please try again.")
 
 def main():
+    if METRICS_PORT:
+        server = start_metrics_server(port=METRICS_PORT)
+        print(f"📈 Serving metrics at http://{server.server_address[0]}:{server.server_address[1]}/metrics")
     prompt_for_govee_api_key_if_needed()
     devices = load_devices_from_factory()
     if len(devices) == 0:
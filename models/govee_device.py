@@ -10,11 +10,21 @@
 # This model is used throughout the LAN and Cloud API toolchain to manage
 # connected devices and send commands.
 #
+# Instances use __slots__ (no per-instance __dict__) and only create the
+# `color` dict once it is first used, to keep large libraries small.
+#
 # Author: Jimmy Hickman
 # License: MIT
 # ==============================================================================
 
 class GoveeDevice:
+    __slots__ = (
+        "id", "name", "sku",
+        "online", "power_state", "brightness", "_color", "color_temp_in_kelvin",
+        "ip", "port",
+        "scenes", "diy_scenes", "mqtt_diy_scenes",  # Attached by the generated factories and the wizard
+    )
+
     def __init__(self, device_id: str, name: str, sku: str, ip: str = ""):
         """
         Initialize a GoveeDevice.
@@ -32,8 +42,19 @@ class GoveeDevice:
         self.online = False
         self.power_state = "off"
         self.brightness = 0
-        self.color = {"r": 0, "g": 0, "b": 0}
+        self._color = None
         self.color_temp_in_kelvin = None
 
         self.ip = ip
-        self.port = 4003  # Default LAN UDP command port for Govee devices
\ No newline at end of file
+        self.port = 4003  # Default LAN UDP command port for Govee devices
+
+    @property
+    def color(self) -> dict:
+        """Current colour as {"r", "g", "b"} (created on first use)."""
+        if self._color is None:
+            self._color = {"r": 0, "g": 0, "b": 0}
+        return self._color
+
+    @color.setter
+    def color(self, value: dict):
+        self._color = value
@@ -10,11 +10,15 @@
 # This model is used for mapping scenes to devices and referencing them
 # when sending LAN or MQTT commands.
 #
+# Instances use __slots__; the `devices` list is created on first use.
+#
 # Author: Jimmy Hickman
 # License: MIT
 # ==============================================================================
 
 class GoveeDIYScene:
+    __slots__ = ("value", "name", "_devices")
+
     def __init__(self, value: int, name: str):
         """
         Initialize a DIY Scene object.
@@ -25,7 +29,17 @@ class GoveeDIYScene:
         """
         self.value = int(value)
         self.name = name
-        self.devices = []  # List of device IDs this scene is associated with
+        self._devices = None  # List of device IDs this scene is associated with
+
+    @property
+    def devices(self) -> list:
+        if self._devices is None:
+            self._devices = []
+        return self._devices
+
+    @devices.setter
+    def devices(self, value: list):
+        self._devices = value
 
     def __repr__(self) -> str:
         """
@@ -8,11 +8,100 @@
 # Represents a captured MQTT payload structure used to trigger a DIY Scene
 # over LAN using Govee's internal messaging format.
 #
+# To keep large scene libraries small, instances use __slots__ and the
+# `command` list of base64 strings is held as one bytes buffer of the decoded
+# 20-byte frames, interned so identical payloads share a single buffer. The
+# `command` attribute still reads as the base64 strings and can be assigned
+# a list of them. Payloads that aren't canonical 20-byte frames are kept as
+# given.
+#
+# Interning is weak: a buffer is freed with the last scene using it, so
+# reloads and re-captures don't pile up stale payloads.
+#
+# Reading `command` returns a read-only tuple. The base64 strings of the
+# MQTT_COMMAND_CACHE_SIZE most recently read buffers are cached, so the send
+# path doesn't pay for base64 each time without the strings of every scene
+# ever read staying in memory. To change a scene's payload, assign a new
+# list to `command` (an in-place edit raises a TypeError instead of being
+# silently lost). Code that only needs the frames (e.g. validation) should
+# read `command_frames` instead, which never builds the strings.
+#
 # Author: Jimmy Hickman
 # License: MIT
 # ==============================================================================
 
-from typing import List
+import os
+import sys
+import base64
+import binascii
+import weakref
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple, Union
+
+from models.mqtt_payload_store import default_payload_store
+
+# Configurable via .env
+MQTT_COMMAND_CACHE_SIZE = int(os.getenv("MQTT_COMMAND_CACHE_SIZE", 256))
+
+FRAME_SIZE = 20
+BASE64_FRAME_SIZE = 28
+
+
+class PackedCommand:
+    """A canonical `command` payload: its decoded 20-byte frames, concatenated."""
+
+    __slots__ = ("frames", "__weakref__")
+
+    def __init__(self, frames: bytes):
+        self.frames = frames
+
+
+# Interned packed payloads (frames → PackedCommand), kept only while a scene uses them
+_PACKED_COMMANDS: "weakref.WeakValueDictionary[bytes, PackedCommand]" = weakref.WeakValueDictionary()
+
+
+def pack_command(command: Sequence[str]) -> Union[PackedCommand, Tuple[str, ...]]:
+    """
+    Pack a base64 `command` list into one interned buffer of decoded frames.
+
+    Returns the strings as a tuple if any entry isn't the canonical encoding of a
+    20-byte frame (so unpacking always reproduces the original strings).
+    """
+    if not command or any(len(c) != BASE64_FRAME_SIZE or c[-1] != "=" or c[-2] == "=" for c in command):
+        return tuple(command)
+    try:
+        # Decode every frame in one call: each 28-char frame becomes 21 bytes (the last one padding)
+        raw = binascii.a2b_base64("".join(c[:-1] + "A" for c in command), strict_mode=True)
+    except (binascii.Error, TypeError):
+        return tuple(command)
+    buffer = b"".join(raw[i:i + FRAME_SIZE] for i in range(0, len(raw), FRAME_SIZE + 1))
+    if frame_strings(buffer) != list(command):
+        return tuple(command)  # Non-canonical base64 (stray bits in the final character)
+
+    packed = _PACKED_COMMANDS.get(buffer)
+    if packed is None:
+        packed = _PACKED_COMMANDS.setdefault(buffer, PackedCommand(buffer))
+    return packed
+
+
+def unpack_command(packed: Union[PackedCommand, Tuple[str, ...]]) -> Tuple[str, ...]:
+    """Return the base64 `command` strings for a packed payload (cached for recently read payloads)."""
+    if not isinstance(packed, PackedCommand):
+        return packed
+    return _command_strings(packed)
+
+
+@lru_cache(maxsize=MQTT_COMMAND_CACHE_SIZE)
+def _command_strings(packed: PackedCommand) -> Tuple[str, ...]:
+    return tuple(frame_strings(packed.frames))
+
+
+def frame_strings(buffer: bytes) -> List[str]:
+    """Base64-encode a buffer of 20-byte frames, one string per frame."""
+    padded = b"".join(buffer[i:i + FRAME_SIZE] + b"\0" for i in range(0, len(buffer), FRAME_SIZE))
+    text = base64.b64encode(padded).decode("ascii")
+    return [text[i:i + BASE64_FRAME_SIZE - 1] + "=" for i in range(0, len(text), BASE64_FRAME_SIZE)]
+
 
 class GoveeMqttDiyScene:
     """
@@ -22,6 +111,8 @@ class GoveeMqttDiyScene:
     and can be replayed locally via LAN to trigger DIY scenes.
     """
 
+    __slots__ = ("accountTopic", "cmd", "transaction", "type", "write", "command_hash", "_command")
+
     def __init__(
         self,
         accountTopic: str,
@@ -29,7 +120,8 @@ class GoveeMqttDiyScene:
         transaction: str,
         type: int,
         write: str,
-        command: List[str]
+        command: Optional[List[str]] = None,
+        command_hash: Optional[str] = None
     ):
         """
         Initialize an MQTT DIY scene payload.
@@ -40,14 +132,32 @@ class GoveeMqttDiyScene:
             transaction (str): Transaction ID associated with the request
             type (int): Message type (usually 1)
             write (str): Indicates if this is a write operation ("true" or "false")
-            command (List[str]): Base64-encoded command payloads
+            command (List[str], optional): Base64-encoded command payloads
+            command_hash (str, optional): Content address of the payloads in the MQTT payload store,
+                                          used instead of `command` (shared payloads are loaded once)
         """
-        self.accountTopic = accountTopic
-        self.cmd = cmd
+        # Every scene of an account shares these strings
+        self.accountTopic = sys.intern(accountTopic) if isinstance(accountTopic, str) else accountTopic
+        self.cmd = sys.intern(cmd) if isinstance(cmd, str) else cmd
         self.transaction = transaction
         self.type = type
         self.write = write
-        self.command = command
+        self.command_hash = command_hash
+        self.command = default_payload_store().get(command_hash) if command is None and command_hash else command
+
+    @property
+    def command(self) -> Optional[Tuple[str, ...]]:
+        """Base64-encoded command payloads (read-only and shared; assign a new list to change them)."""
+        return unpack_command(self._command) if self._command is not None else None
+
+    @command.setter
+    def command(self, value: Optional[List[str]]):
+        self._command = pack_command(value) if value is not None else None
+
+    @property
+    def command_frames(self) -> Optional[bytes]:
+        """The command's decoded 20-byte frames, concatenated, without building the base64 strings (None if not packed)."""
+        return self._command.frames if isinstance(self._command, PackedCommand) else None
 
     def to_dict(self) -> dict:
         """
@@ -0,0 +1,130 @@
+# models/mqtt_payload_store.py
+
+# ==============================================================================
+# Govee LAN API Plus – MQTT Payload Store
+# ---------------------------------------
+#
+# Description:
+# Content-addressed storage for captured MQTT DIY scene `command` payloads.
+#
+# Shared DIY scenes are captured once per device, so devices of the same SKU
+# end up with identical base64 `command` lists. The store keeps each distinct
+# payload once, keyed by the SHA-256 of its contents, and scenes reference it
+# by hash (`GoveeMqttDiyScene(..., command_hash="...")`).
+#
+# Loaded payloads are interned: every scene referencing a hash shares the same
+# in-memory list, which must be treated as read-only.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import json
+import hashlib
+from typing import Dict, List, Optional
+
+from api.metrics import record_cache_lookup
+
+# Configurable via .env
+MQTT_PAYLOAD_STORE_PATH = os.path.abspath(os.getenv("MQTT_PAYLOAD_STORE_PATH", "factories/mqtt_payload_store.json"))
+
+
+def payload_hash(command: List[str]) -> str:
+    """Return the content address (SHA-256 hex) of a `command` list."""
+    return hashlib.sha256("\n".join(command).encode("utf-8")).hexdigest()
+
+
+class MqttPayloadStore:
+    """Hash → payload store, persisted as one JSON file."""
+
+    def __init__(self, path: str = MQTT_PAYLOAD_STORE_PATH):
+        """
+        Initialize an MqttPayloadStore. The file is read on first access.
+
+        Args:
+            path (str): JSON file of {hash: command list}.
+        """
+        self.path = path
+        self._payloads: Optional[Dict[str, List[str]]] = None
+        self._dirty = False
+
+    @property
+    def payloads(self) -> Dict[str, List[str]]:
+        if self._payloads is None:
+            self._payloads = {}
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._payloads = json.load(f)
+        return self._payloads
+
+    def __len__(self) -> int:
+        return len(self.payloads)
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self.payloads
+
+    def put(self, command: List[str]) -> str:
+        """
+        Store a payload (once) and return its hash.
+
+        Args:
+            command (List[str]): Base64 `command` list.
+
+        Returns:
+            str: The payload's hash.
+        """
+        digest = payload_hash(command)
+        stored = digest in self.payloads
+        record_cache_lookup("mqtt_payload_store", stored)
+        if not stored:
+            self.payloads[digest] = list(command)
+            self._dirty = True
+        return digest
+
+    def get(self, digest: str) -> List[str]:
+        """
+        Return the shared payload for a hash.
+
+        Raises:
+            KeyError: If the hash isn't in the store.
+        """
+        try:
+            return self.payloads[digest]
+        except KeyError:
+            raise KeyError(f"MQTT payload {digest} not found in {self.path}") from None
+
+    def intern(self, command: List[str]) -> List[str]:
+        """Return the shared list for an equal payload, storing it first if needed."""
+        return self.get(self.put(command))
+
+    def save(self) -> None:
+        """Write the store atomically (temp file + rename) if anything was added."""
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.payloads, f, indent=1, sort_keys=True)
+            f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self._dirty = False
+
+
+_default_store: Optional[MqttPayloadStore] = None
+
+
+def default_payload_store() -> MqttPayloadStore:
+    """Return the process-wide store at MQTT_PAYLOAD_STORE_PATH."""
+    global _default_store
+    if _default_store is None:
+        _default_store = MqttPayloadStore()
+    return _default_store
+
+
+def use_payload_store(store: MqttPayloadStore) -> None:
+    """Replace the process-wide store (e.g. to point generation at a scratch directory)."""
+    global _default_store
+    _default_store = store
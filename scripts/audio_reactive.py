@@ -0,0 +1,108 @@
+# scripts/audio_reactive.py
+
+# ==============================================================================
+# Govee LAN API Plus – Audio-Reactive Lights
+# ------------------------------------------
+#
+# Description:
+# Drives the factory devices live from audio (see show/audio_reactive.py):
+# either a WAV file, played in step with the wall clock, or raw PCM piped in
+# on stdin from any recorder or decoder. Prints the run report at the end
+# (Ctrl+C stops early and still reports).
+#
+# Usage:
+#   python3 scripts/audio_reactive.py song.wav --player aplay
+#   parec --format=s16le --rate=44100 --channels=2 | python3 scripts/audio_reactive.py -
+#   ffmpeg -i song.mp3 -f s16le -ar 44100 -ac 2 - | python3 scripts/audio_reactive.py - --devices porch_light garage_lights
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import json
+import shlex
+import signal
+import argparse
+import subprocess
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from api.lan.prewarm_devices import DevicePrewarmer
+from show.audio_reactive import (AUDIO_REACTIVE_FPS, AUDIO_REACTIVE_LATENCY, AudioReactiveEngine,
+                                 PcmStreamSource, WavAudioSource)
+from show.show_mode import ShowMode
+from show.show_timeline import load_factory_namespace
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the factory devices live from audio.")
+    parser.add_argument("audio", help="PCM WAV file, or - for raw PCM on stdin")
+    parser.add_argument("--devices", nargs="+", help="Device factory variable names (default: every device with an IP)")
+    parser.add_argument("--fps", type=float, default=AUDIO_REACTIVE_FPS)
+    parser.add_argument("--latency", type=float, default=AUDIO_REACTIVE_LATENCY,
+                        help="Seconds the lights lag the sound; file sources are analysed this far ahead")
+    parser.add_argument("--duration", type=float, help="Stop after this many seconds")
+    parser.add_argument("--player", help="Command started with the WAV file as its last argument, e.g. aplay")
+    parser.add_argument("--rate", type=int, default=44100, help="Sample rate of stdin PCM")
+    parser.add_argument("--channels", type=int, default=2, help="Channels of stdin PCM")
+    parser.add_argument("--width", type=int, default=2, help="Bytes per sample of stdin PCM")
+    parser.add_argument("--report", help="Write the run report (JSON) to this file")
+    args = parser.parse_args()
+
+    factory_devices, _ = load_factory_namespace()
+    if args.devices:
+        unknown = [name for name in args.devices if name not in factory_devices]
+        if unknown:
+            print(f"❌ Unknown devices: {', '.join(unknown)}")
+            return
+        devices = [factory_devices[name] for name in args.devices if factory_devices[name].ip]
+    else:
+        devices = [d for d in factory_devices.values() if d.ip]
+    if not devices:
+        print("⚠️  No devices with a LAN IP to drive.")
+        return
+
+    if args.audio == "-":
+        source = PcmStreamSource(sys.stdin.buffer, args.rate, args.channels, args.width)
+        print(f"🎤 Reading {args.rate} Hz, {args.channels} ch, {args.width * 8}-bit PCM from stdin")
+    else:
+        source = WavAudioSource(args.audio)
+        print(f"🎵 {os.path.basename(args.audio)}: {source.duration:.1f} s")
+
+    prewarmer = DevicePrewarmer(devices)
+    prewarmer.warm()
+    prewarmer.start()
+
+    engine = AudioReactiveEngine(devices, source, fps=args.fps, latency=args.latency)
+    player = None
+    print(f"🌈 Driving {len(devices)} devices at {args.fps:g} fps...")
+    signal.signal(signal.SIGINT, lambda *_: source.stop())  # Ctrl+C ends the run and still reports
+    try:
+        if args.player and args.audio != "-":
+            player = subprocess.Popen(shlex.split(args.player) + [args.audio])
+        report = engine.run(duration=args.duration, show_mode=ShowMode(show_name="audio-reactive"))
+    finally:
+        prewarmer.stop()
+        engine.close()
+        if player is not None:
+            player.terminate()
+
+    latency, cpu = report["latency_ms"], report["cpu_percent"]
+    print(f"✅ {report['frames']} frames ({report['skipped_frames']} skipped), {report['packets']} packets "
+          f"({report['packets_per_second']:.0f}/s)")
+    print(f"   audio → last packet p50 {latency['p50']:.2f} ms, p99 {latency['p99']:.2f} ms; "
+          f"CPU {cpu:.1f}% ({report['cpu_us_per_device_frame']:.1f} µs per device per frame)")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# scripts/batch_capture.py
+
+# ==============================================================================
+# Govee LAN API Plus – Batch MQTT Scene Capture
+# ---------------------------------------------
+#
+# Description:
+# Captures many DIY scenes in one Frida observer session. The operator walks a
+# queue of (device, scene) targets; the session auto-advances as soon as a
+# `ptReal` message for the current target's device arrives on the observer's
+# MQTT stream.
+#
+# Messages are matched to the intended device rather than simply taking "the
+# last message", using (in order):
+# 1. A `device` field in the MQTT payload, when the app includes one.
+# 2. The MQTT topic the message was published to. Govee publishes device
+#    commands to a per-device topic, so once a device's topic is known every
+#    later message can be attributed. Topics are learned the first time a
+#    device is captured (from a topic no other device owns) and saved to
+#    DEVICE_MQTT_TOPICS_FILE_PATH for later sessions.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import json
+import queue
+import select
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.govee_device import GoveeDevice
+from models.govee_diy_scene import GoveeDIYScene
+from scripts.frida_log_reader import MqttLogEntry, is_scene_message
+
+# Configurable via .env
+DEVICE_MQTT_TOPICS_FILE_PATH = os.path.abspath(os.getenv("DEVICE_MQTT_TOPICS_FILE_PATH", "factories/device_mqtt_topics.json"))
+
+
+class DeviceTopicCorrelator:
+    """Attributes captured MQTT messages to devices by payload device ID or learned MQTT topic."""
+
+    def __init__(self, topics_path: Optional[str] = DEVICE_MQTT_TOPICS_FILE_PATH):
+        """
+        Initialize a DeviceTopicCorrelator.
+
+        Args:
+            topics_path (str, optional): JSON file of learned device ID → MQTT topic mappings.
+                                         Nothing is loaded or saved if None.
+        """
+        self.topics_path = topics_path
+        self.topics: Dict[str, str] = {}
+
+        if topics_path and os.path.exists(topics_path):
+            with open(topics_path, "r", encoding="utf-8") as f:
+                self.topics = json.load(f)
+
+    def owner_of(self, topic: str) -> Optional[str]:
+        """Return the device ID that owns an MQTT topic, if known."""
+        for device_id, known_topic in self.topics.items():
+            if known_topic == topic:
+                return device_id
+        return None
+
+    def matches(self, entry: MqttLogEntry, device: GoveeDevice) -> bool:
+        """
+        Decide whether a captured message was sent to `device`, learning its topic if needed.
+
+        Args:
+            entry (MqttLogEntry): The captured MQTT message.
+            device (GoveeDevice): The device currently being captured.
+
+        Returns:
+            bool: True if the message belongs to `device`.
+        """
+        payload_device = entry.msg.get("device") or entry.msg.get("data", {}).get("device")
+        if payload_device:
+            return payload_device.lower() == device.id.lower()
+
+        if not entry.topic:
+            # Nothing to correlate on; only accept it if we don't know this device's topic yet
+            return device.id not in self.topics
+
+        known = self.topics.get(device.id)
+        if known is not None:
+            return entry.topic == known
+
+        if self.owner_of(entry.topic) is None:
+            self.topics[device.id] = entry.topic
+            self.save()
+            print(f"🔗 Learned MQTT topic for {device.name}: {entry.topic}")
+            return True
+        return False
+
+    def save(self) -> None:
+        if not self.topics_path:
+            return
+        os.makedirs(os.path.dirname(self.topics_path), exist_ok=True)
+        with open(self.topics_path, "w", encoding="utf-8") as f:
+            json.dump(self.topics, f, indent=2, sort_keys=True)
+
+
+def read_operator_command(timeout: float) -> Optional[str]:
+    """Return a line typed by the operator within `timeout` seconds, or None."""
+    if sys.stdin in select.select([sys.stdin], [], [], timeout)[0]:
+        return sys.stdin.readline().strip().lower()
+    return None
+
+
+def run_batch_capture(
+    targets: List[Tuple[GoveeDevice, GoveeDIYScene]],
+    stream_queue: queue.Queue,
+    on_captured: Callable[[GoveeDevice, GoveeDIYScene, dict], None],
+    correlator: Optional[DeviceTopicCorrelator] = None,
+    read_command: Callable[[float], Optional[str]] = read_operator_command
+) -> Dict[str, int]:
+    """
+    Walk a queue of capture targets against a live MQTT stream.
+
+    For each target the operator triggers the scene in the Govee app; the first
+    `ptReal` scene message attributed to the target's device is handed to
+    `on_captured` and the session moves on. Pressing Enter skips the current
+    target, typing "q" ends the session.
+
+    Args:
+        targets (List[Tuple[GoveeDevice, GoveeDIYScene]]): (device, scene) pairs to capture, in order.
+        stream_queue (queue.Queue): Queue of (published_at, MqttLogEntry) from the observer's stream.
+        on_captured (Callable): Called with (device, scene, msg) for each captured scene.
+        correlator (DeviceTopicCorrelator, optional): Message → device matcher. Defaults to one backed by
+                                                      DEVICE_MQTT_TOPICS_FILE_PATH.
+        read_command (Callable): Non-blocking operator input reader (for tests/automation).
+
+    Returns:
+        Dict[str, int]: Counts of "captured", "skipped" and "ignored" (messages for other devices).
+    """
+    correlator = correlator or DeviceTopicCorrelator()
+    results = {"captured": 0, "skipped": 0, "ignored": 0}
+
+    for index, (device, scene) in enumerate(targets, 1):
+        print(f"\n🎯 [{index}/{len(targets)}] Trigger '{scene.name}' on '{device.name}' in the Govee app")
+        print("   (Enter to skip, 'q' + Enter to stop)")
+
+        while True:
+            try:
+                _, entry = stream_queue.get(timeout=0.05)
+            except queue.Empty:
+                command = read_command(0.05)
+                if command is None:
+                    continue
+                if command == "q":
+                    print("👋 Ending batch capture.")
+                    return results
+                print("⏭  Skipped.")
+                results["skipped"] += 1
+                break
+
+            if not is_scene_message(entry.msg) or entry.msg.get("cmd") != "ptReal":
+                continue
+            if not correlator.matches(entry, device):
+                results["ignored"] += 1
+                continue
+
+            on_captured(device, scene, entry.msg)
+            results["captured"] += 1
+            break
+
+    print(f"\n🎉 Batch capture finished: {results['captured']} captured, {results['skipped']} skipped.")
+    return results
@@ -0,0 +1,134 @@
+# scripts/benchmark_audio_analysis.py
+
+# ==============================================================================
+# Govee LAN API Plus – Audio Analysis Benchmark
+# ---------------------------------------------
+#
+# Description:
+# Synthesizes a track with a known tempo, beat grid and section layout
+# (44.1 kHz stereo 16-bit, 10 minutes by default, written in chunks), then
+# times `analyze_audio` on it and checks what it found:
+# - Speed (x real time) and peak Python/NumPy memory (tracemalloc).
+# - Tempo error.
+# - Beat F-measure: detected beats within ±70 ms of a true beat, and their
+#   median timing error.
+# - Section boundaries found within one bar of the true ones.
+# Finally builds a timeline for four groups and reports its size.
+#
+# Usage: python3 scripts/benchmark_audio_analysis.py [minutes] [bpm]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import time
+import wave
+import tempfile
+import tracemalloc
+
+import numpy as np
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from show.audio_analysis import analyze_audio
+from show.audio_timeline import build_timeline
+
+SAMPLE_RATE = 44100
+FIRST_BEAT = 0.25  # Seconds
+SECTION_BARS = 32
+# Section layout, repeated: which instruments play (and how loud)
+SECTION_KINDS = (
+    {"kick": 0.5, "hats": 0.3, "bass": 0.0, "pad": 0.2},   # Intro
+    {"kick": 0.8, "hats": 0.4, "bass": 0.4, "pad": 0.0},   # Verse
+    {"kick": 1.0, "hats": 0.6, "bass": 0.8, "pad": 0.4},   # Chorus
+    {"kick": 0.0, "hats": 0.2, "bass": 0.0, "pad": 0.5},   # Breakdown
+)
+TOLERANCE = 0.07
+
+
+def synthesize(path: str, minutes: float, bpm: float, chunk_seconds: float = 10.0) -> None:
+    period = 60 / bpm
+    section_seconds = SECTION_BARS * 4 * period
+    total = int(minutes * 60 * SAMPLE_RATE)
+    rng = np.random.default_rng(3)
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        for first in range(0, total, int(chunk_seconds * SAMPLE_RATE)):
+            t = (np.arange(first, min(total, first + int(chunk_seconds * SAMPLE_RATE))) / SAMPLE_RATE)
+            since_start = t - FIRST_BEAT
+            section = np.clip(since_start // section_seconds, 0, None).astype(np.int64) % len(SECTION_KINDS)
+            levels = {k: np.array([s[k] for s in SECTION_KINDS])[section] for k in SECTION_KINDS[0]}
+
+            beat_phase = np.where(since_start >= 0, since_start % period, 1.0)
+            eighth_phase = np.where(since_start >= 0, since_start % (period / 2), 1.0)
+            kick = np.sin(2 * np.pi * 55 * beat_phase) * np.exp(-beat_phase / 0.07)
+            noise = rng.standard_normal(len(t))
+            hats = np.diff(noise, prepend=0) * np.exp(-eighth_phase / 0.015) * 0.3
+            bass = np.sin(2 * np.pi * 110 * t) * (0.6 + 0.4 * np.exp(-beat_phase / 0.2))
+            pad = (np.sin(2 * np.pi * 220 * t) + np.sin(2 * np.pi * 277.2 * t) + np.sin(2 * np.pi * 329.6 * t)) / 3
+
+            mix = (levels["kick"] * kick + levels["hats"] * hats + levels["bass"] * 0.5 * bass
+                   + levels["pad"] * 0.4 * pad + 0.01 * noise)
+            samples = (np.clip(mix * 0.5, -1, 1) * 32767).astype("<i2")
+            wav.writeframes(np.repeat(samples, 2).tobytes())
+
+
+def beat_f_measure(detected: np.ndarray, truth: np.ndarray):
+    """F-measure of detected beats within TOLERANCE of a true beat, and the median error of those hits."""
+    if not len(detected) or not len(truth):
+        return 0.0, 0.0
+    index = np.clip(np.searchsorted(truth, detected), 1, len(truth) - 1)
+    distance = np.minimum(np.abs(detected - truth[index - 1]), np.abs(detected - truth[index]))
+    hits = int((distance <= TOLERANCE).sum())
+    precision, recall = hits / len(detected), hits / len(truth)
+    f_measure = 2 * precision * recall / (precision + recall) if hits else 0.0
+    return f_measure, float(np.median(distance[distance <= TOLERANCE])) if hits else 0.0
+
+
+def main():
+    minutes = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    bpm = float(sys.argv[2]) if len(sys.argv) > 2 else 126.0
+
+    with tempfile.TemporaryDirectory(prefix="govee-audio-") as workdir:
+        path = os.path.join(workdir, "track.wav")
+        start = time.perf_counter()
+        synthesize(path, minutes, bpm)
+        print(f"🎵 Synthesized {minutes:g} min at {bpm:g} BPM ({os.path.getsize(path) / 1e6:.0f} MB WAV) "
+              f"in {time.perf_counter() - start:.1f} s")
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        analysis = analyze_audio(path)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    duration = minutes * 60
+    period = 60 / bpm
+    truth = np.arange(FIRST_BEAT, duration, period)
+    true_sections = np.arange(FIRST_BEAT, duration, SECTION_BARS * 4 * period)[1:]
+    found = np.array([s for s, _, _ in analysis.sections[1:]])
+    section_hits = sum(bool(len(found)) and np.abs(found - b).min() <= 4 * period for b in true_sections)
+
+    print(f"  analysis              {elapsed:>8.2f} s ({duration / elapsed:.0f}x real time)")
+    print(f"  peak memory           {peak / 1e6:>8.1f} MB (tracemalloc)")
+    print(f"  tempo                 {analysis.tempo:>8.2f} BPM (error {analysis.tempo - bpm:+.2f})")
+    f_measure, error = beat_f_measure(analysis.beats, truth)
+    print(f"  beat F-measure        {f_measure:>8.3f} "
+          f"({len(analysis.beats)} detected, {len(truth)} true, ±{TOLERANCE * 1000:.0f} ms; median error {error * 1000:.1f} ms)")
+    print(f"  sections              {section_hits}/{len(true_sections)} boundaries within a bar "
+          f"({len(found)} found)")
+
+    groups = {f"group_{i}": [f"device_{i}"] for i in range(4)}
+    scenes = {f"group_{i}": [f"device_{i}_scene_{j}" for j in range(3)] for i in range(2)}
+    timeline = build_timeline(analysis, groups, scenes, name="benchmark")
+    print(f"  timeline              {len(timeline['cues'])} cues for {len(groups)} groups")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# scripts/benchmark_audio_reactive.py
+
+# ==============================================================================
+# Govee LAN API Plus – Audio-Reactive Engine Benchmark
+# ----------------------------------------------------
+#
+# Description:
+# Runs the audio-reactive engine (show/audio_reactive.py) on a synthesized
+# track and reports, per device count and frame rate:
+# - Latency: newest audio available → the frame's last packet on the wire
+#   (p50/p99), and the frame timing jitter.
+# - CPU: process CPU time per wall second, and per device per frame.
+# - Packets per second actually sent (only changed colors are sent).
+# Device counts run against one unread local socket, so only the sender's
+# cost is measured. Then:
+# - A run against emulated devices checks every device received packets and
+#   ended on the last color sent to it.
+# - A stream run feeds raw PCM through a pipe in real-time 256-frame blocks,
+#   measuring block arrival → last packet.
+#
+# Usage: python3 scripts/benchmark_audio_reactive.py [seconds per run]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import json
+import time
+import socket
+import wave
+import tempfile
+import threading
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.lan.set_device_color import build_color_payload
+from models.govee_device import GoveeDevice
+from scripts.benchmark_audio_analysis import SAMPLE_RATE, synthesize
+from scripts.lan_device_emulator import GoveeLanEmulator
+from show.audio_reactive import AudioReactiveEngine, PcmStreamSource, WavAudioSource
+from show.color_stream import color_packet
+
+DEVICE_COUNTS = (1, 10, 50, 200, 500)
+FRAME_RATES = (30, 60)
+EMULATED_DEVICES = 10
+
+
+def sink_devices(count: int, port: int) -> list:
+    devices = [GoveeDevice(f"sink-{i}", f"Sink {i}", "H0000", ip="127.0.0.1") for i in range(count)]
+    for device in devices:
+        device.port = port
+    return devices
+
+
+def summary(report: dict) -> str:
+    latency, jitter = report["latency_ms"], report["jitter_ms"]
+    return (f"latency p50 {latency['p50']:6.2f} ms  p99 {latency['p99']:6.2f} ms   "
+            f"jitter p99 {jitter['p99']:5.2f} ms   CPU {report['cpu_percent']:5.1f}% "
+            f"({report['cpu_us_per_device_frame']:5.1f} µs/device/frame)   "
+            f"{report['packets_per_second']:7.0f} packets/s, {report['skipped_frames']} skipped")
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 4.0
+    assert color_packet(1, 22, 255) == json.dumps(build_color_payload({"r": 1, "g": 22, "b": 255})).encode("utf-8")
+
+    with tempfile.TemporaryDirectory(prefix="govee-reactive-") as workdir:
+        path = os.path.join(workdir, "track.wav")
+        synthesize(path, minutes=(seconds + 1) / 60, bpm=126)
+
+        sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sink.bind(("127.0.0.1", 0))
+        port = sink.getsockname()[1]
+        print(f"🌈 Audio-reactive engine, {seconds:g} s per run, sending to an unread local socket")
+        for fps in FRAME_RATES:
+            for count in DEVICE_COUNTS:
+                engine = AudioReactiveEngine(sink_devices(count, port), WavAudioSource(path), fps=fps)
+                report = engine.run(duration=seconds)
+                engine.close()
+                print(f"  {count:>4} devices @ {fps} fps  {summary(report)}")
+        sink.close()
+
+        with GoveeLanEmulator(EMULATED_DEVICES) as emulator:
+            engine = AudioReactiveEngine(emulator.devices, WavAudioSource(path), fps=30)
+            report = engine.run(duration=seconds)
+            engine.close()
+            time.sleep(0.3)
+            last_sent = engine.stream.sent.tolist()
+            received = [len(d.received) for d in emulator.emulated]
+            matching = sum(
+                [d.state["color"][k] for k in "rgb"] == sent for d, sent in zip(emulator.emulated, last_sent)
+            )
+        print(f"📡 {EMULATED_DEVICES} emulated devices @ 30 fps: {sum(received)}/{report['packets']} packets arrived "
+              f"(min {min(received)} per device), {matching}/{EMULATED_DEVICES} ended on the last color sent")
+
+        stream_run(path, seconds)
+
+
+def stream_run(path: str, seconds: float) -> None:
+    """Feed the track as raw PCM through a pipe in real-time blocks and measure arrival → packet."""
+    with wave.open(path, "rb") as wav:
+        pcm = wav.readframes(wav.getnframes())
+    block = 256 * 4  # 256 stereo 16-bit frames
+    read_fd, write_fd = os.pipe()
+
+    def feed():
+        started = time.monotonic()
+        with os.fdopen(write_fd, "wb", buffering=0) as pipe:
+            for i, offset in enumerate(range(0, min(len(pcm), int(seconds * SAMPLE_RATE) * 4), block)):
+                delay = started + i * 256 / SAMPLE_RATE - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                pipe.write(pcm[offset:offset + block])
+
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    devices = sink_devices(50, sink.getsockname()[1])
+    with os.fdopen(read_fd, "rb") as stream:
+        engine = AudioReactiveEngine(devices, PcmStreamSource(stream, SAMPLE_RATE, 2, 2), fps=60)
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+        report = engine.run(duration=seconds)
+        engine.close()
+        feeder.join()
+    sink.close()
+    print(f"🎤 Piped PCM stream, 50 devices @ 60 fps: {summary(report)}")
+    print(f"   (latency = block arrival → last packet; includes up to one frame of waiting for the next frame)")
+
+
+if __name__ == "__main__":
+    main()
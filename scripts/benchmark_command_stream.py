@@ -0,0 +1,187 @@
+# scripts/benchmark_command_stream.py
+
+# ==============================================================================
+# Govee LAN API Plus – Command Stream Benchmark
+# ---------------------------------------------
+#
+# Description:
+# Pipes JSON-lines commands from a separate producer process into
+# CommandStream, the way another tool would, and measures:
+# - Throughput for 200,000 mixed commands (colors from a 64-color palette,
+#   MQTT DIY scenes, brightness; one in ten with a deadline) to 100 devices
+#   pointing at an unread local UDP sink. The producer writes as fast as it
+#   can, so the periodic reports show the pipe filling up (backpressure).
+# - The same commands one at a time through the per-command functions
+#   (`set_device_color` and friends), for comparison.
+# - Commands whose deadline has already passed are dropped, not sent.
+# - A run against emulated devices: every command arrives, and each device
+#   ends on its last color.
+#
+# Usage: python3 scripts/benchmark_command_stream.py [commands]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import json
+import time
+import random
+import socket
+import logging
+import tempfile
+import subprocess
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.lan.command_stream import CommandStream
+from api.lan.set_device_brightness import set_device_brightness
+from api.lan.set_device_color import set_device_color
+from api.lan.set_device_mqtt_diy_scene import set_device_mqtt_diy_scene
+from models.govee_device import GoveeDevice
+from models.govee_mqtt_diy_scene import GoveeMqttDiyScene
+from scripts.lan_device_emulator import GoveeLanEmulator
+
+DEVICES = 100
+SCENES = {
+    f"scene_{i}": GoveeMqttDiyScene("GA/0123456789abcdef", "ptReal", f"v_{i}", 1, "true",
+                                    [f"owABCQIEAAAAAAAAAAAAAAAAAA{i % 10}=" for _ in range(4)])
+    for i in range(8)
+}
+
+
+def sink_devices(count: int, port: int) -> dict:
+    devices = {}
+    for i in range(count):
+        device = GoveeDevice(f"sink-{i}", f"Sink {i}", "H0000", ip="127.0.0.1")
+        device.port = port
+        devices[f"light_{i}"] = device
+    return devices
+
+
+def build_commands(count: int, rng: random.Random) -> list:
+    palette = [{"r": rng.randrange(256), "g": rng.randrange(256), "b": rng.randrange(256)} for _ in range(64)]
+    scenes = list(SCENES)
+    commands = []
+    for i in range(count):
+        device = f"light_{rng.randrange(DEVICES)}"
+        kind = rng.random()
+        if kind < 0.5:
+            command = {"device": device, "color": rng.choice(palette)}
+        elif kind < 0.75:
+            command = {"device": device, "scene": rng.choice(scenes)}
+        else:
+            command = {"device": device, "brightness": rng.randrange(1, 101)}
+        if i % 10 == 0:
+            command["deadline"] = time.time() + 3600
+        commands.append(command)
+    return commands
+
+
+def write_lines(path: str, commands: list) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for command in commands:
+            f.write(json.dumps(command) + "\n")
+
+
+def producer(path: str) -> subprocess.Popen:
+    """A separate process writing the file into a pipe as fast as it can."""
+    return subprocess.Popen(["cat", path], stdout=subprocess.PIPE)
+
+
+def throughput(commands: list, workdir: str) -> None:
+    path = os.path.join(workdir, "commands.jsonl")
+    write_lines(path, commands)
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    devices = sink_devices(DEVICES, sink.getsockname()[1])
+
+    reports = []
+    with CommandStream(devices, SCENES, report_interval=0.25, on_report=reports.append) as stream:
+        process = producer(path)
+        cpu_started = time.process_time()
+        report = stream.run(process.stdout)
+        cpu = time.process_time() - cpu_started
+        process.wait()
+
+    full = [r for r in reports if r["backlog_bytes"] is not None and r["pipe_size"]]
+    print(f"🚀 {len(commands)} commands piped from another process to {DEVICES} devices (unread local sink):")
+    print(f"   {report['commands_per_second']:,.0f} commands/s ({report['packets']} packets in {report['seconds']:.2f} s, "
+          f"{cpu / report['commands'] * 1e6:.1f} µs CPU per command); {report['late']} late, "
+          f"{report['invalid']} invalid, {report['send_errors']} send errors")
+    if full:
+        print(f"   {len(reports)} periodic reports; pipe backlog "
+              f"{min(r['backlog_bytes'] for r in full)}–{max(r['backlog_bytes'] for r in full)} bytes of "
+              f"{full[0]['pipe_size']} (the producer was held back by the pipe)")
+    sink.close()
+
+
+def per_command(commands: list, count: int = 2000) -> None:
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    devices = sink_devices(DEVICES, sink.getsockname()[1])
+    logging.disable(logging.INFO)  # Don't let the terminal decide the result
+    started = time.perf_counter()
+    for line in (json.dumps(c) for c in commands[:count]):
+        command = json.loads(line)
+        device = devices[command["device"]]
+        if "color" in command:
+            set_device_color(device, command["color"])
+        elif "scene" in command:
+            set_device_mqtt_diy_scene(device, SCENES[command["scene"]])
+        else:
+            set_device_brightness(device, command["brightness"])
+    rate = count / (time.perf_counter() - started)
+    logging.disable(logging.NOTSET)
+    sink.close()
+    print(f"🐢 One call per command (new socket per send, logging disabled): {rate:,.0f} commands/s")
+
+
+def deadline_check(workdir: str) -> None:
+    path = os.path.join(workdir, "stale.jsonl")
+    stale = [{"device": "light_0", "color": {"r": 1, "g": 2, "b": 3}, "deadline": time.time() - 1} for _ in range(100)]
+    fresh = [{"device": "light_0", "color": {"r": 1, "g": 2, "b": 3}, "deadline": time.time() + 60} for _ in range(100)]
+    write_lines(path, stale + fresh + [{"device": "nope", "power": True}])
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    with CommandStream(sink_devices(1, sink.getsockname()[1])) as stream, open(path, "rb") as f:
+        report = stream.run(f)
+    sink.close()
+    print(f"⏰ 100 commands past their deadline, 100 before, 1 unknown device: {report['commands']} sent, "
+          f"{report['late']} dropped as late, {report['invalid']} invalid")
+
+
+def emulator_check(workdir: str, count: int = 2000) -> None:
+    rng = random.Random(3)
+    with GoveeLanEmulator(20, first_host=80) as emulator:
+        devices = {f"light_{i}": d for i, d in enumerate(emulator.devices)}
+        commands = [{"device": f"light_{i % 20}", "color": {"r": rng.randrange(256), "g": rng.randrange(256), "b": i % 256}}
+                    for i in range(count)]
+        path = os.path.join(workdir, "emulator.jsonl")
+        write_lines(path, commands)
+        with CommandStream(devices) as stream:
+            process = producer(path)
+            report = stream.run(process.stdout)
+            process.wait()
+        time.sleep(0.3)
+        received = sum(len(d.received) for d in emulator.emulated)
+        last = {c["device"]: c["color"] for c in commands}
+        landed = sum(emulated.state["color"] == last[name] for name, emulated in zip(devices, emulator.emulated))
+    print(f"📡 {count} commands to 20 emulated devices at {report['commands_per_second']:,.0f}/s: "
+          f"{received}/{report['packets']} arrived, {landed}/20 ended on their last color")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    commands = build_commands(count, random.Random(1))
+    with tempfile.TemporaryDirectory(prefix="govee-commands-") as workdir:
+        throughput(commands, workdir)
+        per_command(commands)
+        deadline_check(workdir)
+        emulator_check(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# scripts/benchmark_device_snapshot.py
+
+# ==============================================================================
+# Govee LAN API Plus – Snapshot & Restore Benchmark
+# -------------------------------------------------
+#
+# Description:
+# Gives 100 emulated devices random states (some off, some in white color
+# temperature mode), takes a snapshot, scrambles every device, restores the
+# snapshot and checks each emulated device is back to its original state.
+# Reports:
+# - Snapshot time against the slowest devStatus round trip (the floor for
+#   one concurrent fan-out).
+# - Restore time against the pure pacing time (packets / LAN_RESTORE_RATE).
+# - The same restore over a lossy link (5% of packets dropped), with the
+#   verify pass resending whatever didn't arrive. Lost devStatus replies are
+#   asked again, and devices that never answer are counted as unverified
+#   rather than mismatched.
+#
+# Usage: python3 scripts/benchmark_device_snapshot.py [devices]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.lan.device_snapshot import LAN_RESTORE_RATE, DeviceSnapshot, restore_snapshot, take_snapshot
+from api.lan.get_device_status import get_devices_status
+from scripts.lan_device_emulator import GoveeLanEmulator
+
+
+def randomize(emulator, rng: random.Random) -> dict:
+    """Give every emulated device a random state; returns device ID → expected state dict."""
+    expected = {}
+    for emulated in emulator.emulated:
+        kelvin = rng.choice((0, 0, 0, rng.randrange(2000, 9001, 100)))
+        emulated.state = {
+            "onOff": int(rng.random() > 0.2),
+            "brightness": rng.randrange(1, 101),
+            "color": {"r": rng.randrange(256), "g": rng.randrange(256), "b": rng.randrange(256)},
+            "colorTemInKelvin": kelvin,
+        }
+        expected[emulated.device.id] = {k: (dict(v) if isinstance(v, dict) else v) for k, v in emulated.state.items()}
+    return expected
+
+
+def restored(emulator, expected: dict) -> int:
+    """Devices whose state matches what was captured (for devices that were off: off)."""
+    good = 0
+    for emulated in emulator.emulated:
+        want = expected[emulated.device.id]
+        good += emulated.state == want if want["onOff"] else emulated.state["onOff"] == 0
+    return good
+
+
+def run(count: int, drop_rate: float, verify: bool, workdir: str) -> None:
+    rng = random.Random(7)
+    with GoveeLanEmulator(count, drop_rate=drop_rate) as emulator:
+        devices = emulator.devices
+        expected = randomize(emulator, rng)
+        label = f"{count} devices, {drop_rate * 100:.0f}% loss"
+
+        rtts = [r["rtt"] for r in get_devices_status(devices, timeout=1).values()]
+        started = time.perf_counter()
+        snapshot = take_snapshot(devices, timeout=1)
+        snapshot_seconds = time.perf_counter() - started
+        path = os.path.join(workdir, "snapshot.json")
+        snapshot.save(path)
+        size = os.path.getsize(path)
+        snapshot = DeviceSnapshot.load(path)
+        print(f"📸 {label}: snapshot of {len(snapshot)} devices in {snapshot_seconds * 1000:.1f} ms "
+              f"(slowest devStatus round trip {max(rtts) * 1000:.1f} ms), {len(snapshot.missing)} missing, "
+              f"{size} bytes saved")
+
+        for emulated in emulator.emulated:
+            emulated.state = {"onOff": 1, "brightness": 100, "color": {"r": 255, "g": 255, "b": 255}, "colorTemInKelvin": 0}
+
+        report = restore_snapshot(snapshot, devices, verify=verify, timeout=0.5)
+        time.sleep(0.2)
+        pacing = report["packets"] / LAN_RESTORE_RATE
+        print(f"♻️  {label}: restored {report['devices']} devices with {report['packets']} packets in "
+              f"{report['seconds'] * 1000:.1f} ms (pacing alone {pacing * 1000:.1f} ms at {LAN_RESTORE_RATE:g}/s"
+              f"{', incl. verify' if verify else ''}); {restored(emulator, expected)}/{count} back to their snapshot state"
+              + (f", {len(report['mismatched'])} still mismatched, {len(report['unverified'])} unverified" if verify else ""))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with tempfile.TemporaryDirectory(prefix="govee-snapshot-") as workdir:
+        run(count, 0.0, verify=False, workdir=workdir)
+        run(count, 0.05, verify=False, workdir=workdir)
+        run(count, 0.05, verify=True, workdir=workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# scripts/benchmark_frida_log_reader.py
+
+# ==============================================================================
+# Govee LAN API Plus – Frida Log Reader Benchmark
+# -----------------------------------------------
+#
+# Description:
+# Builds a large synthetic Frida MQTT log (200 MB by default) and compares the
+# original full `readlines()` + reverse regex scan with the incremental
+# FridaLogReader, both for finding the latest message and for picking up a
+# message appended after the log was last read.
+#
+# Usage: python3 scripts/benchmark_frida_log_reader.py [size_mb]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import re
+import sys
+import json
+import time
+import tempfile
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.frida_log_reader import FridaLogReader
+
+
+def synthetic_event(i: int) -> str:
+    msg = {
+        "msg": {
+            "accountTopic": "GA/0123456789abcdef",
+            "cmd": "ptReal" if i % 4 == 0 else "status",
+            "data": {"command": ["owABAAAAAAAAAAAAAAAAAAAAAAAAALM="] * 8, "write": True},
+            "transaction": f"v_{i}",
+            "type": 1,
+        }
+    }
+    return f"[MQTT] Publishing (MqttMessage) to topic: GD/{i % 32:08x}\nMessage: {json.dumps(msg)}\n"
+
+
+def full_scan_latest(path: str):
+    """The original approach: read every line, scan backwards with a regex + json.loads."""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    for line in reversed(lines):
+        match = re.search(r'Message: (.+)$', line)
+        if match:
+            try:
+                entry = json.loads(match.group(1))
+            except Exception:
+                continue
+            msg = entry.get("msg", {})
+            if all(k in msg for k in ["accountTopic", "cmd", "data", "transaction", "type"]):
+                return msg
+    return None
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "frida_govee_mqtt_output.log")
+        print(f"🏗  Writing {size_mb} MB synthetic log...")
+        with open(path, "w", encoding="utf-8") as f:
+            i = 0
+            while f.tell() < size_mb * 1024 * 1024:
+                f.write("".join(synthetic_event(i + j) for j in range(1000)))
+                i += 1000
+
+        reader = FridaLogReader(path)
+        _, initial = timed(reader.read_new_entries)
+
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(synthetic_event(4 * i))
+
+        full, full_time = timed(lambda: full_scan_latest(path))
+        latest, latest_time = timed(lambda: FridaLogReader(path).latest_entry())
+        new, incremental_time = timed(reader.read_new_entries)
+        assert full == latest.msg == new[-1].msg
+
+        print(f"📊 {size_mb} MB log, {i} events")
+        print(f"  full readlines + reverse scan:      {full_time * 1000:10.2f} ms")
+        print(f"  tail-seek latest_entry():           {latest_time * 1000:10.2f} ms")
+        print(f"  incremental read_new_entries():     {incremental_time * 1000:10.2f} ms (one appended event)")
+        print(f"  initial incremental read (one-off): {initial * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# scripts/benchmark_frida_log_writer.py
+
+# ==============================================================================
+# Govee LAN API Plus – Frida Log Writer Benchmark
+# -----------------------------------------------
+#
+# Description:
+# Compares the previous per-event log write (open → write → flush → fsync for
+# every message) with BufferedLogWriter. Reports how many events/sec the
+# Frida message callback can hand off, and the end-to-end rate until
+# everything is durably on disk.
+#
+# Usage: python3 scripts/benchmark_frida_log_writer.py [events]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import time
+import tempfile
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.frida_log_writer import BufferedLogWriter
+from scripts.benchmark_frida_mqtt_stream import fake_frida_payload
+
+
+def per_event_write(log_path: str, event_data: str) -> None:
+    """The observer's previous log_mqtt_event: reopen, write, flush and fsync every event."""
+    with open(log_path, "a", encoding="utf-8") as log_file:
+        log_file.write(event_data)
+        log_file.flush()
+        os.fsync(log_file.fileno())
+
+
+def bench_per_event(events: list, log_path: str) -> float:
+    start = time.perf_counter()
+    for event in events:
+        per_event_write(log_path, event)
+    return time.perf_counter() - start
+
+
+def bench_buffered(events: list, log_path: str, fsync: bool):
+    writer = BufferedLogWriter(log_path, queue_size=len(events) + 1, fsync=fsync)
+    writer.start()
+    start = time.perf_counter()
+    for event in events:
+        writer.write(event)
+    handoff = time.perf_counter() - start
+    writer.close()
+    total = time.perf_counter() - start
+    return handoff, total, writer
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    events = [fake_frida_payload(i) + "\n" for i in range(count)]
+    print(f"📊 Writing {count} Frida MQTT events")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        elapsed = bench_per_event(events, os.path.join(tmp, "per_event.log"))
+        print(f"  per-event fsync      {count / elapsed:12,.0f} events/s (callback blocked for all of it)")
+
+        for fsync in (True, False):
+            handoff, total, writer = bench_buffered(events, os.path.join(tmp, f"buffered_{fsync}.log"), fsync)
+            label = "buffered (fsync)" if fsync else "buffered (no fsync)"
+            print(
+                f"  {label:<20} {count / handoff:12,.0f} events/s handed off, "
+                f"{count / total:10,.0f} events/s on disk ({writer.flushes} flushes, {writer.dropped} dropped)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# scripts/benchmark_frida_mqtt_stream.py
+
+# ==============================================================================
+# Govee LAN API Plus – Frida MQTT Stream Benchmark
+# ------------------------------------------------
+#
+# Description:
+# Uses a fake Frida message producer to compare capture-to-extractor latency of
+# the streaming pipeline (parse → local UDP → listener queue) with the log
+# file pipeline (fsync'd log write → watchdog event → 0.25s settle delay →
+# log parse).
+#
+# Usage: python3 scripts/benchmark_frida_mqtt_stream.py [messages]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import json
+import time
+import queue
+import tempfile
+import statistics
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from watchdog.observers import Observer
+
+from scripts.frida_mqtt_stream import UdpMqttStream, MqttStreamListener, parse_frida_payload
+from scripts.frida_log_reader import FridaLogReader, is_scene_message
+from scripts.log_monitor import LogChangeHandler
+
+BENCHMARK_STREAM_ADDRESS = ("127.0.0.1", 27099)
+
+
+def fake_frida_payload(i: int) -> str:
+    msg = {
+        "msg": {
+            "accountTopic": "GA/0123456789abcdef",
+            "cmd": "ptReal",
+            "data": {"command": ["owABAAAAAAAAAAAAAAAAAAAAAAAAALM="] * 8, "write": True},
+            "transaction": f"v_{i}",
+            "type": 1,
+        }
+    }
+    return f"[MQTT] Publishing (MqttMessage) to topic: GD/00000001\nMessage: {json.dumps(msg)}"
+
+
+def bench_stream(messages: int) -> list:
+    listener = MqttStreamListener(BENCHMARK_STREAM_ADDRESS)
+    stream = UdpMqttStream(BENCHMARK_STREAM_ADDRESS)
+    latencies = []
+    for i in range(messages):
+        start = time.perf_counter()
+        stream.publish(parse_frida_payload(fake_frida_payload(i)))
+        _, entry = listener.queue.get(timeout=1)
+        assert is_scene_message(entry.msg)
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.01)
+    stream.close()
+    listener.close()
+    return latencies
+
+
+def bench_log(messages: int) -> list:
+    latencies = []
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "frida_govee_mqtt_output.log")
+        open(log_path, "w").close()
+        reader = FridaLogReader(log_path)
+        arrivals = queue.Queue()
+
+        def on_detected():
+            time.sleep(0.25)  # Settle delay used by log_monitor
+            for entry in reader.read_new_entries():
+                if is_scene_message(entry.msg):
+                    arrivals.put(entry)
+
+        observer = Observer()
+        observer.schedule(LogChangeHandler(log_path, on_detected), path=tmp, recursive=False)
+        observer.start()
+        time.sleep(0.2)
+
+        for i in range(messages):
+            start = time.perf_counter()
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(fake_frida_payload(i) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            arrivals.get(timeout=5)
+            latencies.append(time.perf_counter() - start)
+
+        observer.stop()
+        observer.join()
+    return latencies
+
+
+def summarize(label: str, latencies: list) -> None:
+    ms = [l * 1000 for l in latencies]
+    print(f"{label:<16} median {statistics.median(ms):9.3f} ms, max {max(ms):9.3f} ms")
+
+
+def main():
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"📊 Capture-to-extractor latency over {messages} fake Frida messages")
+    summarize("  log + watchdog", bench_log(messages))
+    summarize("  stream", bench_stream(messages))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# scripts/benchmark_lan_redundancy.py
+
+# ==============================================================================
+# Govee LAN API Plus – Redundant Send Benchmark
+# ---------------------------------------------
+#
+# Description:
+# Sends a stream of distinct color commands to emulated devices that randomly
+# drop incoming packets, and compares delivery and extra bytes sent for a
+# single copy, a fixed number of copies and an adaptive policy.
+#
+# Usage: python3 scripts/benchmark_lan_redundancy.py [drop_rate] [commands_per_device]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import time
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.lan.redundant_send import RedundancyPolicy, RedundantSender
+from api.lan.set_device_color import build_color_payload
+from scripts.lan_device_emulator import GoveeLanEmulator
+
+DEVICE_COUNT = 5
+
+
+def run(label: str, policy: RedundancyPolicy, drop_rate: float, commands: int) -> None:
+    with GoveeLanEmulator(DEVICE_COUNT, drop_rate=drop_rate) as emulator:
+        with RedundantSender(default_policy=policy, probe_every=5, probe_timeout=0.2) as sender:
+            sender.set_policy(policy, emulator.devices)
+            for i in range(commands):
+                for device in emulator.devices:
+                    sender.send(build_color_payload({"r": i % 256, "g": i // 256, "b": 0}), device)
+                time.sleep(0.01)
+            stats = sender.stats()
+        time.sleep(0.2)
+
+        delivered = 0
+        for e in emulator.emulated:
+            colors = {
+                (m["msg"]["data"]["color"]["r"], m["msg"]["data"]["color"]["g"])
+                for _, m in e.received if m["msg"]["cmd"] == "colorwc"
+            }
+            delivered += len(colors)
+
+    total = commands * DEVICE_COUNT
+    overhead = stats["extra_bytes_sent"] / max(1, stats["bytes_sent"] - stats["extra_bytes_sent"])
+    print(
+        f"{label:<14} delivered {delivered}/{total} ({delivered / total:.1%}), "
+        f"extra bytes {stats['extra_bytes_sent']} (+{overhead:.0%}), "
+        f"probes confirmed {stats['probes_confirmed']}/{stats['probes_sent']}"
+    )
+
+
+def main():
+    drop_rate = float(sys.argv[1]) if len(sys.argv) > 1 else 0.2
+    commands = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    print(f"📊 {DEVICE_COUNT} emulated devices dropping {drop_rate:.0%} of packets, {commands} commands each")
+    run("K=1", RedundancyPolicy(copies=1), drop_rate, commands)
+    run("K=3", RedundancyPolicy(copies=3), drop_rate, commands)
+    run("adaptive", RedundancyPolicy(copies=1, adaptive=True, max_copies=5), drop_rate, commands)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# scripts/benchmark_metrics_overhead.py
+
+# ==============================================================================
+# Govee LAN API Plus – Metrics Overhead Benchmark
+# -----------------------------------------------
+#
+# Description:
+# Measures what the metrics cost on the LAN send hot path:
+# - The per-packet cost of timing a send and calling `record_lan_send`,
+#   compared with updating the counters and histogram directly.
+# - The cost of folding buffered packets into the metrics (off the hot path).
+# - Raw `sendto` throughput to emulated devices with and without recording.
+# Then queries the emulated devices' status and scrapes the Prometheus
+# endpoint once to check the exported metrics end to end.
+#
+# Usage: python3 scripts/benchmark_metrics_overhead.py [packets]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import json
+import time
+import socket
+import urllib.request
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.metrics import (
+    LAN_BYTES_SENT,
+    LAN_PACKETS_SENT,
+    LAN_SEND_SECONDS,
+    REGISTRY,
+    fold_lan_sends,
+    record_lan_send,
+    start_metrics_server
+)
+from api.lan.get_device_status import get_devices_status
+from api.lan.set_device_color import build_color_payload
+from scripts.lan_device_emulator import GoveeLanEmulator
+
+DEVICE_COUNT = 5
+
+
+def per_packet_ns(body, packets: int, repeat: int = 5) -> float:
+    """Best of `repeat` runs, in nanoseconds per packet."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body(packets)
+        best = min(best, time.perf_counter() - start)
+        fold_lan_sends()
+    return best / packets * 1e9
+
+
+def bare(packets: int) -> None:
+    ip = "127.0.0.2"
+    for _ in range(packets):
+        pass
+
+
+def timed(packets: int) -> None:
+    perf_counter = time.perf_counter
+    for _ in range(packets):
+        started = perf_counter()
+        elapsed = perf_counter() - started
+
+
+def recorded(packets: int) -> None:
+    ip = "127.0.0.2"
+    perf_counter = time.perf_counter
+    for _ in range(packets):
+        started = perf_counter()
+        record_lan_send(ip, 120, perf_counter() - started)
+
+
+def direct(packets: int) -> None:
+    """Updating the metrics in place on every packet, for comparison."""
+    ip = "127.0.0.2"
+    perf_counter = time.perf_counter
+    for _ in range(packets):
+        started = perf_counter()
+        elapsed = perf_counter() - started
+        LAN_PACKETS_SENT.inc(1, ip)
+        LAN_BYTES_SENT.inc(120, ip)
+        LAN_SEND_SECONDS.observe(elapsed)
+
+
+def send_loop(sock, messages, record: bool) -> float:
+    perf_counter = time.perf_counter
+    start = perf_counter()
+    for message, address in messages:
+        started = perf_counter()
+        sock.sendto(message, address)
+        if record:
+            record_lan_send(address[0], len(message), perf_counter() - started)
+    return (perf_counter() - start) / len(messages) * 1e9
+
+
+def main():
+    packets = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    baseline = per_packet_ns(bare, packets)
+    timing = per_packet_ns(timed, packets) - baseline
+    hot = per_packet_ns(recorded, packets) - baseline
+    recorded(packets)
+    start = time.perf_counter()
+    fold_lan_sends()
+    fold = (time.perf_counter() - start) / packets * 1e9
+    inline = per_packet_ns(direct, packets) - baseline
+    REGISTRY.reset()
+
+    print(f"📊 Metrics overhead per LAN packet ({packets:,} packets)")
+    print(f"  timing the send (2x perf_counter)     {timing:>7.0f} ns")
+    print(f"  timing + record_lan_send (hot path)   {hot:>7.0f} ns")
+    print(f"  folding into metrics (off hot path)   {fold:>7.0f} ns")
+    print(f"  timing + direct counter/histogram     {inline:>7.0f} ns")
+
+    with GoveeLanEmulator(DEVICE_COUNT) as emulator:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        message = json.dumps(build_color_payload({"r": 255, "g": 0, "b": 0})).encode("utf-8")
+        messages = [(message, (d.ip, d.port)) for d in emulator.devices] * (20000 // DEVICE_COUNT)
+        send_loop(sock, messages, record=False)  # warm up
+        runs = {False: [], True: []}
+        for _ in range(5):  # Interleaved so both see the same system noise
+            for record in (False, True):
+                runs[record].append(send_loop(sock, messages, record))
+        plain, instrumented = min(runs[False]), min(runs[True])
+        sock.close()
+        print(f"  sendto to emulated devices            {plain:>7.0f} ns/packet plain, "
+              f"{instrumented:>7.0f} ns/packet recorded ({instrumented / plain - 1:+.1%})")
+
+        REGISTRY.reset()
+        replies = get_devices_status(emulator.devices, timeout=1)
+        print(f"  devStatus replies                     {len(replies)}/{DEVICE_COUNT}")
+
+    server = start_metrics_server(port=0)
+    try:
+        url = f"http://{server.server_address[0]}:{server.server_address[1]}/metrics"
+        body = urllib.request.urlopen(url, timeout=2).read().decode("utf-8")
+    finally:
+        server.shutdown()
+    rtt_lines = [line for line in body.splitlines() if line.startswith("govee_lan_dev_status_rtt_seconds_count")]
+    print(f"  scraped {url}: {len(body.splitlines())} lines, {rtt_lines[0] if rtt_lines else 'no devStatus RTT'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# scripts/benchmark_model_memory.py
+
+# ==============================================================================
+# Govee LAN API Plus – Model Memory Benchmark
+# -------------------------------------------
+#
+# Description:
+# Builds synthetic scene libraries the way the generated factories do (devices
+# with SimpleNamespace `scenes` and `mqtt_diy_scenes`, shared DIY scenes
+# captured per device) and measures their size with tracemalloc, comparing
+# the previous __dict__-based models with the current slot-based ones. Sizes
+# are measured after every scene's `command` has been read and validated (as
+# a factory load does), and again after the library is deleted, to show what
+# stays cached.
+#
+# Each device has 50 DIY scenes; devices are spread over 10 SKUs and a scene's
+# captured payload is identical for every device of the same SKU.
+#
+# Also times the send path (`build_mqtt_diy_scene_payload` + JSON encoding)
+# for a plain list, for a packed scene whose base64 is re-encoded on every
+# read, and for a packed scene reading its cached strings.
+#
+# Usage: python3 scripts/benchmark_model_memory.py [scene counts...]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import json
+import time
+import gc
+import base64
+import random
+import tracemalloc
+from types import SimpleNamespace
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.govee_device import GoveeDevice
+from models.govee_diy_scene import GoveeDIYScene
+from api.lan.ptreal_codec import validate_scene_commands
+from api.lan.set_device_mqtt_diy_scene import build_mqtt_diy_scene_payload
+from models.govee_mqtt_diy_scene import GoveeMqttDiyScene, frame_strings
+
+SCENES_PER_DEVICE = 50
+SKUS = 10
+FRAMES_PER_SCENE = 12
+
+
+# --- The models as they were before __slots__ and packed commands ---
+
+class DictGoveeDevice:
+    def __init__(self, device_id, name, sku, ip=""):
+        self.id = device_id
+        self.name = name
+        self.sku = sku
+        self.online = False
+        self.power_state = "off"
+        self.brightness = 0
+        self.color = {"r": 0, "g": 0, "b": 0}
+        self.color_temp_in_kelvin = None
+        self.ip = ip
+        self.port = 4003
+
+
+class DictGoveeDIYScene:
+    def __init__(self, value, name):
+        self.value = int(value)
+        self.name = name
+        self.devices = []
+
+
+class DictGoveeMqttDiyScene:
+    def __init__(self, accountTopic, cmd, transaction, type, write, command):
+        self.accountTopic = accountTopic
+        self.cmd = cmd
+        self.transaction = transaction
+        self.type = type
+        self.write = write
+        self.command = command
+
+
+def synthetic_payloads() -> dict:
+    """Base64 frames per (sku, scene index), decoded from fresh strings like a parsed factory would be."""
+    rng = random.Random(42)
+    return {
+        (sku, index): [
+            base64.b64encode(bytes([0xa3, i] + [rng.randrange(256) for _ in range(18)])).decode()
+            for i in range(FRAMES_PER_SCENE)
+        ]
+        for sku in range(SKUS) for index in range(SCENES_PER_DEVICE)
+    }
+
+
+def build_library(scene_count: int, payloads: dict, device_cls, scene_cls, mqtt_scene_cls) -> list:
+    devices = []
+    for d in range(max(1, scene_count // SCENES_PER_DEVICE)):
+        sku = d % SKUS
+        device = device_cls(f"AA:BB:CC:DD:{d // 256:02X}:{d % 256:02X}:00:01", f"Device {d}", f"H60{sku:02d}", ip=f"10.0.{d // 256}.{d % 256}")
+        scenes = {}
+        mqtt_scenes = {}
+        for index in range(SCENES_PER_DEVICE):
+            value = 1000 + index
+            scenes[f"device_{d}_scene_{index}_{value}"] = scene_cls(value, f"Scene {index}")
+            # Each capture produces its own list of strings (as parsing/loading a factory does)
+            command = [str(frame + "") for frame in payloads[(sku, index)]]
+            mqtt_scenes[f"device_{d}_scene_{index}_{value}"] = mqtt_scene_cls(
+                "GA/0123456789abcdef", "ptReal", f"v_{d}_{index}", 1, "true", command
+            )
+        device.scenes = SimpleNamespace(**scenes)
+        device.mqtt_diy_scenes = SimpleNamespace(**mqtt_scenes)
+        devices.append(device)
+    return devices
+
+
+def read_commands(library: list) -> None:
+    """Read every scene's command, then validate them all, as loading a factory does."""
+    scenes = {name: scene for device in library for name, scene in vars(device.mqtt_diy_scenes).items()}
+    for scene in scenes.values():
+        scene.command
+    validate_scene_commands(scenes)
+
+
+def measure(scene_count: int, payloads: dict, device_cls, scene_cls, mqtt_scene_cls) -> tuple:
+    """Return (bytes held by the library after its commands were read, bytes still held once it is deleted)."""
+    gc.collect()
+    tracemalloc.start()
+    library = build_library(scene_count, payloads, device_cls, scene_cls, mqtt_scene_cls)
+    read_commands(library)
+    gc.collect()
+    loaded, _ = tracemalloc.get_traced_memory()
+    del library
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return loaded, retained
+
+
+def per_call_us(fn, calls: int = 20000) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def send_path_cost(payloads: dict) -> None:
+    command = payloads[(0, 0)]
+    device = GoveeDevice("AA:BB:CC:DD:00:00:00:01", "Device 0", "H6000", ip="10.0.0.1")
+    plain = DictGoveeMqttDiyScene("GA/0123456789abcdef", "ptReal", "v_0", 1, "true", list(command))
+    packed = GoveeMqttDiyScene("GA/0123456789abcdef", "ptReal", "v_0", 1, "true", list(command))
+    buffer = packed.command_frames
+
+    def send(scene):
+        return lambda: json.dumps(build_mqtt_diy_scene_payload(device, scene))
+
+    reencode = per_call_us(lambda: frame_strings(buffer))
+    print(f"📨 Send path for a {FRAMES_PER_SCENE}-frame scene (payload dict + JSON), per call:")
+    print(f"  plain list {per_call_us(send(plain)):.1f} µs, packed + cached strings {per_call_us(send(packed)):.1f} µs, "
+          f"re-encoding the base64 on every read would add {reencode:.1f} µs")
+
+
+def main():
+    counts = [int(c) for c in sys.argv[1:]] or [1000, 10000, 50000]
+    payloads = synthetic_payloads()
+    validate_scene_commands({})  # Import-time allocations stay out of the measurements
+    print("📊 Traced memory of synthetic scene libraries, after reading every command (retained once deleted)")
+    print(f"  {'scenes':>8}  {'__dict__ models':>22}  {'slot models':>22}  {'saved':>7}")
+    for count in counts:
+        before, before_retained = measure(count, payloads, DictGoveeDevice, DictGoveeDIYScene, DictGoveeMqttDiyScene)
+        after, after_retained = measure(count, payloads, GoveeDevice, GoveeDIYScene, GoveeMqttDiyScene)
+        print(f"  {count:>8,}  {before / 1e6:>8.1f} MB ({before_retained / 1e6:>5.1f} MB)  "
+              f"{after / 1e6:>8.1f} MB ({after_retained / 1e6:>5.1f} MB)  {1 - after / before:>6.0%}")
+    send_path_cost(payloads)
+
+
+if __name__ == "__main__":
+    main()
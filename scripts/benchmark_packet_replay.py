@@ -0,0 +1,165 @@
+# scripts/benchmark_packet_replay.py
+
+# ==============================================================================
+# Govee LAN API Plus – Packet Capture & Replay Benchmark
+# ------------------------------------------------------
+#
+# Description:
+# Records a show played against one set of emulated devices, replays the
+# capture against a second set on other IPs (at 1x and 2x speed), and compares
+# the replay with the recording:
+# - On the wire: the replay is captured too, and each re-sent packet's offset
+#   from the first packet (and gap from the previous one) is compared with the
+#   recorded offset divided by the speed. Payloads must be byte-identical.
+# - At the devices: the same comparison on each emulated device's arrival
+#   times, and the messages each device received must match the recording.
+# Each run's own jitter report is printed alongside: the emulated devices run
+# in this process, so their threads compete with the player for the GIL and
+# the replay can only be as faithful as the player is on time.
+# Also reports the per-packet cost of the capture tap, idle and recording,
+# and checks the pcap export.
+#
+# Usage: python3 scripts/benchmark_packet_replay.py [cues]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import time
+import random
+import struct
+import tempfile
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.lan.packet_capture import PacketRecorder, capture_lan_send, read_capture, write_pcap
+from api.lan.set_device_brightness import build_brightness_payload
+from api.lan.set_device_color import build_color_payload
+from scripts.lan_device_emulator import GoveeLanEmulator
+from show.show_player import ShowPlayer
+from show.show_replay import capture_cues, remap_to_targets
+from show.show_timeline import ShowCue
+
+DEVICE_COUNT = 4
+
+
+def build_show(devices, cue_count: int) -> list:
+    """Irregular gaps (bursts and pauses) across several devices."""
+    rng = random.Random(11)
+    cues, at = [], 0.0
+    for i in range(cue_count):
+        at += rng.choice((0.0, 0.002, 0.005, 0.01, 0.02, 0.05))
+        device = devices[i % len(devices)]
+        if i % 3:
+            payload = build_color_payload({"r": rng.randrange(256), "g": rng.randrange(256), "b": rng.randrange(256)})
+        else:
+            payload = build_brightness_payload(rng.randrange(1, 101))
+        cues.append(ShowCue(at, device, payload, label=f"cue {i}"))
+    return cues
+
+
+def arrivals(emulator) -> list:
+    """Per emulated device, in device order: [(arrival time, message), ...]."""
+    return [list(d.received) for d in emulator.emulated]
+
+
+def percentiles(values) -> str:
+    values = sorted(abs(v) for v in values)
+    pick = lambda q: values[min(len(values) - 1, int(q * len(values)))] * 1000
+    return f"p50 {pick(0.5):6.3f} ms  p99 {pick(0.99):6.3f} ms  max {values[-1] * 1000:6.3f} ms"
+
+
+def timing_errors(recorded: list, replayed: list, speed: float):
+    """Offset-from-first and gap errors of `replayed` times against `recorded` times scaled by `speed`."""
+    r0, p0 = recorded[0], replayed[0]
+    offsets = [(p - p0) - (r - r0) / speed for r, p in zip(recorded, replayed)]
+    gaps = [(replayed[i] - replayed[i - 1]) - (recorded[i] - recorded[i - 1]) / speed for i in range(1, len(recorded))]
+    return offsets, gaps
+
+
+def compare_sends(packets, replayed_packets, speed: float) -> None:
+    offsets, gaps = timing_errors([p.at for p in packets], [p.at for p in replayed_packets], speed)
+    identical = sum(a.data == b.data for a, b in zip(packets, replayed_packets))
+    print(f"  {speed:.1f}x  sent     offset {percentiles(offsets)}   gap {percentiles(gaps)}")
+    print(f"        {len(replayed_packets)}/{len(packets)} packets re-sent, {identical} byte-identical")
+
+
+def compare_arrivals(recorded: list, replayed: list, speed: float) -> None:
+    offsets, gaps, identical, total = [], [], 0, 0
+    for before, after in zip(recorded, replayed):
+        if len(before) != len(after):
+            print(f"  ⚠️  {len(after)}/{len(before)} packets arrived at one device")
+            return
+        device_offsets, device_gaps = timing_errors([t for t, _ in before], [t for t, _ in after], speed)
+        offsets += device_offsets
+        gaps += device_gaps
+        identical += sum(a == b for (_, a), (_, b) in zip(before, after))
+        total += len(before)
+    print(f"        arrived  offset {percentiles(offsets)}   gap {percentiles(gaps)}")
+    print(f"        {identical}/{total} arrivals match the recording per device")
+
+
+def tap_cost(packets: int) -> float:
+    address, data = ("127.0.0.2", 4003), b"x" * 120
+    start = time.perf_counter()
+    for _ in range(packets):
+        capture_lan_send(address, data)
+    return (time.perf_counter() - start) / packets * 1e9
+
+
+def main():
+    cue_count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    with tempfile.TemporaryDirectory(prefix="govee-replay-") as workdir:
+        run(workdir, cue_count)
+
+
+def run(workdir: str, cue_count: int) -> None:
+    capture_path = os.path.join(workdir, "show.glpc")
+
+    idle = tap_cost(200000)
+    with PacketRecorder(os.path.join(workdir, "tap.glpc")):
+        recording = tap_cost(200000)
+    print(f"📊 capture_lan_send: {idle:.0f} ns/packet idle, {recording:.0f} ns/packet while recording")
+
+    with GoveeLanEmulator(DEVICE_COUNT) as original:
+        cues = build_show(original.devices, cue_count)
+        player = ShowPlayer(cues, show_path=os.path.join(workdir, "show.json"), show_name="replay benchmark")
+        with PacketRecorder(capture_path):
+            jitter = player.play(start_at=time.monotonic() + 0.2)["jitter_ms"]
+        player.close()
+        time.sleep(0.2)
+        recorded = arrivals(original)
+
+    started_at, packets = read_capture(capture_path)
+    size = os.path.getsize(capture_path)
+    print(f"📼 {len(packets)} packets over {packets[-1].at - packets[0].at:.3f} s, "
+          f"{size} bytes on disk ({size / len(packets):.1f} per packet incl. payload)")
+    print(f"   recording run's own jitter: p50 {jitter['p50']:.3f} ms, p99 {jitter['p99']:.3f} ms")
+
+    pcap_path = os.path.join(workdir, "show.pcap")
+    write_pcap(packets, started_at, pcap_path)
+    with open(pcap_path, "rb") as f:
+        magic, = struct.unpack("<I", f.read(4))
+    print(f"🦈 pcap export: {os.path.getsize(pcap_path)} bytes, magic {magic:#x}")
+
+    print(f"🔁 Replay against {DEVICE_COUNT} remapped devices, compared with the recording")
+    for speed in (1.0, 2.0):
+        replay_path = os.path.join(workdir, f"replay-{speed}.glpc")
+        with GoveeLanEmulator(DEVICE_COUNT, first_host=20) as target:
+            remap = remap_to_targets(packets, [d.ip for d in target.devices])
+            player = ShowPlayer(capture_cues(packets, speed=speed, remap=remap),
+                                show_path=os.path.join(workdir, f"replay-{speed}.json"))
+            with PacketRecorder(replay_path):
+                jitter = player.play(start_at=time.monotonic() + 0.2)["jitter_ms"]
+            player.close()
+            time.sleep(0.2)
+            compare_sends(packets, read_capture(replay_path)[1], speed)
+            compare_arrivals(recorded, arrivals(target), speed)
+            print(f"        replay run's own jitter: p50 {jitter['p50']:.3f} ms, p99 {jitter['p99']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# scripts/benchmark_scene_factory_journal.py
+
+# ==============================================================================
+# Govee LAN API Plus – Scene Factory Journal Benchmark
+# ----------------------------------------------------
+#
+# Description:
+# Captures N fake scenes into throwaway factories and compares the latency of
+# the last capture when every capture rewrites both factories (the previous
+# behavior) with journaling each capture and compacting once at the end.
+#
+# Usage: python3 scripts/benchmark_scene_factory_journal.py [captures]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import statistics
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import scripts.frida_govee_mqtt_extractor as extractor
+from scripts.scene_factory_journal import SceneFactoryJournal
+from models.mqtt_payload_store import MqttPayloadStore, use_payload_store
+from models.govee_device import GoveeDevice
+from models.govee_diy_scene import GoveeDIYScene
+
+DEVICE_FACTORY_HEADER = """from types import SimpleNamespace
+from models.govee_device import GoveeDevice
+from factories.device_mqtt_diy_scene_factory import *
+
+benchmark_lamp = GoveeDevice(device_id='AA:BB:CC:DD:EE:FF:00:01', name='Benchmark Lamp', sku='H6008')
+
+all_devices = [benchmark_lamp]
+"""
+
+
+def fake_cmd(i: int) -> dict:
+    return {
+        "accountTopic": "GA/0123456789abcdef",
+        "cmd": "ptReal",
+        "transaction": f"v_{i}",
+        "type": 1,
+        "write": True,
+        "command": ["owABAAAAAAAAAAAAAAAAAAAAAAAAALM="] * 12,
+    }
+
+
+def use_temp_factories(tmp: str) -> None:
+    extractor.DEVICE_FACTORY_FILE_PATH = os.path.join(tmp, "device_factory.py")
+    extractor.DEVICE_MQTT_DIY_SCENE_FACTORY_FILE_PATH = os.path.join(tmp, "device_mqtt_diy_scene_factory.py")
+    with open(extractor.DEVICE_FACTORY_FILE_PATH, "w", encoding="utf-8") as f:
+        f.write(DEVICE_FACTORY_HEADER)
+    shutil.copy(extractor.DEVICE_MQTT_DIY_SCENE_FACTORY_TEMPLATE_FILE_PATH, extractor.DEVICE_MQTT_DIY_SCENE_FACTORY_FILE_PATH)
+    store_path = os.path.join(tmp, "mqtt_payload_store.json")
+    if os.path.exists(store_path):
+        os.remove(store_path)
+    use_payload_store(MqttPayloadStore(store_path))
+
+
+def bench_rewrite(captures: int, device: GoveeDevice) -> list:
+    latencies = []
+    for i in range(captures):
+        scene = GoveeDIYScene(value=i, name=f"Scene {i}")
+        var_name = extractor.make_var_name(device, scene)
+        start = time.perf_counter()
+        extractor.append_new_commands(var_name, fake_cmd(i), device, scene)
+        extractor.append_mqtt_scene_to_device_factory(var_name, device)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def bench_journal(captures: int, device: GoveeDevice, journal_path: str):
+    journal = SceneFactoryJournal(journal_path, compact_every=0)
+    latencies = []
+    for i in range(captures):
+        scene = GoveeDIYScene(value=i, name=f"Scene {i}")
+        start = time.perf_counter()
+        journal.record(extractor.make_var_name(device, scene), fake_cmd(i), extractor.sanitize_var_name(device.name))
+        latencies.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    journal.compact()
+    return latencies, time.perf_counter() - start
+
+
+def main():
+    captures = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    device = GoveeDevice(device_id="AA:BB:CC:DD:EE:FF:00:01", name="Benchmark Lamp", sku="H6008")
+    print(f"📊 Capturing {captures} scenes")
+
+    # The previous per-capture rewrite prints for every capture; keep the output readable
+    stdout = sys.stdout
+    with tempfile.TemporaryDirectory() as tmp:
+        use_temp_factories(tmp)
+        sys.stdout = open(os.devnull, "w")
+        try:
+            rewrite = bench_rewrite(captures, device)
+            use_temp_factories(tmp)
+            journal, compaction = bench_journal(captures, device, os.path.join(tmp, "journal.jsonl"))
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+
+    print(f"  rewrite factories   capture #{captures}: {rewrite[-1] * 1000:8.2f} ms   total {sum(rewrite):7.2f} s")
+    print(f"  journal             capture #{captures}: {journal[-1] * 1000:8.2f} ms   total {sum(journal):7.2f} s"
+          f"   (median {statistics.median(journal) * 1000:.2f} ms, compaction {compaction * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# scripts/benchmark_scene_search.py
+
+# ==============================================================================
+# Govee LAN API Plus – Scene Search Benchmark
+# -------------------------------------------
+#
+# Description:
+# Builds a synthetic scene library (devices with DIY scene and captured MQTT
+# scene namespaces, like the generated factories) and times SceneSearchIndex
+# lookups against a linear scan over every device's scenes, plus the cost of
+# building the index and of an incremental sync after one device changes.
+#
+# Usage: python3 scripts/benchmark_scene_search.py [scene count]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import time
+import random
+from types import SimpleNamespace
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.generate_device_and_scene_factories import sanitize_var_name
+from scripts.scene_search_index import SceneSearchIndex, normalize_name
+from models.govee_device import GoveeDevice
+from models.govee_diy_scene import GoveeDIYScene
+from models.govee_mqtt_diy_scene import GoveeMqttDiyScene
+
+SCENES_PER_DEVICE = 50
+SKUS = 10
+WORDS = [
+    "sunset", "sunrise", "ocean", "forest", "aurora", "candle", "fire", "ice", "neon", "party",
+    "disco", "rainbow", "lava", "galaxy", "storm", "breeze", "glow", "pulse", "wave", "dream",
+    "spring", "autumn", "winter", "summer", "midnight", "dawn", "ember", "frost", "jungle", "desert",
+]
+
+
+def build_devices(scene_count: int) -> list:
+    rng = random.Random(7)
+    library = [
+        (" ".join(rng.sample(WORDS, rng.choice((1, 2, 3)))).title() + f" {i}", 10000 + i)
+        for i in range(scene_count)
+    ]
+    devices = []
+    for d in range(max(1, scene_count // SCENES_PER_DEVICE)):
+        device = GoveeDevice(f"AA:BB:CC:DD:{d // 256:02X}:{d % 256:02X}:00:01", f"Device {d}", f"H60{d % SKUS:02d}")
+        device_var = sanitize_var_name(device.name)
+        scenes, mqtt_scenes = {}, {}
+        for name, value in library[d * SCENES_PER_DEVICE:(d + 1) * SCENES_PER_DEVICE]:
+            scenes[f"{sanitize_var_name(name)}_{value}"] = GoveeDIYScene(value, name)
+            mqtt_scenes[f"{device_var}_{sanitize_var_name(name)}_{value}"] = GoveeMqttDiyScene(
+                "GA/0123456789abcdef", "ptReal", f"v_{d}", 1, "true", []
+            )
+        device.scenes = SimpleNamespace(**scenes)
+        device.mqtt_diy_scenes = SimpleNamespace(**mqtt_scenes)
+        devices.append(device)
+    return devices
+
+
+def linear_search(devices: list, query: str) -> list:
+    """What a picker has to do without the index: scan every scene on every device."""
+    query = normalize_name(query)
+    return [
+        scene for device in devices for scene in vars(device.scenes).values()
+        if query in normalize_name(scene.name)
+    ]
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    scene_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    devices = build_devices(scene_count)
+    total = sum(len(vars(d.scenes)) + len(vars(d.mqtt_diy_scenes)) for d in devices)
+    print(f"📊 {len(devices)} devices, {total:,} indexed scenes (DIY + MQTT)")
+
+    index = SceneSearchIndex()
+    start = time.perf_counter()
+    index.build(devices)
+    print(f"  build                 {(time.perf_counter() - start) * 1000:>9.1f} ms")
+
+    start = time.perf_counter()
+    index.fuzzy("sunest glwo")
+    print(f"  first fuzzy lookup    {(time.perf_counter() - start) * 1000:>9.1f} ms (builds the trigram index)")
+
+    target = vars(devices[len(devices) // 2].scenes)
+    sample = list(target.values())[7]
+    lookups = {
+        "exact": lambda: index.exact(sample.name),
+        "prefix 'sunse'": lambda: index.prefix("sunse")[:20],
+        "fuzzy 'sunest glwo'": lambda: index.fuzzy("sunest glwo"),
+        "by value": lambda: index.by_value(sample.value),
+        "by sku": lambda: index.by_sku("H6003", kind="mqtt"),
+        "search (picker)": lambda: index.search("midnight fro", device_id=devices[0].id),
+        "linear scan": lambda: linear_search(devices, "midnight fro"),
+    }
+    for label, fn in lookups.items():
+        print(f"  {label:<21} {timed(fn, 20 if label == 'linear scan' else 200):>9.3f} ms")
+
+    # A capture adds one MQTT scene to one device; the next factory reload syncs everything
+    changed = devices[3]
+    extra = GoveeMqttDiyScene("GA/0123456789abcdef", "ptReal", "v_new", 1, "true", [])
+    setattr(changed.mqtt_diy_scenes, f"{sanitize_var_name(changed.name)}_new_scene_99999", extra)
+    start = time.perf_counter()
+    reindexed = index.sync_devices(devices)
+    print(f"  incremental sync      {(time.perf_counter() - start) * 1000:>9.1f} ms ({reindexed} device reindexed)")
+    assert index.exact("new scene", kind="mqtt")[0].scene is extra
+
+
+if __name__ == "__main__":
+    main()
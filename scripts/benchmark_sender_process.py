@@ -0,0 +1,110 @@
+# scripts/benchmark_sender_process.py
+
+# ==============================================================================
+# Govee LAN API Plus – Sender Process Benchmark
+# ---------------------------------------------
+#
+# Description:
+# Compares enqueue-to-wire latency of an in-process sender thread with the
+# isolated sender process (shared-memory ring buffer) while the main
+# interpreter is kept busy by CPU-bound Python threads, as it would be when
+# audio playback and automation logic share the process with the show.
+#
+# Usage: python3 scripts/benchmark_sender_process.py [load_threads] [cues]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import time
+import queue
+import socket
+import statistics
+import threading
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.lan.sender_process import CueSenderProcess
+
+SINK_ADDRESS = ("127.0.0.1", 40999)
+CUE_INTERVAL = 0.005
+
+
+def cpu_load(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(i * i for i in range(2000))
+
+
+def summarize(label: str, latencies: list) -> None:
+    ms = sorted(l * 1000 for l in latencies)
+    print(
+        f"{label:<16} n={len(ms)} median {statistics.median(ms):.3f} ms, "
+        f"p99 {ms[int(0.99 * (len(ms) - 1))]:.3f} ms, max {ms[-1]:.3f} ms"
+    )
+
+
+def run_in_process(packets, cues: int) -> list:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    work = queue.Queue()
+    latencies = []
+
+    def sender():
+        while True:
+            item = work.get()
+            if item is None:
+                return
+            cue_id, enqueued_at = item
+            message, address = packets[cue_id]
+            sock.sendto(message, address)
+            latencies.append(time.monotonic() - enqueued_at)
+
+    thread = threading.Thread(target=sender)
+    thread.start()
+    for i in range(cues):
+        work.put((i % len(packets), time.monotonic()))
+        time.sleep(CUE_INTERVAL)
+    work.put(None)
+    thread.join()
+    sock.close()
+    return latencies
+
+
+def run_sender_process(packets, cues: int) -> list:
+    with CueSenderProcess(packets) as sender:
+        time.sleep(0.2)  # Let the process start
+        for i in range(cues):
+            sender.enqueue(i % len(packets))
+            time.sleep(CUE_INTERVAL)
+    return sender.stats["latencies"]
+
+
+def main():
+    load_threads = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    cues = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(SINK_ADDRESS)
+    packets = [(b'{"msg":{"cmd":"turn","data":{"value":1}}}', SINK_ADDRESS)] * 16
+
+    for threads in sorted({0, load_threads}):
+        stop = threading.Event()
+        workers = [threading.Thread(target=cpu_load, args=(stop,)) for _ in range(threads)]
+        for w in workers:
+            w.start()
+
+        print(f"📊 {cues} cues with {threads} CPU-bound threads in the main interpreter")
+        summarize("  in-process", run_in_process(packets, cues))
+        summarize("  sender process", run_sender_process(packets, cues))
+
+        stop.set()
+        for w in workers:
+            w.join()
+
+    sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# scripts/benchmark_show_reload.py
+
+# ==============================================================================
+# Govee LAN API Plus – Show Hot Reload Benchmark
+# ----------------------------------------------
+#
+# Description:
+# Plays a 6-second show (a cue every 20 ms, round-robin over 8 emulated
+# devices) while another thread saves three edits to the show file, the way an
+# editor does (write a temp file, rename it over the original):
+# - each edit re-colors every cue, past and future, with its version number;
+# - the second one also moves every cue from 0.5 s after it on 5 ms later
+#   (a cue that has just fired and is moved later fires again, by design);
+# - each one adds a cue at 0 s, long past by then.
+#
+# Then checks, per cue, on what the emulated devices received:
+# - every cue arrived exactly once (no cue missed or fired twice around a
+#   swap), and the cue added in the past never fired;
+# - cues planned after a swap was picked up carried the new version.
+# Reports swap latency (file saved → swapped in → picked up by the player)
+# and the jitter of the cues around each swap.
+#
+# Also compares a reload with 10 changed cues against compiling the whole
+# show, for a 5000-cue show.
+#
+# Usage: python3 scripts/benchmark_show_reload.py
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.govee_device import GoveeDevice
+from scripts.lan_device_emulator import GoveeLanEmulator
+from show.show_mode import ShowMode
+from show.show_player import ShowPlayer
+from show.show_reload import ShowReloader
+from show.show_timeline import compile_show
+
+DEVICES = 8
+BEATS = 300
+INTERVAL = 0.02
+EDITS = (1.5, 3.0, 4.5)  # Show seconds at which each edit is saved
+SHIFT = 0.005  # The second edit moves every cue this much later
+PAST_COLOR = {"r": 1, "g": 2, "b": 3}
+
+
+def build_show(version: int, beats: int = BEATS) -> dict:
+    shift_from = EDITS[1] + 0.5 if version >= 2 else float("inf")
+    cues = [{"at": round(i * INTERVAL + (SHIFT if i * INTERVAL >= shift_from else 0.0), 4), "device": f"light_{i % DEVICES}",
+             "color": {"r": i & 255, "g": i >> 8, "b": version}} for i in range(beats)]
+    cues += [{"at": 0.0, "device": "light_0", "color": PAST_COLOR}] * version
+    return {"name": f"reload benchmark v{version}", "cues": cues}
+
+
+def save(path: str, show: dict) -> float:
+    """Save like an editor does; returns the perf_counter time the new file appeared."""
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(show, f)
+    os.replace(path + ".tmp", path)
+    return time.perf_counter()
+
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def playback_check(workdir: str) -> None:
+    path = os.path.join(workdir, "show.json")
+    save(path, build_show(0))
+
+    with GoveeLanEmulator(DEVICES, first_host=60) as emulator:
+        devices = {f"light_{i}": d for i, d in enumerate(emulator.devices)}
+        reloader = ShowReloader(path, devices, {})
+        player = ShowPlayer(reloader.cues, show_name="reload benchmark")
+        start_at = time.monotonic() + 0.5
+        offset = time.perf_counter() - time.monotonic()
+        saved = []
+
+        def editor():
+            for version, at in enumerate(EDITS, start=1):
+                time.sleep(max(0.0, start_at + at - time.monotonic()))
+                saved.append(save(path, build_show(version)))
+
+        reloader.start(player)
+        thread = threading.Thread(target=editor)
+        thread.start()
+        mode = ShowMode()
+        report = player.play(start_at=start_at, show_mode=mode)
+        thread.join()
+        reloader.stop()
+        player.close()
+        time.sleep(0.2)
+        received = [(t, m["msg"]["data"]["color"]) for d in emulator.emulated for t, m in d.received]
+
+    # Which beat each packet was, by its color
+    arrivals = {}
+    past_fired = 0
+    for arrived, color in received:
+        if color == PAST_COLOR:
+            past_fired += 1
+            continue
+        arrivals.setdefault(color["r"] + (color["g"] << 8), []).append((arrived, color["b"]))
+    missed = [i for i in range(BEATS) if i not in arrivals]
+    doubled = [i for i, a in arrivals.items() if len(a) > 1]
+
+    picked_up = [t for t, _ in player.swaps]
+    stale = 0
+    for i, packets in arrivals.items():
+        _, version = packets[0]
+        planned = start_at + offset + i * INTERVAL  # Within SHIFT of the true time, well clear of the 1 ms slack
+        expected = sum(1 for t in picked_up if t < planned - 0.001)
+        if version < expected:
+            stale += 1
+
+    print(f"🎬 {BEATS} cues over {BEATS * INTERVAL:.0f} s on {DEVICES} emulated devices, {len(EDITS)} edits saved mid-show:")
+    print(f"   {len(player.swaps)} swaps; {len(missed)} cues missed, {len(doubled)} fired twice, "
+          f"{stale} fired an outdated version, {past_fired} cues added in the past fired")
+    for k, (reload, (pickup, skipped)) in enumerate(zip(reloader.reloads, player.swaps)):
+        print(f"   edit {k + 1}: saved → swapped {(reload['swapped'] - saved[k]) * 1000:.1f} ms "
+              f"(settle {reloader.settle * 1000:.0f} ms, compile {reload['compile_ms']:.2f} ms for "
+              f"{reload['compiled']} changed entries), swapped → picked up {(pickup - reload['swapped']) * 1000:.3f} ms, "
+              f"{skipped} past cue(s) skipped")
+
+    near = [(actual - planned) * 1000 for planned, actual, _ in mode.samples
+            if any(abs(planned + offset - t) < 0.1 for t in picked_up)]
+    far = [(actual - planned) * 1000 for planned, actual, _ in mode.samples
+           if all(abs(planned + offset - t) >= 0.1 for t in picked_up)]
+    print(f"   jitter within 100 ms of a swap: p50 {percentile(near, 0.5):.3f} ms, max {max(near, default=0):.3f} ms "
+          f"({len(near)} cues); elsewhere p50 {percentile(far, 0.5):.3f} ms, p99 {percentile(far, 0.99):.3f} ms; "
+          f"overall p99 {report['jitter_ms']['p99']:.3f} ms")
+
+
+def compile_check(workdir: str, beats: int = 5000, changed: int = 10) -> None:
+    path = os.path.join(workdir, "big.json")
+    devices = {f"light_{i}": GoveeDevice(f"light-{i}", f"Light {i}", "H0000", ip="127.0.0.1") for i in range(DEVICES)}
+    show = build_show(0, beats)
+    save(path, show)
+    reloader = ShowReloader(path, devices, {})
+
+    full = []
+    for _ in range(5):
+        started = time.perf_counter()
+        compile_show(show, devices, {})
+        full.append((time.perf_counter() - started) * 1000)
+
+    reloads = []
+    for version in range(5):
+        for entry in show["cues"][beats // 2:beats // 2 + changed]:
+            entry["color"] = {"r": 9, "g": 9, "b": version}
+        save(path, show)
+        reloader.reload()
+        reloads.append(reloader.reloads[-1])
+    reload = min(reloads, key=lambda r: r["compile_ms"])
+    full_ms = min(full)
+    print(f"🧮 {beats}-cue show, {changed} cues edited (best of 5): reload (parse + {reload['compiled']} compiled + merge) "
+          f"{reload['compile_ms']:.1f} ms vs. compiling the whole show {full_ms:.1f} ms")
+
+
+def main():
+    with tempfile.TemporaryDirectory(prefix="govee-reload-") as workdir:
+        playback_check(workdir)
+        compile_check(workdir)
+
+
+if __name__ == "__main__":
+    main()
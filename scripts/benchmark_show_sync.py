@@ -0,0 +1,152 @@
+# scripts/benchmark_show_sync.py
+
+# ==============================================================================
+# Govee LAN API Plus – Multi-Node Show Sync Benchmark
+# ---------------------------------------------------
+#
+# Description:
+# Plays one show on three nodes, each a separate process with its own clock:
+# a leader and two followers whose clocks are skewed by whole seconds and
+# drift by tens of ppm (as two Raspberry Pis without NTP would). Every node
+# drives two emulated devices, and every beat of the show hits all six
+# devices at once.
+#
+# Since the emulated devices all live in this process, their arrival times
+# share one real clock, and the spread of a beat's arrivals across nodes is
+# the inter-node sync error actually achieved. Also reported: each follower's
+# offset estimate against its true (known) skew, and what the error would
+# have been with no sync at all.
+#
+# Usage: python3 scripts/benchmark_show_sync.py [beats] [beat interval]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import time
+import multiprocessing as mp
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.lan_device_emulator import GoveeLanEmulator
+
+NODES = (
+    # name, clock skew (seconds), drift (ppm)
+    ("leader", 0.0, 0.0),
+    ("house_b", 2.75, 40.0),
+    ("house_c", -1.3, -25.0),
+)
+DEVICES_PER_NODE = 2
+
+
+class SkewedClock:
+    """A monotonic clock that is off by `skew` seconds and runs `drift_ppm` fast."""
+
+    def __init__(self, skew: float, drift_ppm: float):
+        self.skew = skew
+        self.rate = 1 + drift_ppm * 1e-6
+        self._base = time.monotonic()
+
+    def __call__(self) -> float:
+        return self._base + (time.monotonic() - self._base) * self.rate + self.skew
+
+
+def build_show(device_names: list, beats: int, interval: float) -> dict:
+    colors = ({"r": 255, "g": 0, "b": 0}, {"r": 0, "g": 0, "b": 255})
+    return {
+        "name": "sync benchmark",
+        "nodes": {name: [f"{name}_{i}" for i in range(DEVICES_PER_NODE)] for name, _, _ in NODES[1:]},
+        "cues": [{"at": round(i * interval, 3), "device": device_names, "color": colors[i % 2]} for i in range(beats)],
+    }
+
+
+def run_node(name: str, skew: float, drift_ppm: float, port: int, show: dict, device_specs: dict,
+             followers: int, results) -> None:
+    from models.govee_device import GoveeDevice
+    from show.show_player import ShowPlayer
+    from show.show_sync import ShowFollower, ShowLeader, node_show
+    from show.show_timeline import compile_show
+
+    devices = {var: GoveeDevice(var, var, "H0000", ip=ip) for var, ip in device_specs.items()}
+    clock = SkewedClock(skew, drift_ppm)
+    if name == "leader":
+        leader = ShowLeader(show, host="127.0.0.1", port=port, clock=clock)
+        cues = compile_show(node_show(show, name, leader=True), devices, {})
+        leader.wait_for(followers, timeout=10)
+        start_at = leader.start(lead=1.5)
+        player_clock = clock
+    else:
+        follower = ShowFollower("127.0.0.1", name, port=port, clock=clock)
+        cues = compile_show(node_show(follower.join(), name), devices, {})
+        start_at = follower.wait_start(timeout=10)
+        player_clock = follower.sync.leader_time
+
+    player = ShowPlayer(cues, show_name=name, clock=player_clock)
+    report = player.play(start_at=start_at)
+    player.close()
+    estimate = None
+    if name != "leader":
+        sync = follower.sync
+        # True offset: leader clock minus this clock, right now
+        estimate = {"offset": sync.offset, "true": -(skew + (time.monotonic() - clock._base) * (clock.rate - 1)),
+                    "delay": sync.delay, "spread": sync.spread, "bursts": sync.bursts}
+        follower.close()
+    else:
+        leader.close()
+    results.put((name, report["jitter_ms"], estimate))
+
+
+def main():
+    beats = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    interval = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    port = 4610
+
+    with GoveeLanEmulator(len(NODES) * DEVICES_PER_NODE, first_host=40) as emulator:
+        names = [f"{name}_{i}" for name, _, _ in NODES for i in range(DEVICES_PER_NODE)]
+        device_specs = {var: d.ip for var, d in zip(names, emulator.devices)}
+        show = build_show(names, beats, interval)
+
+        ctx = mp.get_context("spawn")
+        results = ctx.Queue()
+        processes = [
+            ctx.Process(target=run_node, args=(name, skew, drift, port, show, device_specs, len(NODES) - 1, results))
+            for name, skew, drift in NODES
+        ]
+        processes[0].start()
+        time.sleep(0.5)  # Let the leader bind before followers connect
+        for process in processes[1:]:
+            process.start()
+        reports = [results.get(timeout=60) for _ in processes]
+        for process in processes:
+            process.join()
+        time.sleep(0.2)
+        arrivals = [[t for t, _ in d.received] for d in emulator.emulated]
+
+    print(f"🕰  {len(NODES)} nodes (separate processes), {beats} beats every {interval * 1000:.0f} ms, "
+          f"{DEVICES_PER_NODE} emulated devices per node")
+    for name, jitter, estimate in sorted(reports):
+        line = f"  {name:<8} jitter p50 {jitter['p50']:.3f} ms, p99 {jitter['p99']:.3f} ms"
+        if estimate:
+            error = (estimate["offset"] - estimate["true"]) * 1e6
+            line += (f"; offset estimate error {error:+.0f} µs (round trip {estimate['delay'] * 1e6:.0f} µs, "
+                     f"spread {estimate['spread'] * 1e6:.0f} µs, {estimate['bursts']} bursts)")
+        print(line)
+
+    if any(len(a) != beats for a in arrivals):
+        print(f"⚠️  Packets lost: {[len(a) for a in arrivals]} of {beats} per device")
+        return
+    # Sync error per beat: spread of the first device of each node's arrival times
+    firsts = [arrivals[i * DEVICES_PER_NODE] for i in range(len(NODES))]
+    errors = sorted((max(times) - min(times)) * 1000 for times in zip(*firsts))
+    pick = lambda q: errors[min(len(errors) - 1, int(q * len(errors)))]
+    print(f"🎯 Inter-node sync error (spread of arrivals per beat): p50 {pick(0.5):.3f} ms, "
+          f"p99 {pick(0.99):.3f} ms, max {errors[-1]:.3f} ms")
+    skews = [skew for _, skew, _ in NODES]
+    print(f"   without sync the nodes would be {(max(skews) - min(skews)) * 1000:.0f} ms apart")
+
+
+if __name__ == "__main__":
+    main()
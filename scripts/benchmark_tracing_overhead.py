@@ -0,0 +1,109 @@
+# scripts/benchmark_tracing_overhead.py
+
+# ==============================================================================
+# Govee LAN API Plus – Tracing Overhead Benchmark
+# -----------------------------------------------
+#
+# Description:
+# Measures what the tracing hooks cost. GOVEE_TRACING is read at import time,
+# so each configuration runs in its own child process:
+# - off:      GOVEE_TRACING=false (traced functions are the originals)
+# - no hooks: GOVEE_TRACING=true with nothing listening
+# - chrome:   a ChromeTraceWriter collecting every span
+# - metrics:  a MetricsSpanHook observing every span
+# Each reports the cost of an empty traced call and of `send_lan_command` to a
+# local UDP socket nobody reads (three spans per send; logging is muted for the
+# run). The emulator is not used here, its receive thread would add noise.
+#
+# Usage: python3 scripts/benchmark_tracing_overhead.py [calls]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import time
+import socket
+import logging
+import subprocess
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+MODES = ("off", "no hooks", "chrome", "metrics")
+
+
+def best_ns(body, calls: int, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body(calls)
+        best = min(best, time.perf_counter() - start)
+    return best / calls * 1e9
+
+
+def run_child(mode: str, calls: int) -> None:
+    from api.tracing import ChromeTraceWriter, MetricsSpanHook, add_hook, traced
+    from api.lan.send_lan_command import send_lan_command
+    from api.lan.set_device_color import build_color_payload
+
+    if mode == "chrome":
+        add_hook(ChromeTraceWriter(os.devnull))  # Collects spans; never closed, so nothing is written
+    elif mode == "metrics":
+        add_hook(MetricsSpanHook())
+    logging.disable(logging.INFO)
+
+    def noop():
+        pass
+
+    traced_noop = traced("bench.noop")(noop)
+
+    def empty_calls(n):
+        for _ in range(n):
+            traced_noop()
+
+    def bare_calls(n):
+        for _ in range(n):
+            noop()
+
+    empty = best_ns(empty_calls, calls) - best_ns(bare_calls, calls)
+
+    payload = build_color_payload({"r": 255, "g": 0, "b": 0})
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    ip, port = sink.getsockname()
+
+    def sends(n):
+        for _ in range(n):
+            send_lan_command(payload, ip, port)
+
+    send = best_ns(sends, max(1, calls // 20), repeat=9)
+    sink.close()
+    print(f"{empty} {send}")
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], int(sys.argv[3]))
+        return
+
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    results = {}
+    for mode in MODES:
+        env = dict(os.environ, GOVEE_TRACING="false" if mode == "off" else "true")
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", mode, str(calls)],
+            env=env, capture_output=True, text=True, check=True
+        ).stdout.split()
+        results[mode] = (float(output[-2]), float(output[-1]))
+
+    base_send = results["off"][1]
+    print(f"📊 Tracing overhead ({calls:,} empty calls, {calls // 20:,} sends)")
+    print(f"  {'mode':<10} {'per traced call':>16} {'send_lan_command':>18}")
+    for mode, (empty, send) in results.items():
+        print(f"  {mode:<10} {empty:>13.0f} ns {send / 1000:>12.2f} µs ({send / base_send - 1:+.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# scripts/benchmark_transitions.py
+
+# ==============================================================================
+# Govee LAN API Plus – Transition Engine Benchmark
+# ------------------------------------------------
+#
+# Description:
+# Measures the transition engine (show/transitions.py):
+# - Frame compute time for 500 devices (all easings in play at once),
+#   vectorized vs. the same math in a per-device Python loop, and checks both
+#   produce identical colors.
+# - A full 60 fps streaming run of a wave, a chase and a fade across 500
+#   devices to an unread local socket: frame time, CPU, packets per second
+#   (only changed colors are sent) and skipped frames.
+# - A run against emulated devices: every device must end on its target
+#   color.
+#
+# Usage: python3 scripts/benchmark_transitions.py [devices] [fps]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import math
+import time
+import socket
+
+import numpy as np
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.govee_device import GoveeDevice
+from scripts.lan_device_emulator import GoveeLanEmulator
+from show.transitions import EASINGS, TransitionEngine
+
+EMULATED_DEVICES = 20
+
+
+def sink_devices(count: int, port: int) -> list:
+    devices = [GoveeDevice(f"sink-{i}", f"Sink {i}", "H0000", ip="127.0.0.1") for i in range(count)]
+    for device in devices:
+        device.port = port
+    return devices
+
+
+def loop_ease(p: float, easing: int) -> float:
+    if easing == 1:
+        return p * p * p
+    if easing == 2:
+        return 1 - (1 - p) ** 3
+    if easing == 3:
+        return 4 * p * p * p if p < 0.5 else 1 - 4 * (1 - p) ** 3
+    if easing == 4:
+        return 0.5 - 0.5 * math.cos(math.pi * p)
+    return p
+
+
+def loop_render(engine: TransitionEngine, now: float) -> list:
+    """The per-device Python loop the engine replaces."""
+    colors = []
+    for i in range(len(engine.devices)):
+        p = min(1.0, max(0.0, (now - engine._begin[i]) / engine._duration[i]))
+        e = loop_ease(p, int(engine._easing[i]))
+        colors.append([int(float(f) + (float(t) - float(f)) * e + 0.5) for f, t in zip(engine._from[i], engine._to[i])])
+    return colors
+
+
+def compute_benchmark(count: int, fps: float) -> None:
+    engine = TransitionEngine(sink_devices(count, 9), fps=fps, initial=(255, 0, 0))
+    rng = np.random.default_rng(5)
+    start = 1000.0
+    # Every easing at once, with random targets and staggered starts
+    for code, easing in enumerate(EASINGS):
+        selected = np.arange(code, count, len(EASINGS))
+        engine.transition(rng.integers(0, 256, (len(selected), 3)), 2.0, easing,
+                          offsets=rng.uniform(0, 1, len(selected)), devices=selected, at=start)
+    frames = [start + i / fps for i in range(int(3 * fps))]
+
+    timings = []
+    for now in frames:
+        started = time.perf_counter()
+        engine.render(now)
+        timings.append(time.perf_counter() - started)
+    timings = np.sort(np.array(timings)) * 1e6
+    started = time.perf_counter()
+    for now in frames[:30]:
+        loop_render(engine, now)
+    loop_us = (time.perf_counter() - started) / 30 * 1e6
+    mismatched = sum(int(np.abs(engine.render(now).astype(int) - np.array(loop_render(engine, now))).max() > 1)
+                     for now in frames[::10])
+
+    budget = 1e6 / fps
+    print(f"🧮 Frame compute, {count} devices: vectorized p50 {np.median(timings):.0f} µs, "
+          f"p99 {timings[int(0.99 * len(timings))]:.0f} µs ({np.median(timings) / budget * 100:.1f}% of a "
+          f"{budget / 1000:.1f} ms frame); Python loop {loop_us:.0f} µs ({loop_us / np.median(timings):.0f}x slower)")
+    print(f"   vectorized and loop colors agree on {len(frames[::10]) - mismatched}/{len(frames[::10])} sampled frames")
+
+
+def stream_benchmark(count: int, fps: float) -> None:
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    engine = TransitionEngine(sink_devices(count, sink.getsockname()[1]), fps=fps)
+    at = time.monotonic() + 0.1
+    engine.wave((0, 120, 255), duration=1.0, spread=1.0, at=at)
+    engine.chase((255, 0, 80), step=1.0 / count, at=at + 2.0)
+    engine.fade((255, 160, 40), duration=1.0, at=at + 3.0)
+    report = engine.run()
+    engine.close()
+    sink.close()
+
+    frame, jitter = report["frame_ms"], report["jitter_ms"]
+    every = report["frames"] * count
+    print(f"🌊 Streaming wave + chase + fade, {count} devices @ {fps:g} fps, {report['seconds']:.1f} s:")
+    print(f"   frame (render + diff + send) p50 {frame['p50']:.2f} ms, p99 {frame['p99']:.2f} ms; "
+          f"jitter p99 {jitter['p99']:.2f} ms; {report['skipped_frames']} skipped")
+    print(f"   CPU {report['cpu_percent']:.1f}%; {report['packets']} packets ({report['packets_per_second']:.0f}/s), "
+          f"{report['packets'] / every * 100:.0f}% of the {every} a send-every-frame engine would send")
+
+
+def emulator_check(fps: float) -> None:
+    with GoveeLanEmulator(EMULATED_DEVICES) as emulator:
+        engine = TransitionEngine(emulator.devices, fps=fps)
+        at = time.monotonic() + 0.1
+        engine.chase((255, 0, 0), step=0.05, at=at)
+        engine.fade({"r": 10, "g": 200, "b": 30}, duration=0.5, at=at + 0.6)
+        report = engine.run()
+        engine.close()
+        time.sleep(0.3)
+        landed = sum(d.state["color"] == {"r": 10, "g": 200, "b": 30} for d in emulator.emulated)
+        received = sum(len(d.received) for d in emulator.emulated)
+    print(f"📡 {EMULATED_DEVICES} emulated devices: {received}/{report['packets']} packets arrived, "
+          f"{landed}/{EMULATED_DEVICES} ended on the target color")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    fps = float(sys.argv[2]) if len(sys.argv) > 2 else 60.0
+    compute_benchmark(count, fps)
+    stream_benchmark(count, fps)
+    emulator_check(fps)
+
+
+if __name__ == "__main__":
+    main()
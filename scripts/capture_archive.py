@@ -0,0 +1,342 @@
+# scripts/capture_archive.py
+
+# ==============================================================================
+# Govee LAN API Plus – MQTT Capture Archive
+# -----------------------------------------
+#
+# Description:
+# A structured, append-only archive of every MQTT message the Frida observer
+# intercepts, so past captures survive observer restarts and can be queried
+# without scanning free-form log text.
+#
+# The archive is JSONL (`logs/mqtt_capture_archive.jsonl`), one record per
+# message:
+#
+#   {"ts": 1730412345.12, "topic": "GD/...", "device": null, "cmd": "ptReal",
+#    "transaction": "v_...", "msg": {...}}
+#
+# A sidecar index (`<archive>.idx`, also JSONL) stores each record's byte
+# offset and length alongside the fields it can be queried by (timestamp,
+# device, topic, cmd, transaction). Queries only consult the in-memory index
+# and then seek straight to the matching records, e.g. "all ptReal payloads
+# for device X in the last hour".
+#
+# Devices are matched by the payload's `device` field when the app includes
+# one, otherwise by the MQTT topics learned during batch capture (see
+# batch_capture.py), resolved at query time so messages archived before a
+# device's topic was learned are still found.
+#
+# Both files are written through BufferedLogWriter. If the process dies
+# between the two, the index is repaired when the archive is next opened for
+# writing (`start()`): entries pointing past the end of the archive are
+# discarded, archived records missing from the index are re-indexed and a
+# torn final record is truncated. A record whose index line was dropped (the
+# writer's queue was full) leaves a gap in the index, which is treated the
+# same way: everything after the gap is re-indexed from the archive. A record
+# the archive writer drops is neither indexed nor counted, so later offsets
+# stay right. Readers (`load()`, queries) never modify
+# either file: they skip a torn tail and index any unindexed records in
+# memory, so they are safe to run while the observer is writing.
+#
+# Usage: python3 scripts/capture_archive.py [--device ID] [--cmd ptReal] [--since SECONDS] [--limit N]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import json
+import time
+import bisect
+import argparse
+from typing import Dict, List, Optional
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.frida_log_reader import MqttLogEntry
+from scripts.frida_log_writer import BufferedLogWriter
+from scripts.batch_capture import DeviceTopicCorrelator, DEVICE_MQTT_TOPICS_FILE_PATH
+
+# Configurable via .env
+MQTT_CAPTURE_ARCHIVE_PATH = os.path.abspath(os.getenv("MQTT_CAPTURE_ARCHIVE_PATH", "logs/mqtt_capture_archive.jsonl"))
+
+INDEXED_FIELDS = ("device", "topic", "cmd", "transaction")
+
+
+class CaptureArchive:
+    """Append-only JSONL archive of captured MQTT messages with a sidecar query index."""
+
+    def __init__(self, path: str = MQTT_CAPTURE_ARCHIVE_PATH, topics_path: Optional[str] = None):
+        """
+        Initialize a CaptureArchive.
+
+        Args:
+            path (str): Archive file. The index is kept next to it as `<path>.idx`.
+            topics_path (str, optional): Learned device → topic mappings used to resolve device queries.
+                                         Defaults to DEVICE_MQTT_TOPICS_FILE_PATH.
+        """
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self.topics_path = topics_path or DEVICE_MQTT_TOPICS_FILE_PATH
+
+        self.entries: List[dict] = []  # Index entries in archive order
+        self._timestamps: List[float] = []
+        self._postings: Dict[str, Dict[str, List[int]]] = {field: {} for field in INDEXED_FIELDS}
+
+        self._size = 0
+        self._archive_writer = None
+        self._index_writer = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # --------------------------------------------------------------------------
+    # Index
+    # --------------------------------------------------------------------------
+
+    def load(self, repair: bool = False) -> "CaptureArchive":
+        """
+        Load the index, indexing any archived records it is missing. Returns self.
+
+        Args:
+            repair (bool): Also truncate a torn final record and rewrite the index file. Only the writer
+                           (`start()`) does this; readers leave both files untouched.
+        """
+        self.entries = []
+        self._timestamps = []
+        self._postings = {field: {} for field in INDEXED_FIELDS}
+        archive_size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+        indexed_to = 0
+        valid = True
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        valid = False  # Torn final line
+                        break
+                    if entry["offset"] + entry["length"] > archive_size:
+                        valid = False  # Index got ahead of the archive
+                        break
+                    if entry["offset"] != indexed_to:
+                        valid = False  # An index line was dropped; re-index from the gap
+                        break
+                    self._add_to_index(entry)
+                    indexed_to = entry["offset"] + entry["length"]
+
+        if indexed_to < archive_size or not valid:
+            self._reindex_from(indexed_to, repair)
+
+        self._size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return self
+
+    def _reindex_from(self, offset: int, repair: bool = False) -> None:
+        """Index archive records from `offset` onward; with `repair`, also fix up the files on disk."""
+        if os.path.exists(self.path):
+            with open(self.path, "r+b" if repair else "rb") as f:
+                f.seek(offset)
+                while True:
+                    line = f.readline()
+                    if not line:
+                        break
+                    if not line.endswith(b"\n"):
+                        # Torn final record (or one still being written); the writer drops it
+                        # so the next append starts on a clean line
+                        if repair:
+                            f.truncate(offset)
+                        break
+                    try:
+                        record = json.loads(line)
+                        self._add_to_index(self._index_entry(record, offset, len(line)))
+                    except ValueError:
+                        pass
+                    offset += len(line)
+
+        if not repair:
+            return
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for entry in self.entries:
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.index_path)
+
+    @staticmethod
+    def _index_entry(record: dict, offset: int, length: int) -> dict:
+        entry = {"offset": offset, "length": length, "ts": record["ts"]}
+        entry.update({field: record.get(field) for field in INDEXED_FIELDS})
+        return entry
+
+    def _add_to_index(self, entry: dict) -> None:
+        position = len(self.entries)
+        self.entries.append(entry)
+        self._timestamps.append(entry["ts"])
+        for field in INDEXED_FIELDS:
+            value = entry.get(field)
+            if value is not None:
+                self._postings[field].setdefault(value, []).append(position)
+
+    # --------------------------------------------------------------------------
+    # Writing
+    # --------------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Load and repair the index and open the archive for appending."""
+        self.load(repair=True)
+        self._archive_writer = BufferedLogWriter(self.path, max_bytes=0)
+        self._index_writer = BufferedLogWriter(self.index_path, max_bytes=0)
+        self._archive_writer.start()
+        self._index_writer.start()
+
+    def append(self, entry: MqttLogEntry, captured_at: Optional[float] = None) -> Optional[dict]:
+        """
+        Archive a captured MQTT message. Never blocks on disk I/O.
+
+        Args:
+            entry (MqttLogEntry): The captured message.
+            captured_at (float, optional): Capture time (`time.time()`). Defaults to now.
+
+        Returns:
+            dict: The archived record, or None if the archive writer's queue was full and it was dropped.
+        """
+        msg = entry.msg
+        record = {
+            "ts": captured_at if captured_at is not None else time.time(),
+            "topic": entry.topic,
+            "device": msg.get("device") or msg.get("data", {}).get("device"),
+            "cmd": msg.get("cmd"),
+            "transaction": msg.get("transaction"),
+            "msg": msg,
+        }
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        length = len(line.encode("utf-8"))
+
+        # Offsets only advance for records that will actually be written
+        if not self._archive_writer.write(line):
+            return None
+        index_entry = self._index_entry(record, self._size, length)
+        self._size += length
+        self._add_to_index(index_entry)
+        self._index_writer.write(json.dumps(index_entry) + "\n")  # If dropped, the next start() re-indexes the gap
+        return record
+
+    def close(self) -> None:
+        """Flush and close the archive and index."""
+        if self._archive_writer is not None:
+            # Archive first, so the index never durably points past it
+            self._archive_writer.close()
+            self._index_writer.close()
+            self._archive_writer = None
+            self._index_writer = None
+
+    # --------------------------------------------------------------------------
+    # Queries
+    # --------------------------------------------------------------------------
+
+    def query(
+        self,
+        device: Optional[str] = None,
+        cmd: Optional[str] = None,
+        transaction: Optional[str] = None,
+        topic: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = True
+    ) -> List[dict]:
+        """
+        Find archived records using the index.
+
+        Args:
+            device (str, optional): Device ID (matched by payload device field or learned topic).
+            cmd (str, optional): MQTT command, e.g. "ptReal".
+            transaction (str, optional): Transaction ID.
+            topic (str, optional): MQTT topic.
+            since (float, optional): Earliest capture time (`time.time()` seconds).
+            until (float, optional): Latest capture time.
+            limit (int, optional): Maximum records to return.
+            newest_first (bool): Return the most recent records first.
+
+        Returns:
+            List[dict]: Matching records ({"ts", "topic", "device", "cmd", "transaction", "msg"}).
+        """
+        if not self.entries:
+            self.load()
+
+        candidates = None
+        filters = {"cmd": cmd, "transaction": transaction, "topic": topic}
+        for field, value in filters.items():
+            if value is not None:
+                positions = set(self._postings[field].get(value, []))
+                candidates = positions if candidates is None else candidates & positions
+
+        if device is not None:
+            positions = set(self._postings["device"].get(device, []))
+            device_topic = self._device_topics().get(device)
+            if device_topic is not None:
+                positions |= set(self._postings["topic"].get(device_topic, []))
+            candidates = positions if candidates is None else candidates & positions
+
+        # Records are appended in capture order, so the time range is a slice
+        start = bisect.bisect_left(self._timestamps, since) if since is not None else 0
+        end = bisect.bisect_right(self._timestamps, until) if until is not None else len(self.entries)
+        if candidates is None:
+            positions = range(start, end)
+        else:
+            positions = sorted(p for p in candidates if start <= p < end)
+
+        positions = list(reversed(positions)) if newest_first else list(positions)
+        if limit is not None:
+            positions = positions[:limit]
+        return self._read_records(positions)
+
+    def latest(self, **filters) -> Optional[dict]:
+        """Return the newest record matching `query()` filters, or None."""
+        records = self.query(limit=1, newest_first=True, **filters)
+        return records[0] if records else None
+
+    def _device_topics(self) -> Dict[str, str]:
+        return DeviceTopicCorrelator(self.topics_path).topics
+
+    def _read_records(self, positions: List[int]) -> List[dict]:
+        if not positions or not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path, "rb") as f:
+            for position in positions:
+                entry = self.entries[position]
+                f.seek(entry["offset"])
+                records.append(json.loads(f.read(entry["length"])))
+        return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the MQTT capture archive.")
+    parser.add_argument("--device", help="Device ID")
+    parser.add_argument("--cmd", help="MQTT command, e.g. ptReal")
+    parser.add_argument("--transaction", help="Transaction ID")
+    parser.add_argument("--since", type=float, help="Only records from the last N seconds")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    archive = CaptureArchive().load()
+    since = time.time() - args.since if args.since else None
+    records = archive.query(device=args.device, cmd=args.cmd, transaction=args.transaction, since=since, limit=args.limit)
+
+    print(f"📚 {len(archive.entries)} archived messages, {len(records)} matching")
+    for record in records:
+        captured = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record["ts"]))
+        print(f"{captured}  {record['cmd']:<10} {record['transaction']}  {record['device'] or record['topic']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# scripts/command_stream.py
+
+# ==============================================================================
+# Govee LAN API Plus – Command Stream Runner
+# ------------------------------------------
+#
+# Description:
+# Sends newline-delimited JSON commands from stdin or a FIFO to the devices in
+# the generated factories (see api/lan/command_stream.py for the format).
+# Reports (JSON, one per line) go to stderr every
+# COMMAND_STREAM_REPORT_INTERVAL seconds and when the input ends.
+#
+# Usage: my_tool | python3 scripts/command_stream.py
+#        python3 scripts/command_stream.py --fifo /tmp/govee.fifo --keep-open
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import json
+import argparse
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from api.lan.command_stream import COMMAND_STREAM_REPORT_INTERVAL, CommandStream
+
+
+def print_report(report: dict) -> None:
+    print(json.dumps(report), file=sys.stderr, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send JSON-lines commands from stdin or a FIFO to the factory devices.")
+    parser.add_argument("--fifo", help="Read from this FIFO (created if missing) instead of stdin")
+    parser.add_argument("--keep-open", action="store_true", help="With --fifo, wait for the next writer when one closes it")
+    parser.add_argument("--report-interval", type=float, default=COMMAND_STREAM_REPORT_INTERVAL,
+                        help="Seconds between reports on stderr (0 for only the final one)")
+    args = parser.parse_args()
+
+    from show.show_timeline import load_factory_namespace
+    devices, scenes = load_factory_namespace()
+    if args.fifo and not os.path.exists(args.fifo):
+        os.mkfifo(args.fifo)
+
+    with CommandStream(devices, scenes, report_interval=args.report_interval,
+                       on_report=print_report if args.report_interval > 0 else None) as stream:
+        try:
+            while True:
+                if args.fifo:
+                    with open(args.fifo, "rb") as fifo:  # Blocks until a writer opens it
+                        report = stream.run(fifo)
+                else:
+                    report = stream.run(sys.stdin.buffer)
+                print_report(report)
+                if not (args.fifo and args.keep_open):
+                    break
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
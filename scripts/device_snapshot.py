@@ -0,0 +1,76 @@
+# scripts/device_snapshot.py
+
+# ==============================================================================
+# Govee LAN API Plus – Snapshot & Restore Runner
+# ----------------------------------------------
+#
+# Description:
+# Saves the current state of every device in the generated device factory
+# (or the named ones) to a JSON file, and puts it back later.
+#
+# Usage: python3 scripts/device_snapshot.py save before_show.json [--devices porch_light,garage_lights]
+#        python3 scripts/device_snapshot.py restore before_show.json [--verify]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import argparse
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from api.lan.device_snapshot import DeviceSnapshot, restore_snapshot, take_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Save or restore the state of the factory devices.")
+    parser.add_argument("action", choices=("save", "restore"))
+    parser.add_argument("path", help="Snapshot JSON file")
+    parser.add_argument("--devices", help="Comma-separated device variable names (default: every device with a LAN IP)")
+    parser.add_argument("--verify", action="store_true", help="After restoring, read every state back and resend what didn't stick")
+    args = parser.parse_args()
+
+    from show.show_timeline import load_factory_namespace
+    namespace, _ = load_factory_namespace()
+    if args.devices:
+        names = [name.strip() for name in args.devices.split(",") if name.strip()]
+        unknown = [name for name in names if name not in namespace]
+        if unknown:
+            parser.error(f"unknown device(s): {', '.join(unknown)}")
+        devices = [namespace[name] for name in names]
+    else:
+        devices = list(namespace.values())
+    devices = [d for d in devices if d.ip]
+    if not devices:
+        print("❌ No devices with LAN IPs found in device_factory.py. Run 'Refresh Device IP Addresses' first.")
+        return
+
+    if args.action == "save":
+        snapshot = take_snapshot(devices)
+        snapshot.save(args.path)
+        print(f"📸 Saved {len(snapshot)} device states to {args.path}")
+        names = {d.id: d.name for d in devices}
+        for device_id in snapshot.missing:
+            print(f"⚠️  No reply from {names.get(device_id, device_id)}")
+        return
+
+    snapshot = DeviceSnapshot.load(args.path)
+    report = restore_snapshot(snapshot, devices, verify=args.verify)
+    print(f"♻️  Restored {report['devices']} devices from {args.path} ({snapshot.taken_at}) with "
+          f"{report['packets']} packets in {report['seconds'] * 1000:.0f} ms")
+    if report["send_errors"]:
+        print(f"⚠️  {report['send_errors']} packets could not be sent")
+    for device_id in report["mismatched"]:
+        print(f"⚠️  {device_id} still doesn't match its snapshot")
+    for device_id in report["unverified"]:
+        print(f"⚠️  {device_id} didn't answer the verify pass; couldn't check it")
+
+
+if __name__ == "__main__":
+    main()
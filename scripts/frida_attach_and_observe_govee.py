@@ -8,7 +8,15 @@
 # This script attaches to the Govee Android app using Frida and logs MQTT payloads
 # published over the LAN, which are used to control DIY scenes.
 #
-# The captured payloads are written to `logs/frida_govee_mqtt_output.log`.
+# Each captured payload is streamed to the wizard over a local UDP socket (see
+# frida_mqtt_stream.py) and, unless FRIDA_LOG_TO_FILE is false, appended to
+# `logs/frida_govee_mqtt_output.log` by a buffered background writer (see
+# frida_log_writer.py) that batches fsyncs and rotates the log by size.
+# Parsed messages are also kept in the structured MQTT capture archive (see
+# capture_archive.py) unless FRIDA_CAPTURE_ARCHIVE is false.
+#
+# Run with `--keep-alive` (as batch capture does) to keep observing until the
+# process is terminated instead of stopping at the first Enter.
 #
 # Author: Jimmy Hickman
 # License: MIT
@@ -17,6 +25,7 @@
 import os
 import sys
 import time
+import signal
 import subprocess
 import frida
 
@@ -25,6 +34,13 @@ load_dotenv()
 
 from typing import Optional
 
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.frida_mqtt_stream import UdpMqttStream, parse_frida_payload
+from scripts.frida_log_writer import BufferedLogWriter
+from scripts.capture_archive import CaptureArchive
+
 # --- Configuration ---
 
 # Load environment variables
@@ -35,13 +51,11 @@ FRIDA_LOG_FILE_PATH = os.path.abspath(os.getenv("FRIDA_LOG_FILE_PATH", "logs/fri
 FRIDA_SERVER_BINARY_PATH = os.path.abspath(os.getenv("FRIDA_SERVER_BINARY_PATH", "bin/frida-server-16.7.10-android-arm64"))
 FRIDA_LOG_MQQT_URI_FILE_PATH = os.path.abspath(os.getenv("FRIDA_LOG_MQQT_URI_FILE_PATH", "frida_log_mqtt_uri.js"))
 FRIDA_SERVER_CLIENT_PATH = os.getenv("FRIDA_SERVER_CLIENT_PATH", "/data/local/tmp/frida-server")
+FRIDA_LOG_TO_FILE = os.getenv("FRIDA_LOG_TO_FILE", "true").lower() == "true"
+FRIDA_CAPTURE_ARCHIVE = os.getenv("FRIDA_CAPTURE_ARCHIVE", "true").lower() == "true"
 
 sys.stdout.reconfigure(line_buffering=True)
 
-# --- Ensure Log Directory Exists ---
-os.makedirs(os.path.dirname(FRIDA_LOG_FILE_PATH), exist_ok=True)
-open(FRIDA_LOG_FILE_PATH, "w").close()  # Clear previous log content
-
 def start_frida_server():
     """Start the Frida server on the connected Android device via ADB."""
     print("\n🚀 Starting Frida server on device...")
@@ -76,8 +90,14 @@ def get_govee_app_id() -> Optional[str]:
     return None
 
 
-def attach_frida_to_app(app_id: str):
-    """Attach to the Govee app using Frida and hook MQTT payloads."""
+def attach_frida_to_app(app_id: str, keep_alive: bool = False):
+    """
+    Attach to the Govee app using Frida and hook MQTT payloads.
+
+    Args:
+        app_id (str): PID of the Govee app.
+        keep_alive (bool): Observe until terminated (SIGTERM/Ctrl+C) instead of until Enter is pressed.
+    """
     print(f"\n🔌 Attaching to Govee app with ID {app_id}...")
 
     with open(FRIDA_LOG_MQQT_URI_FILE_PATH, "r", encoding="utf-8") as f:
@@ -87,11 +107,27 @@ def attach_frida_to_app(app_id: str):
     session = device.attach(int(app_id))
     script = session.create_script(script_source)
 
-    print(f"📄 Writing logs to: {FRIDA_LOG_FILE_PATH}")
+    stream = UdpMqttStream()
+    log_writer = None
+    if FRIDA_LOG_TO_FILE:
+        print(f"📄 Writing logs to: {FRIDA_LOG_FILE_PATH}")
+        log_writer = BufferedLogWriter(FRIDA_LOG_FILE_PATH)
+        log_writer.start()
+    archive = None
+    if FRIDA_CAPTURE_ARCHIVE:
+        archive = CaptureArchive()
+        archive.start()
 
     def on_message(message, data):
         if message["type"] == "send":
-            log_mqtt_event(message["payload"] + "\n")
+            # Stream the parsed message first; the log file is written off this thread
+            entry = parse_frida_payload(message["payload"])
+            if entry is not None:
+                stream.publish(entry)
+                if archive:
+                    archive.append(entry)
+            if log_writer:
+                log_writer.write(message["payload"] + "\n")
         elif message["type"] == "error":
             print(f"❌ Frida error: {message['stack']}")
 
@@ -104,22 +140,26 @@ def attach_frida_to_app(app_id: str):
         print(f"⏳ Preparing to capture... {i}")
         time.sleep(1)
 
-    print("\n📲 Trigger the scene in the Govee app, then press Enter to stop logging.")
-    input()
-
-    print("\n🛑 Stopping Frida observer...")
-    session.detach()
-
-
-def log_mqtt_event(event_data: str):
-    """Append an MQTT event string to the log file."""
+    # The wizard stops the observer with SIGTERM; exit through the cleanup below so buffered log lines are written
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
     try:
-        with open(FRIDA_LOG_FILE_PATH, "a", encoding="utf-8") as log_file:
-            log_file.write(event_data)
-            log_file.flush()
-            os.fsync(log_file.fileno())
-    except Exception as e:
-        print(f"❌ Error writing to log file: {e}")
+        if keep_alive:
+            print("\n📲 Observing until terminated. Trigger scenes in the Govee app.")
+            while True:
+                time.sleep(0.5)
+        else:
+            print("\n📲 Trigger the scene in the Govee app, then press Enter to stop logging.")
+            input()
+    except (KeyboardInterrupt, SystemExit, EOFError):
+        pass
+    finally:
+        print("\n🛑 Stopping Frida observer...")
+        session.detach()
+        stream.close()
+        if log_writer:
+            log_writer.close()
+        if archive:
+            archive.close()
 
 
 def main():
@@ -128,7 +168,7 @@ def main():
     app_id = get_govee_app_id()
     if app_id:
         print(f"Govee App ID: {app_id}")
-        attach_frida_to_app(app_id)
+        attach_frida_to_app(app_id, keep_alive="--keep-alive" in sys.argv)
     else:
         print("❌ No app ID found. Please ensure the Govee app is running on your device.")
 
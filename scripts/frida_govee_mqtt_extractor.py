@@ -9,10 +9,16 @@
 # extracts DIY scene command data, and generates Python factory
 # variables for reuse.
 #
-# These are saved to:
+# Scenes can also be regenerated later from the MQTT capture archive
+# (see capture_archive.py).
+#
+# Captures are journaled (see scene_factory_journal.py) and compacted into:
 # - factories/device_mqtt_diy_scene_factory.py
 # - (and optionally appended to factories/device_factory.py)
 #
+# Command payloads are stored once in the content-addressed MQTT payload store
+# and referenced from the scene factory by hash.
+#
 # Author: Jimmy Hickman
 # License: MIT
 # ==============================================================================
@@ -21,13 +27,19 @@ import json
 import re
 import os
 import sys
-from typing import Optional
+from typing import Dict, List, Optional
 
 # Enable root path imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from models.govee_device import GoveeDevice
 from models.govee_diy_scene import GoveeDIYScene
+from models.govee_mqtt_diy_scene import GoveeMqttDiyScene
+from models.mqtt_payload_store import default_payload_store
+from scripts.frida_log_reader import FridaLogReader, is_scene_message
+from scripts.capture_archive import CaptureArchive
+from scripts.batch_capture import DeviceTopicCorrelator
+from api.tracing import traced
 
 # --- Configuration ---
 
@@ -67,23 +79,23 @@ def format_constructor_arg(value):
 # MQTT Command Parsing
 # ------------------------------------------------------------------------------
 
-def append_new_commands(new_var_name: str, cmd: dict, device: GoveeDevice, scene: GoveeDIYScene):
-    scene_blocks = {}
-
-    # Read existing lines or template
+def read_scene_factory_lines() -> List[str]:
+    """Read the MQTT scene factory, falling back to its template."""
     if os.path.exists(DEVICE_MQTT_DIY_SCENE_FACTORY_FILE_PATH):
         with open(DEVICE_MQTT_DIY_SCENE_FACTORY_FILE_PATH, "r", encoding="utf-8") as f:
-            lines = f.readlines()
+            return f.readlines()
     elif os.path.exists(DEVICE_MQTT_DIY_SCENE_FACTORY_TEMPLATE_FILE_PATH):
         with open(DEVICE_MQTT_DIY_SCENE_FACTORY_TEMPLATE_FILE_PATH, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-    else:
-        raise FileNotFoundError("Missing both factory file and template file for MQTT scenes.")
+            return f.readlines()
+    raise FileNotFoundError("Missing both factory file and template file for MQTT scenes.")
+
+def parse_scene_blocks(lines: List[str]) -> Dict[str, List[str]]:
+    """Split MQTT scene factory lines into {var_name: block lines}."""
+    scene_blocks = {}
 
     # Remove placeholder line if present
     lines = [line for line in lines if line.strip() != "all_mqtt_diy_scenes = []"]
 
-    # Parse scene blocks
     current_var = None
     current_block = []
     for line in lines:
@@ -99,43 +111,52 @@ def append_new_commands(new_var_name: str, cmd: dict, device: GoveeDevice, scene
 
     if current_var and current_block:
         scene_blocks[current_var] = current_block
+    return scene_blocks
 
-    # Construct new scene
+def build_scene_block(var_name: str, cmd: dict) -> List[str]:
+    """Render a scene variable; its command payload goes to the payload store (save it before writing)."""
     cmd_args = []
-    for key in ["accountTopic", "cmd", "transaction", "type", "write", "command"]:
+    for key in ["accountTopic", "cmd", "transaction", "type", "write"]:
         if key in cmd:
             val = "true" if key == "write" and isinstance(cmd[key], bool) else cmd[key]
             cmd_args.append(f"{key}={format_constructor_arg(val)}")
+    if "command" in cmd:
+        cmd_args.append(f"command_hash={format_constructor_arg(default_payload_store().put(cmd['command']))}")
+    return [f"{var_name} = GoveeMqttDiyScene({', '.join(cmd_args)})\n\n"]
 
-    scene_blocks[new_var_name] = [f"{new_var_name} = GoveeMqttDiyScene({', '.join(cmd_args)})\n\n"]
+def render_scene_factory(scene_blocks: Dict[str, List[str]]) -> List[str]:
+    """Render the full MQTT scene factory (template header, sorted scenes, all_mqtt_diy_scenes)."""
+    with open(DEVICE_MQTT_DIY_SCENE_FACTORY_TEMPLATE_FILE_PATH, "r", encoding="utf-8") as tpl:
+        lines = [line for line in tpl.readlines() if line.strip() != "all_mqtt_diy_scenes = []"]
 
-    # Write updated file
-    with open(DEVICE_MQTT_DIY_SCENE_FACTORY_FILE_PATH, "w", encoding="utf-8") as f:
-        with open(DEVICE_MQTT_DIY_SCENE_FACTORY_TEMPLATE_FILE_PATH, "r", encoding="utf-8") as tpl:
-            template_lines = tpl.readlines()
-            f.writelines([line for line in template_lines if line.strip() != "all_mqtt_diy_scenes = []"])
+    for var in sorted(scene_blocks):
+        lines.extend(scene_blocks[var])
 
-        for var in sorted(scene_blocks):
-            f.writelines(scene_blocks[var])
+    lines.append("all_mqtt_diy_scenes = [\n")
+    for var in sorted(scene_blocks):
+        lines.append(f"    {var},\n")
+    lines.append("]\n")
+    return lines
 
-        f.write("all_mqtt_diy_scenes = [\n")
-        for var in sorted(scene_blocks):
-            f.write(f"    {var},\n")
-        f.write("]\n")
+def append_new_commands(new_var_name: str, cmd: dict, device: GoveeDevice, scene: GoveeDIYScene):
+    scene_blocks = parse_scene_blocks(read_scene_factory_lines())
+    scene_blocks[new_var_name] = build_scene_block(new_var_name, cmd)
+    default_payload_store().save()
+
+    with open(DEVICE_MQTT_DIY_SCENE_FACTORY_FILE_PATH, "w", encoding="utf-8") as f:
+        f.writelines(render_scene_factory(scene_blocks))
 
 # ------------------------------------------------------------------------------
 # Append to device_factory.py
 # ------------------------------------------------------------------------------
 
-def append_mqtt_scene_to_device_factory(var_name: str, device: GoveeDevice):
-    if not os.path.exists(DEVICE_FACTORY_FILE_PATH):
-        print(f"❌ Device factory file not found: {DEVICE_FACTORY_FILE_PATH}")
-        return
+def add_scenes_to_device_factory_lines(lines: List[str], device_var: str, var_names: List[str]) -> List[str]:
+    """
+    Add scene variables to a device's `mqtt_diy_scenes` namespace in device factory lines (in place).
 
-    with open(DEVICE_FACTORY_FILE_PATH, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    device_var = sanitize_var_name(device.name)
+    Returns:
+        List[str]: The variable names that were added (already present ones are skipped).
+    """
     namespace_start = None
     namespace_end = None
 
@@ -148,24 +169,41 @@ def append_mqtt_scene_to_device_factory(var_name: str, device: GoveeDevice):
                     break
             break
 
-    new_line = f"    {var_name}={var_name},\n"
-
     if namespace_start is not None and namespace_end is not None:
-        if any(var_name in line for line in lines[namespace_start:namespace_end]):
-            print(f"⚠️ Scene '{var_name}' already exists in mqtt_diy_scenes for {device_var}")
-            return
-        lines.insert(namespace_end, new_line)
-    else:
-        insert_index = None
-        for i, line in enumerate(lines):
-            if line.strip().startswith(f"{device_var} = GoveeDevice("):
-                insert_index = i
-        if insert_index is not None:
-            while insert_index < len(lines) and lines[insert_index].strip() != "":
-                insert_index += 1
-            lines.insert(insert_index + 1, f"{device_var}.mqtt_diy_scenes = SimpleNamespace(\n")
-            lines.insert(insert_index + 2, new_line)
-            lines.insert(insert_index + 3, ")\n\n")
+        existing = lines[namespace_start:namespace_end]
+        added = [v for v in dict.fromkeys(var_names) if not any(v in line for line in existing)]
+        lines[namespace_end:namespace_end] = [f"    {v}={v},\n" for v in added]
+        return added
+
+    insert_index = None
+    for i, line in enumerate(lines):
+        if line.strip().startswith(f"{device_var} = GoveeDevice("):
+            insert_index = i
+    if insert_index is None:
+        return []
+
+    while insert_index < len(lines) and lines[insert_index].strip() != "":
+        insert_index += 1
+    added = list(dict.fromkeys(var_names))
+    lines[insert_index + 1:insert_index + 1] = (
+        [f"{device_var}.mqtt_diy_scenes = SimpleNamespace(\n"]
+        + [f"    {v}={v},\n" for v in added]
+        + [")\n\n"]
+    )
+    return added
+
+def append_mqtt_scene_to_device_factory(var_name: str, device: GoveeDevice):
+    if not os.path.exists(DEVICE_FACTORY_FILE_PATH):
+        print(f"❌ Device factory file not found: {DEVICE_FACTORY_FILE_PATH}")
+        return
+
+    with open(DEVICE_FACTORY_FILE_PATH, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+
+    device_var = sanitize_var_name(device.name)
+    if not add_scenes_to_device_factory_lines(lines, device_var, [var_name]):
+        print(f"⚠️ Scene '{var_name}' not added: already in mqtt_diy_scenes for {device_var} (or device not found)")
+        return
 
     with open(DEVICE_FACTORY_FILE_PATH, "w", encoding="utf-8") as f:
         f.writelines(lines)
@@ -176,38 +214,105 @@ def append_mqtt_scene_to_device_factory(var_name: str, device: GoveeDevice):
 # Entry point
 # ------------------------------------------------------------------------------
 
-def extract_and_generate_mqtt_payload(device: GoveeDevice, scene: GoveeDIYScene) -> bool:
+@traced("capture.build_cmd")
+def build_cmd_from_msg(msg: dict) -> dict:
+    cmd = {
+        "accountTopic": msg["accountTopic"],
+        "cmd": msg["cmd"],
+        "transaction": msg["transaction"],
+        "type": msg["type"]
+    }
+    cmd.update({
+        k: v for k, v in msg.get("data", {}).items()
+        if k in ["write", "command", "color", "colorTemInKelvin", "val", "open", "version"]
+    })
+    return cmd
+
+def mqtt_diy_scene_from_msg(msg: dict) -> GoveeMqttDiyScene:
+    cmd = build_cmd_from_msg(msg)
+    return GoveeMqttDiyScene(
+        accountTopic=cmd["accountTopic"],
+        cmd=cmd["cmd"],
+        transaction=cmd["transaction"],
+        type=cmd["type"],
+        write="true" if cmd.get("write") is True else cmd.get("write"),
+        command=cmd.get("command", [])
+    )
+
+@traced("capture.generate_payload")
+def generate_mqtt_payload_from_msg(device: GoveeDevice, scene: GoveeDIYScene, msg: dict) -> str:
+    from scripts.scene_factory_journal import SceneFactoryJournal
+
+    # Journal the capture (one append); the factories are rewritten on compaction
+    var_name = make_var_name(device, scene)
+    SceneFactoryJournal().record(var_name, build_cmd_from_msg(msg), sanitize_var_name(device.name))
+    print(f"✅ Added or updated command '{var_name}' (journaled for the factories).")
+    return var_name
+
+@traced("capture.extract_from_log")
+def extract_and_generate_mqtt_payload(device: GoveeDevice, scene: GoveeDIYScene, since_offset: int) -> bool:
+    """
+    Journal the newest scene message this capture session logged for `device`.
+
+    Args:
+        device (GoveeDevice): The device being captured.
+        scene (GoveeDIYScene): The scene being captured.
+        since_offset (int): Size of the log before the observer was started. The log persists across
+                            sessions, so anything before it belongs to an earlier capture.
+
+    Returns:
+        bool: True if a message was found and journaled.
+    """
     if not os.path.exists(FRIDA_LOG_FILE_PATH):
         print(f"❌ Log file not found: {FRIDA_LOG_FILE_PATH}")
         return False
 
-    with open(FRIDA_LOG_FILE_PATH, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    for line in reversed(lines):
-        entry = extract_json_from_line(line)
-        if entry and "msg" in entry:
-            msg = entry["msg"]
-            if all(k in msg for k in ["accountTopic", "cmd", "data", "transaction", "type"]):
-                cmd = {
-                    "accountTopic": msg["accountTopic"],
-                    "cmd": msg["cmd"],
-                    "transaction": msg["transaction"],
-                    "type": msg["type"]
-                }
-                cmd.update({
-                    k: v for k, v in msg.get("data", {}).items()
-                    if k in ["write", "command", "color", "colorTemInKelvin", "val", "open", "version"]
-                })
-                var_name = make_var_name(device, scene)
-                append_new_commands(var_name, cmd, device, scene)
-                append_mqtt_scene_to_device_factory(var_name, device)
-                print(f"✅ Added or updated command '{var_name}' in factory.")
-                return True
+    reader = FridaLogReader(FRIDA_LOG_FILE_PATH)
+    reader.offset = since_offset
+    correlator = DeviceTopicCorrelator()
+    entry = None
+    for candidate in reader.iter_new_entries():
+        # Same filter as the live stream, plus the device's topic so another device's scene isn't taken
+        if is_scene_message(candidate.msg) and correlator.matches(candidate, device):
+            entry = candidate
+    if entry:
+        generate_mqtt_payload_from_msg(device, scene, entry.msg)
+        return True
 
     print("⚠️ No valid MQTT payloads found in logs.")
     return False
 
+@traced("capture.regenerate_from_archive")
+def regenerate_mqtt_payload_from_archive(
+    device: GoveeDevice,
+    scene: GoveeDIYScene,
+    transaction: Optional[str] = None,
+    since: Optional[float] = None,
+    archive: Optional[CaptureArchive] = None
+) -> Optional[str]:
+    """
+    Regenerate a scene's factory entries from the capture archive instead of a live capture.
+
+    Args:
+        device (GoveeDevice): The device the scene belongs to.
+        scene (GoveeDIYScene): The scene to (re)generate.
+        transaction (str, optional): Use the archived message with this transaction ID.
+                                     Defaults to the newest ptReal scene message for the device.
+        since (float, optional): Only consider messages captured after this `time.time()`.
+        archive (CaptureArchive, optional): Archive to read. Defaults to MQTT_CAPTURE_ARCHIVE_PATH.
+
+    Returns:
+        Optional[str]: The generated variable name, or None if no matching message was archived.
+    """
+    archive = archive or CaptureArchive().load()
+    filters = {"transaction": transaction} if transaction else {"device": device.id, "cmd": "ptReal"}
+    for record in archive.query(since=since, **filters):
+        if is_scene_message(record["msg"]):
+            return generate_mqtt_payload_from_msg(device, scene, record["msg"])
+
+    print(f"⚠️ No archived MQTT payloads found for {device.name}.")
+    return None
+
 def main():
     pass
 
@@ -0,0 +1,199 @@
+# scripts/frida_log_reader.py
+
+# ==============================================================================
+# Govee LAN API Plus – Incremental Frida Log Reader
+# -------------------------------------------------
+#
+# Description:
+# Reads MQTT messages from the Frida observer log without re-reading the whole
+# file every time it changes.
+#
+# The observer writes each intercepted publish as two lines:
+#
+#   [MQTT] Publishing (MqttMessage) to topic: GD/abc123...
+#   Message: {"msg": {"cmd": "ptReal", ...}}
+#
+# FridaLogReader remembers the byte offset it has consumed up to, and on each
+# call only reads bytes appended since then, parsing complete lines only (a
+# partially written trailing line is left for the next call). For the "most
+# recent message" case it seeks backwards from the end of the file in blocks
+# and stops at the first match, so the cost no longer grows with log size.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import json
+from typing import Callable, Iterator, List, Optional
+
+TOPIC_MARKER = b"to topic: "
+MESSAGE_MARKER = b"Message: "
+BLOCK_SIZE = 64 * 1024
+
+
+class MqttLogEntry:
+    """A single MQTT message parsed from the Frida log."""
+
+    __slots__ = ("topic", "msg", "offset")
+
+    def __init__(self, topic: Optional[str], msg: dict, offset: int):
+        """
+        Initialize an MqttLogEntry.
+
+        Args:
+            topic (str, optional): MQTT topic the message was published to, if logged.
+            msg (dict): The parsed `msg` object (accountTopic, cmd, data, transaction, type, ...).
+            offset (int): Byte offset of the message line in the log file.
+        """
+        self.topic = topic
+        self.msg = msg
+        self.offset = offset
+
+    @property
+    def cmd(self) -> Optional[str]:
+        return self.msg.get("cmd")
+
+    def __repr__(self) -> str:
+        return f"MqttLogEntry(cmd='{self.cmd}', topic='{self.topic}', offset={self.offset})"
+
+
+def parse_message_line(line: bytes) -> Optional[dict]:
+    """
+    Parse the JSON `msg` object out of a "Message: {...}" log line.
+
+    Returns:
+        Optional[dict]: The `msg` object, or None if the line isn't a valid MQTT message.
+    """
+    index = line.find(MESSAGE_MARKER)
+    if index < 0:
+        return None
+    try:
+        entry = json.loads(line[index + len(MESSAGE_MARKER):])
+    except Exception:
+        return None
+    if isinstance(entry, dict) and isinstance(entry.get("msg"), dict):
+        return entry["msg"]
+    return None
+
+
+def parse_topic_line(line: bytes) -> Optional[str]:
+    """Return the topic from a "[MQTT] Publishing ... to topic: X" line, or None."""
+    index = line.find(TOPIC_MARKER)
+    if index < 0:
+        return None
+    return line[index + len(TOPIC_MARKER):].strip().decode("utf-8", errors="replace")
+
+
+def is_scene_message(msg: dict) -> bool:
+    """True if an MQTT `msg` has everything needed to build a GoveeMqttDiyScene."""
+    return all(k in msg for k in ["accountTopic", "cmd", "data", "transaction", "type"])
+
+
+class FridaLogReader:
+    """Incremental, offset-tracking reader for the Frida MQTT log."""
+
+    def __init__(self, log_path: str, from_end: bool = False):
+        """
+        Initialize a FridaLogReader.
+
+        Args:
+            log_path (str): Path to the Frida log file.
+            from_end (bool): If True, skip everything already in the file and only read new messages.
+        """
+        self.log_path = log_path
+        self.offset = 0
+        self._topic = None
+
+        if from_end and os.path.exists(log_path):
+            self.offset = os.path.getsize(log_path)
+
+    def read_new_entries(self) -> List[MqttLogEntry]:
+        """
+        Parse messages appended since the last call.
+
+        Returns:
+            List[MqttLogEntry]: New messages in log order. Empty if nothing new (or no log yet).
+        """
+        return list(self.iter_new_entries())
+
+    def iter_new_entries(self) -> Iterator[MqttLogEntry]:
+        """Yield messages appended since the last call, advancing the offset as complete lines are consumed."""
+        if not os.path.exists(self.log_path):
+            return
+
+        size = os.path.getsize(self.log_path)
+        if size < self.offset:
+            # The log was truncated (e.g. the observer restarted); start over
+            self.offset = 0
+            self._topic = None
+        if size == self.offset:
+            return
+
+        with open(self.log_path, "rb") as f:
+            f.seek(self.offset)
+            while True:
+                line_start = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                if not line.endswith(b"\n"):
+                    break  # Incomplete line still being written
+
+                self.offset = line_start + len(line)
+
+                topic = parse_topic_line(line)
+                if topic is not None:
+                    self._topic = topic
+                    continue
+
+                msg = parse_message_line(line)
+                if msg is not None:
+                    yield MqttLogEntry(self._topic, msg, line_start)
+                    self._topic = None
+
+    def latest_entry(self, predicate: Callable[[dict], bool] = is_scene_message) -> Optional[MqttLogEntry]:
+        """
+        Find the most recent message matching `predicate` by scanning backwards from the end of the log.
+
+        Args:
+            predicate (Callable[[dict], bool]): Filter applied to each `msg`. Defaults to valid scene messages.
+
+        Returns:
+            Optional[MqttLogEntry]: The newest matching message, or None.
+        """
+        if not os.path.exists(self.log_path):
+            return None
+
+        with open(self.log_path, "rb") as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            remainder = b""
+            pending = None  # Newest matching message whose topic line hasn't been seen yet
+
+            while position > 0:
+                read_size = min(BLOCK_SIZE, position)
+                position -= read_size
+                f.seek(position)
+                chunk = f.read(read_size) + remainder
+
+                lines = chunk.split(b"\n")
+                # The first piece may be the tail of a line that starts in an earlier block
+                remainder = lines.pop(0) if position > 0 else b""
+                line_offset = position + len(remainder) + (1 if position > 0 else 0)
+                offsets = []
+                for line in lines:
+                    offsets.append(line_offset)
+                    line_offset += len(line) + 1
+
+                for line, offset in zip(reversed(lines), reversed(offsets)):
+                    if pending is not None:
+                        if line.strip():
+                            pending.topic = parse_topic_line(line)
+                            return pending
+                        continue
+                    msg = parse_message_line(line)
+                    if msg is not None and predicate(msg):
+                        pending = MqttLogEntry(None, msg, offset)
+
+            return pending
@@ -0,0 +1,196 @@
+# scripts/frida_log_writer.py
+
+# ==============================================================================
+# Govee LAN API Plus – Buffered Frida Log Writer
+# ----------------------------------------------
+#
+# Description:
+# Group-commit writer for the Frida observer log. Writing, flushing and
+# fsync'ing the log for every intercepted MQTT message stalls Frida's message
+# callback on disk I/O whenever the app publishes a burst of messages.
+#
+# BufferedLogWriter instead:
+# - Accepts events from any thread into a bounded queue (never blocking the
+#   caller; events are counted as dropped if the writer falls that far behind).
+# - Batches queued events on a background thread and writes them through a
+#   file handle that stays open for the whole session.
+# - Flushes (and optionally fsyncs) when FRIDA_LOG_FLUSH_INTERVAL seconds have
+#   passed or FRIDA_LOG_FLUSH_BYTES are pending, whichever comes first.
+# - Rotates the log by size (log → log.1 → log.2 ...) instead of truncating it
+#   every time the observer starts.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import time
+import queue
+import threading
+
+# Configurable via .env
+FRIDA_LOG_QUEUE_SIZE = int(os.getenv("FRIDA_LOG_QUEUE_SIZE", 10000))
+FRIDA_LOG_FLUSH_INTERVAL = float(os.getenv("FRIDA_LOG_FLUSH_INTERVAL", 0.5))
+FRIDA_LOG_FLUSH_BYTES = int(os.getenv("FRIDA_LOG_FLUSH_BYTES", 64 * 1024))
+FRIDA_LOG_FSYNC = os.getenv("FRIDA_LOG_FSYNC", "true").lower() == "true"
+FRIDA_LOG_MAX_BYTES = int(os.getenv("FRIDA_LOG_MAX_BYTES", 10 * 1024 * 1024))
+FRIDA_LOG_BACKUP_COUNT = int(os.getenv("FRIDA_LOG_BACKUP_COUNT", 3))
+
+_STOP = object()
+
+
+class BufferedLogWriter:
+    """Background, group-committing, size-rotating append-only log writer."""
+
+    def __init__(
+        self,
+        path: str,
+        queue_size: int = FRIDA_LOG_QUEUE_SIZE,
+        flush_interval: float = FRIDA_LOG_FLUSH_INTERVAL,
+        flush_bytes: int = FRIDA_LOG_FLUSH_BYTES,
+        fsync: bool = FRIDA_LOG_FSYNC,
+        max_bytes: int = FRIDA_LOG_MAX_BYTES,
+        backup_count: int = FRIDA_LOG_BACKUP_COUNT
+    ):
+        """
+        Initialize a BufferedLogWriter.
+
+        Args:
+            path (str): Log file to append to.
+            queue_size (int): Maximum events waiting to be written.
+            flush_interval (float): Max seconds an event may sit unflushed.
+            flush_bytes (int): Flush as soon as this many bytes are pending.
+            fsync (bool): fsync on every flush (durable) or leave it to the OS (faster).
+            max_bytes (int): Rotate once the log would grow past this size. 0 disables rotation.
+            backup_count (int): Rotated logs to keep (log.1 is the newest).
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.fsync = fsync
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.rotations = 0
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._file = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def start(self) -> None:
+        """Open the log for appending and start the writer thread."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, event: str) -> bool:
+        """
+        Queue an event for writing. Never blocks.
+
+        Returns:
+            bool: False if the queue was full and the event was dropped.
+        """
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def close(self) -> None:
+        """Write everything still queued, flush, and stop the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        self._file.close()
+        if self.dropped:
+            print(f"⚠️  Frida log writer dropped {self.dropped} events (queue full).")
+
+    # --------------------------------------------------------------------------
+    # Writer thread
+    # --------------------------------------------------------------------------
+
+    def _run(self) -> None:
+        pending = []
+        pending_bytes = 0
+        flush_at = None
+
+        while True:
+            timeout = None if flush_at is None else max(0.0, flush_at - time.monotonic())
+            try:
+                event = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                event = None
+
+            if event is _STOP:
+                self._flush(pending)
+                return
+
+            if event is not None:
+                data = event.encode("utf-8")
+                pending.append(data)
+                pending_bytes += len(data)
+                if flush_at is None:
+                    flush_at = time.monotonic() + self.flush_interval
+
+                # Pick up whatever else is already waiting without blocking
+                while pending_bytes < self.flush_bytes:
+                    try:
+                        event = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if event is _STOP:
+                        self._flush(pending)
+                        return
+                    data = event.encode("utf-8")
+                    pending.append(data)
+                    pending_bytes += len(data)
+
+            if pending and (pending_bytes >= self.flush_bytes or time.monotonic() >= flush_at):
+                self._flush(pending)
+                pending = []
+                pending_bytes = 0
+                flush_at = None
+
+    def _flush(self, pending: list) -> None:
+        if not pending:
+            return
+        batch = b"".join(pending)
+        try:
+            if self.max_bytes and self._file.tell() > 0 and self._file.tell() + len(batch) > self.max_bytes:
+                self._rotate()
+            self._file.write(batch)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.written += len(pending)
+            self.flushes += 1
+        except Exception as e:
+            print(f"❌ Error writing to log file: {e}")
+
+    def _rotate(self) -> None:
+        self._file.close()
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{i}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "ab")
+        self.rotations += 1
+
@@ -0,0 +1,193 @@
+# scripts/frida_mqtt_stream.py
+
+# ==============================================================================
+# Govee LAN API Plus – Frida MQTT Stream
+# --------------------------------------
+#
+# Description:
+# Streams MQTT messages intercepted by the Frida observer straight to the
+# scene extractor, instead of going through the log file, a filesystem
+# watcher, a fixed delay and a re-read of the log.
+#
+# The observer parses each Frida message once and publishes it either onto an
+# in-process queue (QueueMqttStream) or, when it runs as a subprocess (as the
+# wizard's capture step does), as a JSON datagram to a local UDP port
+# (UdpMqttStream). The wizard listens on that port (MqttStreamListener) and
+# hands each scene message to the factory generator as soon as it arrives.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import json
+import time
+import queue
+import socket
+import threading
+from typing import Callable, Optional
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.govee_device import GoveeDevice
+from models.govee_diy_scene import GoveeDIYScene
+from scripts.frida_log_reader import MqttLogEntry, parse_message_line, parse_topic_line, is_scene_message
+
+# Configurable via .env
+FRIDA_STREAM_PORT = int(os.getenv("FRIDA_STREAM_PORT", 27043))
+
+STREAM_ADDRESS = ("127.0.0.1", FRIDA_STREAM_PORT)
+
+
+def parse_frida_payload(payload: str) -> Optional[MqttLogEntry]:
+    """
+    Parse a raw Frida `send()` payload ("[MQTT] Publishing ... to topic: X\\nMessage: {...}").
+
+    Args:
+        payload (str): The payload string sent by frida_log_mqtt_uri.js.
+
+    Returns:
+        Optional[MqttLogEntry]: The parsed message (offset -1), or None if it isn't a JSON MQTT message.
+    """
+    topic = None
+    for line in payload.encode("utf-8").split(b"\n"):
+        parsed_topic = parse_topic_line(line)
+        if parsed_topic is not None:
+            topic = parsed_topic
+            continue
+        msg = parse_message_line(line)
+        if msg is not None:
+            return MqttLogEntry(topic, msg, -1)
+    return None
+
+
+class QueueMqttStream:
+    """Publishes parsed MQTT messages onto an in-process queue."""
+
+    def __init__(self, target: Optional[queue.Queue] = None):
+        self.queue = target if target is not None else queue.Queue()
+
+    def publish(self, entry: MqttLogEntry) -> None:
+        self.queue.put((time.time(), entry))
+
+    def close(self) -> None:
+        pass
+
+
+class UdpMqttStream:
+    """Publishes parsed MQTT messages as JSON datagrams to a local listener (e.g. the wizard)."""
+
+    def __init__(self, address=STREAM_ADDRESS):
+        self.address = address
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def publish(self, entry: MqttLogEntry) -> None:
+        datagram = json.dumps({"published_at": time.time(), "topic": entry.topic, "msg": entry.msg})
+        try:
+            self._sock.sendto(datagram.encode("utf-8"), self.address)
+        except OSError as e:
+            print(f"⚠️  Failed to stream MQTT message: {e}")
+
+    def close(self) -> None:
+        self._sock.close()
+
+
+class MqttStreamListener:
+    """Receives messages published by UdpMqttStream into a queue of (published_at, MqttLogEntry)."""
+
+    def __init__(self, address=STREAM_ADDRESS):
+        """
+        Initialize and bind the listener.
+
+        Args:
+            address (tuple): Local (host, port) to listen on. Defaults to FRIDA_STREAM_PORT on loopback.
+        """
+        self.queue = queue.Queue()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind(address)
+        self._sock.settimeout(0.2)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                data, _ = self._sock.recvfrom(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            try:
+                message = json.loads(data.decode("utf-8"))
+            except Exception:
+                continue
+            self.queue.put((message.get("published_at", time.time()), MqttLogEntry(message.get("topic"), message["msg"], -1)))
+
+    def drain(self) -> None:
+        """Discard anything received so far (e.g. app chatter before the user triggers a scene)."""
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._sock.close()
+
+
+def wait_for_stream_message(
+    stream_queue: queue.Queue,
+    device: GoveeDevice,
+    scene: GoveeDIYScene,
+    timeout=60,
+    on_captured: Optional[Callable[[GoveeDevice, GoveeDIYScene, dict], object]] = None
+) -> bool:
+    """
+    Waits for a scene message on the stream and generates its factory entries as soon as it arrives.
+
+    Args:
+        stream_queue (queue.Queue): Queue fed by QueueMqttStream or MqttStreamListener.
+        device (GoveeDevice): The selected Govee device object.
+        scene (GoveeDIYScene): The scene object selected by the user.
+        timeout (int): Max time to wait for scene trigger (in seconds).
+        on_captured (Callable, optional): Called with (device, scene, msg) to store the capture.
+                                          Defaults to `generate_mqtt_payload_from_msg`.
+
+    Returns:
+        bool: True if a scene was captured and generated.
+    """
+    from scripts.frida_govee_mqtt_extractor import generate_mqtt_payload_from_msg
+    from scripts.log_monitor import listen_for_cancel
+
+    cancelled = threading.Event()
+    input_thread = threading.Thread(target=listen_for_cancel, args=(cancelled,))
+    input_thread.daemon = True
+    input_thread.start()
+
+    print("⏳ Waiting for MQTT scene trigger... (press Enter to cancel)")
+    deadline = time.time() + timeout
+    try:
+        while not cancelled.is_set():
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                print("⚠️ Timeout: No scene trigger detected.")
+                return False
+            try:
+                published_at, entry = stream_queue.get(timeout=min(remaining, 0.1))
+            except queue.Empty:
+                continue
+            if not is_scene_message(entry.msg):
+                continue
+
+            print(f"📡 Received MQTT payload ({(time.time() - published_at) * 1000:.1f} ms after capture)")
+            (on_captured or generate_mqtt_payload_from_msg)(device, scene, entry.msg)
+            print("✅ Scene generated. Returning to scene list.")
+            return True
+        return False
+    finally:
+        cancelled.set()
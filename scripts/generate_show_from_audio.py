@@ -0,0 +1,81 @@
+# scripts/generate_show_from_audio.py
+
+# ==============================================================================
+# Govee LAN API Plus – Show Generator
+# -----------------------------------
+#
+# Description:
+# Analyses a WAV file (tempo, beats, onsets, sections) and writes a first-draft
+# show timeline for it, mapping sections to captured MQTT DIY scenes and beats
+# to brightness pulses across device groups. Edit the result by hand, then play
+# it with `scripts/play_show.py`.
+#
+# Usage:
+#   python3 scripts/generate_show_from_audio.py song.wav
+#   python3 scripts/generate_show_from_audio.py song.wav --groups shows/groups.json --out shows/song.json
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import json
+import time
+import argparse
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from show.audio_analysis import analyze_audio
+from show.audio_timeline import build_timeline, default_groups, load_groups
+from show.show_timeline import compile_show, load_factory_namespace
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a show timeline from a WAV file.")
+    parser.add_argument("audio", help="PCM WAV file")
+    parser.add_argument("--out", help="Timeline to write (default: shows/<audio name>.json)")
+    parser.add_argument("--groups", help="Groups file mapping groups to devices and scenes")
+    parser.add_argument("--beats-per-bar", type=int, default=4)
+    parser.add_argument("--name", help="Show name (default: the audio file name)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    analysis = analyze_audio(args.audio, beats_per_bar=args.beats_per_bar)
+    elapsed = time.perf_counter() - started
+    print(f"🎵 {os.path.basename(args.audio)}: {analysis.duration:.1f} s, {analysis.tempo:.1f} BPM, "
+          f"{len(analysis.beats)} beats, {len(analysis.onsets)} onsets, {len(analysis.sections)} sections "
+          f"(analysed in {elapsed:.2f} s)")
+    for start, end, energy in analysis.sections:
+        print(f"  {start:>7.2f} – {end:>7.2f} s  energy {'▮' * max(1, round(energy * 10))}")
+
+    devices, scenes = load_factory_namespace()
+    if args.groups:
+        groups, group_scenes = load_groups(args.groups)
+    else:
+        groups, group_scenes = default_groups(devices)
+    if not groups:
+        print("⚠️  No devices with captured MQTT DIY scenes in the factories; pass --groups to choose devices.")
+        return
+
+    name = args.name or os.path.splitext(os.path.basename(args.audio))[0]
+    timeline = build_timeline(analysis, groups, group_scenes, name=name, beats_per_bar=args.beats_per_bar, audio=args.audio)
+    try:
+        cues = compile_show(timeline, devices, scenes)  # Catch unknown devices or scenes before writing
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+
+    out = args.out or os.path.join("shows", f"{name}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(timeline, f, indent=4)
+    print(f"✅ Wrote {out}: {len(timeline['cues'])} timeline cues ({len(cues)} packets) for {len(groups)} groups")
+
+
+if __name__ == "__main__":
+    main()
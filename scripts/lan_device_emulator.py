@@ -0,0 +1,194 @@
+# scripts/lan_device_emulator.py
+
+# ==============================================================================
+# Govee LAN API Plus – LAN Device Emulator
+# ----------------------------------------
+#
+# Description:
+# Emulates one or more Govee LAN devices on this machine so the LAN tools can
+# be exercised and measured without real lights.
+#
+# Each emulated device binds its own loopback address (127.0.0.2, 127.0.0.3, ...)
+# on the LAN command port, keeps a simple power/brightness/color state, replies
+# to `devStatus` and `scan` requests on the sender's LAN response port, and
+# records every packet it receives (with arrival time) for later inspection.
+#
+# NOTE: Linux routes all of 127.0.0.0/8 to loopback out of the box. On macOS
+#       each extra address needs an alias first, e.g.:
+#       sudo ifconfig lo0 alias 127.0.0.2 up
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import json
+import time
+import random
+import socket
+import threading
+from typing import List
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.govee_device import GoveeDevice
+
+# Configurable via .env
+LAN_IP_ADDRESS_HELPER_RECEIVE_PORT = int(os.getenv("LAN_IP_ADDRESS_HELPER_RECEIVE_PORT", 4002))
+LAN_EMULATOR_BASE_IP = os.getenv("LAN_EMULATOR_BASE_IP", "127.0.0.")
+LAN_EMULATOR_DEVICE_PORT = int(os.getenv("LAN_EMULATOR_DEVICE_PORT", 4003))
+
+
+class EmulatedGoveeDevice:
+    """A single emulated Govee device listening for LAN commands on its own address."""
+
+    def __init__(self, device: GoveeDevice, response_port: int = LAN_IP_ADDRESS_HELPER_RECEIVE_PORT, drop_rate: float = 0.0):
+        """
+        Initialize an emulated device.
+
+        Args:
+            device (GoveeDevice): The device to emulate. Its `ip` and `port` are bound.
+            response_port (int): Port on the sender to reply to (usually 4002).
+            drop_rate (float): Probability (0-1) of silently dropping each incoming packet,
+                               to stand in for a lossy Wi-Fi link.
+        """
+        self.device = device
+        self.response_port = response_port
+        self.drop_rate = drop_rate
+        self.dropped = 0
+
+        self.state = {
+            "onOff": 1,
+            "brightness": 100,
+            "color": {"r": 255, "g": 255, "b": 255},
+            "colorTemInKelvin": 0,
+        }
+        self.received = []  # List of (arrival perf_counter, message dict) tuples
+
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((device.ip, device.port))
+        self._sock.settimeout(0.2)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._sock.close()
+
+    def _reply(self, addr, msg: dict) -> None:
+        self._sock.sendto(json.dumps({"msg": msg}).encode("utf-8"), (addr[0], self.response_port))
+
+    def _handle(self, message: dict, addr) -> None:
+        msg = message.get("msg", {})
+        cmd = msg.get("cmd")
+        data = msg.get("data", {})
+
+        if cmd == "devStatus":
+            self._reply(addr, {"cmd": "devStatus", "data": dict(self.state)})
+        elif cmd == "scan":
+            self._reply(addr, {"cmd": "scan", "data": {
+                "ip": self.device.ip,
+                "device": self.device.id,
+                "sku": self.device.sku,
+                "device_name": self.device.name,
+            }})
+        elif cmd == "turn":
+            self.state["onOff"] = int(data.get("value", 0))
+        elif cmd == "brightness":
+            self.state["brightness"] = int(data.get("value", 0))
+        elif cmd == "colorwc":
+            if "color" in data:
+                self.state["color"] = data["color"]
+            self.state["colorTemInKelvin"] = int(data.get("colorTemInKelvin", 0))
+
+    def _serve(self) -> None:
+        while not self._stop.is_set():
+            try:
+                data, addr = self._sock.recvfrom(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            if self.drop_rate and random.random() < self.drop_rate:
+                self.dropped += 1
+                continue
+
+            arrived_at = time.perf_counter()
+            try:
+                message = json.loads(data.decode("utf-8"))
+            except Exception:
+                continue
+
+            self.received.append((arrived_at, message))
+            self._handle(message, addr)
+
+
+class GoveeLanEmulator:
+    """A group of emulated Govee devices on consecutive loopback addresses."""
+
+    def __init__(self, count: int, first_host: int = 2, port: int = LAN_EMULATOR_DEVICE_PORT, drop_rate: float = 0.0):
+        """
+        Initialize the emulator.
+
+        Args:
+            count (int): Number of devices to emulate.
+            first_host (int): Last octet of the first device's loopback address.
+            port (int): LAN command port each device listens on.
+            drop_rate (float): Probability (0-1) of each device dropping an incoming packet.
+        """
+        self.emulated = []
+        for i in range(count):
+            device = GoveeDevice(
+                f"EM:UL:AT:ED:00:00:{i // 256:02X}:{i % 256:02X}",
+                f"Emulated Light {i + 1}",
+                "H0000",
+                ip=f"{LAN_EMULATOR_BASE_IP}{first_host + i}"
+            )
+            device.port = port
+            self.emulated.append(EmulatedGoveeDevice(device, drop_rate=drop_rate))
+
+    @property
+    def devices(self) -> List[GoveeDevice]:
+        return [e.device for e in self.emulated]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self) -> None:
+        for e in self.emulated:
+            e.start()
+
+    def stop(self) -> None:
+        for e in self.emulated:
+            e.stop()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    drop_rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    print(f"🧪 Starting {count} emulated Govee devices (drop rate {drop_rate:.0%})...")
+    with GoveeLanEmulator(count, drop_rate=drop_rate) as emulator:
+        for d in emulator.devices:
+            print(f"✅ {d.name}: {d.ip}:{d.port} ({d.id})")
+        print("⏳ Emulator running. Press Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print("\n🛑 Stopping emulator...")
+
+
+if __name__ == "__main__":
+    main()
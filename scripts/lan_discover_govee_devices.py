@@ -21,6 +21,10 @@ import time
 import os
 from dotenv import load_dotenv
 
+from api.lan.packet_capture import capture_lan_send
+from api.metrics import LAN_DISCOVERY_DEVICES, LAN_DISCOVERY_RESPONSES, LAN_DISCOVERY_SCANS, record_lan_send
+from api.tracing import traced
+
 # Load environment variables
 load_dotenv()
 
@@ -41,6 +45,7 @@ SCAN_MESSAGE = json.dumps({
 }).encode("utf-8")
 
 
+@traced("lan.discover")
 def discover_govee_devices():
     """Sends a multicast discovery packet and listens for Govee LAN device responses."""
     print(f"📡 Sending scan request to {LAN_IP_ADDRESS_HELPER_MULTICAST_GROUP}:{LAN_IP_ADDRESS_HELPER_SEND_PORT}...")
@@ -50,6 +55,9 @@ def discover_govee_devices():
     send_sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 2)
     send_sock.sendto(SCAN_MESSAGE, (LAN_IP_ADDRESS_HELPER_MULTICAST_GROUP, LAN_IP_ADDRESS_HELPER_SEND_PORT))
     send_sock.close()
+    record_lan_send(LAN_IP_ADDRESS_HELPER_MULTICAST_GROUP, len(SCAN_MESSAGE))
+    capture_lan_send((LAN_IP_ADDRESS_HELPER_MULTICAST_GROUP, LAN_IP_ADDRESS_HELPER_SEND_PORT), SCAN_MESSAGE)
+    LAN_DISCOVERY_SCANS.inc()
 
     # Listen for responses from devices
     recv_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -64,6 +72,7 @@ def discover_govee_devices():
     while time.time() - start < LAN_IP_ADDRESS_HELPER_TIMEOUT:
         try:
             data, addr = recv_sock.recvfrom(2048)
+            LAN_DISCOVERY_RESPONSES.inc()
             response = json.loads(data.decode("utf-8"))
             ip = addr[0]
             device_info = response.get("msg", {}).get("data", {})
@@ -84,6 +93,7 @@ def discover_govee_devices():
             print(f"⚠️  Error decoding response: {e}")
 
     recv_sock.close()
+    LAN_DISCOVERY_DEVICES.set(len(found_devices))
     return found_devices
 
 
@@ -0,0 +1,51 @@
+# scripts/lan_prewarm_devices.py
+
+# ==============================================================================
+# Govee LAN API Plus – LAN Pre-Warm Runner
+# ----------------------------------------
+#
+# Description:
+# Standalone runner for the LAN pre-warm phase. Loads every device from the
+# generated device factory, touches each one with a `devStatus` request and
+# keeps them warm until the user presses Enter, printing which devices were
+# slow or unreachable.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from api.lan.prewarm_devices import DevicePrewarmer
+
+
+def main():
+    from factories.device_factory import all_devices
+
+    devices = [d for d in all_devices if d.ip]
+    if not devices:
+        print("❌ No devices with LAN IPs found in device_factory.py. Run 'Refresh Device IP Addresses' first.")
+        return
+
+    prewarmer = DevicePrewarmer(devices)
+    print(f"🔥 Pre-warming {len(devices)} devices every {prewarmer.interval:.0f}s...")
+    prewarmer.start()
+
+    input("⏳ Keeping devices warm. Press Enter to stop.\n")
+    prewarmer.stop()
+
+    for device in devices:
+        entry = prewarmer.report.get(device.id, {})
+        rtt = f"{entry['rtt'] * 1000:.1f} ms" if entry.get("rtt") is not None else "-"
+        print(f"{device.name} ({device.ip}): {entry.get('state', 'unknown')} {rtt}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# scripts/mqtt_payload_dedupe_report.py
+
+# ==============================================================================
+# Govee LAN API Plus – MQTT Payload Dedupe Report
+# -----------------------------------------------
+#
+# Description:
+# Reports how much the content-addressed MQTT payload store saves across the
+# captured scenes (distinct payloads, dedupe ratio, disk and memory saved),
+# and with `--migrate` moves scenes that still embed their `command` list in
+# device_mqtt_diy_scene_factory.py over to `command_hash` references.
+#
+# Usage: python3 scripts/mqtt_payload_dedupe_report.py [--migrate]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import json
+import argparse
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import scripts.frida_govee_mqtt_extractor as extractor
+from scripts.scene_factory_journal import atomic_write_lines
+from models.govee_mqtt_diy_scene import GoveeMqttDiyScene
+from models.mqtt_payload_store import default_payload_store, payload_hash
+
+HASH_REFERENCE_BYTES = len("command_hash=''") + 64
+
+
+def payload_memory(command: list) -> int:
+    """Approximate in-memory size of one `command` list and its strings."""
+    return sys.getsizeof(command) + sum(sys.getsizeof(c) for c in command)
+
+
+def dedupe_report(scenes: dict) -> dict:
+    """
+    Summarize payload duplication across scenes.
+
+    Args:
+        scenes (dict): {name: GoveeMqttDiyScene}.
+
+    Returns:
+        dict: Scene/payload counts, dedupe ratio, and disk/memory bytes with and without dedupe.
+    """
+    unique = {}
+    inline_disk = 0
+    inline_memory = 0
+    for scene in scenes.values():
+        command = scene.command or []
+        unique.setdefault(payload_hash(command), command)
+        inline_disk += len(f"command={json.dumps(command)}")
+        inline_memory += payload_memory(command)
+
+    stored_disk = sum(len(json.dumps(c)) + 64 for c in unique.values()) + HASH_REFERENCE_BYTES * len(scenes)
+    stored_memory = sum(payload_memory(c) for c in unique.values())
+    return {
+        "scenes": len(scenes),
+        "unique_payloads": len(unique),
+        "dedupe_ratio": len(scenes) / len(unique) if unique else 1.0,
+        "disk_bytes": {"inline": inline_disk, "stored": stored_disk, "saved": inline_disk - stored_disk},
+        "memory_bytes": {"inline": inline_memory, "interned": stored_memory, "saved": inline_memory - stored_memory},
+    }
+
+
+def migrate_scene_factory(scenes: dict) -> int:
+    """
+    Rewrite scenes that embed their `command` as `command_hash` references to the payload store.
+
+    Returns:
+        int: Number of scenes migrated.
+    """
+    scene_blocks = extractor.parse_scene_blocks(extractor.read_scene_factory_lines())
+    migrated = 0
+    for name, scene in scenes.items():
+        if scene.command_hash is None and name in scene_blocks and scene.command is not None:
+            scene_blocks[name] = extractor.build_scene_block(name, {
+                "accountTopic": scene.accountTopic,
+                "cmd": scene.cmd,
+                "transaction": scene.transaction,
+                "type": scene.type,
+                "write": scene.write,
+                "command": scene.command,
+            })
+            migrated += 1
+
+    if migrated:
+        default_payload_store().save()
+        atomic_write_lines(extractor.DEVICE_MQTT_DIY_SCENE_FACTORY_FILE_PATH, extractor.render_scene_factory(scene_blocks))
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report (and optionally apply) MQTT payload deduplication.")
+    parser.add_argument("--migrate", action="store_true", help="Move inline command lists into the payload store")
+    args = parser.parse_args()
+
+    import factories.device_mqtt_diy_scene_factory as mqtt_scene_factory
+    scenes = {name: scene for name, scene in vars(mqtt_scene_factory).items() if isinstance(scene, GoveeMqttDiyScene)}
+
+    report = dedupe_report(scenes)
+    print(f"📦 {report['scenes']} scenes, {report['unique_payloads']} distinct payloads "
+          f"(dedupe ratio {report['dedupe_ratio']:.2f}x)")
+    for kind, label in (("disk_bytes", "Disk"), ("memory_bytes", "Memory")):
+        sizes = list(report[kind].values())
+        print(f"   {label:<7} {sizes[0]:>10,} B inline → {sizes[1]:>10,} B deduplicated ({sizes[2]:,} B saved)")
+
+    if args.migrate:
+        print(f"✅ Migrated {migrate_scene_factory(scenes)} scenes to payload store references.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# scripts/play_show.py
+
+# ==============================================================================
+# Govee LAN API Plus – Show Runner
+# --------------------------------
+#
+# Description:
+# Plays a show timeline JSON file against the devices in the generated
+# factories. Devices are pre-warmed before the first cue and the run's jitter
+# report is written next to the show file.
+#
+# --trace writes a Chrome trace of the run (view it in https://ui.perfetto.dev
+# or summarize it with `scripts/trace_timeline.py`); --profile writes sampled
+# stacks tagged with the active spans, in the collapsed flamegraph format.
+# --capture records every packet sent for `scripts/replay_capture.py`.
+# --restore snapshots the show's devices before playing and puts them back
+# afterwards (see api/lan/device_snapshot.py). --reload swaps every saved
+# edit of the show file into the running show (see show/show_reload.py); on a
+# multi-node leader only the leader's own cues are reloaded.
+#
+# Multi-node shows (see show/show_sync.py): the leader runs with --lead and
+# the number of followers to wait for; each follower runs with --follow and
+# the leader's address, and gets the show from the leader. Every node plays
+# only its own devices, on the leader's clock.
+#
+# Usage: python3 scripts/play_show.py shows/halloween.json [--trace trace.json] [--profile stacks.txt] [--capture show.glpc]
+#        python3 scripts/play_show.py shows/street.json --lead 1 --node house_a
+#        python3 scripts/play_show.py --follow 192.168.1.20 --node house_b
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import time
+import socket
+import argparse
+import contextlib
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Tracing has to be switched on before the API modules are imported
+if any(arg.startswith(("--trace", "--profile")) for arg in sys.argv[1:]):
+    os.environ["GOVEE_TRACING"] = "true"
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from api.lan.prewarm_devices import DevicePrewarmer
+from show.show_timeline import load_show, compile_show
+from show.show_player import ShowPlayer
+from show.show_reload import ShowReloader
+from show.show_sync import ShowFollower, ShowLeader, node_show
+from api.tracing import ChromeTraceWriter, SamplingProfiler
+from api.lan.packet_capture import PacketRecorder
+from api.lan.device_snapshot import restore_snapshot, take_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a show timeline against the factory devices.")
+    parser.add_argument("show", nargs="?", help="Show timeline JSON file (not needed with --follow)")
+    parser.add_argument("--trace", help="Write a Chrome trace of the run to this file")
+    parser.add_argument("--profile", help="Write sampled stacks (collapsed format) to this file")
+    parser.add_argument("--capture", help="Record every packet sent to this capture file")
+    parser.add_argument("--reload", action="store_true", help="Watch the show file and swap edits into the running show")
+    parser.add_argument("--restore", action="store_true", help="Put the show's devices back the way they were once the show ends")
+    parser.add_argument("--lead", type=int, metavar="FOLLOWERS", help="Lead a multi-node show once this many followers have joined")
+    parser.add_argument("--follow", metavar="LEADER", help="Follow the multi-node show led from this address")
+    parser.add_argument("--node", help="This node's name under the show's \"nodes\" (default: 'leader' or the hostname)")
+    args = parser.parse_args()
+    if not args.show and not args.follow:
+        parser.error("a show file is required unless following a leader")
+    if args.reload and args.follow:
+        parser.error("--reload needs the show file, which followers get from the leader")
+
+    leader = follower = reloader = None
+    clock = time.monotonic
+    show_path = args.show
+    if args.follow:
+        node = args.node or socket.gethostname()
+        follower = ShowFollower(args.follow, node)
+        show = follower.join()
+        sync = follower.sync
+        print(f"🤝 Joined {args.follow} as '{node}': clock offset {sync.offset * 1000:+.3f} ms "
+              f"(round trip {sync.delay * 1000:.3f} ms, spread {sync.spread * 1000:.3f} ms)")
+        show = node_show(show, node)
+        clock = sync.leader_time
+        show_path = None
+    else:
+        show = load_show(show_path)
+        prepare = None
+        if args.lead is not None:
+            node = args.node or "leader"
+            leader = ShowLeader(show)
+            prepare = lambda timeline: node_show(timeline, node, leader=True)
+            show = prepare(show)
+        if args.reload:
+            reloader = ShowReloader(show_path, prepare=prepare)
+
+    cues = reloader.cues if reloader else compile_show(show)
+    devices = list({id(c.device): c.device for c in cues}.values())
+    print(f"🎬 Loaded '{show.get('name', show_path)}': {len(cues)} cues for {len(devices)} devices")
+
+    snapshot = take_snapshot(devices) if args.restore else None
+    if snapshot:
+        print(f"📸 Saved the state of {len(snapshot)} devices")
+
+    prewarmer = DevicePrewarmer(devices)
+    prewarmer.start()  # First pass runs immediately, then every interval
+
+    player = ShowPlayer(cues, show_path=show_path, show_name=show.get("name", ""), clock=clock)
+    if reloader:
+        reloader.start(player)
+        print(f"👀 Watching {show_path} for changes")
+    try:
+        if leader:
+            print(f"⏳ Waiting for {args.lead} follower(s) on port {leader.port}...")
+            leader.wait_for(args.lead)
+            start_at = leader.start()
+        elif follower:
+            print("⏳ Waiting for the leader to start...")
+            start_at = follower.wait_start()
+        else:
+            start_at = time.monotonic() + 1
+
+        print("▶️  Playing...")
+        with contextlib.ExitStack() as recording:
+            if args.trace:
+                recording.enter_context(ChromeTraceWriter(args.trace, process_name=show.get("name", show_path)))
+            if args.profile:
+                profiler = SamplingProfiler()
+                recording.callback(profiler.write_collapsed, args.profile)  # Runs after the profiler stops
+                recording.enter_context(profiler)
+            if args.capture:
+                recording.enter_context(PacketRecorder(args.capture))
+            report = player.play(start_at=start_at)
+    finally:
+        if reloader:
+            reloader.stop()
+        prewarmer.stop()
+        player.close()
+        if leader:
+            leader.close()
+        if follower:
+            follower.close()
+        if snapshot:
+            restored = restore_snapshot(snapshot, devices)
+            print(f"♻️  Restored {restored['devices']} devices in {restored['seconds'] * 1000:.0f} ms")
+
+    jitter = report["jitter_ms"]
+    print(f"✅ Done. Jitter p50 {jitter['p50']:.3f} ms, p99 {jitter['p99']:.3f} ms, max {jitter['max']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
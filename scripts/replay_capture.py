@@ -0,0 +1,88 @@
+# scripts/replay_capture.py
+
+# ==============================================================================
+# Govee LAN API Plus – Capture Replay
+# -----------------------------------
+#
+# Description:
+# Summarizes a LAN packet capture (recorded with `scripts/play_show.py
+# --capture` or api.lan.packet_capture.PacketRecorder) and replays it with the
+# original inter-packet timing, optionally time-scaled and sent to other
+# devices. `--pcap` also exports the capture for Wireshark.
+#
+# Usage:
+#   python3 scripts/replay_capture.py show.glpc
+#   python3 scripts/replay_capture.py show.glpc --speed 2 --map 192.168.1.20=192.168.1.31
+#   python3 scripts/replay_capture.py show.glpc --targets 127.0.0.2,127.0.0.3
+#   python3 scripts/replay_capture.py show.glpc --pcap show.pcap --no-replay
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import time
+import argparse
+from collections import Counter
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from api.lan.packet_capture import read_capture, write_pcap
+from show.show_player import ShowPlayer
+from show.show_replay import capture_cues, parse_remap, remap_to_targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a LAN packet capture.")
+    parser.add_argument("capture", help="Capture file written by PacketRecorder")
+    parser.add_argument("--speed", type=float, default=1.0, help="Time scale (2 = twice as fast)")
+    parser.add_argument("--map", action="append", default=[], metavar="OLD_IP=NEW_IP[:PORT]",
+                        help="Send packets for one captured IP to another address (repeatable)")
+    parser.add_argument("--targets", help="Comma-separated IPs; captured IPs are assigned to them in order of first use")
+    parser.add_argument("--pcap", help="Also export the capture as pcap to this file")
+    parser.add_argument("--no-replay", action="store_true", help="Only summarize (and export) the capture")
+    args = parser.parse_args()
+
+    started_at, packets = read_capture(args.capture)
+    if not packets:
+        print(f"⚠️  {args.capture} holds no packets.")
+        return
+
+    duration = packets[-1].at - packets[0].at
+    per_ip = Counter(p.ip for p in packets)
+    print(f"📼 {args.capture}: {len(packets)} packets, {sum(len(p.data) for p in packets)} bytes over "
+          f"{duration:.3f} s, recorded {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(started_at))}")
+    for ip, count in per_ip.most_common():
+        print(f"  {ip:<16} {count} packets")
+
+    if args.pcap:
+        write_pcap(packets, started_at, args.pcap)
+        print(f"🦈 Wrote {args.pcap}")
+
+    if args.no_replay:
+        return
+
+    remap = remap_to_targets(packets, [t.strip() for t in args.targets.split(",") if t.strip()]) if args.targets else {}
+    remap.update(parse_remap(args.map))
+    cues = capture_cues(packets, speed=args.speed, remap=remap)
+    for old_ip, (new_ip, port) in remap.items():
+        print(f"  ↪ {old_ip} → {new_ip}{f':{port}' if port else ''}")
+
+    player = ShowPlayer(cues, show_path=args.capture, show_name=f"Replay of {os.path.basename(args.capture)}")
+    try:
+        print(f"▶️  Replaying over {duration / args.speed:.3f} s...")
+        report = player.play(start_at=time.monotonic() + 0.5)
+    finally:
+        player.close()
+
+    jitter = report["jitter_ms"]
+    print(f"✅ Done. Jitter p50 {jitter['p50']:.3f} ms, p99 {jitter['p99']:.3f} ms, max {jitter['max']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+# scripts/scene_factory_journal.py
+
+# ==============================================================================
+# Govee LAN API Plus – MQTT Scene Factory Journal
+# -----------------------------------------------
+#
+# Description:
+# Records captured MQTT DIY scenes as O(1) appends to a journal instead of
+# re-reading, re-parsing and rewriting both generated factories on every
+# capture.
+#
+# Each capture appends (and fsyncs) one JSON line:
+#
+#   {"var_name": "...", "device_var": "...", "cmd": {...}}
+#
+# Compaction folds every journaled capture into
+# `device_mqtt_diy_scene_factory.py` and `device_factory.py` in a single
+# read/write pass. It runs every MQTT_SCENE_JOURNAL_COMPACT_EVERY captures and
+# on demand (the wizard compacts when a capture session ends and before
+# anything reads the factories).
+#
+# Crash safety:
+# - Factories are replaced atomically (write to a temp file, fsync, rename),
+#   so they are always either the old or the new version.
+# - The journal is only cleared after both factories have been replaced.
+#   Replaying entries that were already compacted is harmless: scenes are
+#   keyed by variable name and existing device references are skipped.
+# - A torn final journal line (crash mid-append) is newline-terminated by the
+#   next append, so it can't swallow the next entry. Lines that don't parse
+#   are skipped (never the entries after them) and kept in the journal by
+#   compaction for inspection instead of being discarded.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import json
+from typing import Dict, List, Tuple
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import scripts.frida_govee_mqtt_extractor as extractor
+from models.mqtt_payload_store import default_payload_store
+from api.tracing import traced
+
+# Configurable via .env
+MQTT_SCENE_JOURNAL_PATH = os.path.abspath(os.getenv("MQTT_SCENE_JOURNAL_PATH", "factories/device_mqtt_diy_scene_journal.jsonl"))
+MQTT_SCENE_JOURNAL_COMPACT_EVERY = int(os.getenv("MQTT_SCENE_JOURNAL_COMPACT_EVERY", 50))
+
+
+def atomic_write_lines(path: str, lines: List[str]) -> None:
+    """Replace `path` with `lines` atomically (temp file + fsync + rename)."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+    # Persist the rename itself
+    try:
+        dir_fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except OSError:
+        pass
+
+
+class SceneFactoryJournal:
+    """Append-only journal of captured scenes, compacted into the generated factories."""
+
+    def __init__(self, path: str = MQTT_SCENE_JOURNAL_PATH, compact_every: int = MQTT_SCENE_JOURNAL_COMPACT_EVERY):
+        """
+        Initialize a SceneFactoryJournal.
+
+        Args:
+            path (str): Journal file.
+            compact_every (int): Compact automatically after this many journaled captures. 0 disables it.
+        """
+        self.path = path
+        self.compact_every = compact_every
+        self._pending = None
+
+    def entries(self) -> List[dict]:
+        """Return journaled captures not yet compacted, oldest first."""
+        return self._read()[0]
+
+    def _read(self) -> Tuple[List[dict], List[str]]:
+        """Return (journaled captures, lines that didn't parse as one), both in journal order."""
+        if not os.path.exists(self.path):
+            return [], []
+        entries = []
+        unparsed = []
+        with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    entry = None
+                if isinstance(entry, dict) and all(k in entry for k in ("var_name", "device_var", "cmd")):
+                    entries.append(entry)
+                else:
+                    # Torn line from an interrupted append (or a hand edit); the entries after it still count
+                    unparsed.append(line if line.endswith("\n") else line + "\n")
+        return entries, unparsed
+
+    def __len__(self) -> int:
+        if self._pending is None:
+            self._pending = len(self.entries())
+        return self._pending
+
+    @traced("capture.journal_record")
+    def record(self, var_name: str, cmd: dict, device_var: str) -> None:
+        """
+        Durably journal a captured scene (one appended line), compacting if the threshold is reached.
+
+        Args:
+            var_name (str): Scene factory variable name.
+            cmd (dict): Scene command fields (see `build_cmd_from_msg`).
+            device_var (str): Device factory variable to reference the scene from.
+        """
+        pending = len(self)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        line = json.dumps({"var_name": var_name, "device_var": device_var, "cmd": cmd}) + "\n"
+        with open(self.path, "ab+") as f:
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = "\n" + line  # Terminate a torn line left by an interrupted append
+            f.write(line.encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        self._pending = pending + 1
+
+        if self.compact_every and self._pending >= self.compact_every:
+            self.compact()
+
+    @traced("capture.journal_compact")
+    def compact(self) -> int:
+        """
+        Fold all journaled captures into the scene and device factories, then clear the journal.
+
+        Returns:
+            int: Number of journal entries compacted.
+        """
+        entries, unparsed = self._read()
+        if not entries:
+            self._pending = 0
+            return 0
+
+        # Later captures of the same scene replace earlier ones
+        scene_blocks = extractor.parse_scene_blocks(extractor.read_scene_factory_lines())
+        scenes_by_device: Dict[str, List[str]] = {}
+        for entry in entries:
+            scene_blocks[entry["var_name"]] = extractor.build_scene_block(entry["var_name"], entry["cmd"])
+            scenes_by_device.setdefault(entry["device_var"], []).append(entry["var_name"])
+        default_payload_store().save()  # Payloads must exist before the factory references them
+        atomic_write_lines(extractor.DEVICE_MQTT_DIY_SCENE_FACTORY_FILE_PATH, extractor.render_scene_factory(scene_blocks))
+
+        if os.path.exists(extractor.DEVICE_FACTORY_FILE_PATH):
+            with open(extractor.DEVICE_FACTORY_FILE_PATH, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+            for device_var, var_names in scenes_by_device.items():
+                extractor.add_scenes_to_device_factory_lines(lines, device_var, var_names)
+            atomic_write_lines(extractor.DEVICE_FACTORY_FILE_PATH, lines)
+        else:
+            print(f"❌ Device factory file not found: {extractor.DEVICE_FACTORY_FILE_PATH}")
+
+        atomic_write_lines(self.path, unparsed)
+        self._pending = 0
+        print(f"🏭 Compacted {len(entries)} journaled scene captures into the factories.")
+        if unparsed:
+            print(f"⚠️  Kept {len(unparsed)} journal line(s) that couldn't be parsed in {self.path}.")
+        return len(entries)
+
+
+def compact_scene_factory_journal() -> int:
+    """Compact the default journal (e.g. before the wizard reads the factories)."""
+    return SceneFactoryJournal().compact()
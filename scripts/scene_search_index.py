@@ -0,0 +1,466 @@
+# scripts/scene_search_index.py
+
+# ==============================================================================
+# Govee LAN API Plus – Scene Search Index
+# ---------------------------------------
+#
+# Description:
+# In-memory search index over every device's DIY scenes and captured MQTT
+# DIY scenes, so pickers and scripts can find a scene without walking every
+# device's namespaces:
+#
+#   index = SceneSearchIndex()
+#   index.sync_devices(all_devices)
+#   index.search("sunset")            # exact, then prefix, then fuzzy matches
+#   index.by_value(1234)              # every scene with that DIY scene value
+#   index.by_sku("H6199", kind="mqtt")
+#
+# Scene names are normalized (lowercase, punctuation collapsed to single
+# spaces) and stored once per distinct name, however many devices share the
+# scene:
+# - Exact lookups are a dict hit.
+# - Prefix lookups bisect a sorted list holding each name and each of its
+#   word suffixes, so "glow" also finds "Sunset Glow".
+# - Fuzzy lookups shortlist names sharing the most trigrams with the query
+#   and rank the shortlist with difflib.
+#
+# The index is built once when devices are loaded and kept current
+# incrementally: `sync_devices` only reindexes devices whose scenes changed
+# (after a capture or a cloud sync) and `add_scene` indexes a single capture
+# as soon as it is journaled.
+#
+# MQTT scenes have no display name of their own; it is recovered from the
+# factory variable name (`<device>_<scene>_<value>`).
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import re
+import sys
+import difflib
+from bisect import bisect_left, insort
+from collections import Counter
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.generate_device_and_scene_factories import sanitize_var_name
+from models.govee_device import GoveeDevice
+
+KINDS = ("diy", "mqtt")
+FUZZY_SHORTLIST = 32
+FUZZY_CUTOFF = 0.5
+FUZZY_POSTING_BUDGET = 2000
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase a scene/device name and collapse punctuation and underscores to single spaces."""
+    return re.sub(r"[^a-z0-9]+", " ", str(name).lower()).strip()
+
+
+def trigrams(key: str) -> set:
+    """Character trigrams of a normalized name, padded so short names and word edges count."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@lru_cache(maxsize=4096)
+def device_var_prefix(device_name: str) -> str:
+    return f"{sanitize_var_name(device_name)}_"
+
+
+def name_from_var_name(device: GoveeDevice, var_name: str) -> Tuple[str, Optional[int]]:
+    """Recover a scene's display name and value from its `<device>_<scene>_<value>` variable name."""
+    prefix = device_var_prefix(device.name)
+    name = var_name[len(prefix):] if var_name.startswith(prefix) else var_name
+    head, _, tail = name.rpartition("_")
+    if head and tail.isdecimal():
+        return head.replace("_", " "), int(tail)
+    return name.replace("_", " "), None
+
+
+class SceneEntry:
+    """One indexed scene on one device."""
+
+    __slots__ = ("kind", "device", "scene", "var_name", "name", "key", "value")
+
+    def __init__(self, kind: str, device: GoveeDevice, scene, var_name: str, name: str, value: Optional[int]):
+        self.kind = kind
+        self.device = device
+        self.scene = scene
+        self.var_name = var_name
+        self.name = name
+        self.key = normalize_name(name)
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"SceneEntry({self.kind}, {self.device.name!r}, {self.name!r}, {self.value})"
+
+
+class SceneSearchIndex:
+    """Exact, prefix, fuzzy, value and SKU lookups over indexed scenes."""
+
+    def __init__(self):
+        self._devices: Dict[str, GoveeDevice] = {}
+        self._signatures: Dict[str, frozenset] = {}
+        self._entries: Dict[str, Dict[Tuple[str, str], SceneEntry]] = {}  # device id → {(kind, var_name): entry}
+        self._by_key: Dict[str, List[SceneEntry]] = {}
+        self._by_value: Dict[int, List[SceneEntry]] = {}
+        self._by_sku: Dict[str, Dict[str, GoveeDevice]] = {}
+        self._tokens: Optional[List[str]] = []  # sorted names and word suffixes (None until re-sorted)
+        self._token_keys: Dict[str, set] = {}  # token → names it's a suffix of
+        self._trigrams: Optional[Dict[str, set]] = None  # trigram → names containing it (built on first fuzzy lookup)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    # --- Building ---
+
+    @staticmethod
+    def device_scenes(device: GoveeDevice) -> List[Tuple[str, str, object]]:
+        """Return (kind, var_name, scene) for every DIY and MQTT DIY scene a device carries."""
+        scenes = []
+        diy = getattr(device, "scenes", None)
+        if isinstance(diy, SimpleNamespace) and vars(diy):
+            scenes.extend(("diy", var_name, scene) for var_name, scene in vars(diy).items())
+        else:
+            scenes.extend(
+                ("diy", f"{sanitize_var_name(scene.name)}_{scene.value}", scene)
+                for scene in getattr(device, "diy_scenes", None) or []
+            )
+        mqtt = getattr(device, "mqtt_diy_scenes", None)
+        if isinstance(mqtt, SimpleNamespace):
+            scenes.extend(("mqtt", var_name, scene) for var_name, scene in vars(mqtt).items())
+        return scenes
+
+    def build(self, devices: Iterable[GoveeDevice]) -> None:
+        """Rebuild the index from scratch."""
+        self.__init__()
+        self.sync_devices(devices)
+
+    def sync_devices(self, devices: Iterable[GoveeDevice]) -> int:
+        """
+        Bring the index in line with `devices`, reindexing only devices whose scenes changed.
+
+        Devices whose scene variable names are unchanged (e.g. after a factory reload) just
+        have their entries rebound to the new objects; devices no longer present are dropped.
+
+        Returns:
+            int: Number of devices (re)indexed.
+        """
+        seen = set()
+        reindexed = 0
+        for device in devices:
+            seen.add(device.id)
+            reindexed += self.update_device(device)
+
+        for device_id in [d for d in self._devices if d not in seen]:
+            self.remove_device(device_id)
+        return reindexed
+
+    def update_device(self, device: GoveeDevice) -> bool:
+        """
+        Reindex one device if its scenes changed, otherwise rebind its entries to the new objects.
+
+        Returns:
+            bool: True if the device was (re)indexed.
+        """
+        scenes = self.device_scenes(device)
+        signature = frozenset((kind, var_name) for kind, var_name, _ in scenes)
+        if self._signatures.get(device.id) == signature and self._devices[device.id].sku == device.sku:
+            self._rebind(device, scenes)
+            return False
+        self.remove_device(device.id)
+        self.add_device(device, scenes)
+        return True
+
+    def add_device(self, device: GoveeDevice, scenes: Optional[list] = None) -> None:
+        """Index a device and all of its scenes."""
+        scenes = self.device_scenes(device) if scenes is None else scenes
+        self._devices[device.id] = device
+        self._by_sku.setdefault(device.sku, {})[device.id] = device
+        self._entries.setdefault(device.id, {})
+        if scenes:
+            self._tokens = None
+        for kind, var_name, scene in scenes:
+            self.add_scene(device, scene, kind, var_name)
+        self._signatures[device.id] = frozenset((kind, var_name) for kind, var_name, _ in scenes)
+
+    def remove_device(self, device_id: str) -> None:
+        """Drop a device and its scenes from the index."""
+        device = self._devices.pop(device_id, None)
+        if device is None:
+            return
+        for entry in list(self._entries.pop(device_id, {}).values()):
+            self._unlink(entry)
+        self._signatures.pop(device_id, None)
+        sku_devices = self._by_sku.get(device.sku, {})
+        sku_devices.pop(device_id, None)
+        if not sku_devices:
+            self._by_sku.pop(device.sku, None)
+
+    def add_scene(self, device: GoveeDevice, scene, kind: str, var_name: str) -> SceneEntry:
+        """
+        Index (or replace) one scene on a device, e.g. right after it was captured.
+
+        Args:
+            device (GoveeDevice): Device the scene belongs to.
+            scene: GoveeDIYScene or GoveeMqttDiyScene.
+            kind (str): "diy" or "mqtt".
+            var_name (str): The scene's factory variable name.
+
+        Returns:
+            SceneEntry: The indexed entry.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown scene kind '{kind}' (expected one of {KINDS})")
+        if device.id not in self._devices:
+            self.add_device(device, [])
+
+        if kind == "diy":
+            name, value = scene.name, int(scene.value)
+        else:
+            name, value = name_from_var_name(device, var_name)
+
+        entries = self._entries[device.id]
+        previous = entries.get((kind, var_name))
+        if previous is not None:
+            self._unlink(previous)
+        entry = entries[(kind, var_name)] = SceneEntry(kind, device, scene, var_name, name, value)
+
+        if entry.key not in self._by_key:
+            self._by_key[entry.key] = []
+            self._link_key(entry.key)
+        self._by_key[entry.key].append(entry)
+        if value is not None:
+            self._by_value.setdefault(value, []).append(entry)
+        if previous is None:
+            self._signatures[device.id] = self._signatures.get(device.id, frozenset()) | {(kind, var_name)}
+        return entry
+
+    def _rebind(self, device: GoveeDevice, scenes: list) -> None:
+        self._devices[device.id] = device
+        self._by_sku[device.sku][device.id] = device
+        entries = self._entries[device.id]
+        for kind, var_name, scene in scenes:
+            entry = entries[(kind, var_name)]
+            entry.device = device
+            entry.scene = scene
+
+    def _unlink(self, entry: SceneEntry) -> None:
+        same_name = self._by_key.get(entry.key, [])
+        if entry in same_name:
+            same_name.remove(entry)
+        if not same_name:
+            self._by_key.pop(entry.key, None)
+            self._unlink_key(entry.key)
+        if entry.value is not None:
+            same_value = self._by_value.get(entry.value, [])
+            if entry in same_value:
+                same_value.remove(entry)
+            if not same_value:
+                self._by_value.pop(entry.value, None)
+
+    def _link_key(self, key: str) -> None:
+        words = key.split(" ")
+        for i in range(len(words)):
+            token = " ".join(words[i:])
+            keys = self._token_keys.get(token)
+            if keys is None:
+                keys = self._token_keys[token] = set()
+                if self._tokens is not None:
+                    insort(self._tokens, token)
+            keys.add(key)
+        if self._trigrams is not None:
+            for gram in trigrams(key):
+                self._trigrams.setdefault(gram, set()).add(key)
+
+    def _unlink_key(self, key: str) -> None:
+        words = key.split(" ")
+        for i in range(len(words)):
+            token = " ".join(words[i:])
+            keys = self._token_keys.get(token)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._token_keys[token]
+                if self._tokens is not None:
+                    position = bisect_left(self._tokens, token)
+                    if position < len(self._tokens) and self._tokens[position] == token:
+                        del self._tokens[position]
+        for gram in trigrams(key) if self._trigrams is not None else ():
+            names = self._trigrams.get(gram)
+            if names is not None:
+                names.discard(key)
+                if not names:
+                    del self._trigrams[gram]
+
+    def _sorted_tokens(self) -> List[str]:
+        # Bulk indexing drops the sorted list; it is rebuilt once on the next prefix lookup
+        if self._tokens is None:
+            self._tokens = sorted(self._token_keys)
+        return self._tokens
+
+    def _trigram_index(self) -> Dict[str, set]:
+        # Only fuzzy lookups need trigrams, so loading devices doesn't pay for them
+        if self._trigrams is None:
+            self._trigrams = {}
+            for key in self._by_key:
+                for gram in trigrams(key):
+                    self._trigrams.setdefault(gram, set()).add(key)
+        return self._trigrams
+
+    # --- Lookups ---
+
+    @staticmethod
+    def _filter(entries: Iterable[SceneEntry], kind: Optional[str], device_id: Optional[str],
+                limit: Optional[int] = None) -> List[SceneEntry]:
+        matches = []
+        for e in entries:
+            if (kind is None or e.kind == kind) and (device_id is None or e.device.id == device_id):
+                matches.append(e)
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+    def exact(self, name: str, kind: Optional[str] = None, device_id: Optional[str] = None) -> List[SceneEntry]:
+        """Scenes whose normalized name equals `name`."""
+        return self._filter(self._by_key.get(normalize_name(name), ()), kind, device_id)
+
+    def iter_prefix_keys(self, prefix: str) -> Iterator[str]:
+        """Distinct normalized names with a word starting with `prefix`, in word order."""
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return
+        tokens = self._sorted_tokens()
+        seen = set()
+        position = bisect_left(tokens, prefix)
+        while position < len(tokens) and tokens[position].startswith(prefix):
+            for key in sorted(self._token_keys[tokens[position]]):
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+            position += 1
+
+    def prefix(self, prefix: str, kind: Optional[str] = None, device_id: Optional[str] = None,
+               limit: Optional[int] = 50) -> List[SceneEntry]:
+        """Scenes with a name word starting with `prefix`."""
+        return self._filter(
+            (e for key in self.iter_prefix_keys(prefix) for e in self._by_key[key]), kind, device_id, limit
+        )
+
+    def fuzzy_keys(self, query: str, limit: int = 10, cutoff: float = FUZZY_CUTOFF) -> List[str]:
+        """Distinct normalized names most similar to `query` (typos, transpositions), best first."""
+        query = normalize_name(query)
+        if not query:
+            return []
+        # Count shared trigrams using the rarest ones first; very common trigrams
+        # ("  s", "the") barely narrow the candidates and dominate the cost
+        index = self._trigram_index()
+        postings = sorted((index[g] for g in trigrams(query) if g in index), key=len)
+        counts = Counter()
+        budget = FUZZY_POSTING_BUDGET
+        for used, names in enumerate(postings):
+            if used >= 2 and len(names) > budget:
+                break
+            counts.update(names)
+            budget -= len(names)
+        return self._rank_fuzzy(query, (key for key, _ in counts.most_common(FUZZY_SHORTLIST)), limit, cutoff)
+
+    @staticmethod
+    def _rank_fuzzy(query: str, keys: Iterable[str], limit: int, cutoff: float) -> List[str]:
+        matcher = difflib.SequenceMatcher(None, "", query)
+        scored = []
+        for key in keys:
+            matcher.set_seq1(key)
+            if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff:
+                ratio = matcher.ratio()
+                if ratio >= cutoff:
+                    scored.append((ratio, key))
+        scored.sort(key=lambda s: (-s[0], s[1]))
+        return [key for _, key in scored[:limit]]
+
+    def fuzzy(self, query: str, kind: Optional[str] = None, device_id: Optional[str] = None,
+              limit: int = 10) -> List[SceneEntry]:
+        """Scenes whose names are close to `query`, best match first."""
+        return self._filter(
+            (e for key in self.fuzzy_keys(query, limit) for e in self._by_key[key]), kind, device_id
+        )
+
+    def by_value(self, value: int, kind: Optional[str] = None, device_id: Optional[str] = None) -> List[SceneEntry]:
+        """Scenes with the given DIY scene value."""
+        return self._filter(self._by_value.get(int(value), ()), kind, device_id)
+
+    def by_sku(self, sku: str, kind: Optional[str] = None) -> List[SceneEntry]:
+        """Scenes on devices of the given SKU."""
+        return self._filter(
+            (e for device_id in self._by_sku.get(sku, {}) for e in self._entries[device_id].values()), kind, None
+        )
+
+    def devices_for_sku(self, sku: str) -> List[GoveeDevice]:
+        """Indexed devices of the given SKU."""
+        return list(self._by_sku.get(sku, {}).values())
+
+    def search(self, query: str, kind: Optional[str] = None, device_id: Optional[str] = None,
+               limit: int = 20) -> List[SceneEntry]:
+        """
+        Find scenes for free-form picker input.
+
+        A numeric query matches scene values; otherwise exact name matches come first,
+        then prefix matches, then fuzzy matches.
+
+        Args:
+            query (str): Scene name, name fragment, or scene value.
+            kind (str, optional): Only "diy" or "mqtt" scenes.
+            device_id (str, optional): Only scenes on this device.
+            limit (int): Maximum results.
+
+        Returns:
+            List[SceneEntry]: Matching scenes, best first, without duplicates.
+        """
+        query = query.strip()
+        if query.isdecimal():
+            return self.by_value(int(query), kind, device_id)[:limit]
+
+        if device_id is not None:
+            # One device holds at most a few hundred scenes: rank them directly
+            candidates = self._filter(self._entries.get(device_id, {}).values(), kind, None)
+            key = normalize_name(query)
+            fuzzy_keys = self._rank_fuzzy(key, {e.key for e in candidates}, limit, FUZZY_CUTOFF)
+            tiers = (
+                lambda: [e for e in candidates if e.key == key],
+                lambda: [e for e in candidates if key and f" {key}" in f" {e.key}"],
+                lambda: sorted((e for e in candidates if e.key in fuzzy_keys), key=lambda e: fuzzy_keys.index(e.key)),
+            )
+        else:
+            tiers = (
+                lambda: self.exact(query, kind),
+                lambda: self.prefix(query, kind, limit=limit),
+                lambda: self.fuzzy(query, kind, limit=limit),
+            )
+
+        results = []
+        seen = set()
+        for matches in tiers:
+            for entry in matches():
+                if id(entry) not in seen:
+                    seen.add(id(entry))
+                    results.append(entry)
+                    if len(results) >= limit:
+                        return results
+        return results
+
+    def find_devices(self, query: str, limit: int = 20) -> List[GoveeDevice]:
+        """Devices whose name, ID, or SKU contains `query` (case-insensitive)."""
+        name_query = normalize_name(query)
+        query = query.strip().lower()
+        return [
+            d for d in self._devices.values()
+            if (name_query and name_query in normalize_name(d.name)) or query in d.id.lower() or query == d.sku.lower()
+        ][:limit]
@@ -13,16 +13,18 @@
 # License: MIT
 # ==============================================================================
 
-def select_from_list(options, prompt_text="Select an item"):
+def select_from_list(options, prompt_text="Select an item", label=None, allow_cancel=False):
     """
     Prompts the user to select an option from a list.
 
     Args:
         options (list): A list of selectable options.
         prompt_text (str): Optional custom prompt text to display.
+        label (Callable, optional): Returns the display label for an option.
+        allow_cancel (bool): Return None when the user just presses enter.
 
     Returns:
-        Any: The selected item from the list.
+        Any: The selected item from the list (None if cancelled).
 
     Raises:
         ValueError: If the options list is empty.
@@ -33,12 +35,14 @@ def select_from_list(options, prompt_text="Select an item"):
     print(f"\n{prompt_text}:\n")
 
     for i, item in enumerate(options, start=1):
-        label = getattr(item, "name", str(item))
-        print(f"{i}. {label}")
+        print(f"{i}. {label(item) if label else getattr(item, 'name', str(item))}")
 
     while True:
         try:
-            choice = int(input("\nEnter number: "))
+            choice = input(f"\nEnter number{' (or enter to 👈 go back)' if allow_cancel else ''}: ").strip()
+            if allow_cancel and choice == "":
+                return None
+            choice = int(choice)
             if 1 <= choice <= len(options):
                 return options[choice - 1]
             else:
@@ -0,0 +1,209 @@
+# scripts/trace_timeline.py
+
+# ==============================================================================
+# Govee LAN API Plus – Trace Timeline
+# -----------------------------------
+#
+# Description:
+# Turns a Chrome trace written by `api.tracing.ChromeTraceWriter` (e.g. from
+# `scripts/play_show.py --trace`) into a flame-style view of where the time
+# went:
+#
+# - A flame tree: spans nested by call, with total and self time. Self time is
+#   time spent in a span outside its child spans (for `lan.send_lan_command`
+#   that is the socket work).
+# - A timeline: one row per thread across the whole run, each column showing
+#   the span that spent the most self time in that slice of the run.
+# - The slowest individual spans of each kind, with their args (e.g. cue labels).
+#
+# `--collapsed out.txt` also writes collapsed stacks weighted by self time in
+# microseconds, for flamegraph.pl or speedscope.
+#
+# A show run is mostly `show.wait`; `--hide show.wait` leaves it out of the
+# timeline so the cue work stands out.
+#
+# Usage: python3 scripts/trace_timeline.py trace.json [--width 100] [--hide show.wait] [--collapsed out.txt]
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import json
+import argparse
+import string
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+
+class SpanNode:
+    __slots__ = ("name", "ts", "dur", "args", "children")
+
+    def __init__(self, event: dict):
+        self.name = event["name"]
+        self.ts = float(event["ts"])
+        self.dur = float(event.get("dur", 0))
+        self.args = event.get("args")
+        self.children = []
+
+    @property
+    def end(self) -> float:
+        return self.ts + self.dur
+
+    @property
+    def self_time(self) -> float:
+        return max(0.0, self.dur - sum(c.dur for c in self.children))
+
+
+def load_trace(path: str) -> dict:
+    """Return {thread id: [SpanNode, ...]} of complete ("X") events from a Chrome trace file."""
+    with open(path, "r", encoding="utf-8") as f:
+        trace = json.load(f)
+    events = trace["traceEvents"] if isinstance(trace, dict) else trace
+    by_thread = defaultdict(list)
+    for event in events:
+        if event.get("ph") == "X":
+            by_thread[event.get("tid", 0)].append(SpanNode(event))
+    return by_thread
+
+
+def nest(spans: List[SpanNode]) -> List[SpanNode]:
+    """Nest one thread's spans by time containment and return the roots."""
+    roots = []
+    stack: List[SpanNode] = []
+    for node in sorted(spans, key=lambda s: (s.ts, -s.dur)):
+        while stack and node.ts >= stack[-1].end:
+            stack.pop()
+        (stack[-1].children if stack else roots).append(node)
+        stack.append(node)
+    return roots
+
+
+def self_intervals(node: SpanNode):
+    """The parts of a span's interval not covered by its children."""
+    cursor = node.ts
+    for child in node.children:
+        if child.ts > cursor:
+            yield cursor, child.ts
+        cursor = max(cursor, child.end)
+    if node.end > cursor:
+        yield cursor, node.end
+
+
+def walk(nodes: List[SpanNode], path=()):
+    for node in nodes:
+        node_path = path + (node.name,)
+        yield node_path, node
+        yield from walk(node.children, node_path)
+
+
+def collapse(roots_by_thread: Dict[int, List[SpanNode]]) -> Counter:
+    """Self time (µs) per call path, "outer;inner;leaf"."""
+    stacks = Counter()
+    for roots in roots_by_thread.values():
+        for path, node in walk(roots):
+            stacks[";".join(path)] += node.self_time
+    return stacks
+
+
+def print_flame_tree(stacks: Counter, width: int) -> None:
+    totals = Counter()
+    for path, self_us in stacks.items():
+        parts = path.split(";")
+        for i in range(1, len(parts) + 1):
+            totals[";".join(parts[:i])] += self_us
+    grand_total = sum(stacks.values()) or 1.0
+
+    children = defaultdict(list)
+    for path in totals:
+        children[path.rsplit(";", 1)[0] if ";" in path else ""].append(path)
+
+    bar_width = max(10, width - 60)
+
+    def show(parent: str, depth: int) -> None:
+        for path in sorted(children[parent], key=lambda p: -totals[p]):
+            name = path.rsplit(";", 1)[-1]
+            bar = "█" * max(1, round(totals[path] / grand_total * bar_width))
+            print(f"  {'  ' * depth}{name:<{36 - 2 * depth}} {totals[path] / 1000:>9.2f} ms "
+                  f"(self {stacks.get(path, 0) / 1000:>8.2f} ms) {bar}")
+            show(path, depth + 1)
+
+    print("🔥 Flame tree (total / self time)")
+    show("", 0)
+
+
+def print_timeline(roots_by_thread: Dict[int, List[SpanNode]], width: int, hide=()) -> None:
+    spans = [node for roots in roots_by_thread.values() for _, node in walk(roots)]
+    if not spans:
+        return
+    start = min(s.ts for s in spans)
+    end = max(s.end for s in spans)
+    span_us = max(end - start, 1e-9)
+
+    time_by_name = Counter()
+    for node in spans:
+        time_by_name[node.name] += node.self_time
+    symbols = {}
+    for i, (name, _) in enumerate(time_by_name.most_common()):
+        symbols[name] = (string.ascii_uppercase + string.ascii_lowercase + string.digits)[i] if i < 62 else "#"
+
+    column_us = span_us / width
+    print(f"\n🕒 Timeline ({span_us / 1000:.1f} ms, {column_us / 1000:.2f} ms per column)")
+    for tid, roots in roots_by_thread.items():
+        # Each column shows the span with the most self time in it
+        columns = [Counter() for _ in range(width)]
+        for _, node in walk(roots):
+            if node.name in hide:
+                continue
+            for lo, hi in self_intervals(node):
+                first = min(width - 1, int((lo - start) / column_us))
+                last = min(width - 1, int((hi - start) / column_us))
+                for column in range(first, last + 1):
+                    column_start = start + column * column_us
+                    overlap = min(hi, column_start + column_us) - max(lo, column_start)
+                    if overlap > 0:
+                        columns[column][node.name] += overlap
+        row = "".join(symbols[c.most_common(1)[0][0]] if c else "·" for c in columns)
+        print(f"  {str(tid)[-6:]:>6} |{row}|")
+    print("  " + ", ".join(f"{symbol}={name}" for name, symbol in symbols.items()))
+
+
+def print_slowest(roots_by_thread: Dict[int, List[SpanNode]], per_name: int = 3) -> None:
+    by_name = defaultdict(list)
+    for roots in roots_by_thread.values():
+        for _, node in walk(roots):
+            by_name[node.name].append(node)
+    print(f"\n🐢 Slowest spans")
+    for name, nodes in sorted(by_name.items()):
+        durations = sorted(n.dur for n in nodes)
+        print(f"  {name} ({len(nodes)} spans, median {durations[len(durations) // 2] / 1000:.3f} ms)")
+        for node in sorted(nodes, key=lambda s: -s.dur)[:per_name]:
+            args = f" {node.args}" if node.args else ""
+            print(f"    {node.dur / 1000:>9.3f} ms{args}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show where time went in a traced run.")
+    parser.add_argument("trace", help="Chrome trace JSON written by api.tracing.ChromeTraceWriter")
+    parser.add_argument("--width", type=int, default=100, help="Timeline width in columns")
+    parser.add_argument("--hide", action="append", default=[],
+                        help="Leave a span out of the timeline, e.g. --hide show.wait to see only cue work")
+    parser.add_argument("--collapsed", help="Also write collapsed stacks (µs of self time) to this file")
+    args = parser.parse_args()
+
+    roots_by_thread = {tid: nest(spans) for tid, spans in load_trace(args.trace).items()}
+    stacks = collapse(roots_by_thread)
+
+    print_flame_tree(stacks, args.width)
+    print_timeline(roots_by_thread, args.width, set(args.hide))
+    print_slowest(roots_by_thread)
+
+    if args.collapsed:
+        with open(args.collapsed, "w", encoding="utf-8") as f:
+            for path, self_us in stacks.most_common():
+                if self_us >= 1:
+                    f.write(f"{path} {int(self_us)}\n")
+        print(f"\n📝 Collapsed stacks written to {args.collapsed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# scripts/verify_capture_archive.py
+
+# ==============================================================================
+# Govee LAN API Plus – Capture Archive Consistency Check
+# ------------------------------------------------------
+#
+# Description:
+# Archives a handful of MQTT messages into a temporary capture archive while
+# simulating a full writer queue, and checks that every query still returns
+# the right record:
+# - One archive line is dropped: that message is not archived, and the
+#   records after it keep their correct offsets.
+# - One index line is dropped: the record is still found through the writer's
+#   in-memory index, by readers and after the archive is reopened (the index
+#   gap is re-indexed).
+# - A reader (`load()`) never modifies the archive or its index.
+# Exits non-zero on any mismatch.
+#
+# Usage: python3 scripts/verify_capture_archive.py
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+import tempfile
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.capture_archive import CaptureArchive
+from scripts.frida_log_reader import MqttLogEntry
+
+TRANSACTIONS = [f"t{i}" for i in range(6)]
+DROPPED_ARCHIVE_LINE = "t2"
+DROPPED_INDEX_LINE = "t4"
+
+
+def drop_once(writer, transaction: str) -> None:
+    """Make `writer` drop the line for `transaction`, as if its queue were full."""
+    write = writer.write
+
+    def dropping_write(event: str) -> bool:
+        if f'"transaction": "{transaction}"' in event or f'"transaction":"{transaction}"' in event:
+            writer.dropped += 1
+            return False
+        return write(event)
+
+    writer.write = dropping_write
+
+
+def check_queries(archive: CaptureArchive, label: str) -> list:
+    failures = []
+    for transaction in TRANSACTIONS:
+        records = archive.query(transaction=transaction)
+        found = [r["transaction"] for r in records]
+        expected = [] if transaction == DROPPED_ARCHIVE_LINE else [transaction]
+        if found != expected:
+            failures.append(f"{label}: query(transaction='{transaction}') returned {found}, expected {expected}")
+    return failures
+
+
+def files(archive: CaptureArchive) -> tuple:
+    with open(archive.path, "rb") as f, open(archive.index_path, "rb") as g:
+        return f.read(), g.read()
+
+
+def main():
+    failures = []
+    with tempfile.TemporaryDirectory(prefix="govee-archive-") as workdir:
+        path = os.path.join(workdir, "archive.jsonl")
+        topics = os.path.join(workdir, "topics.json")
+
+        archive = CaptureArchive(path, topics_path=topics)
+        archive.start()
+        drop_once(archive._archive_writer, DROPPED_ARCHIVE_LINE)
+        drop_once(archive._index_writer, DROPPED_INDEX_LINE)
+        for transaction in TRANSACTIONS:
+            record = archive.append(MqttLogEntry("GD/topic", {"cmd": "ptReal", "transaction": transaction}, 0))
+            if (record is None) != (transaction == DROPPED_ARCHIVE_LINE):
+                failures.append(f"append('{transaction}') returned {record}")
+        archive.close()
+        failures += check_queries(archive, "writer")
+
+        before = files(archive)
+        failures += check_queries(CaptureArchive(path, topics_path=topics).load(), "reader")
+        if files(archive) != before:
+            failures.append("reader: load() modified the archive or its index")
+
+        reopened = CaptureArchive(path, topics_path=topics)
+        reopened.start()
+        reopened.close()
+        failures += check_queries(CaptureArchive(path, topics_path=topics).load(), "after reopening")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    print(f"{'✅' if not failures else '❌'} {len(TRANSACTIONS)} messages, one archive line and one index line dropped: "
+          f"{len(failures)} problems.")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# scripts/verify_ptreal_codec.py
+
+# ==============================================================================
+# Govee LAN API Plus – ptReal Codec Round-Trip Check
+# --------------------------------------------------
+#
+# Description:
+# Decodes every captured ptReal scene in the MQTT scene factory, validates it,
+# re-encodes it and checks the result is byte-for-byte identical to the
+# capture. Also checks that the vectorized variant generator agrees with the
+# one-at-a-time recolor path. Exits non-zero on any mismatch.
+#
+# Usage: python3 scripts/verify_ptreal_codec.py
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import sys
+
+# Add root path to sys.path to support relative imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.lan.ptreal_codec import PtRealCommand, recolor_variants
+from models.govee_mqtt_diy_scene import GoveeMqttDiyScene
+import factories.device_mqtt_diy_scene_factory as mqtt_scene_factory
+
+
+def verify_scene(name: str, scene: GoveeMqttDiyScene) -> list:
+    failures = []
+    try:
+        decoded = PtRealCommand.decode(scene.command)
+    except ValueError as e:
+        return [f"{name}: {e}"]
+
+    for problem in decoded.validate():
+        failures.append(f"{name}: {problem}")
+    if decoded.encode() != list(scene.command):
+        failures.append(f"{name}: re-encoded command differs from capture")
+    if decoded.with_data(decoded.data).encode() != decoded.encode():
+        failures.append(f"{name}: reassembling the scene data changes the frames")
+
+    data = decoded.data
+    start = decoded.preamble_size  # First colour field
+    if len(data) >= start + 3:
+        rgb = tuple(data[start:start + 3])
+        variant = recolor_variants(decoded, rgb, [(1, 2, 3)])[0]
+        if variant != decoded.recolor(rgb, (1, 2, 3)).encode():
+            failures.append(f"{name}: vectorized recolor differs from recolor()")
+    return failures
+
+
+def main():
+    scenes = {
+        name: scene for name, scene in vars(mqtt_scene_factory).items()
+        if isinstance(scene, GoveeMqttDiyScene) and scene.cmd == "ptReal"
+    }
+    if not scenes:
+        print("⚠️  No captured ptReal scenes found in the MQTT scene factory.")
+        return
+
+    failures = []
+    for name, scene in scenes.items():
+        failures.extend(verify_scene(name, scene))
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    print(f"{'✅' if not failures else '❌'} {len(scenes)} scenes checked, {len(failures)} problems.")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
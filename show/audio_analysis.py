@@ -0,0 +1,431 @@
+# show/audio_analysis.py
+
+# ==============================================================================
+# Govee LAN API Plus – Audio Analysis
+# -----------------------------------
+#
+# Description:
+# Finds the onsets, beats, tempo and sections of a local WAV file, as input
+# for generating show timelines (see show/audio_timeline.py).
+#
+# The file is streamed in chunks, so memory stays constant however long the
+# track is: each chunk is mixed to mono, decimated to about
+# AUDIO_ANALYSIS_SAMPLE_RATE, cut into overlapping windowed frames (a strided
+# view, no copies) and transformed with one batched FFT. Only a few numbers
+# per frame are kept (~43 frames/s, 20 bytes each):
+# - Onset strength: spectral flux, the summed increase in log magnitude
+#   since the previous frame, over the whole spectrum and over the bass band
+#   alone (hi-hats dominate the former; beats are found on both, so kicks
+#   and bass notes carry the beat).
+# - Band energies: bass, mid and high.
+#
+# From those:
+# - Silence: frames quieter than SILENCE_DB carry no onset strength, so
+#   silent (or dither-only) tracks get no tempo, beats or onsets, and no
+#   beats are placed in near-silent passages.
+# - Tempo: the autocorrelation peak of the onset strength, weighted towards
+#   ~120 BPM.
+# - Beats: the beat grid (period and phase) with the most onset strength,
+#   then each beat nudged to the strongest onset near it, so gradual drift
+#   is followed.
+# - Onsets: local peaks of the onset strength above its running mean.
+# - Sections: points where the band energies of the bars before and after
+#   differ the most, snapped to bar lines, each with a relative energy level.
+#
+# Only PCM WAV files (8/16/24/32-bit integer) are supported, as read by the
+# standard library `wave` module.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import wave
+from typing import Iterator, List, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Configurable via .env
+AUDIO_ANALYSIS_SAMPLE_RATE = int(os.getenv("AUDIO_ANALYSIS_SAMPLE_RATE", 22050))
+AUDIO_ANALYSIS_CHUNK_SECONDS = float(os.getenv("AUDIO_ANALYSIS_CHUNK_SECONDS", 10))
+
+FRAME_SIZE = 1024  # At ~22 kHz: 46 ms frames
+HOP_SIZE = 512  # 23 ms between frames
+BANDS = ((20, 150), (150, 2000), (2000, 8000))  # Bass, mid, high (Hz)
+BAND_NAMES = ("bass", "mid", "high")
+ONSET_MAX_HZ = 8000
+
+TEMPO_MIN_BPM = 60
+TEMPO_MAX_BPM = 200
+TEMPO_PRIOR_BPM = 120  # Centre of the (one octave wide) tempo preference
+TEMPO_REFINE = 0.02  # Fraction of the estimated period searched when fitting the beat grid
+BEAT_SEARCH = 0.1  # Fraction of a beat period searched around each predicted beat
+ONSET_MIN_GAP = 0.05  # Seconds
+SECTION_CONTEXT_BARS = 4  # Bars compared on either side of a candidate boundary
+SECTION_MIN_BARS = 8
+SILENCE_DB = -60  # Frames quieter than this (dB relative to a full-scale sine, 20 Hz-8 kHz) count as silence
+
+
+class AudioAnalysis:
+    """Everything found in one track. Times are in seconds."""
+
+    __slots__ = (
+        "path", "duration", "sample_rate", "frame_rate", "tempo",
+        "beats", "beat_strength", "beat_bands", "onsets", "onset_strength", "sections",
+    )
+
+    def __init__(self, path: str, duration: float, sample_rate: int, frame_rate: float):
+        """
+        Initialize an AudioAnalysis.
+
+        Args:
+            path (str): The analysed file.
+            duration (float): Track length.
+            sample_rate (int): Sample rate the analysis ran at (after decimation).
+            frame_rate (float): Analysis frames per second.
+        """
+        self.path = path
+        self.duration = duration
+        self.sample_rate = sample_rate
+        self.frame_rate = frame_rate
+        self.tempo = 0.0  # BPM
+        self.beats = np.zeros(0)  # Beat times
+        self.beat_strength = np.zeros(0)  # Onset strength at each beat, 0-1
+        self.beat_bands = np.zeros((0, len(BANDS)))  # Bass/mid/high energy per beat, 0-1 over the track
+        self.onsets = np.zeros(0)  # Onset times
+        self.onset_strength = np.zeros(0)  # Strength of each onset, 0-1
+        self.sections: List[Tuple[float, float, float]] = []  # (start, end, energy 0-1)
+
+    def summary(self) -> dict:
+        return {
+            "path": self.path,
+            "duration": round(self.duration, 3),
+            "tempo": round(self.tempo, 2),
+            "beats": len(self.beats),
+            "onsets": len(self.onsets),
+            "sections": [(round(s, 3), round(e, 3), round(energy, 3)) for s, e, energy in self.sections],
+        }
+
+
+# ------------------------------------------------------------------------------
+# Streaming front end
+# ------------------------------------------------------------------------------
+
+def read_wav_chunks(path: str, target_rate: int = AUDIO_ANALYSIS_SAMPLE_RATE,
+                    chunk_seconds: float = AUDIO_ANALYSIS_CHUNK_SECONDS) -> Tuple[int, float, Iterator[np.ndarray]]:
+    """
+    Stream a PCM WAV file as mono float32 chunks, decimated by an integer factor towards `target_rate`.
+
+    Decimation averages each group of samples, which also acts as a simple low-pass filter.
+
+    Returns:
+        Tuple[int, float, Iterator[np.ndarray]]: Effective sample rate, duration in seconds, chunk iterator.
+    """
+    wav = wave.open(path, "rb")
+    channels = wav.getnchannels()
+    width = wav.getsampwidth()
+    rate = wav.getframerate()
+    total = wav.getnframes()
+    factor = max(1, rate // target_rate)
+    frames_per_chunk = max(factor, int(chunk_seconds * rate) // factor * factor)
+
+    def chunks():
+        try:
+            while True:
+                raw = wav.readframes(frames_per_chunk)
+                if not raw:
+                    break
+                mixed = mix_down(pcm_to_float(raw, width), channels, factor)
+                if not len(mixed):
+                    break
+                yield mixed
+        finally:
+            wav.close()
+
+    return rate // factor, total / rate, chunks()
+
+
+def mix_down(samples: np.ndarray, channels: int, factor: int = 1) -> np.ndarray:
+    """
+    Mix interleaved samples to mono and decimate by `factor` in one pass, averaging every
+    `channels * factor` samples. Trailing samples that do not fill a group are dropped.
+
+    Summing strided slices is much faster than .mean() over a 2-4 wide axis.
+    """
+    step = channels * factor
+    count = len(samples) // step
+    if step == 1:
+        return samples
+    mixed = samples[0:count * step:step].copy()
+    for offset in range(1, step):
+        mixed += samples[offset:count * step:step]
+    mixed *= 1 / step
+    return mixed
+
+
+def pcm_to_float(raw: bytes, width: int) -> np.ndarray:
+    """Convert little-endian PCM bytes to float32 samples in -1..1."""
+    if width == 1:
+        return (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    if width == 2:
+        return np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768
+    if width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        values = np.where(values & 0x800000, values - 0x1000000, values)
+        return values.astype(np.float32) / 8388608
+    if width == 4:
+        return np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648
+    raise ValueError(f"Unsupported WAV sample width: {width} bytes")
+
+
+def frame_features(chunks: Iterator[np.ndarray], sample_rate: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Run the chunked STFT and reduce each frame to its onset strength and band energies.
+
+    Frames are centred on `frame index * HOP_SIZE / sample_rate` seconds.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Onset strength (frames,), bass onset strength (frames,)
+                                                   and log band energies (frames, bands), all float32.
+    """
+    window = np.hanning(FRAME_SIZE).astype(np.float32)
+    freqs = np.fft.rfftfreq(FRAME_SIZE, 1 / sample_rate)
+    band_matrix = np.stack([(freqs >= lo) & (freqs < hi) for lo, hi in BANDS], axis=1).astype(np.float32)
+    onset_bins = int(np.searchsorted(freqs, ONSET_MAX_HZ))
+    bass_bins = int(np.searchsorted(freqs, BANDS[0][1]))
+
+    tail = np.zeros(FRAME_SIZE // 2, dtype=np.float32)  # Centres the first frame on t = 0
+    previous = None
+    onset_parts, bass_parts, band_parts = [], [], []
+    for chunk in chunks:
+        signal = np.concatenate((tail, chunk.astype(np.float32, copy=False)))
+        count = (len(signal) - FRAME_SIZE) // HOP_SIZE + 1
+        if count <= 0:
+            tail = signal
+            continue
+        frames = sliding_window_view(signal, FRAME_SIZE)[::HOP_SIZE][:count]
+        magnitude = np.abs(np.fft.rfft(frames * window, axis=1)).astype(np.float32, copy=False)
+        tail = signal[count * HOP_SIZE:]
+
+        log_magnitude = np.log1p(magnitude[:, :onset_bins] * 10)
+        if previous is None:
+            previous = log_magnitude[:1]
+        flux = np.maximum(np.diff(np.concatenate((previous, log_magnitude)), axis=0), 0)
+        onset_parts.append(flux.sum(axis=1))
+        bass_parts.append(flux[:, :bass_bins].sum(axis=1))
+        previous = log_magnitude[-1:]
+
+        band_parts.append(np.log1p((magnitude * magnitude) @ band_matrix))
+
+    if not onset_parts:
+        empty = np.zeros(0, dtype=np.float32)
+        return empty, empty, np.zeros((0, len(BANDS)), dtype=np.float32)
+    return np.concatenate(onset_parts), np.concatenate(bass_parts), np.concatenate(band_parts)
+
+
+# ------------------------------------------------------------------------------
+# Onsets, tempo, beats, sections
+# ------------------------------------------------------------------------------
+
+def moving_average(values: np.ndarray, width: int) -> np.ndarray:
+    # No wider than the input, since mode="same" returns max(len(values), width) samples
+    width = max(1, min(int(width), len(values)))
+    kernel = np.ones(width, dtype=np.float32) / width
+    return np.convolve(values, kernel, mode="same")
+
+
+def normalize(values: np.ndarray) -> np.ndarray:
+    low, high = (float(values.min()), float(values.max())) if len(values) else (0.0, 0.0)
+    return (values - low) / (high - low) if high > low else np.zeros_like(values)
+
+
+def frame_levels(bands: np.ndarray) -> np.ndarray:
+    """Level of each frame in dB relative to a full-scale sine, from its log band energies."""
+    window = np.hanning(FRAME_SIZE)
+    full_scale = FRAME_SIZE * float((window * window).sum()) / 4
+    power = np.expm1(bands.astype(np.float64)).sum(axis=1)
+    return 10 * np.log10(np.maximum(power, 1e-20) / full_scale)
+
+
+def onset_envelope(flux: np.ndarray, frame_rate: float) -> np.ndarray:
+    """Onset strength with its slowly varying level removed (half-wave rectified)."""
+    return np.maximum(flux - moving_average(flux, frame_rate * 0.5), 0)
+
+
+def pick_onsets(envelope: np.ndarray, frame_rate: float) -> np.ndarray:
+    """Frame indices of local envelope peaks that stand out from their neighbourhood."""
+    radius = max(1, int(ONSET_MIN_GAP * frame_rate))
+    if len(envelope) <= 2 * radius:
+        return np.zeros(0, dtype=np.int64)
+    padded = np.pad(envelope, radius, mode="constant")
+    local_max = sliding_window_view(padded, 2 * radius + 1).max(axis=1)
+    threshold = moving_average(envelope, frame_rate * 0.25) + 0.5 * float(envelope.std())
+    return np.flatnonzero((envelope == local_max) & (envelope > threshold))
+
+
+def estimate_tempo(envelope: np.ndarray, frame_rate: float) -> float:
+    """
+    Tempo in BPM from the envelope's autocorrelation, with a log-normal preference around TEMPO_PRIOR_BPM.
+
+    Returns 0 when there is no tempo to find (no onset strength, or nothing periodic in it).
+    """
+    n = len(envelope)
+    if not n or float(envelope.max()) <= 0:
+        return 0.0
+    # Smoothing keeps one-frame jitter in onset positions (the period is rarely a whole
+    # number of frames) from favouring lags that happen to be whole multiples
+    smoothed = np.convolve(envelope, np.array([0.25, 0.5, 0.25], dtype=np.float32), mode="same")
+    centred = smoothed - smoothed.mean()
+    spectrum = np.fft.rfft(centred, 2 * n)
+    autocorrelation = np.fft.irfft(spectrum * np.conj(spectrum))[:n]
+
+    lags = np.arange(max(1, int(frame_rate * 60 / TEMPO_MAX_BPM)), min(n - 1, int(frame_rate * 60 / TEMPO_MIN_BPM)) + 1)
+    if not len(lags):
+        return 0.0
+    bpm = 60 * frame_rate / lags
+    prior = np.exp(-0.5 * (np.log2(bpm / TEMPO_PRIOR_BPM)) ** 2)
+    best = int(lags[np.argmax(autocorrelation[lags] * prior)])
+    if autocorrelation[best] <= 0:
+        return 0.0
+
+    # Parabolic interpolation for a sub-frame period
+    if 1 <= best < n - 1:
+        a, b, c = autocorrelation[best - 1:best + 2]
+        denominator = a - 2 * b + c
+        offset = 0.5 * (a - c) / denominator if denominator else 0.0
+    else:
+        offset = 0.0
+    return 60 * frame_rate / (best + float(np.clip(offset, -0.5, 0.5)))
+
+
+def track_beats(envelope: np.ndarray, frame_rate: float, tempo: float) -> np.ndarray:
+    """
+    Beat positions in (fractional) frames: the best-scoring grid phase, then each beat snapped to nearby onsets.
+
+    The grid carries on through passages without onset strength (e.g. silence) but places no beats there.
+    """
+    n = len(envelope)
+    if tempo <= 0 or not n or float(envelope.max()) <= 0:
+        return np.zeros(0)
+    period = 60 * frame_rate / tempo
+
+    # Period and phase: the beat grid that lands on the most onset strength. The period is
+    # refined too, since a 0.1% tempo error drifts a whole-track grid by many frames.
+    best_score, position = -1.0, 0.0
+    phases = np.arange(int(period))
+    for candidate in period * np.linspace(1 - TEMPO_REFINE, 1 + TEMPO_REFINE, 81):
+        grid = np.arange(int((n - 1) / candidate)) * candidate
+        score = envelope[np.rint(phases[:, None] + grid[None, :]).astype(np.int64).clip(0, n - 1)].sum(axis=1)
+        index = int(np.argmax(score))
+        if score[index] > best_score:
+            best_score, position, refined = float(score[index]), float(phases[index]), candidate
+    period = refined
+
+    radius = max(1, int(BEAT_SEARCH * period))
+    offsets = np.arange(-radius, radius + 1)
+    pull = np.exp(-0.5 * (offsets / radius) ** 2)  # Prefer the predicted position when onsets are weak
+    local_period = period
+    beats = []
+    span = int(period)
+    while position < n:
+        centre = int(round(position))
+        if float(envelope[max(0, centre - span):centre + span + 1].max()) <= 0:
+            position += local_period  # Nothing within a beat either side: a silent passage
+            continue
+        lo, hi = max(0, centre - radius), min(n, centre + radius + 1)
+        window = envelope[lo:hi] * pull[lo - centre + radius:hi - centre + radius]
+        snapped = lo + int(np.argmax(window)) if window.size and window.max() > 0 else position
+        if beats:
+            local_period = float(np.clip(0.9 * local_period + 0.1 * (snapped - beats[-1]), 0.95 * period, 1.05 * period))
+        beats.append(snapped)
+        position = snapped + local_period
+    return np.asarray(beats, dtype=np.float64)
+
+
+def find_sections(beat_bands: np.ndarray, beats_per_bar: int = 4) -> List[int]:
+    """Beat indices where sections start (always including 0): the biggest changes in bar-level band energies."""
+    bars = len(beat_bands) // beats_per_bar
+    context = SECTION_CONTEXT_BARS
+    if bars < 2 * context + 1:
+        return [0]
+    bar_bands = beat_bands[:bars * beats_per_bar].reshape(bars, beats_per_bar, -1).mean(axis=1)
+
+    # Novelty at bar b: distance between the mean of the `context` bars before and after it
+    cumulative = np.vstack((np.zeros((1, bar_bands.shape[1])), np.cumsum(bar_bands, axis=0)))
+    candidates = np.arange(context, bars - context + 1)
+    before = (cumulative[candidates] - cumulative[candidates - context]) / context
+    after = (cumulative[candidates + context] - cumulative[candidates]) / context
+    novelty = np.linalg.norm(after - before, axis=1)
+
+    threshold = novelty.mean() + novelty.std()
+    boundaries = [0]
+    for index in np.argsort(-novelty):
+        if novelty[index] < threshold:
+            break
+        bar = int(candidates[index])
+        if all(abs(bar - b) >= SECTION_MIN_BARS for b in boundaries) and bars - bar >= SECTION_MIN_BARS // 2:
+            boundaries.append(bar)
+    return sorted(b * beats_per_bar for b in boundaries)
+
+
+def analyze_audio(path: str, beats_per_bar: int = 4, target_rate: int = AUDIO_ANALYSIS_SAMPLE_RATE) -> AudioAnalysis:
+    """
+    Analyse a PCM WAV file.
+
+    Args:
+        path (str): WAV file.
+        beats_per_bar (int): Beats per bar, used to place section boundaries on bar lines.
+        target_rate (int): Approximate sample rate to decimate to before analysis.
+
+    Returns:
+        AudioAnalysis: Tempo, beats, onsets and sections.
+    """
+    sample_rate, duration, chunks = read_wav_chunks(path, target_rate)
+    flux, bass_flux, bands = frame_features(chunks, sample_rate)
+    frame_rate = sample_rate / HOP_SIZE
+    analysis = AudioAnalysis(path, duration, sample_rate, frame_rate)
+    if len(flux) < 4:
+        analysis.sections = [(0.0, duration, 1.0)]
+        return analysis
+
+    # No onset strength in (near-)silent frames, so silence yields no onsets, tempo or beats
+    audible = frame_levels(bands) > SILENCE_DB
+    envelope = onset_envelope(flux, frame_rate) * audible
+    onsets = pick_onsets(envelope, frame_rate)
+    peak = float(envelope.max()) or 1.0
+    analysis.onsets = onsets / frame_rate
+    analysis.onset_strength = envelope[onsets] / peak
+
+    # Full-band and bass onsets weighted equally, so beats follow the kick rather than the hats
+    bass_envelope = onset_envelope(bass_flux, frame_rate) * audible
+    beat_envelope = envelope / (float(envelope.std()) or 1.0) + bass_envelope / (float(bass_envelope.std()) or 1.0)
+    tempo = estimate_tempo(beat_envelope, frame_rate) if len(onsets) else 0.0
+    beat_frames = track_beats(beat_envelope, frame_rate, tempo)
+    analysis.beats = beat_frames / frame_rate
+    if len(beat_frames) > 1:
+        # Mean beat interval, leaving out the gaps silent passages leave in the grid
+        intervals = np.diff(beat_frames)
+        intervals = intervals[intervals < 1.5 * np.median(intervals)]
+        analysis.tempo = 60 * frame_rate / float(intervals.mean())
+    if not len(beat_frames):
+        analysis.sections = [(0.0, duration, 1.0)]
+        return analysis
+
+    beat_index = np.rint(beat_frames).astype(np.int64).clip(0, len(envelope) - 1)
+    analysis.beat_strength = envelope[beat_index] / peak
+    # Mean band energy from each beat to the next
+    per_beat = np.add.reduceat(bands, beat_index, axis=0)
+    lengths = np.diff(np.append(beat_index, len(bands)))
+    beat_bands = per_beat / np.maximum(lengths, 1)[:, None]
+    analysis.beat_bands = np.stack([normalize(beat_bands[:, i]) for i in range(beat_bands.shape[1])], axis=1)
+
+    starts = find_sections(beat_bands, beats_per_bar)
+    loudness = beat_bands.sum(axis=1)
+    edges = starts + [len(beat_frames)]
+    levels = np.array([loudness[a:b].mean() for a, b in zip(edges, edges[1:])])
+    levels = normalize(levels) if len(levels) > 1 else np.ones(1)
+    times = [float(analysis.beats[s]) if s else 0.0 for s in starts] + [duration]
+    analysis.sections = [(times[i], times[i + 1], float(levels[i])) for i in range(len(starts))]
+    return analysis
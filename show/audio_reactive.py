@@ -0,0 +1,415 @@
+# show/audio_reactive.py
+
+# ==============================================================================
+# Govee LAN API Plus – Audio-Reactive Color Engine
+# ------------------------------------------------
+#
+# Description:
+# Drives many devices live from audio: at a fixed frame rate, takes the latest
+# block of audio, measures its band energies with one NumPy FFT, turns them
+# into a color for every device in one vectorized step and sends the changed
+# colors as native LAN `colorwc` packets.
+#
+# Audio sources:
+# - WavAudioSource: a PCM WAV file, read ahead in step with the wall clock
+#   from the moment the engine starts (play the file at the same moment, e.g.
+#   with `--player aplay`).
+# - PcmStreamSource: raw interleaved PCM from a pipe or stdin, e.g. the output
+#   of `parec`, `arecord` or `ffmpeg`. A reader thread stamps each block as it
+#   arrives.
+#
+# Each frame:
+# - Band energies (show/audio_analysis.py BANDS) of the last AUDIO_REACTIVE_WINDOW
+#   samples, Hann-windowed, in log scale against a slowly decaying peak (auto
+#   gain), smoothed with a fast attack and slower release.
+# - Device i follows band i % bands (mixed with a little of the others); its
+#   hue is spread around the color wheel by position and drifts over time,
+#   the band level sets the value and the high band washes colors out towards
+#   white. Brightness is folded into the RGB value so each device needs one
+#   packet per frame, not two.
+# - The colors go out through the shared LAN streaming path
+#   (show/color_stream.py): only devices whose color moved by more than
+#   AUDIO_REACTIVE_THRESHOLD in any channel (0-255) get a packet.
+#
+# Latency compensation: lights lag the sound by the time a packet takes to
+# reach a device and change its LEDs. For file sources the engine analyses
+# the audio AUDIO_REACTIVE_LATENCY seconds ahead of the playback position, so
+# the lights land on time. Stream sources can only react to audio that has
+# already arrived, so no compensation applies; their report measures how long
+# each block took from arrival to the frame's last packet instead.
+#
+# Frames are clocked by ColorStream.run inside ShowMode, so frame timing
+# lands in the usual jitter report, alongside latency, CPU use and packet
+# rates.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import time
+import threading
+from typing import BinaryIO, List, Optional, Tuple
+
+import numpy as np
+
+from api.tracing import traced
+from models.govee_device import GoveeDevice
+from show.audio_analysis import AUDIO_ANALYSIS_SAMPLE_RATE, BANDS, mix_down, pcm_to_float, read_wav_chunks
+from show.color_stream import COLOR_STREAM_KEEPALIVE, ColorStream, percentiles
+from show.show_mode import ShowMode
+
+# Configurable via .env
+AUDIO_REACTIVE_FPS = float(os.getenv("AUDIO_REACTIVE_FPS", 30))
+AUDIO_REACTIVE_LATENCY = float(os.getenv("AUDIO_REACTIVE_LATENCY", 0.05))
+AUDIO_REACTIVE_WINDOW = int(os.getenv("AUDIO_REACTIVE_WINDOW", 1024))
+AUDIO_REACTIVE_THRESHOLD = int(os.getenv("AUDIO_REACTIVE_THRESHOLD", 4))
+
+RING_SECONDS = 2.0  # Audio kept in memory per source
+STREAM_BLOCK_FRAMES = 256  # Frames read from a stream at a time (~6 ms at 44.1 kHz)
+DYNAMIC_RANGE = 3.0  # Decades of band power between silence and the running peak
+PEAK_DECAY = 0.5  # Per second: how fast the auto gain recovers after a loud passage, in decades
+ATTACK = 0.7  # Fraction of a rise followed within one frame
+RELEASE = 0.2  # Fraction of a fall followed within one frame
+OWN_BAND = 0.8  # Share of a device's level taken from its own band (the rest from all bands)
+HUE_DRIFT = 0.02  # Color wheel turns per second
+HIGH_WASH = 0.6  # How far the high band pushes saturation towards white
+
+# ------------------------------------------------------------------------------
+# Audio sources
+# ------------------------------------------------------------------------------
+
+class AudioRing:
+    """A mono float32 ring buffer that always hands out its newest samples as one contiguous slice."""
+
+    def __init__(self, capacity: int):
+        """
+        Initialize an AudioRing.
+
+        Args:
+            capacity (int): Samples kept. Each sample is stored twice, so any window up to
+                            `capacity` long is a plain slice, never a wrap-around copy.
+        """
+        self.capacity = capacity
+        self.written = 0  # Total samples ever written
+        self._buffer = np.zeros(2 * capacity, dtype=np.float32)
+
+    def write(self, samples: np.ndarray) -> None:
+        samples = samples[-self.capacity:]
+        position = self.written % self.capacity
+        first = min(len(samples), self.capacity - position)
+        for offset in (position, position + self.capacity):
+            self._buffer[offset:offset + first] = samples[:first]
+        rest = len(samples) - first
+        if rest:
+            self._buffer[:rest] = samples[first:]
+            self._buffer[self.capacity:self.capacity + rest] = samples[first:]
+        self.written += len(samples)
+
+    def window(self, size: int, end: Optional[int] = None) -> np.ndarray:
+        """
+        The `size` samples before sample index `end` (default: the newest), zero-padded before the start.
+
+        Args:
+            size (int): Window length (at most `capacity`).
+            end (int, optional): Sample index the window ends at; no later than `written`.
+        """
+        end = self.written if end is None else min(end, self.written)
+        oldest = max(0, self.written - self.capacity)
+        if end - size >= oldest:
+            position = (end - size) % self.capacity
+            return self._buffer[position:position + size]
+        window = np.zeros(size, dtype=np.float32)
+        available = min(size, max(0, end - oldest))
+        if available:
+            position = (end - available) % self.capacity
+            window[size - available:] = self._buffer[position:position + available]
+        return window
+
+
+class WavAudioSource:
+    """A PCM WAV file, read ahead in step with the wall clock from `start()`."""
+
+    def __init__(self, path: str, target_rate: int = AUDIO_ANALYSIS_SAMPLE_RATE):
+        """
+        Initialize a WavAudioSource.
+
+        Args:
+            path (str): PCM WAV file.
+            target_rate (int): Rate the audio is mixed down and decimated towards.
+        """
+        self.path = path
+        self.sample_rate, self.duration, self._chunks = read_wav_chunks(path, target_rate, chunk_seconds=0.1)
+        self.ring = AudioRing(int(RING_SECONDS * self.sample_rate))
+        self.finished = False
+        self.started_at = None
+
+    def start(self, at: float) -> None:
+        """Start the playback clock at monotonic time `at`."""
+        self.started_at = at
+
+    def stop(self) -> None:
+        self.finished = True
+        self._chunks.close()
+
+    def window(self, size: int, now: float, lead: float = 0.0) -> Tuple[np.ndarray, float, float]:
+        """
+        The audio at playback position `now - start + lead`.
+
+        Returns:
+            Tuple[np.ndarray, float, float]: The window, when its newest sample became available
+                                             (here: now, as it is read on demand) and its position (seconds).
+        """
+        position = now - self.started_at + lead
+        end = int(position * self.sample_rate)
+        while self.ring.written < end:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self.finished = True
+                break
+            self.ring.write(chunk)
+        if position >= self.duration:
+            self.finished = True
+        return self.ring.window(size, max(0, end)), now, position
+
+
+class PcmStreamSource:
+    """Raw interleaved little-endian PCM from a pipe or stdin, read by a background thread."""
+
+    def __init__(self, stream: BinaryIO, sample_rate: int = 44100, channels: int = 2, width: int = 2,
+                 target_rate: int = AUDIO_ANALYSIS_SAMPLE_RATE):
+        """
+        Initialize a PcmStreamSource.
+
+        Args:
+            stream (BinaryIO): Binary stream to read (e.g. `sys.stdin.buffer`).
+            sample_rate (int): Stream sample rate.
+            channels (int): Interleaved channels.
+            width (int): Bytes per sample (1-4).
+            target_rate (int): Rate the audio is mixed down and decimated towards.
+        """
+        self.stream = stream
+        self.channels = channels
+        self.width = width
+        self.factor = max(1, sample_rate // target_rate)
+        self.sample_rate = sample_rate // self.factor
+        self.ring = AudioRing(int(RING_SECONDS * self.sample_rate))
+        self.finished = False
+        self.last_arrival = None  # Monotonic time the newest block arrived
+
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._read, name="audio-stream-reader", daemon=True)
+
+    def start(self, at: float) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.finished = True
+
+    def _read(self) -> None:
+        group = self.channels * self.width * self.factor
+        read = getattr(self.stream, "read1", self.stream.read)  # read1: return whatever has arrived
+        pending = b""
+        while not self.finished:
+            data = read(STREAM_BLOCK_FRAMES * self.channels * self.width)
+            if not data:
+                break
+            arrived = time.monotonic()
+            pending += data
+            usable = len(pending) // group * group
+            if not usable:
+                continue
+            mixed = mix_down(pcm_to_float(pending[:usable], self.width), self.channels, self.factor)
+            pending = pending[usable:]
+            with self._lock:
+                self.ring.write(mixed)
+                self.last_arrival = arrived
+        self.finished = True
+
+    def window(self, size: int, now: float, lead: float = 0.0) -> Tuple[np.ndarray, float, float]:
+        """
+        The newest audio (`lead` is ignored: a live stream cannot be read ahead).
+
+        Returns:
+            Tuple[np.ndarray, float, float]: The window, when its newest block arrived and
+                                             its position (seconds of audio received).
+        """
+        with self._lock:
+            samples = self.ring.window(size).copy()
+            arrival = self.last_arrival
+            written = self.ring.written
+        return samples, arrival if arrival is not None else now, written / self.sample_rate
+
+
+# ------------------------------------------------------------------------------
+# Analysis and color mapping
+# ------------------------------------------------------------------------------
+
+class BandAnalyzer:
+    """Per-frame band levels (0-1) with auto gain and attack/release smoothing."""
+
+    def __init__(self, sample_rate: int, fps: float, window: int = AUDIO_REACTIVE_WINDOW):
+        """
+        Initialize a BandAnalyzer.
+
+        Args:
+            sample_rate (int): Sample rate of the windows passed in.
+            fps (float): Frame rate the analyzer is called at (for the auto gain decay).
+            window (int): Samples per analysed window.
+        """
+        self.size = window
+        self._window = np.hanning(window).astype(np.float32)
+        freqs = np.fft.rfftfreq(window, 1 / sample_rate)
+        self._band_matrix = np.stack([(freqs >= lo) & (freqs < hi) for lo, hi in BANDS], axis=1).astype(np.float32)
+        self._decay = PEAK_DECAY / fps
+        self.peak = np.full(len(BANDS), -np.inf)
+        self.levels = np.zeros(len(BANDS))
+
+    def __call__(self, samples: np.ndarray) -> np.ndarray:
+        spectrum = np.fft.rfft(samples * self._window)
+        power = (spectrum.real ** 2 + spectrum.imag ** 2) @ self._band_matrix
+        energy = np.log10(power + 1e-9)
+        self.peak = np.maximum(energy, self.peak - self._decay)
+        target = np.clip((energy - self.peak + DYNAMIC_RANGE) / DYNAMIC_RANGE, 0, 1)
+        self.levels += np.where(target > self.levels, ATTACK, RELEASE) * (target - self.levels)
+        return self.levels
+
+
+def hsv_to_rgb(h: np.ndarray, s, v: np.ndarray) -> np.ndarray:
+    """Vectorized HSV (all 0-1) to RGB, returned as an (n, 3) float array in 0-1."""
+    h6 = (h % 1.0) * 6
+    sector = h6.astype(np.int64) % 6
+    f = h6 - np.floor(h6)
+    p = v * (1 - s)
+    q = v * (1 - s * f)
+    t = v * (1 - s * (1 - f))
+    r = np.choose(sector, (v, q, p, p, t, v))
+    g = np.choose(sector, (t, v, v, q, p, p))
+    b = np.choose(sector, (p, p, t, v, v, q))
+    return np.stack((r, g, b), axis=1)
+
+
+class ColorMapper:
+    """Maps band levels to one RGB color per device, for all devices at once."""
+
+    def __init__(self, count: int):
+        """
+        Initialize a ColorMapper.
+
+        Args:
+            count (int): Number of devices.
+        """
+        bands = len(BANDS)
+        own = np.eye(bands)[np.arange(count) % bands]
+        self._weights = OWN_BAND * own + (1 - OWN_BAND) / bands  # (devices, bands)
+        self._hue = np.arange(count) / max(1, count) + (np.arange(count) % bands) / (3 * bands)
+
+    def __call__(self, levels: np.ndarray, seconds: float) -> np.ndarray:
+        """
+        Args:
+            levels (np.ndarray): Band levels (0-1).
+            seconds (float): Time since the start, for the hue drift.
+
+        Returns:
+            np.ndarray: (devices, 3) uint8 RGB.
+        """
+        value = self._weights @ levels
+        saturation = 1 - HIGH_WASH * levels[-1]
+        rgb = hsv_to_rgb(self._hue + HUE_DRIFT * seconds + 0.1 * levels[0], saturation, value)
+        return (rgb * 255 + 0.5).astype(np.uint8)
+
+
+# ------------------------------------------------------------------------------
+# Engine
+# ------------------------------------------------------------------------------
+
+class AudioReactiveEngine:
+    """Sends audio-driven colors to many devices at a fixed frame rate."""
+
+    def __init__(
+        self,
+        devices: List[GoveeDevice],
+        source,
+        fps: float = AUDIO_REACTIVE_FPS,
+        latency: float = AUDIO_REACTIVE_LATENCY,
+        threshold: int = AUDIO_REACTIVE_THRESHOLD,
+        keepalive: float = COLOR_STREAM_KEEPALIVE
+    ):
+        """
+        Initialize an AudioReactiveEngine.
+
+        Args:
+            devices (List[GoveeDevice]): Devices to drive, in color-wheel order.
+            source: WavAudioSource or PcmStreamSource.
+            fps (float): Frames per second.
+            latency (float): Seconds the audio is analysed ahead of playback, to make up for the
+                             time packets take to show on the devices (file sources only).
+            threshold (int): Smallest change in any RGB channel worth a packet.
+            keepalive (float): Resend a device's color after this many seconds without a packet.
+        """
+        self.devices = devices
+        self.source = source
+        self.fps = fps
+        self.latency = latency
+
+        self.analyzer = BandAnalyzer(source.sample_rate, fps)
+        self.mapper = ColorMapper(len(devices))
+        self.stream = ColorStream(devices, threshold=threshold, keepalive=keepalive)
+        self.last_report = None
+
+        self._started_at = None
+        self._latency_ms = []
+        self._sync_ms = []
+
+    def close(self) -> None:
+        self.stream.close()
+
+    @traced("audio.frame")
+    def frame(self, now: float) -> int:
+        """
+        Analyse the current audio and send every device whose color changed.
+
+        Args:
+            now (float): Monotonic time of this frame.
+
+        Returns:
+            int: Packets sent.
+        """
+        samples, available_at, position = self.source.window(self.analyzer.size, now, self.latency)
+        rgb = self.mapper(self.analyzer(samples), now - self._started_at)
+        sent = self.stream.send(rgb, now)
+
+        done = time.monotonic()
+        self._latency_ms.append((done - available_at) * 1000)
+        if isinstance(self.source, WavAudioSource):
+            # How far ahead of the audio being heard the packets leave (aim: device latency)
+            self._sync_ms.append((position - (done - self._started_at)) * 1000)
+        return sent
+
+    def run(self, duration: Optional[float] = None, show_mode: Optional[ShowMode] = None) -> dict:
+        """
+        Run until the source ends (or for `duration` seconds).
+
+        Args:
+            duration (float, optional): Seconds to run. Defaults to the whole source.
+            show_mode (ShowMode, optional): Custom show mode. Defaults to one without a report file.
+
+        Returns:
+            dict: The ColorStream run report, plus latency (newest audio available → last packet
+                  of the frame) and, for file sources, the sync offset.
+        """
+        self._started_at = time.monotonic()
+        self.source.start(self._started_at)
+        try:
+            report = self.stream.run(self.frame, self.fps, duration=duration, finished=lambda: self.source.finished,
+                                     show_mode=show_mode or ShowMode(show_name="audio-reactive"),
+                                     started_at=self._started_at)
+        finally:
+            self.source.stop()
+
+        report["latency_ms"] = percentiles(self._latency_ms)
+        if self._sync_ms:
+            report["sync_ms"] = percentiles(self._sync_ms)
+            report["latency_compensation_ms"] = self.latency * 1000
+        self.last_report = report
+        return report
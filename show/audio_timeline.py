@@ -0,0 +1,156 @@
+# show/audio_timeline.py
+
+# ==============================================================================
+# Govee LAN API Plus – Audio-Driven Timelines
+# -------------------------------------------
+#
+# Description:
+# Turns an AudioAnalysis (show/audio_analysis.py) into a show timeline in the
+# format read by show/show_timeline.py, so a song gets a first-draft light
+# show in seconds instead of hours of hand-placed cues.
+#
+# Devices are arranged in groups (lists of device factory variable names),
+# each with a list of captured MQTT DIY scenes to use. Then:
+# - Each section starts with the next scene of every group (or, for groups
+#   without scenes, the next colour of the palette), and the section's energy
+#   sets the brightness range for the beats that follow.
+# - Downbeats (the first beat of a bar) flash every group.
+# - The other beats chase through the groups, one group per beat, with the
+#   brightness following the bass energy at that beat.
+#
+# Without a groups file every factory device with captured MQTT DIY scenes is
+# its own group, using its own scenes.
+#
+# Groups file format:
+#
+# {
+#     "groups": {"front": ["porch_light", "garage_lights"], "yard": ["smart_ground_lights"]},
+#     "scenes": {"yard": ["smart_ground_lights_spooky_123456"]}
+# }
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import json
+from typing import Dict, List, Optional, Tuple
+
+from models.govee_device import GoveeDevice
+from show.audio_analysis import AudioAnalysis
+
+PALETTE = (
+    {"r": 255, "g": 40, "b": 0},
+    {"r": 120, "g": 0, "b": 255},
+    {"r": 0, "g": 200, "b": 255},
+    {"r": 255, "g": 0, "b": 120},
+    {"r": 0, "g": 255, "b": 80},
+    {"r": 255, "g": 180, "b": 0},
+)
+MIN_BRIGHTNESS = 10
+MAX_BRIGHTNESS = 100
+
+
+def default_groups(devices: Dict[str, GoveeDevice]) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """
+    One group per factory device that has captured MQTT DIY scenes, using those scenes.
+
+    Args:
+        devices (Dict[str, GoveeDevice]): Device variable name → device (from `load_factory_namespace`).
+
+    Returns:
+        Tuple[Dict[str, List[str]], Dict[str, List[str]]]: Groups and their scene variable names.
+    """
+    groups, scenes = {}, {}
+    for var_name, device in devices.items():
+        namespace = getattr(device, "mqtt_diy_scenes", None)
+        device_scenes = sorted(vars(namespace)) if namespace is not None else []
+        if device_scenes:
+            groups[var_name] = [var_name]
+            scenes[var_name] = device_scenes
+    return groups, scenes
+
+
+def load_groups(path: str) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """Read a groups file (see module description)."""
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    groups = {name: list(members) for name, members in config.get("groups", {}).items()}
+    scenes = {name: list(names) for name, names in config.get("scenes", {}).items()}
+    unknown = set(scenes) - set(groups)
+    if unknown:
+        raise ValueError(f"Scenes given for unknown groups: {', '.join(sorted(unknown))}")
+    return groups, scenes
+
+
+def build_timeline(
+    analysis: AudioAnalysis,
+    groups: Dict[str, List[str]],
+    scenes: Optional[Dict[str, List[str]]] = None,
+    name: str = "",
+    beats_per_bar: int = 4,
+    audio: Optional[str] = None
+) -> dict:
+    """
+    Build a show timeline from an audio analysis.
+
+    Args:
+        analysis (AudioAnalysis): The analysed track.
+        groups (Dict[str, List[str]]): Group name → device variable names.
+        scenes (Dict[str, List[str]], optional): Group name → MQTT DIY scene variable names, used in turn per section.
+        name (str): Show name.
+        beats_per_bar (int): Beats per bar; the first beat of each bar is a downbeat.
+        audio (str, optional): Audio file recorded in the timeline for reference.
+
+    Returns:
+        dict: A timeline for `compile_show`.
+
+    Raises:
+        ValueError: If there are no groups.
+    """
+    if not groups:
+        raise ValueError("No device groups to build a timeline for")
+    scenes = scenes or {}
+    group_names = list(groups)
+    cues = []
+
+    section_starts = [start for start, _, _ in analysis.sections] or [0.0]
+    section_energy = [energy for _, _, energy in analysis.sections] or [1.0]
+
+    for index, (start, energy) in enumerate(zip(section_starts, section_energy)):
+        for group_index, group in enumerate(group_names):
+            group_scenes = scenes.get(group)
+            if group_scenes:
+                cues.append({"at": round(start, 3), "device": groups[group], "scene": group_scenes[index % len(group_scenes)]})
+            else:
+                color = PALETTE[(index + group_index) % len(PALETTE)]
+                cues.append({"at": round(start, 3), "device": groups[group], "color": color})
+
+    section = 0
+    chase = 0
+    for beat, (at, bands) in enumerate(zip(analysis.beats, analysis.beat_bands)):
+        while section + 1 < len(section_starts) and at >= section_starts[section + 1]:
+            section += 1
+        # Quiet sections pulse between dimmer levels than loud ones
+        ceiling = MIN_BRIGHTNESS + (MAX_BRIGHTNESS - MIN_BRIGHTNESS) * (0.5 + 0.5 * section_energy[section])
+        floor = MIN_BRIGHTNESS + (ceiling - MIN_BRIGHTNESS) * 0.3
+        at = round(float(at), 3)
+
+        if beat % beats_per_bar == 0:
+            devices = [device for group in group_names for device in groups[group]]
+            cues.append({"at": at, "device": devices, "brightness": int(round(ceiling)), "priority": "normal"})
+        else:
+            group = group_names[chase % len(group_names)]
+            chase += 1
+            level = floor + (ceiling - floor) * float(bands[0])
+            cues.append({"at": at, "device": groups[group], "brightness": int(round(level)), "priority": "low"})
+
+    cues.sort(key=lambda cue: cue["at"])
+    timeline = {
+        "name": name,
+        "tempo": round(analysis.tempo, 2),
+        "sections": [{"at": round(start, 3), "energy": round(energy, 3)} for start, _, energy in analysis.sections],
+        "cues": cues,
+    }
+    if audio:
+        timeline["audio"] = audio
+    return timeline
@@ -0,0 +1,201 @@
+# show/color_stream.py
+
+# ==============================================================================
+# Govee LAN API Plus – Color Streaming
+# ------------------------------------
+#
+# Description:
+# The LAN streaming path shared by the frame-based effects (audio-reactive
+# lights, transitions): a fixed-rate frame clock and a sender that takes one
+# RGB color per device per frame, as a NumPy array, and puts only the colors
+# that changed on the wire as native `colorwc` packets.
+#
+# - Change detection is one vectorized comparison against the last color sent
+#   to each device; devices that have not been sent anything for
+#   COLOR_STREAM_KEEPALIVE seconds are resent anyway, in case a packet was lost.
+# - Packets are formatted straight into bytes, identical to
+#   `json.dumps(build_color_payload(...))`, over one reused socket.
+# - The frame clock runs inside ShowMode (frame timing lands in the usual
+#   jitter report) and skips frames it is already too late for rather than
+#   bunching them up.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import json
+import time
+import socket
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from api.lan.packet_capture import capture_lan_send
+from api.lan.set_device_color import build_color_payload
+from api.metrics import LAN_SEND_ERRORS, record_lan_send
+from models.govee_device import GoveeDevice
+from show.show_mode import ShowMode
+
+# Configurable via .env
+COLOR_STREAM_KEEPALIVE = float(os.getenv("COLOR_STREAM_KEEPALIVE", 1.0))
+
+# One `colorwc` packet with %d placeholders for r, g, b: the exact bytes json.dumps writes for the payload
+_COLOR_PACKET = json.dumps(build_color_payload({"r": 256, "g": 257, "b": 258})).encode("utf-8")
+_COLOR_PACKET = _COLOR_PACKET.replace(b"256", b"%d").replace(b"257", b"%d").replace(b"258", b"%d")
+
+
+def color_packet(r: int, g: int, b: int) -> bytes:
+    """Encode a `colorwc` packet for an RGB color (same bytes as json.dumps of `build_color_payload`)."""
+    return _COLOR_PACKET % (r, g, b)
+
+
+def percentiles(values_ms: List[float]) -> dict:
+    """p50/p95/p99/max of a list of milliseconds."""
+    if not values_ms:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    values = np.asarray(values_ms)
+    return {
+        "p50": float(np.percentile(values, 50)),
+        "p95": float(np.percentile(values, 95)),
+        "p99": float(np.percentile(values, 99)),
+        "max": float(values.max()),
+    }
+
+
+class ColorStream:
+    """Sends per-device RGB frames, only where the color changed."""
+
+    def __init__(self, devices: List[GoveeDevice], threshold: int = 0, keepalive: float = COLOR_STREAM_KEEPALIVE):
+        """
+        Initialize a ColorStream.
+
+        Args:
+            devices (List[GoveeDevice]): Devices, in the row order of the frames passed to `send`.
+            threshold (int): A device gets a packet when any RGB channel moved by more than this.
+            keepalive (float): Resend a device's color after this many seconds without a packet.
+        """
+        self.devices = devices
+        self.threshold = threshold
+        self.keepalive = keepalive
+
+        self.sent = np.zeros((len(devices), 3), dtype=np.int16)  # Last color sent to each device
+        self.packets = 0
+        self.send_errors = 0
+
+        self._addresses = [(d.ip, d.port) for d in devices]
+        self._sent_at = np.full(len(devices), -np.inf)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def send(self, rgb: np.ndarray, now: float) -> int:
+        """
+        Send every device whose color changed (or is due a keepalive).
+
+        Args:
+            rgb (np.ndarray): (devices, 3) uint8 colors.
+            now (float): Monotonic time of this frame.
+
+        Returns:
+            int: Packets sent.
+        """
+        due = (np.abs(rgb - self.sent).max(axis=1) > self.threshold) | (now - self._sent_at >= self.keepalive)
+        indices = np.flatnonzero(due)
+        if not len(indices):
+            return 0
+        self.sent[indices] = rgb[indices]
+        self._sent_at[indices] = now
+
+        sock, addresses, sent = self._sock, self._addresses, 0
+        for i, (r, g, b) in zip(indices.tolist(), rgb[indices].tolist()):
+            address = addresses[i]
+            data = _COLOR_PACKET % (r, g, b)
+            started = time.perf_counter()
+            try:
+                sock.sendto(data, address)
+            except OSError:
+                LAN_SEND_ERRORS.inc(1, address[0])
+                self.send_errors += 1
+                continue
+            record_lan_send(address[0], len(data), time.perf_counter() - started)
+            capture_lan_send(address, data)
+            sent += 1
+        self.packets += sent
+        return sent
+
+    def run(
+        self,
+        frame: Callable[[float], None],
+        fps: float,
+        duration: Optional[float] = None,
+        finished: Optional[Callable[[], bool]] = None,
+        show_mode: Optional[ShowMode] = None,
+        started_at: Optional[float] = None
+    ) -> dict:
+        """
+        Call `frame(now)` at a fixed rate until `finished()` is true (or for `duration` seconds).
+
+        Args:
+            frame (Callable[[float], None]): Renders and sends one frame for monotonic time `now`.
+            fps (float): Frames per second.
+            duration (float, optional): Seconds to run.
+            finished (Callable[[], bool], optional): Checked before every frame.
+            show_mode (ShowMode, optional): Custom show mode. Defaults to one without a report file.
+            started_at (float, optional): Monotonic time of frame 0. Defaults to when show mode is entered.
+
+        Returns:
+            dict: Frame counts, frame time, CPU use (process time per wall second, and per device
+                  per frame), packet counts and the frame jitter report.
+        """
+        show_mode = show_mode or ShowMode(show_name="color-stream")
+        period = 1 / fps
+        skipped = 0
+        frame_ms = []
+        packets_before = self.packets
+        cpu_started = time.process_time()
+
+        with show_mode as mode:
+            start = started_at if started_at is not None else time.monotonic()
+            index = 0
+            try:
+                while not (finished and finished()):
+                    planned = start + index * period
+                    if duration is not None and planned - start >= duration:
+                        break
+                    remaining = planned - time.monotonic()
+                    if remaining > 0:
+                        time.sleep(remaining)
+                    now = time.monotonic()
+                    frame(now)
+                    done = time.monotonic()
+                    frame_ms.append((done - now) * 1000)
+                    mode.record(planned, now, f"frame {index}")
+
+                    # Skip frames we are already too late for rather than bunching them up
+                    behind = int((done - start) / period) + 1
+                    if behind > index + 1:
+                        skipped += behind - index - 1
+                    index = max(index + 1, behind)
+                    mode.idle(start + index * period - time.monotonic())
+            finally:
+                wall = time.monotonic() - start
+                cpu = time.process_time() - cpu_started
+
+        frames, count = len(frame_ms), len(self.devices)
+        packets = self.packets - packets_before
+        return {
+            "devices": count,
+            "fps": fps,
+            "frames": frames,
+            "skipped_frames": skipped,
+            "seconds": wall,
+            "packets": packets,
+            "packets_per_second": packets / wall if wall else 0.0,
+            "send_errors": self.send_errors,
+            "frame_ms": percentiles(frame_ms),
+            "cpu_percent": 100 * cpu / wall if wall else 0.0,
+            "cpu_us_per_device_frame": cpu / frames / count * 1e6 if frames and count else 0.0,
+            "jitter_ms": mode.report()["jitter_ms"],
+        }
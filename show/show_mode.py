@@ -0,0 +1,235 @@
+# show/show_mode.py
+
+# ==============================================================================
+# Govee LAN API Plus – Real-Time Show Mode
+# ----------------------------------------
+#
+# Description:
+# A context manager that makes the current process as quiet as possible while
+# a show is playing, and measures how well cues hit their planned times.
+#
+# While active, show mode:
+# - Collects and `gc.freeze()`s everything loaded so far (devices, scenes,
+#   compiled cues), so the collector never re-scans them.
+# - Disables automatic cyclic GC; `idle()` runs a young-generation collection
+#   only when the next cue is far enough away.
+# - Optionally pins the process to one CPU and raises its scheduling priority
+#   (real-time FIFO if permitted, otherwise a lower nice value).
+# - Records planned vs actual fire time for every cue and writes a jitter
+#   report (percentiles + histogram) next to the show file on exit, so
+#   rehearsals can be compared.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import gc
+import os
+import json
+import time
+from datetime import datetime
+from typing import Optional
+
+from api.tracing import traced
+
+# Configurable via .env
+SHOW_MODE_CPU = os.getenv("SHOW_MODE_CPU", "")
+SHOW_MODE_REALTIME = os.getenv("SHOW_MODE_REALTIME", "false").lower() == "true"
+SHOW_MODE_GC_MIN_IDLE = float(os.getenv("SHOW_MODE_GC_MIN_IDLE", 0.05))
+
+# Upper bounds (in milliseconds) of the jitter histogram buckets
+JITTER_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 50, 100, float("inf"))
+
+
+class ShowMode:
+    """GC-quiet, jitter-instrumented context for show playback."""
+
+    def __init__(
+        self,
+        report_path: Optional[str] = None,
+        cpu: Optional[int] = None,
+        realtime: bool = SHOW_MODE_REALTIME,
+        gc_min_idle: float = SHOW_MODE_GC_MIN_IDLE,
+        show_name: str = ""
+    ):
+        """
+        Initialize ShowMode.
+
+        Args:
+            report_path (str, optional): Where to write the jitter report on exit. No report if None.
+            cpu (int, optional): CPU to pin the process to. Defaults to SHOW_MODE_CPU; not pinned if unset.
+            realtime (bool): Try to switch to SCHED_FIFO (needs root/CAP_SYS_NICE); falls back to nice -10.
+            gc_min_idle (float): Minimum seconds until the next cue for `idle()` to run a collection.
+            show_name (str): Name recorded in the report.
+        """
+        self.report_path = report_path
+        self.cpu = cpu if cpu is not None else (int(SHOW_MODE_CPU) if SHOW_MODE_CPU else None)
+        self.realtime = realtime
+        self.gc_min_idle = gc_min_idle
+        self.show_name = show_name
+
+        self.samples = []  # List of (planned, actual, label) tuples, in seconds
+        self.gc_runs = 0
+        self.settings = {}
+
+        self._gc_was_enabled = True
+        self._previous_affinity = None
+        self._previous_nice = None
+        self._previous_scheduler = None
+        self._started_at = None
+
+    # --------------------------------------------------------------------------
+    # Context manager
+    # --------------------------------------------------------------------------
+
+    def __enter__(self):
+        self._started_at = datetime.now()
+
+        # Move everything loaded so far out of the collector's reach
+        gc.collect()
+        gc.freeze()
+        self._gc_was_enabled = gc.isenabled()
+        gc.disable()
+        self.settings["frozen_objects"] = gc.get_freeze_count()
+
+        if self.cpu is not None and hasattr(os, "sched_setaffinity"):
+            try:
+                self._previous_affinity = os.sched_getaffinity(0)
+                os.sched_setaffinity(0, {self.cpu})
+                self.settings["cpu"] = self.cpu
+            except OSError as e:
+                print(f"⚠️  Could not pin show to CPU {self.cpu}: {e}")
+
+        self._raise_priority()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._gc_was_enabled:
+            gc.enable()
+        gc.unfreeze()
+
+        if self._previous_affinity is not None:
+            os.sched_setaffinity(0, self._previous_affinity)
+        if self._previous_scheduler is not None:
+            try:
+                os.sched_setscheduler(0, *self._previous_scheduler)
+            except OSError:
+                pass
+        if self._previous_nice is not None:
+            try:
+                os.setpriority(os.PRIO_PROCESS, 0, self._previous_nice)
+            except OSError:
+                pass
+
+        if self.report_path:
+            self.write_report(self.report_path)
+
+    def _raise_priority(self) -> None:
+        if self.realtime and hasattr(os, "sched_setscheduler"):
+            try:
+                policy = os.sched_getscheduler(0)
+                param = os.sched_getparam(0)
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(os.sched_get_priority_min(os.SCHED_FIFO) + 10))
+                self._previous_scheduler = (policy, param)
+                self.settings["scheduler"] = "SCHED_FIFO"
+                return
+            except (OSError, AttributeError) as e:
+                print(f"⚠️  Real-time scheduling not permitted ({e}), trying nice instead.")
+
+        if self.realtime and hasattr(os, "setpriority"):
+            try:
+                self._previous_nice = os.getpriority(os.PRIO_PROCESS, 0)
+                os.setpriority(os.PRIO_PROCESS, 0, -10)
+                self.settings["nice"] = -10
+            except OSError as e:
+                self._previous_nice = None
+                print(f"⚠️  Could not raise process priority: {e}")
+
+    # --------------------------------------------------------------------------
+    # During playback
+    # --------------------------------------------------------------------------
+
+    def record(self, planned: float, actual: float, label: str = "") -> None:
+        """
+        Record a fired cue.
+
+        Args:
+            planned (float): Planned fire time (monotonic seconds).
+            actual (float): Actual fire time (monotonic seconds).
+            label (str): Cue description.
+        """
+        self.samples.append((planned, actual, label))
+
+    @traced("show.idle")
+    def idle(self, seconds_until_next_cue: float) -> None:
+        """
+        Run a young-generation collection if there's enough time before the next cue.
+
+        Args:
+            seconds_until_next_cue (float): Time left before the next cue fires.
+        """
+        if seconds_until_next_cue >= self.gc_min_idle:
+            gc.collect(0)
+            self.gc_runs += 1
+
+    # --------------------------------------------------------------------------
+    # Reporting
+    # --------------------------------------------------------------------------
+
+    def report(self) -> dict:
+        """
+        Summarize fire-time jitter for this run.
+
+        Returns:
+            dict: Percentiles (ms), a histogram keyed by bucket upper bound (ms) and the worst cues.
+        """
+        jitter_ms = sorted((actual - planned) * 1000 for planned, actual, _ in self.samples)
+
+        def percentile(p: float) -> float:
+            if not jitter_ms:
+                return 0.0
+            return jitter_ms[min(len(jitter_ms) - 1, int(round(p / 100 * (len(jitter_ms) - 1))))]
+
+        histogram = {str(bound): 0 for bound in JITTER_BUCKETS_MS}
+        for value in jitter_ms:
+            for bound in JITTER_BUCKETS_MS:
+                if abs(value) <= bound:
+                    histogram[str(bound)] += 1
+                    break
+
+        worst = sorted(self.samples, key=lambda s: s[1] - s[0], reverse=True)[:10]
+        return {
+            "show": self.show_name,
+            "started_at": self._started_at.isoformat() if self._started_at else None,
+            "cues": len(jitter_ms),
+            "jitter_ms": {
+                "mean": sum(jitter_ms) / len(jitter_ms) if jitter_ms else 0.0,
+                "p50": percentile(50),
+                "p95": percentile(95),
+                "p99": percentile(99),
+                "max": jitter_ms[-1] if jitter_ms else 0.0,
+            },
+            "histogram_ms": histogram,
+            "worst_cues": [
+                {"label": label, "jitter_ms": (actual - planned) * 1000}
+                for planned, actual, label in worst
+            ],
+            "gc_runs": self.gc_runs,
+            "settings": self.settings,
+        }
+
+    def write_report(self, path: str) -> None:
+        """Write the jitter report as JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        print(f"📝 Jitter report written to {path}")
+
+
+def jitter_report_path(show_path: str) -> str:
+    """
+    Return a per-run report path next to a show file.
+
+    e.g. shows/halloween.json → shows/halloween.jitter-20251031-201500.json
+    """
+    base, _ = os.path.splitext(show_path)
+    return f"{base}.jitter-{time.strftime('%Y%m%d-%H%M%S')}.json"
@@ -0,0 +1,205 @@
+# show/show_player.py
+
+# ==============================================================================
+# Govee LAN API Plus – Show Player
+# --------------------------------
+#
+# Description:
+# Plays a compiled show timeline, firing each cue's pre-encoded LAN packet at
+# its planned time. The player sleeps until just before each cue, then spins
+# for the last couple of milliseconds to hit the planned time precisely.
+#
+# Playback runs inside ShowMode, which keeps the garbage collector quiet and
+# records a jitter report for every run.
+#
+# The schedule can be replaced while the show plays (`swap`, used by
+# show/show_reload.py). The player picks the new cues up between cues, or
+# wakes from its sleep to do so, and carries on after the last cue it fired:
+# nothing planned before that cue is fired, nor anything planned at the same
+# time that already went out (same device and command). Cues edited into the
+# past (more than SHOW_RELOAD_LATE_TOLERANCE ago) are skipped rather than
+# fired late. A cue that has just fired and is moved a little later fires
+# again at its new time.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import time
+import socket
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Callable, List, Optional
+
+from api.lan.packet_capture import capture_lan_send
+from api.metrics import LAN_SEND_ERRORS, record_lan_send
+from api.tracing import traced
+from show.show_mode import ShowMode, jitter_report_path
+from show.show_timeline import ShowCue
+
+# Configurable via .env
+SHOW_SPIN_MARGIN = float(os.getenv("SHOW_SPIN_MARGIN", 0.002))
+SHOW_RELOAD_LATE_TOLERANCE = float(os.getenv("SHOW_RELOAD_LATE_TOLERANCE", 0.05))
+
+
+class ShowPlayer:
+    """Fires compiled show cues at their planned times."""
+
+    def __init__(
+        self,
+        cues: List[ShowCue],
+        show_path: Optional[str] = None,
+        show_name: str = "",
+        spin_margin: float = SHOW_SPIN_MARGIN,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize a ShowPlayer.
+
+        Args:
+            cues (List[ShowCue]): Compiled cues, ordered by time.
+            show_path (str, optional): Path of the show file. Jitter reports are written next to it.
+            show_name (str): Name recorded in reports.
+            spin_margin (float): Seconds before each cue to stop sleeping and busy-wait instead.
+            clock (Callable[[], float]): Clock the show is timed against, in seconds. Defaults to the
+                                         monotonic clock; multi-node shows pass the leader's clock
+                                         (see show/show_sync.py).
+        """
+        self.cues = cues
+        self.show_path = show_path
+        self.show_name = show_name
+        self.spin_margin = spin_margin
+        self.clock = clock
+        self.last_report = None
+        self.swaps = []  # (perf_counter when the player picked it up, cues skipped as past) per swap
+
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._pending = None
+        self._swapped = threading.Event()
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def swap(self, cues: List[ShowCue]) -> None:
+        """
+        Replace the schedule, even while the show is playing.
+
+        Args:
+            cues (List[ShowCue]): The new compiled cues, ordered by time.
+        """
+        self.cues = cues
+        self._pending = cues
+        self._swapped.set()
+
+    @traced("show.wait")
+    def wait_until(self, target: float) -> bool:
+        """
+        Sleep, then spin, until the show clock reaches `target`.
+
+        Returns:
+            bool: False if a swap woke the player up before `target`.
+        """
+        clock = self.clock
+        remaining = target - clock()
+        if remaining > self.spin_margin and self._swapped.wait(remaining - self.spin_margin):
+            return False
+        while clock() < target:
+            pass
+        return True
+
+    @traced("show.fire", args=lambda self, cue: {"label": cue.label, "device": cue.device.name})
+    def fire(self, cue: ShowCue) -> None:
+        """Put a cue's packet on the wire."""
+        started = time.perf_counter()
+        address = (cue.device.ip, cue.device.port)
+        try:
+            self._sock.sendto(cue.message, address)
+        except OSError as e:
+            LAN_SEND_ERRORS.inc(1, cue.device.ip)
+            print(f"❌ Failed to send cue '{cue.label}' to {cue.device.name}: {e}")
+            return
+        record_lan_send(cue.device.ip, len(cue.message), time.perf_counter() - started)
+        capture_lan_send(address, cue.message)
+
+    def play(self, start_at: Optional[float] = None, show_mode: Optional[ShowMode] = None) -> dict:
+        """
+        Play the show from start to end.
+
+        Args:
+            start_at (float, optional): Show clock time the show starts at. Defaults to now.
+            show_mode (ShowMode, optional): Custom show mode. Defaults to one that writes a
+                                            jitter report next to the show file (if any).
+
+        Returns:
+            dict: The jitter report for this run.
+        """
+        if show_mode is None:
+            report_path = jitter_report_path(self.show_path) if self.show_path else None
+            show_mode = ShowMode(report_path=report_path, show_name=self.show_name)
+
+        with show_mode as mode:
+            if start_at is None:
+                start_at = self.clock()
+
+            cues = self.cues
+            i = 0
+            while i < len(cues):
+                if self._swapped.is_set():
+                    cues, i = self._resume(cues, i, start_at)
+                    continue
+                cue = cues[i]
+                planned = start_at + cue.at
+                if not self.wait_until(planned):
+                    continue
+                self.fire(cue)
+                mode.record(planned, self.clock(), cue.label)
+
+                i += 1
+                if i < len(cues):
+                    mode.idle(start_at + cues[i].at - self.clock())
+
+        self.last_report = mode.report()
+        if self.swaps:
+            self.last_report["swaps"] = len(self.swaps)
+        return self.last_report
+
+    @traced("show.swap")
+    def _resume(self, fired: List[ShowCue], fired_count: int, start_at: float):
+        """Pick up a swapped-in schedule. Returns (new cues, index of the next cue to fire)."""
+        self._swapped.clear()
+        cues = self._pending
+        times = [cue.at for cue in cues]  # Bisected directly, as bisect's key= needs Python 3.10
+        if not fired_count:
+            i = 0
+        else:
+            # Skip everything before the last fired cue, and the cues sharing its time that already went out
+            last_at = fired[fired_count - 1].at
+            first = fired_count - 1
+            while first and fired[first - 1].at == last_at:
+                first -= 1
+            already = Counter(_cue_key(c) for c in fired[first:fired_count])
+            i = bisect_left(times, last_at)
+            end = i
+            done, todo = [], []
+            while end < len(cues) and cues[end].at == last_at:
+                cue = cues[end]
+                if already[_cue_key(cue)]:
+                    already[_cue_key(cue)] -= 1
+                    done.append(cue)
+                else:
+                    todo.append(cue)
+                end += 1
+            if done and todo:
+                cues = cues[:i] + done + todo + cues[end:]  # Only this copy's order changes, not the schedule's
+            i += len(done)
+        # Cues edited into the past are dropped rather than fired late
+        late = bisect_left(times, self.clock() - start_at - SHOW_RELOAD_LATE_TOLERANCE, lo=i)
+        self.swaps.append((time.perf_counter(), late - i))
+        return cues, late
+
+
+def _cue_key(cue: ShowCue) -> tuple:
+    """What a cue does: its device and command."""
+    return cue.device.id, cue.payload.get("msg", {}).get("cmd")
@@ -0,0 +1,215 @@
+# show/show_reload.py
+
+# ==============================================================================
+# Govee LAN API Plus – Show Hot Reload
+# ------------------------------------
+#
+# Description:
+# Watches a show timeline file while it plays and swaps every saved edit into
+# the running ShowPlayer, so rehearsals don't need a restart.
+#
+# - Changes are picked up with a watchdog filesystem observer (edits in place
+#   and editors' write-then-rename saves alike), SHOW_RELOAD_SETTLE seconds
+#   after the last event so half-written files aren't read.
+# - Only the cue entries that changed are compiled again: each entry is
+#   compared with the previous version's (in file order, tolerating inserted
+#   and deleted entries) and unchanged ones keep their compiled cues. The
+#   device and scene factories are read once, up front.
+# - The new schedule is swapped in with ShowPlayer.swap(): cues already fired
+#   are not fired again and the packet in flight is never cut short (see
+#   show/show_player.py).
+# - A file that doesn't parse or compile is reported and ignored; the show
+#   keeps playing the last good version.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import time
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from api.tracing import traced
+from models.govee_device import GoveeDevice
+from models.govee_mqtt_diy_scene import GoveeMqttDiyScene
+from show.show_player import ShowPlayer
+from show.show_timeline import ShowCue, compile_cue, load_factory_namespace, load_show
+
+# Configurable via .env
+SHOW_RELOAD_SETTLE = float(os.getenv("SHOW_RELOAD_SETTLE", 0.05))
+
+REALIGN_WINDOW = 32  # Entries to look ahead for a match after deletions
+
+
+class _ShowFileHandler(FileSystemEventHandler):
+    """Flags changes to one file in a watched directory."""
+
+    def __init__(self, path: str, changed: threading.Event):
+        self.path = path
+        self.changed = changed
+
+    def on_any_event(self, event):
+        if event.src_path == self.path or getattr(event, "dest_path", None) == self.path:
+            self.changed.set()
+
+
+class ShowReloader:
+    """Recompiles a show file's changed cues and swaps them into a playing ShowPlayer."""
+
+    def __init__(
+        self,
+        show_path: str,
+        devices: Optional[Dict[str, GoveeDevice]] = None,
+        scenes: Optional[Dict[str, GoveeMqttDiyScene]] = None,
+        prepare: Optional[Callable[[dict], dict]] = None,
+        settle: float = SHOW_RELOAD_SETTLE
+    ):
+        """
+        Initialize a ShowReloader and compile the show as it is now.
+
+        Args:
+            show_path (str): The show timeline file to watch.
+            devices (Dict[str, GoveeDevice], optional): Device variable name → device. Defaults to the device factory.
+            scenes (Dict[str, GoveeMqttDiyScene], optional): Scene variable name → scene. Defaults to the MQTT DIY scene factory.
+            prepare (Callable[[dict], dict], optional): Applied to every parsed version of the show before it is
+                                                        compiled, e.g. `lambda show: node_show(show, "house_a")`.
+            settle (float): Seconds to wait after the last change before reading the file.
+        """
+        if devices is None or scenes is None:
+            factory_devices, factory_scenes = load_factory_namespace()
+            devices = factory_devices if devices is None else devices
+            scenes = factory_scenes if scenes is None else scenes
+
+        self.show_path = os.path.abspath(show_path)
+        self.devices = devices
+        self.scenes = scenes
+        self.prepare = prepare or (lambda show: show)
+        self.settle = settle
+        self.reloads = []  # One dict per swapped-in version (see `reload`)
+
+        self._entries: List[Tuple[dict, List[ShowCue]]] = []  # (entry, its compiled cues) in file order
+        self._signature = self._stat()
+        self.show = self.prepare(load_show(self.show_path))
+        self.cues, _ = self._compile(self.show)
+
+        self._player: Optional[ShowPlayer] = None
+        self._changed = threading.Event()
+        self._stop = threading.Event()
+        self._observer = None
+        self._thread = None
+
+    def start(self, player: ShowPlayer) -> None:
+        """Start watching the file, swapping every good version into `player` (which should be playing `self.cues`)."""
+        self._player = player
+        self._stop.clear()
+        self._observer = Observer()
+        self._observer.schedule(_ShowFileHandler(self.show_path, self._changed), path=os.path.dirname(self.show_path), recursive=False)
+        self._observer.start()
+        self._thread = threading.Thread(target=self._run, name="show-reloader", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._changed.set()
+        if self._observer:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    @traced("show.reload")
+    def reload(self, detected_at: Optional[float] = None) -> bool:
+        """
+        Read the show file again and swap it into the player if it changed.
+
+        Args:
+            detected_at (float, optional): perf_counter time the change was noticed, for the report.
+
+        Returns:
+            bool: Whether a new schedule was swapped in.
+        """
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+
+        started = time.perf_counter()
+        try:
+            show = self.prepare(load_show(self.show_path))
+            cues, compiled = self._compile(show)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️  Not reloading {self.show_path}: {e}")
+            return False
+        compiled_at = time.perf_counter()
+        if self._player:
+            self._player.swap(cues)
+        swapped_at = time.perf_counter()
+
+        self.show, self.cues = show, cues
+        self.reloads.append({
+            "detected": detected_at if detected_at is not None else started,
+            "swapped": swapped_at,
+            "compile_ms": (compiled_at - started) * 1000,
+            "entries": len(show.get("cues", [])),
+            "compiled": compiled,
+            "cues": len(cues),
+        })
+        print(f"🔄 Reloaded {os.path.basename(self.show_path)}: {compiled} changed cue(s) compiled "
+              f"in {(compiled_at - started) * 1000:.1f} ms")
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._changed.wait()
+            detected_at = time.perf_counter()
+            # Wait for the writes to settle
+            while self._changed.is_set() and not self._stop.is_set():
+                self._changed.clear()
+                time.sleep(self.settle)
+            if not self._stop.is_set():
+                self.reload(detected_at)
+
+    def _compile(self, show: dict):
+        """Compile a show, reusing the cues of entries unchanged since the last version. Returns (cues, entries compiled)."""
+        previous = self._entries
+        entries = []
+        cues = []
+        compiled = 0
+        j = 0  # Where this entry most likely sits in the previous version
+        for entry in show.get("cues", []):
+            # Comparing dicts is much cheaper than compiling (or hashing) an entry. Look a few
+            # entries ahead in case some were deleted; an inserted entry just doesn't match.
+            if j < len(previous) and previous[j][0] == entry:
+                match = j
+            else:
+                match = next((k for k in range(j + 1, min(j + REALIGN_WINDOW, len(previous))) if previous[k][0] == entry), None)
+            if match is None:
+                entry_cues = compile_cue(entry, self.devices, self.scenes)
+                compiled += 1
+            else:
+                entry_cues = previous[match][1]
+                j = match + 1
+            entries.append((entry, entry_cues))
+            cues.extend(entry_cues)
+        cues.sort(key=lambda c: c.at)  # Same order as compile_show()
+        self._entries = entries
+        return cues, compiled
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.show_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,104 @@
+# show/show_replay.py
+
+# ==============================================================================
+# Govee LAN API Plus – Capture Replay
+# -----------------------------------
+#
+# Description:
+# Turns a LAN packet capture (api.lan.packet_capture) back into show cues, so
+# ShowPlayer can re-send it byte for byte with the original inter-packet
+# timing, in show mode, with a jitter report like any other show.
+#
+# Replays can be time-scaled (speed 2.0 plays twice as fast) and remapped to
+# other devices: each captured destination IP can be sent to another address,
+# e.g. to rehearse a recorded show against the LAN device emulator or a
+# second set of lights.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import json
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from api.lan.packet_capture import CapturedPacket
+from models.govee_device import GoveeDevice
+from show.show_timeline import ShowCue
+
+Address = Tuple[str, int]
+
+
+def parse_remap(specs: Iterable[str]) -> Dict[str, Address]:
+    """
+    Parse "OLD_IP=NEW_IP[:PORT]" remap specs.
+
+    Returns:
+        Dict[str, Address]: {captured IP: (new IP, new port or None to keep the captured port)}
+    """
+    remap = {}
+    for spec in specs:
+        old, sep, new = spec.partition("=")
+        if not sep or not old or not new:
+            raise ValueError(f"Invalid remap '{spec}', expected OLD_IP=NEW_IP[:PORT]")
+        ip, _, port = new.partition(":")
+        remap[old.strip()] = (ip.strip(), int(port) if port else None)
+    return remap
+
+
+def remap_to_targets(packets: List[CapturedPacket], targets: List[str]) -> Dict[str, Address]:
+    """
+    Map each captured destination IP, in order of first use, onto `targets` (cycling if there are fewer targets).
+    """
+    remap = {}
+    for packet in packets:
+        if packet.ip not in remap:
+            remap[packet.ip] = (targets[len(remap) % len(targets)], None)
+    return remap
+
+
+def capture_cues(
+    packets: List[CapturedPacket],
+    speed: float = 1.0,
+    remap: Optional[Dict[str, Address]] = None
+) -> List[ShowCue]:
+    """
+    Build show cues that re-send captured packets.
+
+    Args:
+        packets (List[CapturedPacket]): Packets from `read_capture`, in send order.
+        speed (float): Time scale; 2.0 replays twice as fast, 0.5 at half speed.
+        remap (Dict[str, Address], optional): Destination remapping from `parse_remap` or `remap_to_targets`.
+                                              Unmapped IPs are sent to their captured address.
+
+    Returns:
+        List[ShowCue]: Cues whose messages are the captured bytes, starting at 0.0.
+    """
+    if speed <= 0:
+        raise ValueError("Replay speed must be greater than 0")
+    if not packets:
+        return []
+
+    remap = remap or {}
+    devices: Dict[Address, GoveeDevice] = {}
+    first_at = packets[0].at
+    cues = []
+    for i, packet in enumerate(packets):
+        ip, port = remap.get(packet.ip, (packet.ip, None))
+        address = (ip, port or packet.port)
+        device = devices.get(address)
+        if device is None:
+            name = f"{packet.ip} → {ip}" if ip != packet.ip else ip
+            device = devices[address] = GoveeDevice(f"{ip}:{address[1]}", name, "", ip=ip)
+            device.port = address[1]
+
+        try:
+            payload = json.loads(packet.data)
+            command = payload.get("msg", {}).get("cmd", "?")
+        except (ValueError, AttributeError):
+            payload, command = None, "?"
+
+        cue = ShowCue((packet.at - first_at) / speed, device, {}, label=f"#{i} {command}")
+        cue.payload = payload
+        cue.message = packet.data  # Re-send the captured bytes, not a re-encoding of them
+        cues.append(cue)
+    return cues
@@ -0,0 +1,351 @@
+# show/show_sync.py
+
+# ==============================================================================
+# Govee LAN API Plus – Multi-Node Show Sync
+# -----------------------------------------
+#
+# Description:
+# Plays one show across several machines (e.g. a Raspberry Pi per house),
+# each firing its own devices, all on the leader's clock.
+#
+# - The leader serves the show timeline and the start time over TCP, and
+#   answers clock requests over UDP, on SHOW_SYNC_PORT.
+# - Each follower joins, receives the show (it compiles it against its own
+#   factories) and estimates its clock offset to the leader NTP-style: a burst
+#   of SHOW_SYNC_EXCHANGES request/reply exchanges, each timestamped on both
+#   ends. Exchanges that took noticeably longer than the fastest one were
+#   delayed on the way (Wi-Fi retries, scheduling) and are dropped; the offset
+#   is the median of the rest. The burst repeats every SHOW_SYNC_INTERVAL
+#   seconds during the show, so clock drift never builds up.
+# - The leader announces a start time SHOW_SYNC_LEAD seconds ahead, in its own
+#   clock. Every node plays with a ShowPlayer timed against the leader's clock
+#   (its own clock plus the estimated offset), so the same cue fires at the
+#   same moment everywhere.
+#
+# Which node drives which devices is listed in the show, by node name. Devices
+# not listed under any node are driven by the leader:
+#
+# {
+#     "name": "Street Show",
+#     "nodes": {"house_a": ["porch_light", "garage_lights"], "house_b": ["smart_ground_lights"]},
+#     "cues": [...]
+# }
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import json
+import time
+import socket
+import struct
+import threading
+from statistics import median
+from typing import Callable, Dict, Optional, Tuple
+
+# Configurable via .env
+SHOW_SYNC_PORT = int(os.getenv("SHOW_SYNC_PORT", 4010))
+SHOW_SYNC_EXCHANGES = int(os.getenv("SHOW_SYNC_EXCHANGES", 16))
+SHOW_SYNC_INTERVAL = float(os.getenv("SHOW_SYNC_INTERVAL", 1.0))
+SHOW_SYNC_LEAD = float(os.getenv("SHOW_SYNC_LEAD", 3.0))
+
+TIME_MAGIC = b"GLTS"
+TIME_REQUEST = struct.Struct("<4sId")  # Magic, sequence, follower send time
+TIME_REPLY = struct.Struct("<4sIddd")  # Magic, sequence, follower send time, leader receive time, leader send time
+EXCHANGE_TIMEOUT = 0.2  # Seconds to wait for one clock reply
+DELAY_TOLERANCE = 1.5  # Exchanges slower than this × the fastest round trip are dropped
+
+
+def node_show(show: dict, node: str, leader: bool = False) -> dict:
+    """
+    The part of a show one node plays: its own devices' cues.
+
+    Args:
+        show (dict): The full timeline (see module description).
+        node (str): Node name.
+        leader (bool): Whether this node is the leader, which also drives every unassigned device.
+
+    Returns:
+        dict: A copy of the timeline with only this node's devices in its cues.
+    """
+    nodes = show.get("nodes", {})
+    owned = set(nodes.get(node, []))
+    assigned = {device for devices in nodes.values() for device in devices}
+
+    cues = []
+    for entry in show.get("cues", []):
+        names = entry["device"] if isinstance(entry["device"], list) else [entry["device"]]
+        mine = [name for name in names if name in owned or (leader and name not in assigned)]
+        if mine:
+            cues.append(dict(entry, device=mine))
+    return dict(show, cues=cues)
+
+
+class ClockSync:
+    """Keeps an estimate of the offset from a local clock to the leader's clock."""
+
+    def __init__(
+        self,
+        leader_host: str,
+        port: int = SHOW_SYNC_PORT,
+        clock: Callable[[], float] = time.monotonic,
+        exchanges: int = SHOW_SYNC_EXCHANGES,
+        interval: float = SHOW_SYNC_INTERVAL
+    ):
+        """
+        Initialize a ClockSync.
+
+        Args:
+            leader_host (str): Leader address.
+            port (int): Leader sync port.
+            clock (Callable[[], float]): The local clock, in seconds.
+            exchanges (int): Request/reply exchanges per sync burst.
+            interval (float): Seconds between bursts once `start()`ed.
+        """
+        self.address = (leader_host, port)
+        self.clock = clock
+        self.exchanges = exchanges
+        self.interval = interval
+
+        self.offset = None  # Leader clock minus local clock, in seconds
+        self.delay = None  # Round trip of the best exchange in the latest burst, in seconds
+        self.spread = None  # Spread of the kept offsets in the latest burst, in seconds
+        self.bursts = 0
+
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.settimeout(EXCHANGE_TIMEOUT)
+        self._sequence = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def leader_time(self) -> float:
+        """The leader's clock right now, as estimated (the clock for a ShowPlayer on this node)."""
+        return self.clock() + self.offset
+
+    def exchange(self) -> Optional[Tuple[float, float]]:
+        """
+        One request/reply exchange.
+
+        Returns:
+            Tuple[float, float]: (offset, round-trip delay) in seconds, or None if the reply was lost.
+        """
+        self._sequence = (self._sequence + 1) & 0xFFFFFFFF
+        sequence = self._sequence
+        t0 = self.clock()
+        self._sock.sendto(TIME_REQUEST.pack(TIME_MAGIC, sequence, t0), self.address)
+        while True:
+            try:
+                data = self._sock.recv(64)
+            except socket.timeout:
+                return None
+            t3 = self.clock()
+            if len(data) != TIME_REPLY.size:
+                continue
+            magic, reply_sequence, echoed, t1, t2 = TIME_REPLY.unpack(data)
+            if magic == TIME_MAGIC and reply_sequence == sequence and echoed == t0:
+                return ((t1 - t0) + (t2 - t3)) / 2, (t3 - t0) - (t2 - t1)
+            # Otherwise a late reply to an earlier exchange: keep waiting for ours
+
+    def sync(self) -> float:
+        """
+        Run one burst of exchanges and update the offset estimate.
+
+        Returns:
+            float: The new offset (leader minus local), in seconds.
+
+        Raises:
+            TimeoutError: If the leader answered none of the exchanges.
+        """
+        samples = [s for s in (self.exchange() for _ in range(self.exchanges)) if s is not None]
+        if not samples:
+            raise TimeoutError(f"No clock replies from the show leader at {self.address[0]}:{self.address[1]}")
+        fastest = min(delay for _, delay in samples)
+        # (+50 µs so jitter on a sub-millisecond link doesn't drop nearly every exchange)
+        kept = [offset for offset, delay in samples if delay <= fastest * DELAY_TOLERANCE + 50e-6]
+        self.offset = median(kept)
+        self.delay = fastest
+        self.spread = max(kept) - min(kept)
+        self.bursts += 1
+        return self.offset
+
+    def start(self) -> None:
+        """Sync now, then keep re-syncing in the background."""
+        if self.offset is None:
+            self.sync()
+        self._thread = threading.Thread(target=self._run, name="show-clock-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self._sock.close()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sync()
+            except (TimeoutError, OSError) as e:
+                print(f"⚠️  Clock sync failed, keeping the last offset: {e}")
+
+
+class ShowLeader:
+    """Serves a show, its start time and the reference clock to follower nodes."""
+
+    def __init__(
+        self,
+        show: dict,
+        host: str = "0.0.0.0",
+        port: int = SHOW_SYNC_PORT,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize a ShowLeader and start serving.
+
+        Args:
+            show (dict): The full show timeline (followers pick their own part).
+            host (str): Address to listen on.
+            port (int): TCP (show, start) and UDP (clock) port.
+            clock (Callable[[], float]): The leader's clock, which the whole show is timed against.
+        """
+        self.show = show
+        self.clock = clock
+        self.followers: Dict[str, socket.socket] = {}
+
+        self._udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._udp.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._udp.bind((host, port))
+        self._udp.settimeout(0.2)
+        self._tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._tcp.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._tcp.bind((host, port))
+        self._tcp.listen()
+        self._tcp.settimeout(0.2)
+        self.port = self._tcp.getsockname()[1]
+
+        self._lock = threading.Condition()
+        self._stop = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._serve_clock, name="show-leader-clock", daemon=True),
+            threading.Thread(target=self._serve_joins, name="show-leader-joins", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._udp.close()
+        self._tcp.close()
+        for conn in self.followers.values():
+            conn.close()
+
+    def _serve_clock(self) -> None:
+        clock, sock = self.clock, self._udp
+        while not self._stop.is_set():
+            try:
+                data, addr = sock.recvfrom(64)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            t1 = clock()
+            if len(data) != TIME_REQUEST.size:
+                continue
+            magic, sequence, t0 = TIME_REQUEST.unpack(data)
+            if magic == TIME_MAGIC:
+                sock.sendto(TIME_REPLY.pack(TIME_MAGIC, sequence, t0, t1, clock()), addr)
+
+    def _serve_joins(self) -> None:
+        while not self._stop.is_set():
+            try:
+                conn, addr = self._tcp.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            conn.settimeout(5)
+            try:
+                hello = json.loads(conn.makefile("rb").readline())
+                node = hello.get("node") if isinstance(hello, dict) else None
+                if not isinstance(node, str) or not node:
+                    raise ValueError(f"no node name in its hello ({hello!r})")
+                conn.sendall(json.dumps({"show": self.show}).encode("utf-8") + b"\n")
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Follower at {addr[0]} failed to join: {e}")
+                conn.close()
+                continue
+            with self._lock:
+                self.followers[node] = conn
+                self._lock.notify_all()
+            print(f"🤝 Node '{node}' joined from {addr[0]}")
+            if node not in self.show.get("nodes", {}):
+                print(f"⚠️  Node '{node}' isn't in the show's \"nodes\", so it has no devices to play")
+
+    def wait_for(self, count: int, timeout: Optional[float] = None) -> bool:
+        """Wait until `count` followers have joined. Returns False on timeout."""
+        with self._lock:
+            return self._lock.wait_for(lambda: len(self.followers) >= count, timeout)
+
+    def start(self, lead: float = SHOW_SYNC_LEAD) -> float:
+        """
+        Announce the start time to every follower.
+
+        Args:
+            lead (float): Seconds from now until the show starts (time for followers to sync and compile).
+
+        Returns:
+            float: The start time, in the leader's clock.
+        """
+        start_at = self.clock() + lead
+        message = json.dumps({"start_at": start_at}).encode("utf-8") + b"\n"
+        with self._lock:
+            for node, conn in list(self.followers.items()):
+                try:
+                    conn.sendall(message)
+                except OSError as e:
+                    print(f"⚠️  Could not send the start time to node '{node}': {e}")
+        return start_at
+
+
+class ShowFollower:
+    """Joins a leader, receives the show and its start time, and keeps its clock in sync."""
+
+    def __init__(self, leader_host: str, node: str, port: int = SHOW_SYNC_PORT,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize a ShowFollower.
+
+        Args:
+            leader_host (str): Leader address.
+            node (str): This node's name (as listed under "nodes" in the show).
+            port (int): Leader sync port.
+            clock (Callable[[], float]): This machine's clock.
+        """
+        self.node = node
+        self.sync = ClockSync(leader_host, port, clock)
+        self._conn = socket.create_connection((leader_host, port), timeout=10)
+        self._file = self._conn.makefile("rwb")
+
+    def join(self) -> dict:
+        """Introduce this node, start syncing the clock and return the full show."""
+        self._file.write(json.dumps({"node": self.node}).encode("utf-8") + b"\n")
+        self._file.flush()
+        show = json.loads(self._file.readline())["show"]
+        self.sync.start()
+        return show
+
+    def wait_start(self, timeout: Optional[float] = None) -> float:
+        """Wait for the leader's start announcement. Returns the start time in the leader's clock."""
+        self._conn.settimeout(timeout)
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("The show leader closed the connection before starting")
+        return json.loads(line)["start_at"]
+
+    def close(self) -> None:
+        self.sync.stop()
+        self._file.close()
+        self._conn.close()
@@ -0,0 +1,179 @@
+# show/show_timeline.py
+
+# ==============================================================================
+# Govee LAN API Plus – Show Timeline
+# ----------------------------------
+#
+# Description:
+# Loads a Light & Sound show timeline from JSON and compiles it into a list of
+# ready-to-send cues. Every cue's LAN payload is built and JSON-encoded once at
+# load time, so nothing but a socket send happens while the show is playing.
+#
+# Timeline format:
+#
+# {
+#     "name": "Halloween 2025",
+#     "cues": [
+#         {"at": 0.0, "device": "smart_ground_lights", "scene": "smart_ground_lights_spooky_123456"},
+#         {"at": 1.5, "device": ["porch_light", "garage_lights"], "color": {"r": 255, "g": 80, "b": 0}},
+#         {"at": 3.0, "device": "porch_light", "brightness": 40, "priority": "low"},
+#         {"at": 9.0, "device": "porch_light", "power": false}
+#     ]
+# }
+#
+# `device` and `scene` are the variable names generated in the device and MQTT
+# DIY scene factories. `at` is in seconds from the start of the show. Shows
+# played from several machines also list which node drives which devices
+# under "nodes" (see show/show_sync.py).
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import json
+from typing import Dict, List, Optional, Tuple
+
+from api.lan.set_device_mqtt_diy_scene import build_mqtt_diy_scene_payload
+from api.lan.set_device_power import build_power_payload
+from api.lan.set_device_brightness import build_brightness_payload
+from api.lan.set_device_color import build_color_payload
+from api.lan.send_queue import PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_HIGH
+
+from models.govee_device import GoveeDevice
+from models.govee_mqtt_diy_scene import GoveeMqttDiyScene
+
+PRIORITIES = {
+    "low": PRIORITY_LOW,
+    "normal": PRIORITY_NORMAL,
+    "high": PRIORITY_HIGH,
+}
+
+
+class ShowCue:
+    """A single compiled cue: one pre-encoded LAN packet for one device at one point in the show."""
+
+    __slots__ = ("at", "device", "payload", "message", "priority", "label")
+
+    def __init__(self, at: float, device: GoveeDevice, payload: dict, priority: int = PRIORITY_HIGH, label: str = ""):
+        """
+        Initialize a ShowCue.
+
+        Args:
+            at (float): Seconds from the start of the show.
+            device (GoveeDevice): The device the cue is sent to.
+            payload (dict): The LAN command payload.
+            priority (int): Send priority (see api.lan.send_queue).
+            label (str): Human-readable description for logs and reports.
+        """
+        self.at = at
+        self.device = device
+        self.payload = payload
+        self.message = json.dumps(payload).encode("utf-8")
+        self.priority = priority
+        self.label = label
+
+    def __repr__(self) -> str:
+        return f"ShowCue(at={self.at}, device='{self.device.name}', label='{self.label}')"
+
+
+def load_factory_namespace() -> Tuple[Dict[str, GoveeDevice], Dict[str, GoveeMqttDiyScene]]:
+    """
+    Collect every generated device and MQTT DIY scene variable from the factories.
+
+    Returns:
+        Tuple[Dict[str, GoveeDevice], Dict[str, GoveeMqttDiyScene]]: Variable name → object maps.
+    """
+    import factories.device_factory as device_factory
+    import factories.device_mqtt_diy_scene_factory as mqtt_scene_factory
+
+    devices = {k: v for k, v in vars(device_factory).items() if isinstance(v, GoveeDevice)}
+    scenes = {k: v for k, v in vars(mqtt_scene_factory).items() if isinstance(v, GoveeMqttDiyScene)}
+    return devices, scenes
+
+
+def compile_cue(entry: dict, devices: Dict[str, GoveeDevice], scenes: Dict[str, GoveeMqttDiyScene]) -> List[ShowCue]:
+    """
+    Compile one timeline entry into cues (one per target device and command).
+
+    Args:
+        entry (dict): A timeline entry (see module description).
+        devices (Dict[str, GoveeDevice]): Device variable name → device.
+        scenes (Dict[str, GoveeMqttDiyScene]): MQTT DIY scene variable name → scene.
+
+    Returns:
+        List[ShowCue]: The compiled cues.
+
+    Raises:
+        ValueError: If the entry references an unknown device or scene, or has no command.
+    """
+    at = float(entry["at"])
+    priority = PRIORITIES[entry.get("priority", "high")]
+
+    device_names = entry["device"] if isinstance(entry["device"], list) else [entry["device"]]
+    targets = []
+    for name in device_names:
+        if name not in devices:
+            raise ValueError(f"Unknown device '{name}' in cue at {at}s")
+        targets.append(devices[name])
+
+    cues = []
+    for device in targets:
+        if "scene" in entry:
+            if entry["scene"] not in scenes:
+                raise ValueError(f"Unknown MQTT DIY scene '{entry['scene']}' in cue at {at}s")
+            payload = build_mqtt_diy_scene_payload(device, scenes[entry["scene"]])
+            cues.append(ShowCue(at, device, payload, priority, entry["scene"]))
+        if "power" in entry:
+            cues.append(ShowCue(at, device, build_power_payload(entry["power"]), priority, f"power {'on' if entry['power'] else 'off'}"))
+        if "brightness" in entry:
+            cues.append(ShowCue(at, device, build_brightness_payload(entry["brightness"]), priority, f"brightness {entry['brightness']}"))
+        if "color" in entry or "color_temp_in_kelvin" in entry:
+            color = entry.get("color", {"r": 0, "g": 0, "b": 0})
+            payload = build_color_payload(color, entry.get("color_temp_in_kelvin", 0))
+            cues.append(ShowCue(at, device, payload, priority, "color"))
+
+    if not cues:
+        raise ValueError(f"Cue at {at}s has no scene, power, brightness or color command")
+    return cues
+
+
+def compile_show(
+    show: dict,
+    devices: Optional[Dict[str, GoveeDevice]] = None,
+    scenes: Optional[Dict[str, GoveeMqttDiyScene]] = None
+) -> List[ShowCue]:
+    """
+    Compile a show timeline into cues sorted by time.
+
+    Args:
+        show (dict): The parsed timeline.
+        devices (Dict[str, GoveeDevice], optional): Device variable name → device. Defaults to the device factory.
+        scenes (Dict[str, GoveeMqttDiyScene], optional): Scene variable name → scene. Defaults to the MQTT DIY scene factory.
+
+    Returns:
+        List[ShowCue]: Compiled cues, ordered by `at`.
+    """
+    if devices is None or scenes is None:
+        factory_devices, factory_scenes = load_factory_namespace()
+        devices = factory_devices if devices is None else devices
+        scenes = factory_scenes if scenes is None else scenes
+
+    cues = []
+    for entry in show.get("cues", []):
+        cues.extend(compile_cue(entry, devices, scenes))
+    cues.sort(key=lambda c: c.at)
+    return cues
+
+
+def load_show(path: str) -> dict:
+    """
+    Read a show timeline JSON file.
+
+    Args:
+        path (str): Path to the timeline file.
+
+    Returns:
+        dict: The parsed timeline.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
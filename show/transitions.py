@@ -0,0 +1,260 @@
+# show/transitions.py
+
+# ==============================================================================
+# Govee LAN API Plus – Transition Engine
+# --------------------------------------
+#
+# Description:
+# Smooth color transitions (fades, chases, waves) across many devices at
+# once. Every device's transition is a row in a handful of NumPy arrays:
+#
+#   from color, to color, begin time, duration, easing
+#
+# so a frame for 500 devices is a few vectorized operations, not 500 Python
+# calls. Chases and waves are plain fades with a per-device begin time offset
+# by the device's position (its index, or any positions you pass, e.g. along
+# the front of a house).
+#
+# Starting a transition on devices that are mid-fade starts from the color
+# they are showing right now, so interrupting one never jumps.
+#
+# Frames go out through the shared LAN streaming path (show/color_stream.py),
+# which only sends devices whose 8-bit color actually changed: a slow fade at
+# 60 fps sends far fewer than 60 packets per second per device, and devices
+# that have settled are left alone apart from the keepalive.
+#
+# Transitions are between colors. Captured MQTT DIY scenes run on the device
+# itself, so there is nothing to blend them with; fade to a color (e.g.
+# black), then trigger the scene.
+#
+# Author: Jimmy Hickman
+# License: MIT
+# ==============================================================================
+
+import os
+import time
+import threading
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from api.tracing import traced
+from models.govee_device import GoveeDevice
+from show.color_stream import COLOR_STREAM_KEEPALIVE, ColorStream
+from show.show_mode import ShowMode
+
+# Configurable via .env
+TRANSITION_FPS = float(os.getenv("TRANSITION_FPS", 40))
+
+EASINGS = ("linear", "ease_in", "ease_out", "ease_in_out", "sine")
+
+Color = Union[dict, Sequence[int]]
+
+
+def ease(progress: np.ndarray, easing: np.ndarray) -> np.ndarray:
+    """
+    Apply each device's easing curve to its progress (both per device; progress in 0-1).
+
+    Args:
+        progress (np.ndarray): Linear progress per device.
+        easing (np.ndarray): Index into EASINGS per device.
+    """
+    out = progress.copy()
+    for code in np.unique(easing).tolist():
+        if code == 0:
+            continue
+        mask = easing == code
+        p = progress[mask]
+        if code == 1:
+            out[mask] = p * p * p
+        elif code == 2:
+            q = 1 - p
+            out[mask] = 1 - q * q * q
+        elif code == 3:
+            out[mask] = np.where(p < 0.5, 4 * p * p * p, 1 - 4 * (1 - p) ** 3)
+        else:
+            out[mask] = 0.5 - 0.5 * np.cos(np.pi * p)
+    return out
+
+
+def to_rgb_array(colors: Union[Color, Sequence[Color], np.ndarray], count: int) -> np.ndarray:
+    """
+    Normalize one color (or one per device) to a (count, 3) float array.
+
+    Colors may be {"r", "g", "b"} dicts (as used by `build_color_payload`) or (r, g, b) sequences.
+    """
+    if isinstance(colors, dict):
+        colors = (colors["r"], colors["g"], colors["b"])
+    elif not isinstance(colors, np.ndarray) and len(colors) and isinstance(colors[0], dict):
+        colors = [(c["r"], c["g"], c["b"]) for c in colors]
+    array = np.asarray(colors, dtype=np.float32)
+    if array.shape == (3,):
+        array = np.broadcast_to(array, (count, 3))
+    if array.shape != (count, 3):
+        raise ValueError(f"Expected one color or {count} colors, got an array of shape {array.shape}")
+    return np.clip(array, 0, 255)
+
+
+class TransitionEngine:
+    """Computes and streams color transitions for many devices at once."""
+
+    def __init__(
+        self,
+        devices: List[GoveeDevice],
+        fps: float = TRANSITION_FPS,
+        initial: Optional[Color] = None,
+        keepalive: float = COLOR_STREAM_KEEPALIVE
+    ):
+        """
+        Initialize a TransitionEngine.
+
+        Args:
+            devices (List[GoveeDevice]): Devices, in position order (chases run in this order).
+            fps (float): Frames per second while running.
+            initial (Color, optional): Color the devices are assumed to show at the start. Defaults to black.
+            keepalive (float): Resend a device's color after this many seconds without a packet.
+        """
+        count = len(devices)
+        self.devices = devices
+        self.fps = fps
+        self.stream = ColorStream(devices, threshold=0, keepalive=keepalive)
+        self.positions = np.arange(count) / max(1, count - 1)  # 0-1 along the device list
+        self.last_report = None
+
+        start = to_rgb_array(initial if initial is not None else (0, 0, 0), count)
+        self._from = start.copy()
+        self._to = start.copy()
+        self._begin = np.zeros(count)
+        self._duration = np.ones(count)
+        self._easing = np.zeros(count, dtype=np.int8)
+        self._lock = threading.Lock()  # Transitions may be started from another thread while running
+
+    def close(self) -> None:
+        self.stream.close()
+
+    # --------------------------------------------------------------------------
+    # Starting transitions
+    # --------------------------------------------------------------------------
+
+    def transition(
+        self,
+        to: Union[Color, Sequence[Color], np.ndarray],
+        duration: float,
+        easing: str = "ease_in_out",
+        offsets: Union[float, np.ndarray] = 0.0,
+        devices: Optional[np.ndarray] = None,
+        at: Optional[float] = None
+    ) -> None:
+        """
+        Start a transition.
+
+        Args:
+            to: Target color, or one per selected device.
+            duration (float): Seconds each device takes to get there.
+            easing (str): One of EASINGS.
+            offsets (float | np.ndarray): Seconds each selected device waits before starting.
+            devices (np.ndarray, optional): Indices or boolean mask of the devices to transition. Defaults to all.
+            at (float, optional): Monotonic start time. Defaults to now.
+
+        Raises:
+            ValueError: If the easing is unknown or the colors don't match the selection.
+        """
+        if easing not in EASINGS:
+            raise ValueError(f"Unknown easing '{easing}' (expected one of {', '.join(EASINGS)})")
+        at = time.monotonic() if at is None else at
+        selected = self._select(devices)
+        target = to_rgb_array(to, len(selected))
+
+        with self._lock:
+            self._from[selected] = self._current(at)[selected]
+            self._to[selected] = target
+            self._begin[selected] = at + np.asarray(offsets, dtype=np.float64)
+            self._duration[selected] = max(duration, 1e-6)
+            self._easing[selected] = EASINGS.index(easing)
+
+    def _select(self, devices: Optional[np.ndarray]) -> np.ndarray:
+        """Device indices from indices, a boolean mask or None (all)."""
+        if devices is None:
+            return np.arange(len(self.devices))
+        selected = np.asarray(devices)
+        return np.flatnonzero(selected) if selected.dtype == bool else selected
+
+    def fade(self, to, duration: float, easing: str = "ease_in_out", devices=None, at: Optional[float] = None) -> None:
+        """Fade the devices to `to` together."""
+        self.transition(to, duration, easing, 0.0, devices, at)
+
+    def chase(self, to, step: float, duration: Optional[float] = None, reverse: bool = False,
+              devices=None, at: Optional[float] = None) -> None:
+        """
+        Switch the devices to `to` one after another, `step` seconds apart.
+
+        Args:
+            step (float): Seconds between consecutive devices.
+            duration (float, optional): Each device's fade time. Defaults to `step` (a snappy chase).
+            reverse (bool): Run from the last device to the first.
+        """
+        selected = self._select(devices)
+        order = np.arange(len(selected))
+        if reverse:
+            order = order[::-1]
+        self.transition(to, step if duration is None else duration, "linear", order * step, selected, at)
+
+    def wave(self, to, duration: float, spread: float, positions: Optional[np.ndarray] = None,
+             devices=None, at: Optional[float] = None) -> None:
+        """
+        Sweep `to` across the devices as a soft wave: each device fades over `duration`,
+        starting `spread` × its position (0-1) seconds in, so neighbouring fades overlap.
+
+        Args:
+            positions (np.ndarray, optional): Position (0-1) of every device. Defaults to evenly
+                                              spaced in device order.
+        """
+        selected = self._select(devices)
+        where = self.positions if positions is None else np.asarray(positions, dtype=np.float64)
+        self.transition(to, duration, "sine", where[selected] * spread, selected, at)
+
+    # --------------------------------------------------------------------------
+    # Frames
+    # --------------------------------------------------------------------------
+
+    def _current(self, now: float) -> np.ndarray:
+        progress = np.clip((now - self._begin) / self._duration, 0.0, 1.0)
+        eased = ease(progress, self._easing)
+        return self._from + (self._to - self._from) * eased[:, None].astype(np.float32)
+
+    def render(self, now: float) -> np.ndarray:
+        """Every device's color at monotonic time `now`, as (devices, 3) uint8."""
+        with self._lock:
+            return (self._current(now) + 0.5).astype(np.uint8)
+
+    def busy(self, now: float) -> bool:
+        """Whether any transition is still running (or waiting to start) at `now`."""
+        with self._lock:
+            return bool((now < self._begin + self._duration).any())
+
+    @traced("transition.frame")
+    def frame(self, now: float) -> int:
+        """Render and send one frame. Returns the packets sent."""
+        return self.stream.send(self.render(now), now)
+
+    def run(self, duration: Optional[float] = None, until_idle: bool = True,
+            show_mode: Optional[ShowMode] = None) -> dict:
+        """
+        Stream frames until every transition has finished (or for `duration` seconds).
+
+        Args:
+            duration (float, optional): Seconds to run.
+            until_idle (bool): Stop once no transition is running. Set False to keep running (and
+                               picking up transitions started from other threads) until `duration`.
+            show_mode (ShowMode, optional): Custom show mode. Defaults to one without a report file.
+
+        Returns:
+            dict: The ColorStream run report.
+        """
+        finished = None
+        if until_idle:
+            # Keep going for a couple of frames after the transitions end, so every device lands on its final color
+            finished = lambda: not self.busy(time.monotonic() - 2 / self.fps)
+        self.last_report = self.stream.run(self.frame, self.fps, duration=duration, finished=finished,
+                                           show_mode=show_mode or ShowMode(show_name="transitions"))
+        return self.last_report